@@ -0,0 +1,66 @@
+"""
+Measure write latency of the configured durability tiers against a real MongoDB.
+
+Usage (from the backend directory):
+    python -m examples.write_concern_latency [--writes 500] [--size 4096]
+
+Writes go to a scratch collection that is dropped afterwards. Run it against
+the same topology as production (replica set, storage, network) - results
+from a standalone local mongod say nothing about majority writes.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from motor.motor_asyncio import AsyncIOMotorClient
+from src.services.database import write_concern
+from src.settings import settings
+
+SCRATCH_COLLECTION = "write_concern_latency"
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def measure(collection, writes: int, payload: str):
+    samples = []
+    await collection.insert_one({"_id": "doc", "content": payload})
+    for i in range(writes):
+        started = time.perf_counter()
+        await collection.update_one({"_id": "doc"}, {"$set": {"content": payload, "n": i}})
+        samples.append((time.perf_counter() - started) * 1000)
+    await collection.delete_one({"_id": "doc"})
+    return samples
+
+
+async def main(writes: int, size: int) -> None:
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    base = client[settings.database_name][SCRATCH_COLLECTION]
+    payload = "x" * size
+    tiers = {
+        "create (durable)": write_concern(settings.write_concern_create, settings.write_journal_create),
+        "update (fast)": write_concern(settings.write_concern_update, settings.write_journal_update)
+    }
+    try:
+        print(f"{'tier':<18} {'concern':<28} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for name, concern in tiers.items():
+            samples = await measure(base.with_options(write_concern=concern), writes, payload)
+            print(
+                f"{name:<18} {str(concern.document):<28} "
+                f"{statistics.median(samples):>8.2f} {percentile(samples, 0.95):>8.2f} "
+                f"{percentile(samples, 0.99):>8.2f}"
+            )
+    finally:
+        await base.drop()
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writes", type=int, default=500)
+    parser.add_argument("--size", type=int, default=4096, help="document size in bytes")
+    args = parser.parse_args()
+    asyncio.run(main(args.writes, args.size))
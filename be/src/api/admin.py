@@ -0,0 +1,66 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from typing import Literal, Optional
+import asyncio
+import hmac
+import logging
+
+from ..services.profiler import dump_tasks, profile
+from ..settings import settings
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# One profile per worker at a time; overlapping samplers would skew each other
+_profile_lock = asyncio.Lock()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """
+    Allow admin endpoints only in debug mode or with the configured admin token.
+    
+    Without either the endpoints do not exist (404). With a token configured
+    it is required even in debug mode.
+    """
+    if settings.admin_token:
+        if x_admin_token is None or not hmac.compare_digest(x_admin_token, settings.admin_token):
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+        return
+    if not settings.debug:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
+@router.get("/profile", dependencies=[Depends(require_admin)])
+async def profile_worker(
+    seconds: float = Query(5.0, gt=0),
+    interval_ms: float = Query(settings.profiler_interval_ms, ge=1),
+    format: Literal["json", "collapsed"] = "json"
+):
+    """Sample this worker's stacks for `seconds` and dump its asyncio tasks."""
+    if seconds > settings.profiler_max_seconds:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"seconds must not exceed {settings.profiler_max_seconds}"
+        )
+    if _profile_lock.locked():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running")
+    
+    async with _profile_lock:
+        logger.info("Profiling worker for %ss", seconds)
+        profiler = await profile(seconds, interval_ms / 1000)
+        tasks = dump_tasks()
+    
+    if format == "collapsed":
+        return PlainTextResponse(profiler.collapsed())
+    return {
+        "seconds": seconds,
+        "samples": profiler.sample_count,
+        "collapsed": profiler.collapsed(),
+        "tasks": tasks
+    }
+
+
+@router.get("/tasks", dependencies=[Depends(require_admin)])
+async def task_dump():
+    """List this worker's asyncio tasks and what each one is waiting on."""
+    return {"tasks": dump_tasks()}
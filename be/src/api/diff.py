@@ -0,0 +1,64 @@
+from fastapi import APIRouter, HTTPException, Query, status, Depends
+import logging
+
+from ..models.diff import DiffResponse
+from ..services.diff_service import DiffFormat, DiffService, get_diff_service
+from ..services.admission_controller import Overloaded
+from ..services.circuit_breaker import retry_after_header
+from ..settings import settings
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/diff", response_model=DiffResponse, response_model_exclude_none=True)
+async def diff_documents(
+    a: str = Query(..., description="Share ID of the original document"),
+    b: str = Query(..., description="Share ID of the compared document"),
+    format: DiffFormat = Query(default="unified"),
+    context: int = Query(default=3, ge=0, le=100),
+    diff_service: DiffService = Depends(get_diff_service)
+):
+    """Return a line diff between two documents."""
+    try:
+        result = await diff_service.diff_documents(a, b, format=format, context=context)
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document with share_id '{a}' or '{b}' not found"
+            )
+        return result
+    except HTTPException:
+        raise
+    except TimeoutError as e:
+        logger.warning("Deadline exceeded diffing documents: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded"
+        )
+    except ConnectionError as e:
+        logger.warning("Database unavailable diffing documents: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database temporarily unavailable",
+            headers={"Retry-After": retry_after_header(e)}
+        )
+    except Overloaded as e:
+        logger.warning("Executor overloaded diffing documents: %s", e.reason)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is overloaded, retry later",
+            headers={"Retry-After": str(settings.admission_retry_after)}
+        )
+    except RuntimeError as e:
+        logger.error("Service error diffing documents: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to diff documents"
+        )
+    except Exception as e:
+        logger.error("Unexpected error diffing documents: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
@@ -4,8 +4,10 @@ import logging
 from ..models.document import DocumentCreate, DocumentUpdate, DocumentResponse
 from ..services.document_service import DocumentService
 from src.services.document_service import get_document_service
+from ..services.circuit_breaker import retry_after_header
+from .timed_route import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 logger = logging.getLogger(__name__)
 
 
@@ -17,22 +19,38 @@ async def create_document(
     """Create a new document with auto-generated share_id."""
     try:
         result = await document_service.create_document(document)
-        logger.info(f"Document created with share_id: {result.share_id}")
+        logger.info(
+            "Document created with share_id: %s", result.share_id,
+            extra={"share_id": result.share_id, "sample": True}
+        )
         return result
     except ValueError as e:
-        logger.warning(f"Validation error creating document: {e}")
+        logger.warning("Validation error creating document: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except TimeoutError as e:
+        logger.warning("Deadline exceeded creating document: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded"
+        )
+    except ConnectionError as e:
+        logger.warning("Database unavailable creating document: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database temporarily unavailable",
+            headers={"Retry-After": retry_after_header(e)}
+        )
     except RuntimeError as e:
-        logger.error(f"Service error creating document: {e}")
+        logger.error("Service error creating document: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create document"
         )
     except Exception as e:
-        logger.error(f"Unexpected error creating document: {e}")
+        logger.error("Unexpected error creating document: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
@@ -52,18 +70,31 @@ async def get_document(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Document with share_id '{share_id}' not found"
             )
-        logger.info(f"Document retrieved: {share_id}")
+        logger.info("Document retrieved: %s", share_id, extra={"share_id": share_id, "sample": True})
         return result
     except HTTPException:
         raise
+    except TimeoutError as e:
+        logger.warning("Deadline exceeded retrieving document: %s", e, extra={"share_id": share_id})
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded"
+        )
+    except ConnectionError as e:
+        logger.warning("Database unavailable retrieving document: %s", e, extra={"share_id": share_id})
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database temporarily unavailable",
+            headers={"Retry-After": retry_after_header(e)}
+        )
     except RuntimeError as e:
-        logger.error(f"Service error retrieving document: {e}")
+        logger.error("Service error retrieving document: %s", e, extra={"share_id": share_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve document"
         )
     except Exception as e:
-        logger.error(f"Unexpected error retrieving document: {e}")
+        logger.error("Unexpected error retrieving document: %s", e, extra={"share_id": share_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
@@ -84,24 +115,37 @@ async def update_document(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Document with share_id '{share_id}' not found"
             )
-        logger.info(f"Document updated: {share_id}")
+        logger.info("Document updated: %s", share_id, extra={"share_id": share_id, "sample": True})
         return result
     except HTTPException:
         raise
     except ValueError as e:
-        logger.warning(f"Validation error updating document: {e}")
+        logger.warning("Validation error updating document: %s", e, extra={"share_id": share_id})
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except TimeoutError as e:
+        logger.warning("Deadline exceeded updating document: %s", e, extra={"share_id": share_id})
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded"
+        )
+    except ConnectionError as e:
+        logger.warning("Database unavailable updating document: %s", e, extra={"share_id": share_id})
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database temporarily unavailable",
+            headers={"Retry-After": retry_after_header(e)}
+        )
     except RuntimeError as e:
-        logger.error(f"Service error updating document: {e}")
+        logger.error("Service error updating document: %s", e, extra={"share_id": share_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to update document"
         )
     except Exception as e:
-        logger.error(f"Unexpected error updating document: {e}")
+        logger.error("Unexpected error updating document: %s", e, extra={"share_id": share_id})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
@@ -0,0 +1,85 @@
+from fastapi import APIRouter, HTTPException, Query, status, Depends
+import logging
+from typing import Optional
+
+from ..models.revision import RevisionListResponse, RevisionResponse
+from ..services.revision_service import RevisionService, get_revision_service
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/documents/{share_id}/revisions", response_model=RevisionListResponse)
+async def list_revisions(
+    share_id: str,
+    limit: int = Query(default=100, ge=1, le=1000),
+    revision_service: Optional[RevisionService] = Depends(get_revision_service)
+):
+    """List the revisions of a document, newest first."""
+    if revision_service is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Revisions are not available with this storage backend"
+        )
+    try:
+        return await revision_service.list_revisions(share_id, limit)
+    except TimeoutError as e:
+        logger.warning("Deadline exceeded listing revisions: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded"
+        )
+    except RuntimeError as e:
+        logger.error("Service error listing revisions: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to list revisions"
+        )
+    except Exception as e:
+        logger.error("Unexpected error listing revisions: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.get("/documents/{share_id}/revisions/{number}", response_model=RevisionResponse)
+async def get_revision(
+    share_id: str,
+    number: int,
+    revision_service: Optional[RevisionService] = Depends(get_revision_service)
+):
+    """Retrieve a document as it was at a given revision."""
+    if revision_service is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Revisions are not available with this storage backend"
+        )
+    try:
+        result = await revision_service.get_revision(share_id, number)
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Revision {number} of document '{share_id}' not found"
+            )
+        return result
+    except HTTPException:
+        raise
+    except TimeoutError as e:
+        logger.warning("Deadline exceeded retrieving revision: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded"
+        )
+    except RuntimeError as e:
+        logger.error("Service error retrieving revision: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve revision"
+        )
+    except Exception as e:
+        logger.error("Unexpected error retrieving revision: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
@@ -1,26 +1,73 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, status
+from fastapi.responses import JSONResponse, PlainTextResponse
 from ..settings import settings
 from .documents import router as documents_router
-from ..services.database import db_manager
+from .revisions import router as revisions_router
+from .diff import router as diff_router
+from .sync import router as sync_router
+from .snapshots import router as snapshots_router
+from .stats import router as stats_router
+from .admin import router as admin_router
+from ..services.health_monitor import health_monitor
+from ..services.mongo_monitoring import command_monitor
+from ..services.metrics import CONTENT_TYPE, exporter
+from ..services.loop_monitor import loop_monitor
+from ..services.admission_controller import admission_controller
+from ..services.circuit_breaker import document_breaker
+from ..services.executor import executor
+from ..services.access_tracker import access_tracker
 
 router = APIRouter()
 
 router.include_router(documents_router, prefix="/api/v1", tags=["documents"])
+router.include_router(revisions_router, prefix="/api/v1", tags=["revisions"])
+router.include_router(diff_router, prefix="/api/v1", tags=["diff"])
+router.include_router(sync_router, prefix="/api/v1", tags=["sync"])
+router.include_router(snapshots_router, prefix="/api/v1", tags=["snapshots"])
+router.include_router(stats_router, prefix="/api/v1", tags=["stats"])
+router.include_router(admin_router, prefix="/admin", tags=["admin"], include_in_schema=False)
 
-# Health check endpoint
+# Health check endpoint; reports the cached result of the background probe
 @router.get("/health")
 async def health_check():
-    # Check database health
-    db_healthy = await db_manager.health_check()
+    probe = health_monitor.status()
     
     return {
-        "status": "healthy" if db_healthy else "unhealthy", 
+        "status": "healthy" if probe["ready"] else "unhealthy", 
         "service": "editer-api",
         "version": settings.api_version,
         "debug": settings.debug,
-        "database": "healthy" if db_healthy else "unhealthy"
+        "database": probe["database"],
+        "probe": probe,
+        "database_commands": command_monitor.stats(),
+        "event_loop": loop_monitor.stats(),
+        "admission": admission_controller.stats(),
+        "circuit_breaker": document_breaker.stats(),
+        "executors": executor.stats(),
+        "access_tracking": access_tracker.stats()
     }
 
+# Liveness: the process is up and its event loop is serving requests
+@router.get("/health/live")
+async def liveness_check():
+    return {"status": "alive"}
+
+# Readiness: the last database probe succeeded recently
+@router.get("/health/ready")
+async def readiness_check():
+    ready = health_monitor.ready
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if ready else "not_ready", "database": health_monitor.status()["database"]}
+    )
+
+# Prometheus metrics, merged across workers when METRICS_MULTIPROCESS_DIR is set
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    if not settings.metrics_enabled:
+        return PlainTextResponse("metrics disabled\n", status_code=status.HTTP_404_NOT_FOUND)
+    return PlainTextResponse(exporter.render(), media_type=CONTENT_TYPE)
+
 # Root endpoint
 @router.get("/")
 async def root():
@@ -0,0 +1,132 @@
+from fastapi import APIRouter, HTTPException, Request, Response, status, Depends
+import logging
+import re
+from typing import Optional
+
+from ..models.snapshot import SnapshotPublishResponse, SnapshotResponse
+from ..services.snapshot_service import SnapshotService, get_snapshot_service
+from ..settings import settings
+from ..services.circuit_breaker import retry_after_header
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+CONTENT_HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header, a list of strong or weak ETags or `*`, against an ETag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in (etag, "*"):
+            return True
+    return False
+
+
+@router.post(
+    "/documents/{share_id}/snapshots",
+    response_model=SnapshotPublishResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def publish_snapshot(
+    share_id: str,
+    snapshot_service: Optional[SnapshotService] = Depends(get_snapshot_service)
+):
+    """Publish the current content of a document under an immutable URL."""
+    if snapshot_service is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Snapshots are not available with this storage backend"
+        )
+    try:
+        result = await snapshot_service.publish(share_id)
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document with share_id '{share_id}' not found"
+            )
+        logger.info("Snapshot published for %s: %s", share_id, result.content_hash)
+        return result
+    except HTTPException:
+        raise
+    except TimeoutError as e:
+        logger.warning("Deadline exceeded publishing snapshot: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded"
+        )
+    except ConnectionError as e:
+        logger.warning("Database unavailable publishing snapshot: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database temporarily unavailable",
+            headers={"Retry-After": retry_after_header(e)}
+        )
+    except RuntimeError as e:
+        logger.error("Service error publishing snapshot: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to publish snapshot"
+        )
+    except Exception as e:
+        logger.error("Unexpected error publishing snapshot: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.get("/snapshots/{content_hash}", response_model=SnapshotResponse)
+async def get_snapshot(
+    content_hash: str,
+    request: Request,
+    response: Response,
+    snapshot_service: Optional[SnapshotService] = Depends(get_snapshot_service)
+):
+    """Serve a snapshot; its content never changes, so it is cacheable forever."""
+    if snapshot_service is None or not CONTENT_HASH_PATTERN.match(content_hash):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Snapshot '{content_hash}' not found"
+        )
+
+    cache_headers = {
+        "Cache-Control": f"public, max-age={settings.snapshot_max_age}, immutable",
+        "ETag": f'"{content_hash}"'
+    }
+
+    try:
+        result = await snapshot_service.get_snapshot(content_hash)
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Snapshot '{content_hash}' not found"
+            )
+        if etag_matches(request.headers.get("if-none-match"), cache_headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+        response.headers.update(cache_headers)
+        return result
+    except HTTPException:
+        raise
+    except TimeoutError as e:
+        logger.warning("Deadline exceeded retrieving snapshot: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded"
+        )
+    except RuntimeError as e:
+        logger.error("Service error retrieving snapshot: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve snapshot"
+        )
+    except Exception as e:
+        logger.error("Unexpected error retrieving snapshot: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
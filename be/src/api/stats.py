@@ -0,0 +1,50 @@
+from fastapi import APIRouter, HTTPException, status, Depends
+import logging
+from typing import Optional
+
+from ..models.document import DocumentStatsResponse
+from ..services.access_tracker import AccessTracker, get_access_tracker
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.get("/documents/{share_id}/stats", response_model=DocumentStatsResponse)
+async def get_document_stats(
+    share_id: str,
+    access_tracker: Optional[AccessTracker] = Depends(get_access_tracker)
+):
+    """Retrieve the view count and last access time of a document."""
+    if access_tracker is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Access tracking is disabled"
+        )
+    try:
+        result = await access_tracker.get_stats(share_id)
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document with share_id '{share_id}' not found"
+            )
+        return result
+    except HTTPException:
+        raise
+    except TimeoutError as e:
+        logger.warning("Deadline exceeded retrieving document stats: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded"
+        )
+    except RuntimeError as e:
+        logger.error("Service error retrieving document stats: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve document stats"
+        )
+    except Exception as e:
+        logger.error("Unexpected error retrieving document stats: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, HTTPException, status, Depends
+import logging
+
+from ..models.sync import SyncRequest, SyncResponse
+from ..services.sync_service import SyncService, get_sync_service
+from ..services.admission_controller import Overloaded
+from ..services.circuit_breaker import retry_after_header
+from ..settings import settings
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+@router.post("/documents/{share_id}/sync", response_model=SyncResponse, response_model_exclude_none=True)
+async def sync_document(
+    share_id: str,
+    request: SyncRequest,
+    sync_service: SyncService = Depends(get_sync_service)
+):
+    """Return copy/literal instructions that rebuild the document from the client's copy."""
+    try:
+        result = await sync_service.sync(share_id, request)
+        if not result:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Document with share_id '{share_id}' not found"
+            )
+        return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.warning("Validation error syncing document: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except TimeoutError as e:
+        logger.warning("Deadline exceeded syncing document: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded"
+        )
+    except ConnectionError as e:
+        logger.warning("Database unavailable syncing document: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database temporarily unavailable",
+            headers={"Retry-After": retry_after_header(e)}
+        )
+    except Overloaded as e:
+        logger.warning("Executor overloaded syncing document: %s", e.reason)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is overloaded, retry later",
+            headers={"Retry-After": str(settings.admission_retry_after)}
+        )
+    except RuntimeError as e:
+        logger.error("Service error syncing document: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to sync document"
+        )
+    except Exception as e:
+        logger.error("Unexpected error syncing document: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
@@ -0,0 +1,38 @@
+"""
+Route class marking handler boundaries for the Server-Timing header and
+the route template for structured logs.
+"""
+
+import functools
+import inspect
+import time
+from fastapi.routing import APIRoute
+from ..context.request_context import get_request_context
+
+
+def _timed_endpoint(endpoint, path: str):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        context = get_request_context()
+        if context is not None:
+            context.route = path
+            # Everything before the handler: middleware, routing, body parsing and validation
+            context.timings["parse"] = time.monotonic() - context.started_at
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            if context is not None:
+                context.handler_finished_at = time.monotonic()
+
+    wrapper.timed_endpoint = endpoint
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that records its template and when its async handler starts and finishes."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            # include_router copies routes with their wrapped endpoint; wrap the original once
+            endpoint = _timed_endpoint(getattr(endpoint, "timed_endpoint", endpoint), path)
+        super().__init__(path, endpoint, **kwargs)
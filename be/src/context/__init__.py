@@ -0,0 +1,8 @@
+"""
+Per-request context carried via contextvars.
+"""
+
+from .request_context import RequestContext, get_request_context
+from .deadline import DeadlineExceeded
+
+__all__ = ["RequestContext", "get_request_context", "DeadlineExceeded"]
@@ -0,0 +1,57 @@
+"""
+Deadline helpers for the current request.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from .request_context import RequestContext, get_request_context, reset_request_context, set_request_context
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when the current request deadline has passed."""
+
+
+def remaining_time() -> Optional[float]:
+    """
+    Get the time left before the current deadline.
+
+    Returns:
+        Optional[float]: Seconds left (may be negative), None without a deadline
+    """
+    context = get_request_context()
+    if context is None or context.deadline is None:
+        return None
+    return context.deadline - time.monotonic()
+
+
+def check_deadline(operation: str = "operation") -> None:
+    """
+    Fail fast if the current deadline has already passed.
+
+    Raises:
+        DeadlineExceeded: If no time is left
+    """
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {operation}")
+
+
+@contextmanager
+def deadline_scope(seconds: Optional[float]) -> Iterator[RequestContext]:
+    """
+    Run a block under a deadline outside of an HTTP request, e.g. in a bulk job.
+
+    Args:
+        seconds: Time budget, None for no deadline
+    """
+    deadline = time.monotonic() + seconds if seconds is not None else None
+    parent = get_request_context()
+    if parent is not None and parent.deadline is not None:
+        deadline = parent.deadline if deadline is None else min(deadline, parent.deadline)
+    context = RequestContext(deadline=deadline)
+    token = set_request_context(context)
+    try:
+        yield context
+    finally:
+        reset_request_context(token)
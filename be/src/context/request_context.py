@@ -0,0 +1,69 @@
+"""
+Request-scoped state shared between middleware, services and repositories.
+"""
+
+import time
+from contextvars import ContextVar, Token
+from typing import Dict, Optional
+
+
+class RequestContext:
+    """Mutable state of the request being handled by the current task."""
+
+    def __init__(
+        self,
+        method: str = "",
+        path: str = "",
+        deadline: Optional[float] = None,
+        request_id: Optional[str] = None
+    ):
+        """
+        Initialize the request context.
+
+        Args:
+            method: HTTP method
+            path: Request path
+            deadline: Absolute time.monotonic() value after which work should stop
+            request_id: Id correlating the logs of this request
+        """
+        self.method = method
+        self.path = path
+        self.deadline = deadline
+        # Set when the client shortened the deadline below the route default
+        self.client_deadline = False
+        self.request_id = request_id
+        self.route: Optional[str] = None
+        self.started_at = time.monotonic()
+        self.stale_age: Optional[float] = None
+        self.timings: Dict[str, float] = {}
+        self.handler_finished_at: Optional[float] = None
+        # Set when a resource of this server rejected work for lack of capacity
+        self.overloaded = False
+
+
+_request_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    """
+    Get the context of the request handled by the current task.
+
+    Returns:
+        Optional[RequestContext]: Current request context, None outside requests
+    """
+    return _request_context.get()
+
+
+def set_request_context(context: Optional[RequestContext]) -> Token:
+    """
+    Make a context current for the running task.
+
+    Returns:
+        Token: Token to restore the previous context with reset_request_context
+    """
+    return _request_context.set(context)
+
+
+def reset_request_context(token: Token) -> None:
+    """Restore the context that was current before set_request_context."""
+    _request_context.reset(token)
@@ -0,0 +1,59 @@
+"""
+Per-request phase timings reported in the Server-Timing header.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from .request_context import RequestContext, get_request_context
+
+# Descriptions shown by browser dev tools next to each phase
+PHASE_DESCRIPTIONS = {
+    "parse": "Routing, body parsing and validation",
+    "hrid": "Share ID generation",
+    "repo": "Repository calls",
+    "db": "MongoDB round trips",
+    "revision": "Revision recording",
+    "convert": "Model conversion",
+    "serialize": "Response serialization",
+    "total": "Total"
+}
+
+
+def add_timing(name: str, seconds: float) -> None:
+    """Add `seconds` to phase `name` of the current request, if any."""
+    context = get_request_context()
+    if context is not None:
+        context.timings[name] = context.timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Time a block as phase `name` of the current request."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(name, time.perf_counter() - started)
+
+
+def server_timing_header(context: RequestContext, now: Optional[float] = None) -> str:
+    """
+    Build the Server-Timing header value for a request.
+
+    Serialization is the time between the handler returning and the
+    response starting; total is measured from the start of the request.
+    """
+    now = time.monotonic() if now is None else now
+    timings = dict(context.timings)
+    if context.handler_finished_at is not None:
+        timings["serialize"] = now - context.handler_finished_at
+    timings["total"] = now - context.started_at
+    parts = []
+    for name, seconds in timings.items():
+        description = PHASE_DESCRIPTIONS.get(name)
+        entry = f"{name};dur={seconds * 1000:.2f}"
+        if description:
+            entry += f';desc="{description}"'
+        parts.append(entry)
+    return ", ".join(parts)
@@ -6,12 +6,30 @@ from fastapi.middleware.cors import CORSMiddleware
 from .settings import settings
 from .api.router import router
 from .api.documents import router as documents_router
-from .services.database import db_manager
+from .services.database import document_database
+from .services.health_monitor import health_monitor
+from .services.revision_service import revision_compactor
+from .services.tiering import tiering_job
+from .services.access_tracker import get_access_tracker
+from .services.rate_limiter import rate_limiter
+from .middleware.rate_limit import RateLimitMiddleware
+from .services.admission_controller import admission_controller
+from .middleware.admission import AdmissionMiddleware
+from .middleware.request_context import RequestContextMiddleware
+from .middleware.metrics import MetricsMiddleware
+from .services.metrics import exporter
+from .services.loop_monitor import loop_monitor
+from .services.executor import executor
+from .services.traffic_capture import traffic_recorder
+from .middleware.traffic_capture import TrafficCaptureMiddleware
+from .utils.structured_logging import configure_logging
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level),
-    format=settings.log_format
+# Configure logging; records are written by a background thread
+configure_logging(
+    level=settings.log_level,
+    json_format=settings.log_json,
+    text_format=settings.log_format,
+    sample_rate=settings.log_sample_rate
 )
 logger = logging.getLogger(__name__)
 
@@ -21,18 +39,48 @@ async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
     # Startup
     logger.info("Starting application...")
+    database = document_database()
     try:
-        await db_manager.connect()
+        await database.connect()
         logger.info("Database connected successfully")
     except Exception as e:
-        logger.error(f"Failed to connect to database: {e}")
+        logger.error("Failed to connect to database: %s", e)
         raise
     
+    await health_monitor.start()
+    if settings.metrics_enabled:
+        exporter.start()
+    if settings.loop_monitor_enabled:
+        loop_monitor.start()
+    executor.start()
+    if settings.traffic_capture_enabled:
+        traffic_recorder.start()
+    if settings.revisions_enabled and settings.storage_backend == "mongodb":
+        revision_compactor.start()
+    if settings.tiering_enabled and settings.storage_backend == "mongodb":
+        tiering_job.start()
+    access_tracker = get_access_tracker()
+    if access_tracker is not None:
+        access_tracker.start()
+    if settings.rate_limit_enabled:
+        await rate_limiter.backend.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down application...")
-    await db_manager.disconnect()
+    await revision_compactor.stop()
+    await tiering_job.stop()
+    if access_tracker is not None:
+        # Before disconnecting, so the final flush reaches the database
+        await access_tracker.stop()
+    await rate_limiter.backend.stop()
+    await health_monitor.stop()
+    await exporter.stop()
+    await loop_monitor.stop()
+    await executor.stop()
+    traffic_recorder.stop()
+    await database.disconnect()
     logger.info("Application shutdown complete")
 
 
@@ -45,6 +93,18 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Cap in-flight requests per route class; innermost so rate limited requests never queue
+if settings.admission_enabled:
+    app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
+# Enforce rate limits inside CORS so rejections still carry CORS headers
+if settings.rate_limit_enabled:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limiter=rate_limiter,
+        trust_forwarded=settings.rate_limit_trust_forwarded
+    )
+
 # Configure CORS with settings
 app.add_middleware(
     CORSMiddleware,
@@ -54,6 +114,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Establish the request context and deadline before any other middleware runs
+app.add_middleware(RequestContextMiddleware)
+
+# Record traffic for replay, including rejected and shed requests
+if settings.traffic_capture_enabled:
+    app.add_middleware(TrafficCaptureMiddleware, recorder=traffic_recorder)
+
+# Outermost so that rejected and shed requests are measured too
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Include API routers
 app.include_router(router)
 app.include_router(documents_router, prefix="/api/v1", tags=["documents"])
@@ -0,0 +1,64 @@
+"""
+ASGI middleware applying adaptive concurrency limits per route class.
+"""
+
+import json
+import logging
+import time
+from ..context.deadline import remaining_time
+from ..context.request_context import get_request_context
+from ..services.admission_controller import AdmissionController, Overloaded
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionMiddleware:
+    """Admits, queues or sheds requests; shed requests get 503 with Retry-After."""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.controller.limiter_for(scope["method"], scope["path"])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            # Never queue a request longer than its own deadline allows
+            await limiter.acquire(max_wait=remaining_time())
+        except Overloaded as e:
+            logger.warning("Shedding %s %s (%s: %s)", scope['method'], scope['path'], limiter.name, e.reason)
+            body = json.dumps({"detail": "Server is overloaded, retry later"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"retry-after", str(self.controller.retry_after).encode()),
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Errors from the database or the client's own deadline are not overload of this server
+            context = get_request_context()
+            limiter.release(time.perf_counter() - start, ok=context is None or not context.overloaded)
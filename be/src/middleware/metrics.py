@@ -0,0 +1,71 @@
+"""
+ASGI middleware recording request metrics.
+"""
+
+import time
+from ..services.metrics import (
+    http_request_duration_seconds,
+    http_request_size_bytes,
+    http_requests_in_flight,
+    http_requests_total,
+    http_response_size_bytes
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_label(scope) -> str:
+    """
+    Get the route template of a handled request, e.g. /api/v1/documents/{share_id}.
+
+    Templates keep label cardinality bounded; requests that matched no
+    route share a single label.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Records latency, size and in-flight metrics for every HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        status_code = 500
+        request_size = 0
+        response_size = 0
+
+        async def receive_wrapper():
+            nonlocal request_size
+            message = await receive()
+            if message["type"] == "http.request":
+                request_size += len(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            http_requests_in_flight.dec(method)
+            route = route_label(scope)
+            status = str(status_code)
+            http_requests_total.inc(method, route, status)
+            http_request_duration_seconds.observe(time.perf_counter() - started, method, route, status)
+            http_request_size_bytes.observe(request_size, method, route)
+            http_response_size_bytes.observe(response_size, method, route)
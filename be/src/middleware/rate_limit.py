@@ -0,0 +1,72 @@
+"""
+ASGI middleware enforcing token bucket rate limits.
+"""
+
+import json
+import logging
+from ..services.rate_limiter import RateLimiter, format_reset
+
+logger = logging.getLogger(__name__)
+
+
+def client_address(scope, trust_forwarded: bool = False) -> str:
+    """Return the client address of a request, optionally from X-Forwarded-For."""
+    if trust_forwarded:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode("latin-1").split(",")[0].strip()
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """
+    Rejects requests over budget with 429 and adds IETF RateLimit headers
+    (RateLimit-Limit, RateLimit-Remaining, RateLimit-Reset, RateLimit-Policy)
+    to every rate limited response.
+    """
+
+    def __init__(self, app, limiter: RateLimiter, trust_forwarded: bool = False):
+        self.app = app
+        self.limiter = limiter
+        self.trust_forwarded = trust_forwarded
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client = client_address(scope, self.trust_forwarded)
+        result, rule = await self.limiter.check(scope["method"], scope["path"], client)
+        if result is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = [
+            (b"ratelimit-limit", str(result.limit).encode()),
+            (b"ratelimit-remaining", str(result.remaining).encode()),
+            (b"ratelimit-reset", format_reset(result.reset_after).encode()),
+            (b"ratelimit-policy", f"{rule.capacity};w={int(rule.window)}".encode()),
+        ]
+
+        if not result.allowed:
+            logger.warning("Rate limit '%s' exceeded by %s on %s %s", rule.name, client, scope['method'], scope['path'])
+            body = json.dumps({"detail": "Rate limit exceeded"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": headers + [
+                    (b"retry-after", format_reset(result.retry_after).encode()),
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
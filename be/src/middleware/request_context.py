@@ -0,0 +1,95 @@
+"""
+ASGI middleware establishing the per-request context and deadline.
+"""
+
+import time
+from ..context.request_context import RequestContext, reset_request_context, set_request_context
+from ..context.timing import server_timing_header
+from ..settings import settings
+from ..utils.structured_logging import new_request_id
+
+DEADLINE_HEADER = b"x-request-timeout-ms"
+REQUEST_ID_HEADER = b"x-request-id"
+STALE_WARNING = b'110 - "Response is Stale"'
+TIMING_ALLOW_ORIGIN = ", ".join(
+    origin.strip() for origin in settings.allowed_origins.split(",") if origin.strip()
+).encode()
+
+
+def default_timeout_ms(method: str) -> int:
+    """Get the time budget of a route class when the client sets none."""
+    if method in ("GET", "HEAD"):
+        return settings.request_timeout_read_ms
+    return settings.request_timeout_write_ms
+
+
+def request_timeout_ms(method: str, headers) -> int:
+    """
+    Resolve the time budget of a request.
+
+    The client may shorten or extend the route default with the
+    X-Request-Timeout-Ms header, capped at `request_timeout_max_ms`.
+    """
+    for name, value in headers:
+        if name == DEADLINE_HEADER:
+            try:
+                return max(1, min(int(value), settings.request_timeout_max_ms))
+            except ValueError:
+                break
+    return default_timeout_ms(method)
+
+
+class RequestContextMiddleware:
+    """
+    Creates a RequestContext with a deadline and a request id for every
+    HTTP request; the id is taken from X-Request-ID when the client sent
+    one and is echoed in the response.
+
+    Responses built from data served stale (see CircuitBreakerRepository)
+    get a Warning header and an Age header with the age of that data.
+    Requests that recorded phase timings get a Server-Timing header when
+    `server_timing_enabled` is set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = scope.get("headers", [])
+        timeout_ms = request_timeout_ms(scope["method"], headers)
+        incoming_id = next((value for name, value in headers if name == REQUEST_ID_HEADER), None)
+        context = RequestContext(
+            method=scope["method"],
+            path=scope["path"],
+            deadline=time.monotonic() + timeout_ms / 1000,
+            request_id=new_request_id(incoming_id.decode("latin-1") if incoming_id else None)
+        )
+        context.client_deadline = timeout_ms < default_timeout_ms(scope["method"])
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                extra_headers = [(REQUEST_ID_HEADER, context.request_id.encode("latin-1"))]
+                if context.stale_age is not None:
+                    extra_headers += [
+                        (b"warning", STALE_WARNING),
+                        (b"age", str(int(context.stale_age)).encode())
+                    ]
+                if settings.server_timing_enabled and context.timings:
+                    extra_headers += [
+                        (b"server-timing", server_timing_header(context).encode()),
+                        # Lets the cross-origin frontend see the breakdown in dev tools
+                        (b"timing-allow-origin", TIMING_ALLOW_ORIGIN)
+                    ]
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + extra_headers
+            await send(message)
+
+        token = set_request_context(context)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            reset_request_context(token)
@@ -0,0 +1,73 @@
+"""
+ASGI middleware recording request traffic for later replay.
+"""
+
+import re
+import time
+from ..services.traffic_capture import TrafficRecorder
+from .metrics import route_label
+
+# Created documents are only identified by the response; its id precedes the content
+SHARE_ID_PATTERN = re.compile(rb'"share_id":"([^"]{1,128})"')
+SHARE_ID_SEARCH_BYTES = 512
+
+
+class TrafficCaptureMiddleware:
+    """Records method, route, share_id, sizes and timing of every HTTP request."""
+
+    def __init__(self, app, recorder: TrafficRecorder):
+        self.app = app
+        self.recorder = recorder
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.recorder.running:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+        request_size = 0
+        response_size = 0
+        response_share_id = None
+        body_chunks = [] if self.recorder.include_content else None
+
+        async def receive_wrapper():
+            nonlocal request_size
+            message = await receive()
+            if message["type"] == "http.request":
+                body = message.get("body", b"")
+                request_size += len(body)
+                if body_chunks is not None:
+                    body_chunks.append(body)
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status_code, response_size, response_share_id
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                if response_size == 0 and scope["method"] == "POST":
+                    match = SHARE_ID_PATTERN.search(body, 0, SHARE_ID_SEARCH_BYTES)
+                    if match:
+                        response_share_id = match.group(1).decode("utf-8", "replace")
+                response_size += len(body)
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            entry = {
+                "m": scope["method"],
+                "r": route_label(scope),
+                "q": request_size,
+                "p": response_size,
+                "c": status_code,
+                "d": round((time.perf_counter() - started) * 1000, 3)
+            }
+            share_id = scope.get("path_params", {}).get("share_id") or response_share_id
+            if share_id:
+                entry["s"] = share_id
+            if body_chunks:
+                entry["b"] = b"".join(body_chunks).decode("utf-8", "replace")
+            self.recorder.record(entry, started)
@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+
+class DiffHunk(BaseModel):
+    """Model for a single diff hunk."""
+    a_start: int = Field(..., description="First line of the hunk in document a (1-based)")
+    a_count: int = Field(..., description="Number of lines from document a")
+    b_start: int = Field(..., description="First line of the hunk in document b (1-based)")
+    b_count: int = Field(..., description="Number of lines from document b")
+    lines: List[str] = Field(..., description="Hunk lines prefixed with ' ', '-' or '+'")
+
+
+class DiffResponse(BaseModel):
+    """Model for diff API responses."""
+    a: str = Field(..., description="Share ID of the original document")
+    b: str = Field(..., description="Share ID of the compared document")
+    status: Literal["ok", "too_large", "timeout"] = Field(..., description="Outcome of the diff computation")
+    identical: bool = Field(default=False, description="Whether both documents have identical content")
+    added: int = Field(default=0, description="Number of added lines")
+    removed: int = Field(default=0, description="Number of removed lines")
+    truncated: bool = Field(default=False, description="Whether hunks were dropped to cap response size")
+    unified: Optional[str] = Field(default=None, description="Unified diff text")
+    hunks: Optional[List[DiffHunk]] = Field(default=None, description="Structured diff hunks")
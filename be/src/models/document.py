@@ -49,6 +49,14 @@ class DocumentResponse(BaseModel):
         }
 
 
+class DocumentStatsResponse(BaseModel):
+    """Model for document access statistics API responses."""
+    share_id: str = Field(..., description="Human-readable ID for sharing")
+    view_count: int = Field(..., description="Number of times the document was read")
+    last_accessed_at: Optional[datetime] = Field(None, description="Last read or update, if tracked")
+    pending_views: int = Field(..., description="Views counted in memory and not yet stored")
+
+
 class Document(BeanieDocument):
     """
     Beanie document model for database operations.
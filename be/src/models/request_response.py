@@ -4,5 +4,6 @@ from .document import (
     DocumentCreate,
     DocumentUpdate,
     DocumentResponse,
+    DocumentStatsResponse,
     DocumentBase
 )
\ No newline at end of file
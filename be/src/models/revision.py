@@ -0,0 +1,49 @@
+from pydantic import BaseModel, Field
+from beanie import Document as BeanieDocument
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from typing import Any, List, Optional
+from datetime import datetime, UTC
+
+
+class RevisionSummary(BaseModel):
+    """Model for a revision entry in revision listings."""
+    number: int = Field(..., description="Sequential revision number")
+    is_snapshot: bool = Field(..., description="Whether the revision is stored as a full snapshot")
+    size: int = Field(..., description="Content length of the revision")
+    created_at: datetime = Field(..., description="Revision timestamp")
+
+
+class RevisionListResponse(BaseModel):
+    """Model for revision listing API responses."""
+    share_id: str = Field(..., description="Human-readable ID for sharing")
+    revisions: List[RevisionSummary] = Field(..., description="Revisions, newest first")
+
+
+class RevisionResponse(BaseModel):
+    """Model for a single reconstructed revision."""
+    share_id: str = Field(..., description="Human-readable ID for sharing")
+    number: int = Field(..., description="Sequential revision number")
+    content: str = Field(..., description="Document content at this revision")
+    created_at: datetime = Field(..., description="Revision timestamp")
+
+
+class Revision(BeanieDocument):
+    """
+    Beanie document model for document revisions.
+    Each revision stores either a full snapshot or a forward delta
+    against the previous revision of the same document.
+    """
+
+    share_id: str = Field(..., description="Share ID of the owning document")
+    number: int = Field(..., description="Sequential revision number")
+    is_snapshot: bool = Field(default=False, description="Whether content holds a full snapshot")
+    content: Optional[str] = Field(default=None, description="Full content for snapshots")
+    delta: Optional[List[List[Any]]] = Field(default=None, description="Delta against the previous revision")
+    size: int = Field(default=0, description="Content length of the revision")
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    class Settings:
+        name = "revisions"
+        indexes = [
+            IndexModel([("share_id", ASCENDING), ("number", DESCENDING)], unique=True),
+        ]
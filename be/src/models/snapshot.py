@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from beanie import Document as BeanieDocument, Indexed
+from datetime import datetime, UTC
+
+
+class SnapshotPublishResponse(BaseModel):
+    """Model for snapshot publishing API responses."""
+    share_id: str = Field(..., description="Share ID of the source document")
+    content_hash: str = Field(..., description="SHA-256 of the frozen content")
+    url: str = Field(..., description="Immutable URL serving the snapshot")
+    created_at: datetime = Field(..., description="Time the content was first published")
+
+
+class SnapshotResponse(BaseModel):
+    """Model for snapshot API responses."""
+    content_hash: str = Field(..., description="SHA-256 of the frozen content")
+    content: str = Field(..., description="Frozen document content")
+    created_at: datetime = Field(..., description="Time the content was first published")
+
+
+class Snapshot(BeanieDocument):
+    """
+    Beanie document model for published snapshots.
+    Content is addressed by its hash, so identical content is stored once.
+    """
+
+    content_hash: Indexed(str, unique=True) = Field(..., description="SHA-256 of the content")
+    share_id: str = Field(..., description="Share ID of the document first published with this content")
+    content: str = Field(..., description="Frozen document content")
+    created_at: datetime = Field(default_factory=lambda: datetime.now(UTC))
+
+    class Settings:
+        name = "snapshots"
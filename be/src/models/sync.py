@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from datetime import datetime
+
+
+class BlockSignature(BaseModel):
+    """Model for the checksums of one block of the client's copy."""
+    weak: int = Field(..., ge=0, lt=2 ** 32, description="rsync rolling checksum of the block")
+    strong: str = Field(..., min_length=32, max_length=32, description="First 32 hex characters of the block's SHA-256")
+
+
+class SyncRequest(BaseModel):
+    """Model for delta sync requests."""
+    block_size: int = Field(..., description="Block size in bytes used for the signatures")
+    length: int = Field(..., ge=0, description="Byte length of the client's UTF-8 encoded copy")
+    blocks: List[BlockSignature] = Field(..., description="Signatures of consecutive blocks of the client's copy")
+
+
+class SyncInstruction(BaseModel):
+    """Model for one reconstruction step."""
+    op: Literal["copy", "literal"] = Field(..., description="Copy client blocks or insert literal bytes")
+    start: Optional[int] = Field(default=None, description="First client block to copy")
+    count: Optional[int] = Field(default=None, description="Number of consecutive client blocks to copy")
+    data: Optional[str] = Field(default=None, description="Base64 encoded literal bytes")
+
+
+class SyncResponse(BaseModel):
+    """Model for delta sync responses."""
+    share_id: str = Field(..., description="Human-readable ID for sharing")
+    updated_at: datetime = Field(..., description="Last update timestamp of the current content")
+    length: int = Field(..., description="Byte length of the current UTF-8 encoded content")
+    sha256: str = Field(..., description="SHA-256 of the current content for verification")
+    block_size: int = Field(..., description="Block size the instructions refer to")
+    literal_bytes: int = Field(..., description="Number of literal bytes in the instructions")
+    instructions: List[SyncInstruction] = Field(..., description="Steps rebuilding the current content")
@@ -2,8 +2,16 @@
 Protocol interfaces for dependency injection.
 """
 
+from .access_stats_protocol import AccessStatsRepositoryProtocol
 from .hrid_protocol import HRIDGeneratorProtocol
 from .repository_protocol import DocumentRepositoryProtocol
+from .revision_protocol import RevisionRepositoryProtocol
+from .snapshot_protocol import SnapshotRepositoryProtocol
 
-__all__ = ["HRIDGeneratorProtocol", "DocumentRepositoryProtocol"]
-
+__all__ = [
+    "AccessStatsRepositoryProtocol",
+    "HRIDGeneratorProtocol",
+    "DocumentRepositoryProtocol",
+    "RevisionRepositoryProtocol",
+    "SnapshotRepositoryProtocol",
+]
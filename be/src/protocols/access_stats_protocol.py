@@ -0,0 +1,45 @@
+"""
+Protocol for access statistics repository to enable dependency injection.
+"""
+
+from typing import Dict, Optional, Protocol, Tuple
+from datetime import datetime
+
+
+class AccessStatsData:
+    """Data class for the stored access statistics of a document."""
+
+    def __init__(
+        self,
+        share_id: str,
+        view_count: int,
+        last_accessed_at: Optional[datetime]
+    ):
+        self.share_id = share_id
+        self.view_count = view_count
+        self.last_accessed_at = last_accessed_at
+
+
+class AccessStatsRepositoryProtocol(Protocol):
+    """Protocol defining the interface for access statistics persistence."""
+
+    async def increment(self, updates: Dict[str, Tuple[int, datetime]]) -> None:
+        """
+        Add views and advance the last access time of documents.
+
+        Args:
+            updates: Views to add and latest access time per share_id
+        """
+        ...
+
+    async def find(self, share_id: str) -> Optional[AccessStatsData]:
+        """
+        Get the stored access statistics of a document.
+
+        Args:
+            share_id: Human-readable share identifier
+
+        Returns:
+            Optional[AccessStatsData]: Statistics if the document exists, None otherwise
+        """
+        ...
@@ -0,0 +1,62 @@
+"""
+Protocol for rate limit state backends to enable dependency injection.
+"""
+
+from typing import Protocol
+
+
+class RateLimitResult:
+    """Data class for the outcome of a rate limit check."""
+
+    def __init__(
+        self,
+        allowed: bool,
+        limit: int,
+        remaining: int,
+        reset_after: float,
+        retry_after: float = 0.0
+    ):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_after = reset_after
+        self.retry_after = retry_after
+
+
+class RateLimitBackendProtocol(Protocol):
+    """Protocol defining the interface for token bucket state storage."""
+
+    async def consume(self, key: str, capacity: int, refill_rate: float, cost: int = 1) -> RateLimitResult:
+        """
+        Take tokens from the bucket identified by `key`.
+
+        Args:
+            key: Bucket identifier
+            capacity: Maximum number of tokens in the bucket
+            refill_rate: Tokens added per second
+            cost: Tokens required by this request
+
+        Returns:
+            RateLimitResult: Whether the request is allowed and the bucket state
+        """
+        ...
+
+    async def refund(self, key: str, capacity: int, refill_rate: float, cost: int = 1) -> None:
+        """
+        Return tokens taken by consume() for a request rejected by another rule.
+
+        Args:
+            key: Bucket identifier
+            capacity: Maximum number of tokens in the bucket
+            refill_rate: Tokens added per second
+            cost: Tokens to return
+        """
+        ...
+
+    async def start(self) -> None:
+        """Start any background maintenance."""
+        ...
+
+    async def stop(self) -> None:
+        """Stop background maintenance."""
+        ...
@@ -0,0 +1,127 @@
+"""
+Protocol for revision repository to enable dependency injection.
+"""
+
+from typing import Any, List, Optional, Protocol
+from datetime import datetime
+
+
+class RevisionData:
+    """Data class for revision information."""
+
+    def __init__(
+        self,
+        share_id: str,
+        number: int,
+        is_snapshot: bool,
+        size: int,
+        created_at: datetime,
+        content: Optional[str] = None,
+        delta: Optional[List[List[Any]]] = None
+    ):
+        self.share_id = share_id
+        self.number = number
+        self.is_snapshot = is_snapshot
+        self.size = size
+        self.created_at = created_at
+        self.content = content
+        self.delta = delta
+
+
+class RevisionRepositoryProtocol(Protocol):
+    """Protocol defining the interface for revision persistence."""
+
+    async def add(self, revision: RevisionData) -> None:
+        """
+        Store a new revision.
+
+        Args:
+            revision: Revision to store
+        """
+        ...
+
+    async def replace(self, revision: RevisionData) -> None:
+        """
+        Overwrite an existing revision with the same share_id and number.
+
+        Args:
+            revision: Revision to store
+        """
+        ...
+
+    async def latest_chain(self, share_id: str) -> List[RevisionData]:
+        """
+        Get the revisions from the most recent snapshot to the latest revision.
+
+        Args:
+            share_id: Human-readable share identifier
+
+        Returns:
+            List[RevisionData]: Revisions in ascending order, empty if none exist
+        """
+        ...
+
+    async def chain_for(self, share_id: str, number: int) -> List[RevisionData]:
+        """
+        Get the revisions needed to reconstruct a given revision.
+
+        Args:
+            share_id: Human-readable share identifier
+            number: Revision number to reconstruct
+
+        Returns:
+            List[RevisionData]: Revisions from the nearest snapshot up to `number`,
+            in ascending order, empty if the revision does not exist
+        """
+        ...
+
+    async def list_summaries(self, share_id: str, limit: int) -> List[RevisionData]:
+        """
+        List revisions without their content or delta payloads.
+
+        Args:
+            share_id: Human-readable share identifier
+            limit: Maximum number of revisions to return
+
+        Returns:
+            List[RevisionData]: Revisions, newest first
+        """
+        ...
+
+    async def count(self, share_id: str) -> int:
+        """
+        Count the stored revisions of a document.
+
+        Args:
+            share_id: Human-readable share identifier
+
+        Returns:
+            int: Number of stored revisions
+        """
+        ...
+
+    async def delete_before(self, share_id: str, number: int) -> int:
+        """
+        Delete all revisions older than `number`.
+
+        Args:
+            share_id: Human-readable share identifier
+            number: First revision number to keep
+
+        Returns:
+            int: Number of deleted revisions
+        """
+        ...
+
+    async def find_compactable(self, retention_count: int, limit: int) -> List[str]:
+        """
+        Find documents that store more than `retention_count` revisions.
+
+        Args:
+            retention_count: Number of most recent revisions to keep
+            limit: Maximum number of documents to return
+
+        Returns:
+            List[str]: Share IDs of documents to compact
+        """
+        ...
@@ -0,0 +1,52 @@
+"""
+Protocol for snapshot repository to enable dependency injection.
+"""
+
+from typing import Optional, Protocol
+from datetime import datetime
+
+
+class SnapshotData:
+    """Data class for snapshot information."""
+
+    def __init__(
+        self,
+        content_hash: str,
+        share_id: str,
+        content: str,
+        created_at: datetime
+    ):
+        self.content_hash = content_hash
+        self.share_id = share_id
+        self.content = content
+        self.created_at = created_at
+
+
+class SnapshotRepositoryProtocol(Protocol):
+    """Protocol defining the interface for snapshot persistence."""
+
+    async def save(self, content_hash: str, share_id: str, content: str) -> SnapshotData:
+        """
+        Store a snapshot unless one with the same hash already exists.
+
+        Args:
+            content_hash: SHA-256 of the content
+            share_id: Share ID of the source document
+            content: Content to freeze
+
+        Returns:
+            SnapshotData: Stored or already existing snapshot
+        """
+        ...
+
+    async def find_by_hash(self, content_hash: str) -> Optional[SnapshotData]:
+        """
+        Find a snapshot by its content hash.
+
+        Args:
+            content_hash: SHA-256 of the content
+
+        Returns:
+            Optional[SnapshotData]: Snapshot if found, None otherwise
+        """
+        ...
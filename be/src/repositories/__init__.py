@@ -3,6 +3,21 @@ Repository implementations for data access.
 """
 
 from .document_repository import DocumentRepository
+from .access_stats_repository import AccessStatsRepository
+from .circuit_breaker_repository import CircuitBreakerRepository
+from .fault_injection_repository import FaultInjectingRepository
+from .instrumented_repository import InstrumentedDocumentRepository
+from .log_repository import LogDocumentRepository
+from .revision_repository import RevisionRepository
+from .snapshot_repository import SnapshotRepository
 
-__all__ = ["DocumentRepository"]
-
+__all__ = [
+    "DocumentRepository",
+    "AccessStatsRepository",
+    "CircuitBreakerRepository",
+    "FaultInjectingRepository",
+    "InstrumentedDocumentRepository",
+    "LogDocumentRepository",
+    "RevisionRepository",
+    "SnapshotRepository"
+]
@@ -0,0 +1,86 @@
+"""
+Access statistics repository storing view counts and last access times on
+the documents themselves.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import UpdateOne
+from ..protocols.access_stats_protocol import AccessStatsData
+from ..services.database import document_collections, mongo_deadline
+from ..services.tiering import archive_of, unpack_document
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+STATS_PROJECTION = {"share_id": 1, "view_count": 1, "last_accessed_at": 1}
+
+
+def _to_data(document: dict) -> AccessStatsData:
+    return AccessStatsData(
+        share_id=document["share_id"],
+        view_count=document.get("view_count", 0),
+        last_accessed_at=document.get("last_accessed_at")
+    )
+
+
+class AccessStatsRepository:
+    """Repository for access statistics using bulk writes to the documents collections."""
+
+    async def increment(self, updates: Dict[str, Tuple[int, datetime]]) -> None:
+        """
+        Add views and advance the last access time of documents.
+
+        One unordered bulk write is sent per collection. Documents that no
+        longer exist, or are archived, are skipped.
+
+        Raises:
+            RuntimeError: If database operation fails
+        """
+        batches: Dict[int, Tuple[Optional[str], AsyncIOMotorCollection, List[UpdateOne]]] = {}
+        for share_id, (views, accessed_at) in updates.items():
+            # With fallback reads the document may still be on its previous shard; only one matches
+            for shard, collection in document_collections(share_id, settings.mongodb_shard_fallback_reads):
+                batch = batches.setdefault(id(collection), (shard, collection, []))
+                batch[2].append(UpdateOne(
+                    {"share_id": share_id},
+                    {"$inc": {"view_count": views}, "$max": {"last_accessed_at": accessed_at}}
+                ))
+        try:
+            for shard, collection, operations in batches.values():
+                with mongo_deadline("access stats update", shard):
+                    await collection.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error("Failed to update access stats in database: %s", e)
+            raise RuntimeError(f"Database access stats operation failed: {e}")
+
+    async def find(self, share_id: str) -> Optional[AccessStatsData]:
+        """
+        Get the stored access statistics of a document, including archived ones.
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes
+            RuntimeError: If database operation fails
+        """
+        try:
+            collections = document_collections(share_id, settings.mongodb_shard_fallback_reads)
+            for shard, collection in collections:
+                with mongo_deadline("access stats find", shard):
+                    document = await collection.find_one({"share_id": share_id}, STATS_PROJECTION)
+                if document:
+                    return _to_data(document)
+            if settings.tiering_enabled:
+                # Reading statistics is not an access, so archived documents stay archived
+                for shard, collection in collections:
+                    with mongo_deadline("access stats find", shard):
+                        record = await archive_of(collection).find_one({"share_id": share_id})
+                    if record:
+                        return _to_data(unpack_document(record))
+            return None
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Failed to find access stats in database: %s", e)
+            raise RuntimeError(f"Database access stats operation failed: {e}")
@@ -0,0 +1,153 @@
+"""
+Document repository wrapper that guards the database with a circuit breaker.
+
+Every successful read or write refreshes a bounded last-known-good cache.
+While the breaker is open, or when a read fails, reads are answered from
+that cache and the request context is marked stale; writes fail fast with
+CircuitOpenError. Only infrastructure errors count as failures (see
+is_infrastructure_error), so clients cannot open the breaker for everyone
+with short deadlines or duplicate keys.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+from ..context.deadline import check_deadline
+from ..context.request_context import get_request_context
+from ..protocols.repository_protocol import DocumentData, DocumentRepositoryProtocol
+from ..services.circuit_breaker import CircuitBreaker, CircuitOpenError, is_infrastructure_error
+from ..settings import settings
+from ..utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+CachedDocument = Tuple[DocumentData, float]
+
+
+def _cached_weight(entry: CachedDocument) -> int:
+    return len(entry[0].content)
+
+
+last_known_good: LRUCache[CachedDocument] = LRUCache(
+    settings.circuit_breaker_cache_size,
+    max_weight=settings.circuit_breaker_cache_max_bytes,
+    weigher=_cached_weight
+)
+
+
+class CircuitBreakerRepository:
+    """Document repository that fails fast and serves stale reads during outages."""
+
+    def __init__(
+        self,
+        repository: DocumentRepositoryProtocol,
+        breaker: CircuitBreaker,
+        cache: LRUCache[CachedDocument]
+    ):
+        """
+        Initialize the wrapper.
+
+        Args:
+            repository: Repository doing the actual database work
+            breaker: Circuit breaker shared by all requests
+            cache: Last-known-good documents keyed by share_id
+        """
+        self.repository = repository
+        self.breaker = breaker
+        self.cache = cache
+
+    def _remember(self, doc_data: DocumentData) -> None:
+        self.cache.set(doc_data.share_id, (doc_data, time.monotonic()))
+
+    def _serve_stale(self, share_id: str, error: Exception) -> DocumentData:
+        entry = self.cache.get(share_id)
+        if entry is None:
+            raise error
+        doc_data, cached_at = entry
+        age = time.monotonic() - cached_at
+        context = get_request_context()
+        if context is not None:
+            context.stale_age = age if context.stale_age is None else max(context.stale_age, age)
+        logger.warning("Serving stale document %s (%.1fs old): %s", share_id, age, error)
+        return doc_data
+
+    def _record_error(self, error: BaseException) -> None:
+        if is_infrastructure_error(error):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release()
+
+    async def _call_write(self, operation, *args) -> Optional[DocumentData]:
+        self.breaker.check()
+        try:
+            doc_data = await operation(*args)
+        except (RuntimeError, TimeoutError) as e:
+            self._record_error(e)
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        return doc_data
+
+    async def create(self, share_id: str, content: str) -> DocumentData:
+        """
+        Create a new document unless the circuit is open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            DeadlineExceeded: If the request deadline passes
+            RuntimeError: If database operation fails
+        """
+        check_deadline("create")
+        doc_data = await self._call_write(self.repository.create, share_id, content)
+        self._remember(doc_data)
+        return doc_data
+
+    async def find_by_share_id(self, share_id: str) -> Optional[DocumentData]:
+        """
+        Find a document, falling back to the last-known-good copy.
+
+        Raises:
+            CircuitOpenError: If the circuit is open and nothing is cached
+            DeadlineExceeded: If the request deadline passes and nothing is cached
+            RuntimeError: If database operation fails and nothing is cached
+        """
+        check_deadline("find")
+        if not self.breaker.allow():
+            return self._serve_stale(
+                share_id, CircuitOpenError(self.breaker.name, self.breaker.retry_after())
+            )
+        try:
+            doc_data = await self.repository.find_by_share_id(share_id)
+        except (RuntimeError, TimeoutError) as e:
+            self._record_error(e)
+            return self._serve_stale(share_id, e)
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+
+        if doc_data is None:
+            self.cache.pop(share_id)
+        else:
+            self._remember(doc_data)
+        return doc_data
+
+    async def update(self, share_id: str, content: str, updated_at: datetime) -> Optional[DocumentData]:
+        """
+        Update a document unless the circuit is open.
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            DeadlineExceeded: If the request deadline passes
+            RuntimeError: If database operation fails
+        """
+        check_deadline("update")
+        doc_data = await self._call_write(self.repository.update, share_id, content, updated_at)
+        if doc_data is None:
+            self.cache.pop(share_id)
+        else:
+            self._remember(doc_data)
+        return doc_data
@@ -4,17 +4,146 @@ Separates data access logic from business logic.
 """
 
 import logging
+import time
 from typing import Optional
 from datetime import datetime
+from beanie.odm.utils.dump import get_dict
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from pymongo.write_concern import WriteConcern
 from ..models.document import Document
 from ..protocols.repository_protocol import DocumentData, DocumentRepositoryProtocol
+from ..services.database import document_collections, mongo_deadline, write_concern
+from ..services.tiering import archive_of, rehydrate
+from ..utils.lru_cache import LRUCache
+from ..services.circuit_breaker import document_breaker
+from ..settings import settings
+from .circuit_breaker_repository import CircuitBreakerRepository, last_known_good
+from .fault_injection_repository import FaultInjectingRepository, get_fault_injector
+from .instrumented_repository import InstrumentedDocumentRepository
+from .log_repository import LogDocumentRepository
+from ..storage.log_store import log_store
 
 logger = logging.getLogger(__name__)
 
 
+class DurabilityPolicy:
+    """
+    Chooses the write concern of each document write.
+    
+    Creates always use the durable concern. Updates (autosaves) use the fast
+    concern, except that a document gets a durable write when its last one
+    is older than `checkpoint_interval`, so at most that much editing can be
+    lost with an unacknowledged primary failover.
+    """
+    
+    def __init__(
+        self,
+        durable: WriteConcern,
+        fast: WriteConcern,
+        checkpoint_interval: float,
+        max_tracked: int = 10000,
+        clock=time.monotonic
+    ):
+        """
+        Initialize the policy.
+        
+        Args:
+            durable: Write concern for creates and checkpoints
+            fast: Write concern for intermediate updates
+            checkpoint_interval: Maximum seconds between durable writes of a document
+            max_tracked: Documents whose last durable write is remembered
+            clock: Monotonic time source
+        """
+        self.durable = durable
+        self.fast = fast
+        self.checkpoint_interval = checkpoint_interval
+        self.clock = clock
+        self._last_durable: LRUCache[float] = LRUCache(max_tracked)
+    
+    def for_create(self) -> WriteConcern:
+        """Get the write concern for creating a document."""
+        return self.durable
+    
+    def for_update(self, share_id: str) -> WriteConcern:
+        """Get the write concern for updating a document."""
+        last = self._last_durable.get(share_id)
+        if last is None or self.clock() - last >= self.checkpoint_interval:
+            return self.durable
+        return self.fast
+    
+    def written(self, share_id: str, concern: WriteConcern) -> None:
+        """Record a successful write made with `concern`."""
+        if concern is self.durable:
+            self._last_durable.set(share_id, self.clock())
+
+
+def create_durability_policy() -> DurabilityPolicy:
+    """
+    Create the durability policy from settings.
+    
+    Returns:
+        DurabilityPolicy: Configured durability policy
+    """
+    return DurabilityPolicy(
+        durable=write_concern(settings.write_concern_create, settings.write_journal_create),
+        fast=write_concern(settings.write_concern_update, settings.write_journal_update),
+        checkpoint_interval=settings.write_checkpoint_interval
+    )
+
+
+# Global durability policy shared by all repository instances
+durability_policy = create_durability_policy()
+
+
+def _to_data(document: dict) -> DocumentData:
+    return DocumentData(
+        id=str(document["_id"]),
+        share_id=document["share_id"],
+        content=document["content"],
+        created_at=document["created_at"],
+        updated_at=document["updated_at"]
+    )
+
+
 class DocumentRepository:
     """Repository for document persistence using Beanie ODM."""
     
+    def __init__(self, durability: Optional[DurabilityPolicy] = None):
+        """
+        Initialize the repository.
+        
+        Args:
+            durability: Write concern policy, defaults to the global policy
+        """
+        self.durability = durability or durability_policy
+    
+    async def _update_hot(
+        self, share_id: str, content: str, updated_at: datetime, concern: WriteConcern
+    ) -> Optional[dict]:
+        """Update a document in the first hot collection that holds it."""
+        for shard, collection in document_collections(share_id, settings.mongodb_shard_fallback_reads):
+            with mongo_deadline("document update", shard):
+                document = await collection.with_options(write_concern=concern).find_one_and_update(
+                    {"share_id": share_id},
+                    {"$set": {"content": content, "updated_at": updated_at}},
+                    return_document=ReturnDocument.AFTER
+                )
+            if document:
+                return document
+        return None
+    
+    async def _rehydrate(self, share_id: str) -> Optional[dict]:
+        """Move a document missing from the hot tier back from the archive, if tiering is on."""
+        if not settings.tiering_enabled:
+            return None
+        for shard, collection in document_collections(share_id, settings.mongodb_shard_fallback_reads):
+            with mongo_deadline("document rehydrate", shard):
+                document = await rehydrate(collection, share_id)
+            if document:
+                return document
+        return None
+    
     async def create(self, share_id: str, content: str) -> DocumentData:
         """
         Create a new document in the database.
@@ -27,14 +156,36 @@ class DocumentRepository:
             DocumentData: Created document data
             
         Raises:
+            DeadlineExceeded: If the request deadline passes
             RuntimeError: If database operation fails
         """
         try:
+            collections = document_collections(share_id, settings.mongodb_shard_fallback_reads)
+            shard, collection = collections[0]
+            # The unique index only covers the owning shard's hot collection; while
+            # rebalancing an older document may still sit on a previous owner, and
+            # with tiering it may be archived
+            others = collections[1:]
+            if settings.tiering_enabled:
+                others += [(other_shard, archive_of(other)) for other_shard, other in collections]
+            for other_shard, other in others:
+                with mongo_deadline("document create", other_shard):
+                    existing = await other.find_one({"share_id": share_id}, {"_id": 1})
+                if existing:
+                    raise DuplicateKeyError(
+                        f"share_id '{share_id}' exists in {other.name} of shard {other_shard or 'primary'}"
+                    )
             document = Document(
                 share_id=share_id,
                 content=content
             )
-            await document.insert()
+            concern = self.durability.for_create()
+            with mongo_deadline("document create", shard):
+                result = await collection.with_options(write_concern=concern).insert_one(
+                    get_dict(document, to_db=True)
+                )
+            document.id = result.inserted_id
+            self.durability.written(share_id, concern)
             
             return DocumentData(
                 id=str(document.id),
@@ -43,8 +194,10 @@ class DocumentRepository:
                 created_at=document.created_at,
                 updated_at=document.updated_at
             )
+        except TimeoutError:
+            raise
         except Exception as e:
-            logger.error(f"Failed to create document in database: {e}")
+            logger.error("Failed to create document in database: %s", e)
             raise RuntimeError(f"Database create operation failed: {e}")
     
     async def find_by_share_id(self, share_id: str) -> Optional[DocumentData]:
@@ -58,23 +211,21 @@ class DocumentRepository:
             Optional[DocumentData]: Document data if found, None otherwise
             
         Raises:
+            DeadlineExceeded: If the request deadline passes
             RuntimeError: If database operation fails
         """
         try:
-            document = await Document.find_one(Document.share_id == share_id)
-            
-            if not document:
-                return None
-            
-            return DocumentData(
-                id=str(document.id),
-                share_id=document.share_id,
-                content=document.content,
-                created_at=document.created_at,
-                updated_at=document.updated_at
-            )
+            for shard, collection in document_collections(share_id, settings.mongodb_shard_fallback_reads):
+                with mongo_deadline("document find", shard):
+                    document = await collection.find_one({"share_id": share_id})
+                if document:
+                    return _to_data(document)
+            document = await self._rehydrate(share_id)
+            return _to_data(document) if document else None
+        except TimeoutError:
+            raise
         except Exception as e:
-            logger.error(f"Failed to find document in database: {e}")
+            logger.error("Failed to find document in database: %s", e)
             raise RuntimeError(f"Database find operation failed: {e}")
     
     async def update(self, share_id: str, content: str, updated_at: datetime) -> Optional[DocumentData]:
@@ -90,27 +241,23 @@ class DocumentRepository:
             Optional[DocumentData]: Updated document data if found, None otherwise
             
         Raises:
+            DeadlineExceeded: If the request deadline passes
             RuntimeError: If database operation fails
         """
         try:
-            document = await Document.find_one(Document.share_id == share_id)
-            
+            concern = self.durability.for_update(share_id)
+            document = await self._update_hot(share_id, content, updated_at, concern)
+            if document is None and await self._rehydrate(share_id):
+                document = await self._update_hot(share_id, content, updated_at, concern)
             if not document:
                 return None
             
-            document.content = content
-            document.updated_at = updated_at
-            await document.save()
-            
-            return DocumentData(
-                id=str(document.id),
-                share_id=document.share_id,
-                content=document.content,
-                created_at=document.created_at,
-                updated_at=document.updated_at
-            )
+            self.durability.written(share_id, concern)
+            return _to_data(document)
+        except TimeoutError:
+            raise
         except Exception as e:
-            logger.error(f"Failed to update document in database: {e}")
+            logger.error("Failed to update document in database: %s", e)
             raise RuntimeError(f"Database update operation failed: {e}")
 
 def get_document_repository() -> DocumentRepositoryProtocol:
@@ -120,4 +267,19 @@ def get_document_repository() -> DocumentRepositoryProtocol:
     Returns:
         DocumentRepositoryProtocol: Document repository for database operations
     """
-    return DocumentRepository()
\ No newline at end of file
+    repository: DocumentRepositoryProtocol
+    if settings.storage_backend == "log":
+        repository = LogDocumentRepository(log_store)
+    else:
+        repository = DocumentRepository()
+    if settings.fault_injection_enabled:
+        injector = get_fault_injector()
+        if injector is not None:
+            # Innermost, so injected faults look like database faults to the layers above
+            repository = FaultInjectingRepository(repository, injector)
+    if settings.repository_instrumentation_enabled:
+        repository = InstrumentedDocumentRepository(repository, settings.repository_slow_threshold_ms / 1000)
+    if settings.circuit_breaker_enabled:
+        # Outermost, so calls rejected by an open circuit are not timed as database calls
+        repository = CircuitBreakerRepository(repository, document_breaker, last_known_good)
+    return repository
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+Document repository wrapper that injects latency and faults for testing.
+
+Each operation (create, find, update, or "*" for all others) gets a
+FaultProfile with:
+
+- latency: a distribution added before every call, written as
+  "fixed:SECONDS", "uniform:LOW:HIGH", "exponential:MEAN" or
+  "lognormal:MEDIAN:SIGMA";
+- error_rate: share of calls failing like a lost connection (RuntimeError
+  caused by AutoReconnect);
+- timeout_rate: share of calls that hang for `timeout_seconds`, or until
+  the request deadline, and then fail with DeadlineExceeded;
+- stall_rate: share of calls whose result is held back for
+  `stall_seconds` after the wrapped call completed, e.g. a write that is
+  applied but acknowledged late.
+
+Every operation draws from its own random generator seeded from `seed`,
+so a given sequence of calls per operation sees the same faults on every
+run, however calls of different operations interleave.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import random
+from collections import Counter
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from pymongo.errors import AutoReconnect
+from ..context.deadline import DeadlineExceeded, remaining_time
+from ..protocols.repository_protocol import DocumentData, DocumentRepositoryProtocol
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+LatencyDistribution = Callable[[random.Random], float]
+
+
+def parse_latency(spec: Optional[str]) -> LatencyDistribution:
+    """
+    Parse a latency distribution spec such as "lognormal:0.02:0.5".
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    if not spec:
+        return lambda rng: 0.0
+    kind, *raw = spec.split(":")
+    try:
+        params = [float(value) for value in raw]
+    except ValueError:
+        raise ValueError(f"Invalid latency parameters in '{spec}'")
+
+    if kind == "fixed" and len(params) == 1:
+        return lambda rng: params[0]
+    if kind == "uniform" and len(params) == 2:
+        return lambda rng: rng.uniform(params[0], params[1])
+    if kind == "exponential" and len(params) == 1 and params[0] > 0:
+        return lambda rng: rng.expovariate(1 / params[0])
+    if kind == "lognormal" and len(params) == 2 and params[0] > 0:
+        return lambda rng: rng.lognormvariate(math.log(params[0]), params[1])
+    raise ValueError(f"Invalid latency distribution '{spec}'")
+
+
+class FaultProfile:
+    """Faults injected into one repository operation."""
+
+    def __init__(
+        self,
+        latency: Optional[str] = None,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        timeout_seconds: float = 30.0,
+        stall_rate: float = 0.0,
+        stall_seconds: float = 1.0
+    ):
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_seconds = timeout_seconds
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "FaultProfile":
+        """
+        Build a profile from its JSON form.
+
+        Raises:
+            ValueError: If a key is unknown or a value is invalid
+        """
+        try:
+            return cls(**data)
+        except TypeError as e:
+            raise ValueError(f"Invalid fault profile {data}: {e}")
+
+
+def parse_profiles(data: Dict[str, Dict[str, object]]) -> Dict[str, FaultProfile]:
+    """Build the profiles of each operation from a dict keyed by operation name."""
+    return {operation: FaultProfile.from_dict(profile) for operation, profile in data.items()}
+
+
+class FaultInjector:
+    """Decides and applies the faults of each call; shared by all repository wrappers."""
+
+    def __init__(
+        self,
+        profiles: Dict[str, FaultProfile],
+        seed: Optional[int] = None,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        """
+        Initialize the injector.
+
+        Args:
+            profiles: Fault profile per operation name, "*" for the others
+            seed: Seed of the random generators, None for a random seed
+            sleep: Sleep function, replaceable to run tests without waiting
+        """
+        self.profiles = profiles
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.sleep = sleep
+        self.injected: Counter = Counter()
+        self._generators: Dict[str, random.Random] = {}
+
+    def _generator(self, operation: str) -> random.Random:
+        rng = self._generators.get(operation)
+        if rng is None:
+            rng = self._generators[operation] = random.Random(f"{self.seed}:{operation}")
+        return rng
+
+    async def _hang(self, seconds: float, operation: str) -> None:
+        remaining = remaining_time()
+        if remaining is not None:
+            seconds = min(seconds, max(0.0, remaining))
+        await self.sleep(seconds)
+        raise DeadlineExceeded(f"Deadline exceeded during document {operation} (injected)")
+
+    async def call(self, operation: str, call: Callable[[], Awaitable[T]]) -> T:
+        """Run `call()` with the faults drawn for this call of `operation`."""
+        profile = self.profiles.get(operation) or self.profiles.get("*")
+        if profile is None:
+            return await call()
+
+        rng = self._generator(operation)
+        # Always draw the same number of values, so outcomes do not shift when rates change
+        latency = max(0.0, profile.latency(rng))
+        fails, hangs, stalls = rng.random(), rng.random(), rng.random()
+
+        if latency:
+            await self.sleep(latency)
+        if hangs < profile.timeout_rate:
+            self.injected[(operation, "timeout")] += 1
+            await self._hang(profile.timeout_seconds, operation)
+        if fails < profile.error_rate:
+            self.injected[(operation, "error")] += 1
+            raise RuntimeError(
+                f"Database {operation} operation failed: injected fault"
+            ) from AutoReconnect("injected fault")
+
+        result = await call()
+        if stalls < profile.stall_rate:
+            self.injected[(operation, "stall")] += 1
+            remaining = remaining_time()
+            if remaining is not None and remaining < profile.stall_seconds:
+                await self._hang(remaining, operation)
+            await self.sleep(profile.stall_seconds)
+        return result
+
+
+class FaultInjectingRepository:
+    """Document repository that adds latency, errors, hangs and stalls to calls."""
+
+    def __init__(self, repository: DocumentRepositoryProtocol, injector: FaultInjector):
+        """
+        Initialize the wrapper.
+
+        Args:
+            repository: Any document repository, e.g. the database or a mock one
+            injector: Injector holding the fault profiles and random state
+        """
+        self.repository = repository
+        self.injector = injector
+
+    async def create(self, share_id: str, content: str) -> DocumentData:
+        """Create a document, subject to the faults of "create"."""
+        return await self.injector.call("create", lambda: self.repository.create(share_id, content))
+
+    async def find_by_share_id(self, share_id: str) -> Optional[DocumentData]:
+        """Find a document, subject to the faults of "find"."""
+        return await self.injector.call("find", lambda: self.repository.find_by_share_id(share_id))
+
+    async def update(self, share_id: str, content: str, updated_at: datetime) -> Optional[DocumentData]:
+        """Update a document, subject to the faults of "update"."""
+        return await self.injector.call("update", lambda: self.repository.update(share_id, content, updated_at))
+
+
+_fault_injector: Optional[FaultInjector] = None
+
+
+def get_fault_injector() -> Optional[FaultInjector]:
+    """
+    Get the injector configured in settings, shared by all requests.
+
+    Fault injection is a development tool and only applies in debug mode.
+
+    Returns:
+        Optional[FaultInjector]: Configured injector, None outside debug mode
+
+    Raises:
+        ValueError: If the configured profile is invalid
+    """
+    global _fault_injector
+    if not settings.debug:
+        return None
+    if _fault_injector is None:
+        profiles = parse_profiles(json.loads(settings.fault_injection_profile or "{}"))
+        _fault_injector = FaultInjector(profiles, settings.fault_injection_seed)
+        logger.warning("Injecting document repository faults (seed %s)", _fault_injector.seed)
+    return _fault_injector
@@ -0,0 +1,78 @@
+"""
+Document repository wrapper that times every call and logs slow ones.
+
+Timings cover the whole repository call, including conversion of database
+records, while `mongodb_operation_duration_seconds` only covers the MongoDB
+round trip, so the two together show where a slow request spends its time.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+from ..protocols.repository_protocol import DocumentData, DocumentRepositoryProtocol
+from ..services.metrics import repository_document_size_bytes, repository_operation_duration_seconds
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedDocumentRepository:
+    """Document repository that records latency and size of each operation."""
+
+    def __init__(self, repository: DocumentRepositoryProtocol, slow_threshold: float):
+        """
+        Initialize the wrapper.
+
+        Args:
+            repository: Any document repository, e.g. the database or a mock one
+            slow_threshold: Seconds above which an operation is logged as slow
+        """
+        self.repository = repository
+        self.slow_threshold = slow_threshold
+
+    def _record(self, operation: str, share_id: str, started: float, outcome: str, size: int) -> None:
+        duration = time.perf_counter() - started
+        repository_operation_duration_seconds.observe(duration, operation, outcome)
+        repository_document_size_bytes.observe(size, operation)
+        if duration >= self.slow_threshold:
+            fields = {
+                "operation": operation,
+                "share_id": share_id,
+                "duration_ms": round(duration * 1000, 1),
+                "threshold_ms": round(self.slow_threshold * 1000, 1),
+                "size": size,
+                "outcome": outcome
+            }
+            logger.warning(
+                "Slow repository operation " + " ".join(f"{key}={value}" for key, value in fields.items()),
+                extra={"slow_operation": fields}
+            )
+
+    async def _timed(self, operation: str, share_id: str, call, size: int = 0) -> Optional[DocumentData]:
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            doc_data = await call
+            outcome = "ok"
+            if doc_data is not None:
+                size = len(doc_data.content)
+            return doc_data
+        except TimeoutError:
+            outcome = "timeout"
+            raise
+        finally:
+            self._record(operation, share_id, started, outcome, size)
+
+    async def create(self, share_id: str, content: str) -> DocumentData:
+        """Create a document, recording its latency and size."""
+        return await self._timed("create", share_id, self.repository.create(share_id, content), len(content))
+
+    async def find_by_share_id(self, share_id: str) -> Optional[DocumentData]:
+        """Find a document, recording its latency and size."""
+        return await self._timed("find", share_id, self.repository.find_by_share_id(share_id))
+
+    async def update(self, share_id: str, content: str, updated_at: datetime) -> Optional[DocumentData]:
+        """Update a document, recording its latency and size."""
+        return await self._timed(
+            "update", share_id, self.repository.update(share_id, content, updated_at), len(content)
+        )
@@ -0,0 +1,113 @@
+"""
+Document repository on the embedded log store, for single-node deployments
+without MongoDB.
+"""
+
+import logging
+from datetime import datetime, UTC
+from typing import Optional
+from bson import ObjectId
+from ..context.deadline import check_deadline
+from ..protocols.repository_protocol import DocumentData
+from ..storage.log_store import DuplicateKeyError, LogRecord, LogStore
+
+logger = logging.getLogger(__name__)
+
+
+def _to_data(record: LogRecord) -> DocumentData:
+    return DocumentData(
+        id=str(ObjectId(record.id)),
+        share_id=record.key,
+        content=record.content,
+        created_at=datetime.fromtimestamp(record.created_at, UTC),
+        updated_at=datetime.fromtimestamp(record.updated_at, UTC)
+    )
+
+
+class LogDocumentRepository:
+    """Repository for document persistence in a LogStore."""
+
+    def __init__(self, store: LogStore):
+        """
+        Initialize the repository.
+
+        Args:
+            store: Opened log store
+        """
+        self.store = store
+
+    async def create(self, share_id: str, content: str) -> DocumentData:
+        """
+        Create a new document in the log.
+
+        Args:
+            share_id: Human-readable share identifier
+            content: Document content
+
+        Returns:
+            DocumentData: Created document data
+
+        Raises:
+            DeadlineExceeded: If the request deadline has passed
+            RuntimeError: If the share_id exists or writing fails
+        """
+        check_deadline("document create")
+        now = datetime.now(UTC).timestamp()
+        try:
+            record = await self.store.put(
+                LogRecord(key=share_id, id=ObjectId().binary, created_at=now, updated_at=now, content=content),
+                create=True
+            )
+            return _to_data(record)
+        except DuplicateKeyError:
+            raise RuntimeError(f"Database create operation failed: duplicate share_id '{share_id}'")
+        except Exception as e:
+            logger.error("Failed to create document in log store: %s", e)
+            raise RuntimeError(f"Database create operation failed: {e}")
+
+    async def find_by_share_id(self, share_id: str) -> Optional[DocumentData]:
+        """
+        Find a document by its share_id.
+
+        Args:
+            share_id: Human-readable share identifier
+
+        Returns:
+            Optional[DocumentData]: Document data if found, None otherwise
+
+        Raises:
+            RuntimeError: If reading fails
+        """
+        try:
+            record = self.store.get(share_id)
+        except Exception as e:
+            logger.error("Failed to find document in log store: %s", e)
+            raise RuntimeError(f"Database find operation failed: {e}")
+        return _to_data(record) if record is not None else None
+
+    async def update(self, share_id: str, content: str, updated_at: datetime) -> Optional[DocumentData]:
+        """
+        Update a document's content and timestamp.
+
+        Args:
+            share_id: Human-readable share identifier
+            content: New document content
+            updated_at: New timestamp
+
+        Returns:
+            Optional[DocumentData]: Updated document data if found, None otherwise
+
+        Raises:
+            DeadlineExceeded: If the request deadline has passed
+            RuntimeError: If writing fails
+        """
+        check_deadline("document update")
+        try:
+            current = self.store.get(share_id)
+            if current is None:
+                return None
+            record = await self.store.put(current._replace(content=content, updated_at=updated_at.timestamp()))
+            return _to_data(record)
+        except Exception as e:
+            logger.error("Failed to update document in log store: %s", e)
+            raise RuntimeError(f"Database update operation failed: {e}")
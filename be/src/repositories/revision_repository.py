@@ -0,0 +1,241 @@
+"""
+Revision repository implementation for database operations.
+"""
+
+import logging
+from typing import List
+from ..models.revision import Revision
+from ..protocols.revision_protocol import RevisionData, RevisionRepositoryProtocol
+from ..services.database import mongo_deadline
+
+logger = logging.getLogger(__name__)
+
+
+def _to_data(revision: Revision) -> RevisionData:
+    return RevisionData(
+        share_id=revision.share_id,
+        number=revision.number,
+        is_snapshot=revision.is_snapshot,
+        size=revision.size,
+        created_at=revision.created_at,
+        content=revision.content,
+        delta=revision.delta
+    )
+
+
+class RevisionRepository:
+    """Repository for revision persistence using Beanie ODM."""
+
+    async def add(self, revision: RevisionData) -> None:
+        """
+        Store a new revision.
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes
+            RuntimeError: If database operation fails
+        """
+        try:
+            with mongo_deadline("revision add"):
+                await Revision(
+                    share_id=revision.share_id,
+                    number=revision.number,
+                    is_snapshot=revision.is_snapshot,
+                    content=revision.content,
+                    delta=revision.delta,
+                    size=revision.size,
+                    created_at=revision.created_at
+                ).insert()
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Failed to store revision in database: %s", e)
+            raise RuntimeError(f"Database revision insert failed: {e}")
+
+    async def replace(self, revision: RevisionData) -> None:
+        """
+        Overwrite an existing revision with the same share_id and number.
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes
+            RuntimeError: If database operation fails
+        """
+        try:
+            with mongo_deadline("revision replace"):
+                await Revision.find_one(
+                    Revision.share_id == revision.share_id,
+                    Revision.number == revision.number
+                ).update({"$set": {
+                    "is_snapshot": revision.is_snapshot,
+                    "content": revision.content,
+                    "delta": revision.delta,
+                    "size": revision.size
+                }})
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Failed to replace revision in database: %s", e)
+            raise RuntimeError(f"Database revision replace failed: {e}")
+
+    async def latest_chain(self, share_id: str) -> List[RevisionData]:
+        """
+        Get the revisions from the most recent snapshot to the latest revision.
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes
+            RuntimeError: If database operation fails
+        """
+        try:
+            with mongo_deadline("revision latest chain"):
+                snapshot = await Revision.find(
+                    Revision.share_id == share_id,
+                    Revision.is_snapshot == True  # noqa: E712
+                ).sort(-Revision.number).first_or_none()
+
+                if not snapshot:
+                    return []
+
+                revisions = await Revision.find(
+                    Revision.share_id == share_id,
+                    Revision.number >= snapshot.number
+                ).sort(+Revision.number).to_list()
+                return [_to_data(revision) for revision in revisions]
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Failed to load revision chain from database: %s", e)
+            raise RuntimeError(f"Database revision find failed: {e}")
+
+    async def chain_for(self, share_id: str, number: int) -> List[RevisionData]:
+        """
+        Get the revisions needed to reconstruct a given revision.
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes
+            RuntimeError: If database operation fails
+        """
+        try:
+            with mongo_deadline("revision chain for"):
+                snapshot = await Revision.find(
+                    Revision.share_id == share_id,
+                    Revision.is_snapshot == True,  # noqa: E712
+                    Revision.number <= number
+                ).sort(-Revision.number).first_or_none()
+
+                if not snapshot:
+                    return []
+
+                revisions = await Revision.find(
+                    Revision.share_id == share_id,
+                    Revision.number >= snapshot.number,
+                    Revision.number <= number
+                ).sort(+Revision.number).to_list()
+
+                if revisions[-1].number != number:
+                    return []
+                return [_to_data(revision) for revision in revisions]
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Failed to load revision chain from database: %s", e)
+            raise RuntimeError(f"Database revision find failed: {e}")
+
+    async def list_summaries(self, share_id: str, limit: int) -> List[RevisionData]:
+        """
+        List revisions without their content or delta payloads.
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes
+            RuntimeError: If database operation fails
+        """
+        try:
+            with mongo_deadline("revision list summaries"):
+                cursor = Revision.get_motor_collection().find(
+                    {"share_id": share_id},
+                    {"content": 0, "delta": 0}
+                ).sort("number", -1).limit(limit)
+
+                return [
+                    RevisionData(
+                        share_id=raw["share_id"],
+                        number=raw["number"],
+                        is_snapshot=raw["is_snapshot"],
+                        size=raw["size"],
+                        created_at=raw["created_at"]
+                    )
+                    async for raw in cursor
+                ]
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Failed to list revisions from database: %s", e)
+            raise RuntimeError(f"Database revision find failed: {e}")
+
+    async def count(self, share_id: str) -> int:
+        """
+        Count the stored revisions of a document.
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes
+            RuntimeError: If database operation fails
+        """
+        try:
+            with mongo_deadline("revision count"):
+                return await Revision.find(Revision.share_id == share_id).count()
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Failed to count revisions in database: %s", e)
+            raise RuntimeError(f"Database revision count failed: {e}")
+
+    async def delete_before(self, share_id: str, number: int) -> int:
+        """
+        Delete all revisions older than `number`.
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes
+            RuntimeError: If database operation fails
+        """
+        try:
+            with mongo_deadline("revision delete before"):
+                result = await Revision.find(
+                    Revision.share_id == share_id,
+                    Revision.number < number
+                ).delete()
+                return result.deleted_count if result else 0
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Failed to delete revisions from database: %s", e)
+            raise RuntimeError(f"Database revision delete failed: {e}")
+
+    async def find_compactable(self, retention_count: int, limit: int) -> List[str]:
+        """
+        Find documents whose stored revisions span more than `retention_count` numbers.
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes
+            RuntimeError: If database operation fails
+        """
+        try:
+            with mongo_deadline("revision find compactable"):
+                cursor = Revision.get_motor_collection().aggregate([
+                    {"$group": {"_id": "$share_id", "first": {"$min": "$number"}, "last": {"$max": "$number"}}},
+                    {"$match": {"$expr": {"$gte": [{"$subtract": ["$last", "$first"]}, retention_count]}}},
+                    {"$limit": limit}
+                ])
+                return [raw["_id"] async for raw in cursor]
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Failed to find compactable revisions in database: %s", e)
+            raise RuntimeError(f"Database revision find failed: {e}")
+
+
+def get_revision_repository() -> RevisionRepositoryProtocol:
+    """
+    Get the revision repository instance.
+
+    Returns:
+        RevisionRepositoryProtocol: Revision repository for database operations
+    """
+    return RevisionRepository()
@@ -0,0 +1,88 @@
+"""
+Snapshot repository implementation for database operations.
+"""
+
+import logging
+from typing import Optional
+from datetime import datetime, UTC
+from pymongo import ReturnDocument
+from ..models.snapshot import Snapshot
+from ..protocols.snapshot_protocol import SnapshotData, SnapshotRepositoryProtocol
+from ..services.database import mongo_deadline
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotRepository:
+    """Repository for snapshot persistence using Beanie ODM."""
+
+    async def save(self, content_hash: str, share_id: str, content: str) -> SnapshotData:
+        """
+        Store a snapshot unless one with the same hash already exists.
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes
+            RuntimeError: If database operation fails
+        """
+        try:
+            with mongo_deadline("snapshot save"):
+                raw = await Snapshot.get_motor_collection().find_one_and_update(
+                    {"content_hash": content_hash},
+                    {"$setOnInsert": {
+                        "content_hash": content_hash,
+                        "share_id": share_id,
+                        "content": content,
+                        "created_at": datetime.now(UTC)
+                    }},
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER
+                )
+
+                return SnapshotData(
+                    content_hash=raw["content_hash"],
+                    share_id=raw["share_id"],
+                    content=raw["content"],
+                    created_at=raw["created_at"]
+                )
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Failed to store snapshot in database: %s", e)
+            raise RuntimeError(f"Database snapshot save failed: {e}")
+
+    async def find_by_hash(self, content_hash: str) -> Optional[SnapshotData]:
+        """
+        Find a snapshot by its content hash.
+
+        Raises:
+            DeadlineExceeded: If the request deadline passes
+            RuntimeError: If database operation fails
+        """
+        try:
+            with mongo_deadline("snapshot find by hash"):
+                snapshot = await Snapshot.find_one(Snapshot.content_hash == content_hash)
+
+                if not snapshot:
+                    return None
+
+                return SnapshotData(
+                    content_hash=snapshot.content_hash,
+                    share_id=snapshot.share_id,
+                    content=snapshot.content,
+                    created_at=snapshot.created_at
+                )
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Failed to find snapshot in database: %s", e)
+            raise RuntimeError(f"Database snapshot find failed: {e}")
+
+
+def get_snapshot_repository() -> SnapshotRepositoryProtocol:
+    """
+    Get the snapshot repository instance.
+
+    Returns:
+        SnapshotRepositoryProtocol: Snapshot repository for database operations
+    """
+    return SnapshotRepository()
@@ -0,0 +1,219 @@
+"""
+Batched tracking of document views and last access times.
+
+Reads and writes only update an in-memory entry per document. A background
+task flushes all entries every `access_tracking_flush_interval` seconds with
+one bulk `$inc`/`$max` write per collection, so a popular document costs one
+write per interval however often it is read. At most
+`access_tracking_max_pending` documents are held between flushes. Accesses to
+further documents are dropped and counted, and the flush is started early.
+Entries of a failed flush are merged back and retried with the next one,
+and the tracker flushes once more on shutdown.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, UTC
+from typing import Dict, List, Optional
+from ..models.document import DocumentStatsResponse
+from ..protocols.access_stats_protocol import AccessStatsRepositoryProtocol
+from ..repositories.access_stats_repository import AccessStatsRepository
+from ..settings import settings
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+access_tracking_flushes_total = registry.counter(
+    "access_tracking_flushes_total", "Access statistics flushes by outcome.", ("outcome",)
+)
+access_tracking_dropped_total = registry.counter(
+    "access_tracking_dropped_total", "Document accesses not tracked because too many were pending."
+)
+
+
+class PendingAccess:
+    """Views and latest access of one document since the last flush."""
+
+    __slots__ = ("views", "accessed_at")
+
+    def __init__(self, views: int, accessed_at: datetime):
+        self.views = views
+        self.accessed_at = accessed_at
+
+
+class AccessTracker:
+    """Counts document accesses in memory and flushes them in bulk."""
+
+    def __init__(
+        self,
+        repository: AccessStatsRepositoryProtocol,
+        flush_interval: float,
+        max_pending: int,
+        batch_size: int
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            repository: Repository persisting the statistics
+            flush_interval: Seconds between flushes
+            max_pending: Documents with unflushed accesses kept at most
+            batch_size: Documents per repository call
+        """
+        self.repository = repository
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.pending: Dict[str, PendingAccess] = {}
+        self.dropped = 0
+        self._wake: Optional[asyncio.Event] = None
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, share_id: str, view: bool = True) -> None:
+        """
+        Record an access to a document.
+
+        Args:
+            share_id: Accessed document
+            view: Whether the access counts as a view; edits only mark the document as accessed
+        """
+        now = datetime.now(UTC)
+        entry = self.pending.get(share_id)
+        if entry is not None:
+            entry.views += view
+            entry.accessed_at = now
+            return
+        if len(self.pending) >= self.max_pending:
+            self.dropped += 1
+            access_tracking_dropped_total.inc()
+            if self._wake is not None:
+                self._wake.set()
+            return
+        self.pending[share_id] = PendingAccess(int(view), now)
+
+    def _merge(self, entries: Dict[str, PendingAccess]) -> None:
+        for share_id, entry in entries.items():
+            current = self.pending.get(share_id)
+            if current is not None:
+                current.views += entry.views
+                current.accessed_at = max(current.accessed_at, entry.accessed_at)
+            elif len(self.pending) < self.max_pending:
+                self.pending[share_id] = entry
+            else:
+                self.dropped += 1
+                access_tracking_dropped_total.inc()
+
+    async def flush(self) -> int:
+        """
+        Write all pending accesses.
+
+        Returns:
+            int: Number of documents written
+        """
+        async with self._flush_lock:
+            entries, self.pending = self.pending, {}
+            items = list(entries.items())
+            written = 0
+            for start in range(0, len(items), self.batch_size):
+                batch = items[start:start + self.batch_size]
+                try:
+                    await self.repository.increment({
+                        share_id: (entry.views, entry.accessed_at) for share_id, entry in batch
+                    })
+                    written += len(batch)
+                except asyncio.CancelledError:
+                    self._merge(dict(items[start:]))
+                    raise
+                except Exception as e:
+                    logger.warning("Access stats flush failed, retrying with the next flush: %s", e)
+                    access_tracking_flushes_total.inc("error")
+                    self._merge(dict(items[start:]))
+                    return written
+            if items:
+                access_tracking_flushes_total.inc("ok")
+            return written
+
+    async def get_stats(self, share_id: str) -> Optional[DocumentStatsResponse]:
+        """
+        Get the stored statistics of a document plus its pending accesses.
+
+        Returns:
+            Optional[DocumentStatsResponse]: Statistics, None if the document does not exist
+        """
+        try:
+            stored = await self.repository.find(share_id)
+            if stored is None:
+                return None
+            entry = self.pending.get(share_id)
+            pending_views = entry.views if entry else 0
+            accessed: List[datetime] = [
+                _as_utc(value) for value in (stored.last_accessed_at, entry.accessed_at if entry else None) if value
+            ]
+            return DocumentStatsResponse(
+                share_id=share_id,
+                view_count=stored.view_count + pending_views,
+                last_accessed_at=max(accessed) if accessed else None,
+                pending_views=pending_views
+            )
+        except (TimeoutError, ConnectionError):
+            raise
+        except Exception as e:
+            logger.error("Error retrieving document stats: %s", e)
+            raise RuntimeError(f"Failed to retrieve document stats: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of pending documents and dropped accesses."""
+        return {"pending": len(self.pending), "dropped": self.dropped}
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the background flush loop."""
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background flush loop and flush what is pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wake = None
+            await self.flush()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # MongoDB returns naive UTC datetimes
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+
+# Global access tracker instance
+access_tracker = AccessTracker(
+    repository=AccessStatsRepository(),
+    flush_interval=settings.access_tracking_flush_interval,
+    max_pending=settings.access_tracking_max_pending,
+    batch_size=settings.access_tracking_batch_size
+)
+
+
+def get_access_tracker() -> Optional[AccessTracker]:
+    """
+    Get the access tracker, if access tracking is enabled.
+
+    Statistics are stored in MongoDB, so tracking is off with the log backend.
+    """
+    if not settings.access_tracking_enabled or settings.storage_backend != "mongodb":
+        return None
+    return access_tracker
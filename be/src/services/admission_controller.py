@@ -0,0 +1,252 @@
+"""
+Adaptive concurrency limiting and load shedding.
+
+Each limiter caps in-flight requests, queues a bounded number of excess
+requests for a bounded time and sheds the rest. The limit adapts from
+observed latency with AIMD: it grows by about one slot per `limit`
+fast completions while the limiter is saturated, and shrinks
+multiplicatively (at most once per latency target) when requests are
+slower than the target or were rejected by an overloaded resource of this
+server. Limits, in-flight and queued requests and shed counts are exported
+as metrics.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+from ..settings import settings
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class AdaptiveLimiter:
+    """Concurrency limiter with a bounded wait queue and an AIMD limit."""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        max_queue: int,
+        max_wait: float,
+        target_latency: float,
+        backoff: float = 0.9,
+        clock=time.monotonic
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Limiter name used in stats and logs
+            initial_limit: Starting concurrency limit
+            min_limit: Lower bound for the adaptive limit
+            max_limit: Upper bound for the adaptive limit
+            max_queue: Maximum number of waiting requests
+            max_wait: Maximum seconds a request waits for a slot
+            target_latency: Latency in seconds above which the limit shrinks
+            backoff: Multiplicative decrease factor
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.clock = clock
+
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = 0.0
+
+        self.admitted = 0
+        self.queued = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "timeout": 0}
+        self.last_latency = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, max_wait: Optional[float] = None) -> None:
+        """
+        Wait for a slot.
+
+        Args:
+            max_wait: Seconds to wait at most, bounded by the limiter's own max_wait
+
+        Raises:
+            Overloaded: If the queue is full or no slot frees up within `max_wait`
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.shed["queue_full"] += 1
+            raise Overloaded("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            timeout = self.max_wait if max_wait is None else max(0.0, min(max_wait, self.max_wait))
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait expired
+                self.admitted += 1
+                return
+            waiter.cancel()
+            self._remove(waiter)
+            self.shed["timeout"] += 1
+            raise Overloaded("timeout")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release_slot()
+            else:
+                waiter.cancel()
+                self._remove(waiter)
+            raise
+        self.admitted += 1
+
+    def _remove(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def release(self, latency: float, ok: bool = True) -> None:
+        """
+        Return a slot and adapt the limit.
+
+        Args:
+            latency: Seconds the request took
+            ok: Whether the request completed without signs of overload
+        """
+        self.last_latency = latency
+        now = self.clock()
+        if not ok or latency > self.target_latency:
+            if now - self._last_decrease >= self.target_latency:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+        elif self.in_flight >= int(self.limit):
+            self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+        self._release_slot()
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def stats(self) -> dict:
+        """Return a snapshot of the limiter state."""
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": dict(self.shed),
+            "last_latency_ms": round(self.last_latency * 1000, 3),
+        }
+
+
+class AdmissionController:
+    """Routes requests to per-class limiters."""
+
+    def __init__(self, limiters: Dict[str, AdaptiveLimiter], retry_after: int = 1):
+        self.limiters = limiters
+        self.retry_after = retry_after
+
+    def limiter_for(self, method: str, path: str) -> Optional[AdaptiveLimiter]:
+        """Return the limiter for a request, or None for unlimited paths."""
+        if not path.startswith("/api/"):
+            return None
+        if method in ("GET", "HEAD"):
+            return self.limiters.get("reads")
+        return self.limiters.get("writes")
+
+    def stats(self) -> dict:
+        """Return a snapshot of all limiters."""
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+
+def create_admission_controller() -> AdmissionController:
+    """Create the admission controller configured in settings."""
+    def limiter(name: str, initial_limit: int, target_latency_ms: int) -> AdaptiveLimiter:
+        return AdaptiveLimiter(
+            name=name,
+            initial_limit=initial_limit,
+            min_limit=settings.admission_min_limit,
+            max_limit=settings.admission_max_limit,
+            max_queue=settings.admission_max_queue,
+            max_wait=settings.admission_max_wait_ms / 1000,
+            target_latency=target_latency_ms / 1000
+        )
+
+    return AdmissionController(
+        limiters={
+            "reads": limiter("reads", settings.admission_read_limit, settings.admission_read_target_latency_ms),
+            "writes": limiter("writes", settings.admission_write_limit, settings.admission_write_target_latency_ms),
+        },
+        retry_after=settings.admission_retry_after
+    )
+
+
+# Global admission controller instance
+admission_controller = create_admission_controller()
+
+
+def admission_metrics() -> Dict[str, Dict[str, object]]:
+    """
+    Collect the state and shed counts of each limiter.
+
+    Returns:
+        Dict[str, Dict[str, object]]: Gauge and counter snapshots
+    """
+    limiters = list(admission_controller.limiters.values())
+
+    def gauge(help_text: str, value) -> Dict[str, object]:
+        return {
+            "type": "gauge",
+            "help": help_text,
+            "labelnames": ["limiter"],
+            "samples": [[[limiter.name], value(limiter)] for limiter in limiters]
+        }
+
+    return {
+        "admission_limit": gauge("Current adaptive concurrency limit.", lambda limiter: int(limiter.limit)),
+        "admission_in_flight": gauge("Requests holding a concurrency slot.", lambda limiter: limiter.in_flight),
+        "admission_queue_depth": gauge("Requests waiting for a concurrency slot.", lambda limiter: limiter.queue_depth),
+        "admission_shed_total": {
+            "type": "counter",
+            "help": "Requests shed instead of admitted by reason.",
+            "labelnames": ["limiter", "reason"],
+            "samples": [
+                [[limiter.name, reason], count] for limiter in limiters for reason, count in limiter.shed.items()
+            ]
+        }
+    }
+
+
+registry.add_collector(admission_metrics)
@@ -0,0 +1,240 @@
+"""
+Circuit breaker for calls to the database.
+
+The breaker records the outcome of every call over a rolling time window.
+Once at least `min_calls` outcomes are known and the failure rate reaches
+`failure_rate`, it opens and rejects calls immediately for `open_seconds`.
+After that it lets a few probe calls through (half-open): if they all
+succeed the breaker closes again, a single failure reopens it.
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Tuple
+from pymongo.errors import ConnectionFailure, PyMongoError
+from ..context.deadline import DeadlineExceeded
+from ..context.request_context import get_request_context
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit '{name}' is open")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def is_infrastructure_error(error: BaseException) -> bool:
+    """
+    Tell whether a failed database call says something about the database's health.
+
+    Connection errors and server-side timeouts count, including a request
+    running out of its route default deadline. Deadlines the client
+    shortened itself, duplicate keys and other errors caused by the request
+    do not.
+    """
+    if isinstance(error, DeadlineExceeded):
+        context = get_request_context()
+        return context is None or not context.client_deadline
+    cause = error
+    while cause is not None:
+        if isinstance(cause, PyMongoError):
+            # ConnectionFailure covers network errors and server selection timeouts
+            return cause.timeout or isinstance(cause, ConnectionFailure)
+        if isinstance(cause, OSError):
+            return True
+        cause = cause.__cause__ or cause.__context__
+    return False
+
+
+class CircuitBreaker:
+    """Rolling-window failure-rate circuit breaker with half-open probing."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float,
+        min_calls: int,
+        window_seconds: float,
+        open_seconds: float,
+        half_open_calls: int,
+        clock=time.monotonic
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            name: Breaker name used in errors, stats and logs
+            failure_rate: Failure ratio (0-1) at which the breaker opens
+            min_calls: Minimum outcomes in the window before it may open
+            window_seconds: Length of the rolling outcome window
+            open_seconds: Time calls are rejected before probing again
+            half_open_calls: Successful probes needed to close the breaker
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = max(1, min_calls)
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = max(1, half_open_calls)
+        self.clock = clock
+
+        self.state = CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            _, ok = self._outcomes.popleft()
+            if not ok:
+                self._failures -= 1
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning("Circuit '%s' %s -> %s", self.name, self.state, state)
+        self.state = state
+        if state == OPEN:
+            self._opened_at = self.clock()
+            self.times_opened += 1
+        if state != CLOSED:
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        if state == CLOSED:
+            self._outcomes.clear()
+            self._failures = 0
+
+    def retry_after(self) -> float:
+        """Seconds until the open breaker starts probing, 0 when not open."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.open_seconds - self.clock())
+
+    def allow(self) -> bool:
+        """
+        Ask whether a call may proceed; every allowed call must be followed
+        by exactly one record_success, record_failure or release.
+
+        Returns:
+            bool: True if the call may go to the database
+        """
+        if self.state == OPEN:
+            if self.clock() - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_calls:
+                self.rejected += 1
+                return False
+            self._probes_in_flight += 1
+        return True
+
+    def check(self) -> None:
+        """
+        Like allow, but raise instead of returning False.
+
+        Raises:
+            CircuitOpenError: If the call is rejected
+        """
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after())
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_calls:
+                self._transition(CLOSED)
+            return
+        self._record(True)
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        if self.state == HALF_OPEN:
+            self._transition(OPEN)
+            return
+        if self.state == OPEN:
+            return
+        self._record(False)
+        total = len(self._outcomes)
+        if total >= self.min_calls and self._failures / total >= self.failure_rate:
+            self._transition(OPEN)
+
+    def release(self) -> None:
+        """Finish an allowed call whose outcome says nothing about the database."""
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def _record(self, ok: bool) -> None:
+        now = self.clock()
+        self._prune(now)
+        self._outcomes.append((now, ok))
+        if not ok:
+            self._failures += 1
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Get the breaker state for health reporting.
+
+        Returns:
+            Dict[str, object]: State, window counts and counters
+        """
+        self._prune(self.clock())
+        return {
+            "state": self.state,
+            "calls": len(self._outcomes),
+            "failures": self._failures,
+            "retry_after": round(self.retry_after(), 3),
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
+
+
+def create_document_breaker() -> CircuitBreaker:
+    """
+    Create the document repository breaker from settings.
+
+    Returns:
+        CircuitBreaker: Configured circuit breaker
+    """
+    return CircuitBreaker(
+        name="documents",
+        failure_rate=settings.circuit_breaker_failure_rate,
+        min_calls=settings.circuit_breaker_min_calls,
+        window_seconds=settings.circuit_breaker_window_seconds,
+        open_seconds=settings.circuit_breaker_open_seconds,
+        half_open_calls=settings.circuit_breaker_half_open_calls
+    )
+
+
+document_breaker = create_document_breaker()
+
+
+def retry_after_header(error: Exception) -> str:
+    """
+    Get the Retry-After value for a request rejected by an unavailable database.
+
+    Returns:
+        str: Whole seconds, at least 1
+    """
+    retry_after = getattr(error, "retry_after", None) or settings.circuit_breaker_open_seconds
+    return str(max(1, math.ceil(retry_after)))
@@ -1,69 +1,283 @@
 from beanie import init_beanie
-from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
-from typing import Optional
+from contextlib import contextmanager
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+import asyncio
+import time
+import pymongo
+from pymongo.errors import ConnectionFailure, PyMongoError, ServerSelectionTimeoutError
+from pymongo.write_concern import WriteConcern
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 import logging
+from ..context.deadline import DeadlineExceeded, remaining_time
+from ..context.timing import add_timing
 from ..settings import settings
 from ..models.document import Document
+from ..models.revision import Revision
+from ..models.snapshot import Snapshot
+from ..storage.log_store import LogStore, log_store
+from .mongo_monitoring import command_monitor, pool_monitor
+from .metrics import mongodb_operation_duration_seconds, mongodb_shard_operation_duration_seconds, registry
+from .sharding import ShardSet, create_shard_set
 
 logger = logging.getLogger(__name__)
 
 
+def parse_w(value: str) -> Union[int, str]:
+    """Convert a configured write concern `w` value to a node count or tag like "majority"."""
+    return int(value) if value.isdigit() else value
+
+
+def write_concern(w: str, journal: Optional[bool] = None) -> WriteConcern:
+    """
+    Build a write concern from configured values.
+    
+    Args:
+        w: Node count or "majority"
+        journal: Whether to wait for the journal, None for the server default
+    """
+    return WriteConcern(w=parse_w(w), j=journal)
+
+
+def client_options() -> Dict[str, Any]:
+    """
+    Build Motor client keyword arguments from settings.
+    
+    Returns:
+        Dict[str, Any]: Pool, timeout, compression, write concern and listener options
+    """
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.mongodb_max_pool_size,
+        "minPoolSize": settings.mongodb_min_pool_size,
+        "serverSelectionTimeoutMS": settings.mongodb_server_selection_timeout_ms,
+        "connectTimeoutMS": settings.mongodb_connect_timeout_ms,
+        "socketTimeoutMS": settings.mongodb_socket_timeout_ms,
+        "w": parse_w(settings.mongodb_write_concern),
+        "event_listeners": [pool_monitor, command_monitor]
+    }
+    if settings.mongodb_max_idle_time_ms is not None:
+        options["maxIdleTimeMS"] = settings.mongodb_max_idle_time_ms
+    if settings.mongodb_wait_queue_timeout_ms is not None:
+        options["waitQueueTimeoutMS"] = settings.mongodb_wait_queue_timeout_ms
+    if settings.mongodb_compressors:
+        options["compressors"] = settings.mongodb_compressors
+    if settings.mongodb_journal is not None:
+        options["journal"] = settings.mongodb_journal
+    return options
+
+
 class DatabaseManager:
     """MongoDB database connection manager with Beanie ODM."""
     
     def __init__(self):
         self.client: Optional[AsyncIOMotorClient] = None
+        self.shards: Optional[ShardSet] = None
         self.initialized: bool = False
     
     async def connect(self) -> None:
         """Initialize Beanie with MongoDB connection."""
         try:
             # Create Motor client
-            self.client = AsyncIOMotorClient(
-                settings.mongodb_url,
-                serverSelectionTimeoutMS=5000,
-                connectTimeoutMS=5000,
-                socketTimeoutMS=5000
-            )
+            self.client = AsyncIOMotorClient(settings.mongodb_url, **client_options())
             
             # Test the connection
             await self.client.admin.command('ping')
+            await self.prewarm(settings.mongodb_prewarm_connections)
             
             # Initialize Beanie
             await init_beanie(
                 database=self.client[settings.database_name],
-                document_models=[Document]
+                document_models=[Document, Revision, Snapshot]
             )
             
+            # Documents live on the shards when configured, everything else on the primary database
+            self.shards = create_shard_set(settings.mongodb_shards, settings.mongodb_url, settings.database_name)
+            if self.shards is not None:
+                await self.shards.connect(client_options())
+            
             self.initialized = True
-            logger.info(f"Beanie initialized with MongoDB: {settings.database_name}")
+            logger.info("Beanie initialized with MongoDB: %s", settings.database_name)
             
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
-            logger.error(f"Failed to connect to MongoDB: {e}")
+            logger.error("Failed to connect to MongoDB: %s", e)
             raise ConnectionError(f"Database connection failed: {e}")
         except Exception as e:
-            logger.error(f"Unexpected database error: {e}")
+            logger.error("Unexpected database error: %s", e)
             raise
     
+    async def prewarm(self, connections: int) -> None:
+        """
+        Open pooled connections ahead of traffic.
+        
+        Runs concurrent pings, each of which checks out its own connection, so
+        the first requests after startup do not pay for connection setup.
+        
+        Args:
+            connections: Number of connections to open, capped at the pool size
+        """
+        connections = min(connections, settings.mongodb_max_pool_size)
+        if not self.client or connections <= 0:
+            return
+        results = await asyncio.gather(
+            *(self.client.admin.command('ping') for _ in range(connections)),
+            return_exceptions=True
+        )
+        failures = sum(1 for result in results if isinstance(result, Exception))
+        if failures:
+            logger.warning("Pool pre-warm: %s of %s pings failed", failures, connections)
+        logger.info("Pool pre-warmed with %s connections", pool_monitor.stats()['open_connections'])
+    
     async def disconnect(self) -> None:
         """Close MongoDB connection."""
+        if self.shards is not None:
+            await self.shards.disconnect()
         if self.client:
             self.client.close()
             self.initialized = False
             logger.info("Disconnected from MongoDB")
     
-    async def health_check(self) -> bool:
-        """Check if database connection is healthy."""
+    async def health_check(self, timeout: Optional[float] = None) -> bool:
+        """
+        Check if database connection is healthy.
+        
+        Args:
+            timeout: Optional bound in seconds for the ping
+        """
         try:
             if not self.client or not self.initialized:
                 return False
-            await self.client.admin.command('ping')
+            if timeout is None:
+                await self.client.admin.command('ping')
+            else:
+                with pymongo.timeout(timeout):
+                    await self.client.admin.command('ping')
+            if self.shards is not None:
+                return await self.shards.health_check(timeout)
             return True
         except Exception as e:
-            logger.error(f"Database health check failed: {e}")
+            logger.error("Database health check failed: %s", e)
             return False
+    
+    def pool_stats(self) -> Dict[str, object]:
+        """
+        Get connection pool statistics.
+        
+        Returns:
+            Dict[str, object]: Pool configuration and live counters from the pool listener
+        """
+        stats: Dict[str, object] = {
+            "max_pool_size": settings.mongodb_max_pool_size,
+            "min_pool_size": settings.mongodb_min_pool_size
+        }
+        stats.update(pool_monitor.stats())
+        if self.shards is not None:
+            stats["shards"] = self.shards.stats()
+        return stats
+
+
+@contextmanager
+def mongo_deadline(operation: str = "database operation", shard: Optional[str] = None) -> Iterator[None]:
+    """
+    Bound MongoDB calls in this block by the current request deadline.
+    
+    Uses PyMongo client-side operation timeouts, which set maxTimeMS on each
+    command and cap server selection, connection checkout and socket reads
+    by the remaining time. Without a deadline the client defaults apply.
+    The duration of the block is recorded per operation and outcome, and
+    added to the request's "db" Server-Timing phase, and also recorded per
+    shard when `shard` names the shard the block runs against.
+    
+    Raises:
+        DeadlineExceeded: If the deadline passed before or during the block
+    """
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {operation}")
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        if remaining is None:
+            yield
+        else:
+            with pymongo.timeout(remaining):
+                yield
+        outcome = "ok"
+    except PyMongoError as e:
+        if e.timeout:
+            outcome = "timeout"
+            raise DeadlineExceeded(f"Deadline exceeded during {operation}") from e
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        mongodb_operation_duration_seconds.observe(duration, operation, outcome)
+        if shard is not None:
+            mongodb_shard_operation_duration_seconds.observe(duration, shard, operation, outcome)
+        add_timing("db", duration)
 
 
 # Global database manager instance
 db_manager = DatabaseManager()
+
+
+def document_collections(share_id: str, fallbacks: int = 0) -> List[Tuple[Optional[str], AsyncIOMotorCollection]]:
+    """
+    Get the collections that may hold a document, in the order to search them.
+    
+    Without shards this is the documents collection of the primary database.
+    With shards it is the owning shard followed by up to `fallbacks`
+    next-ranked shards, which held the document before shards were added.
+    
+    Returns:
+        List of (shard name or None, collection)
+    """
+    if db_manager.shards is None:
+        return [(None, Document.get_motor_collection())]
+    shards = db_manager.shards.rank(share_id)[:1 + fallbacks]
+    return [(shard.name, shard.collection) for shard in shards]
+
+
+def shard_metrics() -> Dict[str, Dict[str, object]]:
+    """
+    Collect health and pool gauges per document shard.
+    
+    Returns:
+        Dict[str, Dict[str, object]]: Gauge snapshots, empty without shards
+    """
+    if db_manager.shards is None:
+        return {}
+    shards = list(db_manager.shards.shards.values())
+    
+    def gauge(help_text: str, value) -> Dict[str, object]:
+        return {
+            "type": "gauge",
+            "help": help_text,
+            "labelnames": ["shard"],
+            "samples": [[[shard.name], value(shard)] for shard in shards]
+        }
+    
+    return {
+        "mongodb_shard_healthy": gauge(
+            "Whether the last health check of a shard succeeded.", lambda shard: 1 if shard.healthy else 0
+        ),
+        "mongodb_shard_pool_open_connections": gauge(
+            "Open pooled connections per shard.", lambda shard: shard.pool.stats()["open_connections"]
+        ),
+        "mongodb_shard_pool_in_use_connections": gauge(
+            "Connections checked out of each shard's pool.", lambda shard: shard.pool.stats()["in_use"]
+        ),
+        "mongodb_shard_pool_waiting": gauge(
+            "Operations waiting for a connection of each shard.", lambda shard: shard.pool.stats()["waiting"]
+        )
+    }
+
+
+registry.add_collector(shard_metrics)
+
+
+def document_database() -> Union[DatabaseManager, LogStore]:
+    """
+    Get the manager of the configured document storage backend.
+    
+    Both provide connect, disconnect, health_check and pool_stats, so the
+    lifespan and health monitoring do not depend on the backend.
+    """
+    return log_store if settings.storage_backend == "log" else db_manager
@@ -0,0 +1,161 @@
+"""
+Diff service for comparing the content of two documents.
+"""
+
+import asyncio
+import logging
+from typing import Literal, Optional, Tuple
+from ..models.diff import DiffHunk, DiffResponse
+from ..protocols.repository_protocol import DocumentRepositoryProtocol
+from ..repositories.document_repository import get_document_repository
+from ..settings import settings
+from ..utils.diff import DiffResult, DiffTimeout, DiffTooLarge, diff_texts, render_unified
+from ..utils.hashing import content_hash
+from ..utils.lru_cache import LRUCache
+from .admission_controller import Overloaded
+from .executor import PROCESS, executor
+
+logger = logging.getLogger(__name__)
+
+DiffFormat = Literal["unified", "structured"]
+
+
+def _cached_weight(entry: Tuple[str, Optional[DiffResult]]) -> int:
+    result = entry[1]
+    if result is None:
+        return 0
+    return sum(len(line) for hunk in result.hunks for line in hunk.lines)
+
+
+# Diff results keyed by (content hash a, content hash b, context), shared across requests
+diff_cache: LRUCache[Tuple[str, Optional[DiffResult]]] = LRUCache(
+    settings.diff_cache_size,
+    max_weight=settings.diff_cache_max_bytes,
+    weigher=_cached_weight
+)
+
+
+class DiffService:
+    """Service for computing diffs between documents."""
+
+    def __init__(
+        self,
+        document_repository: DocumentRepositoryProtocol,
+        cache: LRUCache = diff_cache
+    ):
+        """
+        Initialize the diff service with its dependencies.
+
+        Args:
+            document_repository: Repository for document persistence
+            cache: Cache of computed diffs keyed by content hashes
+        """
+        self.document_repository = document_repository
+        self.cache = cache
+
+    async def _compute(self, a: str, b: str, context: int) -> Tuple[str, Optional[DiffResult]]:
+        """
+        Compute a diff, in a worker process for large inputs.
+
+        Myers' cost grows with the edit distance, not just the size, so a
+        small input is first tried inline within `diff_inline_budget_seconds`
+        and moved to a worker process if that runs out.
+        """
+        if len(a) + len(b) > settings.diff_max_input_size:
+            return "too_large", None
+
+        kwargs = dict(
+            context=context,
+            timeout=settings.diff_timeout_seconds,
+            max_edits=settings.diff_max_edit_distance,
+            max_output_lines=settings.diff_max_output_lines
+        )
+        try:
+            if len(a) + len(b) < settings.diff_offload_threshold:
+                try:
+                    return "ok", diff_texts(a, b, **dict(kwargs, timeout=settings.diff_inline_budget_seconds))
+                except DiffTimeout:
+                    pass
+            # diff_texts enforces its own deadline; wait_for is only a backstop
+            return "ok", await asyncio.wait_for(
+                executor.run(PROCESS, diff_texts, a, b, **kwargs),
+                timeout=settings.diff_timeout_seconds + 1.0
+            )
+        except DiffTooLarge:
+            return "too_large", None
+        except (DiffTimeout, asyncio.TimeoutError):
+            return "timeout", None
+
+    async def diff_documents(
+        self,
+        a: str,
+        b: str,
+        format: DiffFormat = "unified",
+        context: int = 3
+    ) -> Optional[DiffResponse]:
+        """
+        Diff the content of two documents.
+
+        Returns:
+            Optional[DiffResponse]: Diff result, None if either document does not exist
+        """
+        try:
+            doc_a = await self.document_repository.find_by_share_id(a)
+            doc_b = await self.document_repository.find_by_share_id(b)
+
+            if not doc_a or not doc_b:
+                return None
+
+            key = (content_hash(doc_a.content), content_hash(doc_b.content), context)
+            if key[0] == key[1]:
+                return DiffResponse(a=a, b=b, status="ok", identical=True)
+
+            cached = self.cache.get(key)
+            if cached is None:
+                cached = await self._compute(doc_a.content, doc_b.content, context)
+                if cached[0] != "timeout":
+                    self.cache.set(key, cached)
+
+            status, result = cached
+            if result is None:
+                logger.info("Diff of %s and %s not computed: %s", a, b, status)
+                return DiffResponse(a=a, b=b, status=status)
+
+            response = DiffResponse(
+                a=a,
+                b=b,
+                status=status,
+                added=result.added,
+                removed=result.removed,
+                truncated=result.truncated
+            )
+            if format == "unified":
+                response.unified = render_unified(result, a, b)
+            else:
+                response.hunks = [
+                    DiffHunk(
+                        a_start=hunk.a_start,
+                        a_count=hunk.a_count,
+                        b_start=hunk.b_start,
+                        b_count=hunk.b_count,
+                        lines=hunk.lines
+                    )
+                    for hunk in result.hunks
+                ]
+            return response
+
+        except (TimeoutError, ConnectionError, Overloaded):
+            raise
+        except Exception as e:
+            logger.error("Error diffing documents: %s", e)
+            raise RuntimeError(f"Failed to diff documents: {e}")
+
+
+def get_diff_service() -> DiffService:
+    """
+    Get a DiffService instance with injected dependencies.
+
+    Returns:
+        DiffService: Configured diff service instance
+    """
+    return DiffService(document_repository=get_document_repository())
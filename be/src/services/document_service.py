@@ -5,11 +5,16 @@ Document service for handling document operations.
 import logging
 from typing import Optional
 from datetime import datetime, UTC
+from ..context.deadline import check_deadline
+from ..context.timing import timed
 from ..models.request_response import DocumentCreate, DocumentUpdate, DocumentResponse
 from ..protocols.hrid_protocol import HRIDGeneratorProtocol
 from ..protocols.repository_protocol import DocumentRepositoryProtocol
 from ..repositories.document_repository import get_document_repository
+from ..services.access_tracker import AccessTracker, get_access_tracker
 from ..services.hrid_service import get_hrid_generator
+from ..services.revision_service import RevisionService, get_revision_service
+from ..settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +25,9 @@ class DocumentService:
     def __init__(
         self,
         hrid_generator: HRIDGeneratorProtocol,
-        document_repository: DocumentRepositoryProtocol
+        document_repository: DocumentRepositoryProtocol,
+        revision_service: Optional[RevisionService] = None,
+        access_tracker: Optional[AccessTracker] = None
     ):
         """
         Initialize the document service with its dependencies.
@@ -28,76 +35,117 @@ class DocumentService:
         Args:
             hrid_generator: Service for generating human-readable IDs
             document_repository: Repository for document persistence
+            revision_service: Optional service recording revision history
+            access_tracker: Optional tracker counting views and accesses
         """
         self.hrid_generator = hrid_generator
         self.document_repository = document_repository
+        self.revision_service = revision_service
+        self.access_tracker = access_tracker
+    
+    async def _record_revision(self, share_id: str, content: str, created_at: datetime) -> None:
+        """Record a revision without failing the surrounding write."""
+        if self.revision_service is None:
+            return
+        try:
+            with timed("revision"):
+                await self.revision_service.record(share_id, content, created_at)
+        except (RuntimeError, TimeoutError) as e:
+            logger.warning("Revision not recorded for %s: %s", share_id, e)
     
     async def create_document(self, document_data: DocumentCreate) -> DocumentResponse:
         """Create a new document."""
         try:
-            share_id = self.hrid_generator.generate_id()
+            check_deadline("create")
+            with timed("hrid"):
+                share_id = self.hrid_generator.generate_id()
+            
+            with timed("repo"):
+                doc_data = await self.document_repository.create(
+                    share_id=share_id,
+                    content=document_data.content
+                )
             
-            doc_data = await self.document_repository.create(
-                share_id=share_id,
-                content=document_data.content
-            )
+            await self._record_revision(doc_data.share_id, doc_data.content, doc_data.updated_at)
             
-            return DocumentResponse(
-                id=doc_data.id,
-                share_id=doc_data.share_id,
-                content=doc_data.content,
-                created_at=doc_data.created_at,
-                updated_at=doc_data.updated_at
-            )
+            with timed("convert"):
+                return DocumentResponse(
+                    id=doc_data.id,
+                    share_id=doc_data.share_id,
+                    content=doc_data.content,
+                    created_at=doc_data.created_at,
+                    updated_at=doc_data.updated_at
+                )
             
+        except (TimeoutError, ConnectionError):
+            raise
         except Exception as e:
-            logger.error(f"Error creating document: {e}")
+            logger.error("Error creating document: %s", e)
             raise RuntimeError(f"Failed to create document: {e}")
     
     async def get_document(self, share_id: str) -> Optional[DocumentResponse]:
         """Get a document by share_id."""
         try:
-            doc_data = await self.document_repository.find_by_share_id(share_id)
+            check_deadline("find")
+            with timed("repo"):
+                doc_data = await self.document_repository.find_by_share_id(share_id)
             
             if not doc_data:
                 return None
             
-            return DocumentResponse(
-                id=doc_data.id,
-                share_id=doc_data.share_id,
-                content=doc_data.content,
-                created_at=doc_data.created_at,
-                updated_at=doc_data.updated_at
-            )
+            if self.access_tracker is not None:
+                self.access_tracker.record(share_id)
             
+            with timed("convert"):
+                return DocumentResponse(
+                    id=doc_data.id,
+                    share_id=doc_data.share_id,
+                    content=doc_data.content,
+                    created_at=doc_data.created_at,
+                    updated_at=doc_data.updated_at
+                )
+            
+        except (TimeoutError, ConnectionError):
+            raise
         except Exception as e:
-            logger.error(f"Error retrieving document: {e}")
+            logger.error("Error retrieving document: %s", e)
             raise RuntimeError(f"Failed to retrieve document: {e}")
     
     async def update_document(self, share_id: str, document_data: DocumentUpdate) -> Optional[DocumentResponse]:
         """Update a document by share_id."""
         try:
+            check_deadline("update")
             updated_at = datetime.now(UTC)
             
-            doc_data = await self.document_repository.update(
-                share_id=share_id,
-                content=document_data.content,
-                updated_at=updated_at
-            )
+            with timed("repo"):
+                doc_data = await self.document_repository.update(
+                    share_id=share_id,
+                    content=document_data.content,
+                    updated_at=updated_at
+                )
             
             if not doc_data:
                 return None
             
-            return DocumentResponse(
-                id=doc_data.id,
-                share_id=doc_data.share_id,
-                content=doc_data.content,
-                created_at=doc_data.created_at,
-                updated_at=doc_data.updated_at
-            )
+            if self.access_tracker is not None:
+                # Edits keep a document hot without counting as views
+                self.access_tracker.record(share_id, view=False)
+            
+            await self._record_revision(doc_data.share_id, doc_data.content, doc_data.updated_at)
+            
+            with timed("convert"):
+                return DocumentResponse(
+                    id=doc_data.id,
+                    share_id=doc_data.share_id,
+                    content=doc_data.content,
+                    created_at=doc_data.created_at,
+                    updated_at=doc_data.updated_at
+                )
             
+        except (TimeoutError, ConnectionError):
+            raise
         except Exception as e:
-            logger.error(f"Error updating document: {e}")
+            logger.error("Error updating document: %s", e)
             raise RuntimeError(f"Failed to update document: {e}")
 
 def get_document_service() -> DocumentService:
@@ -110,9 +158,12 @@ def get_document_service() -> DocumentService:
     """
     hrid_generator = get_hrid_generator()
     document_repository = get_document_repository()
+    revision_service = get_revision_service() if settings.revisions_enabled else None
     
     return DocumentService(
         hrid_generator=hrid_generator,
-        document_repository=document_repository
+        document_repository=document_repository,
+        revision_service=revision_service,
+        access_tracker=get_access_tracker()
     )
 
@@ -0,0 +1,229 @@
+"""
+Shared executors for CPU-heavy work that must not run on the event loop.
+
+Two pools serve different kinds of work:
+
+- a thread pool for calls that mostly release the GIL (hashlib, zlib) or
+  that work on objects too large to pickle for every call, such as cached
+  signature indexes;
+- a process pool for pure-Python CPU work such as line diffs and revision
+  deltas, which would hold the GIL and keep starving the loop even from a
+  thread.
+
+Each pool runs at most as many calls as it has workers. Further calls wait
+in a bounded queue, no longer than the request deadline allows, and are
+rejected with `Overloaded` beyond that, so a burst of large documents turns
+into 503 responses instead of an unbounded backlog of work items. Callers
+only offload inputs above a size threshold: for small inputs the hand-off
+costs more than the work.
+"""
+
+import asyncio
+import functools
+import logging
+import math
+import multiprocessing
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, TypeVar
+from ..context.deadline import remaining_time
+from ..context.request_context import get_request_context
+from ..settings import settings
+from .admission_controller import AdaptiveLimiter, Overloaded
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+THREAD = "thread"
+PROCESS = "process"
+
+executor_tasks_total = registry.counter(
+    "executor_tasks_total", "Calls submitted to the executors by pool and outcome.", ("pool", "outcome")
+)
+executor_queue_wait_seconds = registry.histogram(
+    "executor_queue_wait_seconds", "Time calls waited for an executor slot.", ("pool",)
+)
+executor_task_duration_seconds = registry.histogram(
+    "executor_task_duration_seconds", "Time from executor slot to result, including pickling.", ("pool",)
+)
+
+
+class OffloadExecutor:
+    """Bounded thread and process pools shared by all services of a worker."""
+
+    def __init__(
+        self,
+        thread_workers: int,
+        process_workers: int,
+        max_queue: int,
+        max_wait: float,
+        start_method: str = "spawn"
+    ):
+        """
+        Initialize the executor; pools are created on start or first use.
+
+        Args:
+            thread_workers: Threads in the thread pool
+            process_workers: Processes in the process pool, 0 to run process work on threads
+            max_queue: Maximum number of calls waiting per pool
+            max_wait: Maximum seconds a call waits for a slot
+            start_method: Multiprocessing start method of the worker processes
+        """
+        self.workers = {THREAD: max(1, thread_workers)}
+        if process_workers > 0:
+            self.workers[PROCESS] = process_workers
+        self.start_method = start_method
+        # A fixed limit turns the admission limiter into a plain bounded semaphore with a queue
+        self.limiters = {
+            kind: AdaptiveLimiter(
+                name=kind,
+                initial_limit=workers,
+                min_limit=workers,
+                max_limit=workers,
+                max_queue=max_queue,
+                max_wait=max_wait,
+                target_latency=math.inf
+            )
+            for kind, workers in self.workers.items()
+        }
+        self._pools: Dict[str, Executor] = {}
+
+    def _pool(self, kind: str) -> Executor:
+        pool = self._pools.get(kind)
+        if pool is None:
+            if kind == PROCESS:
+                pool = ProcessPoolExecutor(
+                    max_workers=self.workers[PROCESS],
+                    mp_context=multiprocessing.get_context(self.start_method)
+                )
+            else:
+                pool = ThreadPoolExecutor(max_workers=self.workers[THREAD], thread_name_prefix="offload")
+            self._pools[kind] = pool
+        return pool
+
+    def _finished(self, kind: str, pool: Executor, started: float, future: Future) -> None:
+        duration = time.perf_counter() - started
+        if future.cancelled():
+            outcome = "cancelled"
+        elif future.exception() is not None:
+            outcome = "error"
+            if isinstance(future.exception(), BrokenProcessPool) and self._pools.get(kind) is pool:
+                logger.error("Process pool broken by a crashed worker; it is recreated on next use")
+                del self._pools[kind]
+        else:
+            outcome = "ok"
+        executor_tasks_total.inc(kind, outcome)
+        executor_task_duration_seconds.observe(duration, kind)
+        self.limiters[kind].release(duration, ok=outcome == "ok")
+
+    async def run(self, kind: str, fn: Callable[..., T], *args, **kwargs) -> T:
+        """
+        Run `fn(*args, **kwargs)` on a pool and wait for its result.
+
+        For the process pool, `fn`, its arguments and its result must be
+        picklable, so `fn` has to be a module-level function.
+
+        Args:
+            kind: THREAD or PROCESS; PROCESS falls back to threads when disabled
+
+        Raises:
+            Overloaded: If the pool's queue is full or no slot frees up in time
+        """
+        if kind not in self.workers:
+            kind = THREAD
+        limiter = self.limiters[kind]
+        queued = time.perf_counter()
+        try:
+            await limiter.acquire(max_wait=remaining_time())
+        except Overloaded:
+            executor_tasks_total.inc(kind, "rejected")
+            context = get_request_context()
+            if context is not None:
+                context.overloaded = True
+            raise
+        started = time.perf_counter()
+        executor_queue_wait_seconds.observe(started - queued, kind)
+
+        try:
+            pool = self._pool(kind)
+            future = pool.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            limiter.release(0.0, ok=False)
+            raise
+
+        loop = asyncio.get_running_loop()
+
+        def finished(done: Future) -> None:
+            # Release the slot only when the call really ended, even if the caller stopped waiting
+            try:
+                loop.call_soon_threadsafe(self._finished, kind, pool, started, done)
+            except RuntimeError:
+                pass  # loop already closed
+
+        future.add_done_callback(finished)
+        return await asyncio.wrap_future(future)
+
+    def start(self) -> None:
+        """Create the pools ahead of the first request."""
+        for kind in self.workers:
+            self._pool(kind)
+
+    async def stop(self) -> None:
+        """Cancel queued work, wait for running calls and shut the pools down."""
+        pools = list(self._pools.values())
+        self._pools.clear()
+        for pool in pools:
+            await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(pool.shutdown, wait=True, cancel_futures=True)
+            )
+
+    def stats(self) -> Dict[str, dict]:
+        """Return a snapshot of each pool's size, slots and queue."""
+        return {
+            kind: {"workers": workers, **self.limiters[kind].stats()}
+            for kind, workers in self.workers.items()
+        }
+
+
+def create_executor() -> OffloadExecutor:
+    """Create the executor configured in settings."""
+    return OffloadExecutor(
+        thread_workers=settings.executor_thread_workers,
+        process_workers=settings.executor_process_workers,
+        max_queue=settings.executor_max_queue,
+        max_wait=settings.executor_max_wait_ms / 1000,
+        start_method=settings.executor_start_method
+    )
+
+
+# Global executor instance
+executor = create_executor()
+
+
+def executor_metrics() -> Dict[str, Dict[str, object]]:
+    """
+    Collect in-flight and queued calls per pool.
+
+    Returns:
+        Dict[str, Dict[str, object]]: Gauge snapshots
+    """
+    stats = executor.stats()
+
+    def gauge(help_text: str, field: str) -> Dict[str, object]:
+        return {
+            "type": "gauge",
+            "help": help_text,
+            "labelnames": ["pool"],
+            "samples": [[[kind], pool[field]] for kind, pool in stats.items()]
+        }
+
+    return {
+        "executor_in_flight": gauge("Calls running on an executor pool.", "in_flight"),
+        "executor_queue_depth": gauge("Calls waiting for an executor slot.", "queue_depth")
+    }
+
+
+registry.add_collector(executor_metrics)
@@ -0,0 +1,134 @@
+"""
+Background health probing for the liveness, readiness and health endpoints.
+
+A single task pings the database on an interval and keeps the result, so
+health endpoints only read cached state and load-balancer probes never
+reach MongoDB. Event-loop lag is measured by the loop monitor.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, UTC
+from typing import Dict, Optional
+from ..settings import settings
+from .database import DatabaseManager, document_database
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Periodically probes the database and caches the outcome."""
+
+    def __init__(
+        self,
+        database: DatabaseManager,
+        interval: float = settings.health_probe_interval,
+        timeout: float = settings.health_probe_timeout_ms / 1000,
+        max_staleness: float = settings.health_max_staleness,
+        clock=time.monotonic
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            database: Database manager to probe
+            interval: Seconds between probes
+            timeout: Seconds after which a probe counts as failed
+            max_staleness: Seconds after which a missing probe result means not ready
+            clock: Monotonic time source
+        """
+        self.database = database
+        self.interval = interval
+        self.timeout = timeout
+        self.max_staleness = max_staleness
+        self.clock = clock
+
+        self.database_healthy = False
+        self.last_probe_at: Optional[datetime] = None
+        self.last_probe_latency: Optional[float] = None
+        self.consecutive_failures = 0
+        self._last_probe_monotonic: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def probe(self) -> bool:
+        """
+        Ping the database once and record the result.
+
+        Returns:
+            bool: True if the database answered in time
+        """
+        started = self.clock()
+        try:
+            healthy = await asyncio.wait_for(
+                self.database.health_check(timeout=self.timeout), self.timeout * 2
+            )
+        except asyncio.TimeoutError:
+            healthy = False
+        self.last_probe_latency = self.clock() - started
+        self._last_probe_monotonic = self.clock()
+        self.last_probe_at = datetime.now(UTC)
+
+        if healthy:
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_failures += 1
+        if healthy != self.database_healthy:
+            logger.warning("Database health changed: %s", 'healthy' if healthy else 'unhealthy')
+        self.database_healthy = healthy
+        return healthy
+
+    @property
+    def ready(self) -> bool:
+        """True if the last probe succeeded and is recent enough."""
+        if not self.database_healthy or self._last_probe_monotonic is None:
+            return False
+        return self.clock() - self._last_probe_monotonic <= self.max_staleness
+
+    def status(self) -> Dict[str, object]:
+        """
+        Get the cached probe state.
+
+        Returns:
+            Dict[str, object]: Probe outcome, latency and pool stats
+        """
+        return {
+            "ready": self.ready,
+            "database": "healthy" if self.database_healthy else "unhealthy",
+            "last_probe_at": self.last_probe_at.isoformat() if self.last_probe_at else None,
+            "last_probe_latency_ms": (
+                round(self.last_probe_latency * 1000, 3)
+                if self.last_probe_latency is not None else None
+            ),
+            "consecutive_failures": self.consecutive_failures,
+            "pool": self.database.pool_stats()
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.probe()
+            except Exception as e:
+                logger.error("Health probe failed: %s", e)
+
+    async def start(self) -> None:
+        """Probe once, then keep probing in the background."""
+        if self._task is None:
+            await self.probe()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background probe loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.database_healthy = False
+
+
+# Global health monitor instance
+health_monitor = HealthMonitor(document_database())
@@ -37,9 +37,9 @@ class HRIDService:
         try:
             seed = str(uuid4())
             self._hrid = HRID(seed=seed)
-            logger.info(f"HRID service initialized with seed: {seed[:10]}...")
+            logger.info("HRID service initialized with seed: %s...", seed[:10])
         except Exception as e:
-            logger.error(f"Failed to initialize HRID service: {e}")
+            logger.error("Failed to initialize HRID service: %s", e)
             raise RuntimeError(f"HRID initialization failed: {e}")
     
     def generate_id(self) -> str:
@@ -55,11 +55,11 @@ class HRIDService:
             
             hrid_value = self._hrid.generate()
             url_safe_hrid = hrid_value.replace(' ', '-')
-            logger.debug(f"Generated HRID: {url_safe_hrid}")
+            logger.debug("Generated HRID: %s", url_safe_hrid)
             return url_safe_hrid
             
         except Exception as e:
-            logger.error(f"Failed to generate HRID: {e}")
+            logger.error("Failed to generate HRID: %s", e)
             raise RuntimeError(f"HRID generation failed: {e}")
     
     def generate_multiple(self, count: int) -> list[str]:
@@ -80,11 +80,11 @@ class HRIDService:
             for _ in range(count):
                 ids.append(self._hrid.generate())
             
-            logger.debug(f"Generated {count} HRIDs")
+            logger.debug("Generated %s HRIDs", count)
             return ids
             
         except Exception as e:
-            logger.error(f"Failed to generate multiple HRIDs: {e}")
+            logger.error("Failed to generate multiple HRIDs: %s", e)
             raise RuntimeError(f"HRID generation failed: {e}")
 
 
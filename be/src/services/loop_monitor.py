@@ -0,0 +1,138 @@
+"""
+Event-loop lag monitor and blocking-call detector.
+
+A heartbeat task on the event loop sleeps for a fixed interval and records
+by how much each wake-up was late; that lag is exported as a metric. A
+watchdog thread checks the heartbeat: when the loop has not come back for
+longer than the stall threshold, some callback is blocking it, and the
+watchdog logs the stack of the loop thread at that moment - which is the
+stack of the offending callback - once per stall. The stall is counted on
+the loop once it unblocks, since the metrics registry is not thread-safe.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+from ..settings import settings
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+event_loop_lag_seconds = registry.histogram(
+    "event_loop_lag_seconds", "Delay of event loop heartbeats beyond their schedule.", buckets=LAG_BUCKETS
+)
+event_loop_stalls_total = registry.counter(
+    "event_loop_stalls_total", "Times the event loop was blocked longer than the stall threshold."
+)
+
+
+class LoopMonitor:
+    """Measures event-loop lag and reports callbacks that block the loop."""
+
+    def __init__(self, interval: float, stall_threshold: float, clock=time.monotonic):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between heartbeats
+            stall_threshold: Seconds without a heartbeat after which the loop counts as blocked
+            clock: Monotonic time source shared by the loop and the watchdog
+        """
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.clock = clock
+
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._last_beat = clock()
+        self._loop_thread_id: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            before = self.clock()
+            self._last_beat = before
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, self.clock() - before - self.interval)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            event_loop_lag_seconds.observe(lag)
+
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stop.wait(self.interval / 2):
+            beat = self._last_beat
+            blocked_for = self.clock() - beat - self.interval
+            if blocked_for < self.stall_threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            try:
+                self._loop.call_soon_threadsafe(self._count_stall)
+            except RuntimeError:
+                pass  # loop already closed
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "unavailable\n"
+            logger.warning(
+                "Event loop blocked for at least %.0f ms; loop thread stack:\n%s", blocked_for * 1000, stack,
+                extra={"blocked_ms": round(blocked_for * 1000)}
+            )
+
+    def _count_stall(self) -> None:
+        self.stalls += 1
+        event_loop_stalls_total.inc()
+
+    def start(self) -> None:
+        """Start the heartbeat on the running loop and the watchdog thread."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = self.clock()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop the heartbeat and the watchdog."""
+        if self._task is None:
+            return
+        self._stop.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._watchdog.join()
+        self._watchdog = None
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Get lag and stall statistics.
+
+        Returns:
+            Dict[str, object]: Last and maximum lag in milliseconds and the stall count
+        """
+        return {
+            "lag_ms": round(self.last_lag * 1000, 3),
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "stalls": self.stalls
+        }
+
+
+# Global loop monitor instance
+loop_monitor = LoopMonitor(
+    interval=settings.loop_monitor_interval_ms / 1000,
+    stall_threshold=settings.loop_stall_threshold_ms / 1000
+)
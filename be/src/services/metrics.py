@@ -0,0 +1,476 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Metrics are plain counters held per worker process and only touched from
+its event loop, so recording is a dict lookup and an integer add without
+locks. With several uvicorn workers, each worker periodically writes a
+snapshot of its metrics to `metrics_multiprocess_dir` and `/metrics`
+merges the snapshots of all workers: counters and histograms are summed
+(including those of exited workers, so totals never go backwards) while
+gauges and per-process series are only taken from live workers.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import resource
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from ..settings import settings
+from .mongo_monitoring import LATENCY_BUCKETS as MONGO_LATENCY_BUCKETS, command_monitor, pool_monitor
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Payload size buckets in bytes
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Metric:
+    """Base class of a labelled metric family."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def snapshot(self) -> Dict[str, object]:
+        """Get a JSON-serializable copy of the metric family."""
+        return {
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": self._samples()
+        }
+
+    def _samples(self) -> List[list]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonically increasing value."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increase the counter of `labels` by `amount`."""
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def _samples(self) -> List[list]:
+        return [[list(labels), value] for labels, value in self.values.items()]
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        """Set the gauge of `labels` to `value`."""
+        self.values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increase the gauge of `labels` by `amount`."""
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        """Decrease the gauge of `labels` by `amount`."""
+        self.values[labels] = self.values.get(labels, 0) - amount
+
+    def _samples(self) -> List[list]:
+        return [[list(labels), value] for labels, value in self.values.items()]
+
+
+class Histogram(Metric):
+    """Distribution of observations over fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: [per-bucket counts..., +Inf count, sum]
+        self.values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for `labels`."""
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    def snapshot(self) -> Dict[str, object]:
+        data = super().snapshot()
+        data["buckets"] = list(self.buckets)
+        return data
+
+    def _samples(self) -> List[list]:
+        return [[list(labels), list(entry)] for labels, entry in self.values.items()]
+
+
+Collector = Callable[[], Dict[str, Dict[str, object]]]
+
+
+class MetricsRegistry:
+    """Holds this worker's metrics and renders merged snapshots."""
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self.collectors: List[Collector] = []
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric family; names must be unique."""
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Register and return a counter."""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Register and return a gauge."""
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """Register and return a histogram."""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Collector) -> None:
+        """Add a callable returning metric snapshots computed at collection time."""
+        self.collectors.append(collector)
+
+    def collect(self) -> Dict[str, Dict[str, object]]:
+        """
+        Snapshot all metrics of this worker.
+
+        Returns:
+            Dict[str, Dict[str, object]]: Metric snapshots keyed by name
+        """
+        snapshot = {name: metric.snapshot() for name, metric in self.metrics.items()}
+        for collector in self.collectors:
+            try:
+                snapshot.update(collector())
+            except Exception as e:
+                logger.warning("Metrics collector failed: %s", e)
+        return snapshot
+
+
+def merge_snapshots(snapshots: Iterable[Tuple[Dict[str, Dict[str, object]], bool]]) -> Dict[str, Dict[str, object]]:
+    """
+    Merge worker snapshots.
+
+    Args:
+        snapshots: Pairs of (snapshot, worker is alive)
+
+    Returns:
+        Dict[str, Dict[str, object]]: Merged snapshot
+    """
+    merged: Dict[str, Dict[str, object]] = {}
+    for snapshot, alive in snapshots:
+        for name, family in snapshot.items():
+            if not alive and (family["type"] == "gauge" or "pid" in family["labelnames"]):
+                continue
+            target = merged.get(name)
+            if target is None:
+                target = merged[name] = {key: value for key, value in family.items() if key != "samples"}
+                target["samples"] = {}
+            samples = target["samples"]
+            for labels, value in family["samples"]:
+                key = tuple(labels)
+                current = samples.get(key)
+                if current is None:
+                    samples[key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    samples[key] = [a + b for a, b in zip(current, value)]
+                else:
+                    samples[key] = current + value
+    for family in merged.values():
+        family["samples"] = [[list(labels), value] for labels, value in family["samples"].items()]
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render(snapshot: Dict[str, Dict[str, object]]) -> str:
+    """
+    Render a snapshot in the Prometheus text exposition format.
+
+    Returns:
+        str: Exposition text
+    """
+    lines: List[str] = []
+    for name in sorted(snapshot):
+        family = snapshot[name]
+        labelnames = family["labelnames"]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for labels, value in family["samples"]:
+            if family["type"] == "histogram":
+                cumulative = 0
+                for bound, count in zip(list(family["buckets"]) + [float("inf")], value[:-1]):
+                    cumulative += count
+                    le = f'le="{_number(float(bound))}"'
+                    lines.append(f"{name}_bucket{_labels(labelnames, labels, le)} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labelnames, labels)} {_number(value[-1])}")
+                lines.append(f"{name}_count{_labels(labelnames, labels)} {cumulative}")
+            else:
+                lines.append(f"{name}{_labels(labelnames, labels)} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+_start_time = time.time()
+
+
+def process_metrics() -> Dict[str, Dict[str, object]]:
+    """
+    Collect stats of the current process, labelled by pid.
+
+    Returns:
+        Dict[str, Dict[str, object]]: Gauge snapshots
+    """
+    pid = str(os.getpid())
+    times = os.times()
+    # ru_maxrss is in kilobytes on Linux
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    try:
+        with open("/proc/self/statm") as statm:
+            rss = int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        pass
+    try:
+        open_fds = len(os.listdir("/proc/self/fd"))
+    except OSError:
+        open_fds = -1
+
+    def gauge(help_text: str, value: float) -> Dict[str, object]:
+        return {"type": "gauge", "help": help_text, "labelnames": ["pid"], "samples": [[[pid], value]]}
+
+    metrics = {
+        "process_cpu_seconds_total": gauge("User and system CPU time spent in seconds.", times.user + times.system),
+        "process_resident_memory_bytes": gauge("Resident memory size in bytes.", rss),
+        "process_open_fds": gauge("Number of open file descriptors.", open_fds),
+        "process_start_time_seconds": gauge("Start time of the process since unix epoch in seconds.", _start_time)
+    }
+    metrics["process_cpu_seconds_total"]["type"] = "counter"
+    return metrics
+
+
+def mongo_metrics() -> Dict[str, Dict[str, object]]:
+    """
+    Collect connection pool and command metrics from the PyMongo listeners.
+
+    Returns:
+        Dict[str, Dict[str, object]]: Gauge and histogram snapshots
+    """
+    pool = pool_monitor.stats()
+    wait = pool["checkout_wait_seconds"]
+    commands = command_monitor.stats()
+
+    def gauge(help_text: str, value: float) -> Dict[str, object]:
+        return {"type": "gauge", "help": help_text, "labelnames": [], "samples": [[[], value]]}
+
+    return {
+        "mongodb_pool_open_connections": gauge("Open pooled connections.", pool["open_connections"]),
+        "mongodb_pool_in_use_connections": gauge("Connections checked out of the pool.", pool["in_use"]),
+        "mongodb_pool_waiting": gauge("Operations waiting for a pooled connection.", pool["waiting"]),
+        "mongodb_pool_checkout_wait_seconds": {
+            "type": "histogram",
+            "help": "Time spent waiting to check out a pooled connection.",
+            "labelnames": [],
+            "buckets": wait["buckets"],
+            "samples": [[[], wait["counts"] + [wait["sum"]]]] if wait["count"] else []
+        },
+        "mongodb_command_duration_seconds": {
+            "type": "histogram",
+            "help": "MongoDB command latency by command name.",
+            "labelnames": ["command"],
+            "buckets": list(MONGO_LATENCY_BUCKETS),
+            "samples": [
+                [[name], data["latency_seconds"]["counts"] + [data["latency_seconds"]["sum"]]]
+                for name, data in commands.items()
+            ]
+        }
+    }
+
+
+class MultiprocessStore:
+    """Shares worker snapshots through one JSON file per process."""
+
+    def __init__(self, directory: str, registry: MetricsRegistry):
+        self.directory = directory
+        self.registry = registry
+        self.path = os.path.join(directory, f"{os.getpid()}.json")
+
+    def write(self) -> None:
+        """Atomically replace this worker's snapshot file."""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.registry.collect(), f)
+        os.replace(tmp_path, self.path)
+
+    def read_all(self) -> List[Tuple[Dict[str, Dict[str, object]], bool]]:
+        """
+        Read the snapshots of all workers, including exited ones.
+
+        Returns:
+            List[Tuple[Dict, bool]]: (snapshot, worker is alive) pairs
+        """
+        snapshots = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                pid = int(filename[:-5])
+                with open(os.path.join(self.directory, filename)) as f:
+                    snapshots.append((json.load(f), _pid_alive(pid)))
+            except (ValueError, OSError) as e:
+                logger.warning("Skipping metrics file %s: %s", filename, e)
+        return snapshots
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsExporter:
+    """Renders /metrics and keeps this worker's shared snapshot fresh."""
+
+    def __init__(self, registry: MetricsRegistry, store: Optional[MultiprocessStore], interval: float):
+        self.registry = registry
+        self.store = store
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def render(self) -> str:
+        """Render the metrics of this worker, or of all workers when shared."""
+        if self.store is None:
+            return render(self.registry.collect())
+        self.store.write()
+        return render(merge_snapshots(self.store.read_all()))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.store.write()
+            except OSError as e:
+                logger.warning("Failed to write metrics snapshot: %s", e)
+
+    def start(self) -> None:
+        """Start writing snapshots in the background when shared."""
+        if self.store is not None and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background loop and write a final snapshot."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            try:
+                self.store.write()
+            except OSError as e:
+                logger.warning("Failed to write metrics snapshot: %s", e)
+
+
+# Global registry and the metrics recorded by the application
+registry = MetricsRegistry()
+registry.add_collector(process_metrics)
+registry.add_collector(mongo_metrics)
+
+http_requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by method, route and status.", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method, route and status.",
+    ("method", "route", "status")
+)
+http_request_size_bytes = registry.histogram(
+    "http_request_size_bytes", "HTTP request body size by method and route.", ("method", "route"), SIZE_BUCKETS
+)
+http_response_size_bytes = registry.histogram(
+    "http_response_size_bytes", "HTTP response body size by method and route.", ("method", "route"), SIZE_BUCKETS
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled.", ("method",)
+)
+mongodb_operation_duration_seconds = registry.histogram(
+    "mongodb_operation_duration_seconds", "Repository database operation latency.", ("operation", "outcome")
+)
+mongodb_shard_operation_duration_seconds = registry.histogram(
+    "mongodb_shard_operation_duration_seconds", "Repository database operation latency per document shard.",
+    ("shard", "operation", "outcome")
+)
+repository_operation_duration_seconds = registry.histogram(
+    "repository_operation_duration_seconds", "Document repository call latency.", ("operation", "outcome")
+)
+repository_document_size_bytes = registry.histogram(
+    "repository_document_size_bytes", "Document content size per repository call.", ("operation",), SIZE_BUCKETS
+)
+
+exporter = MetricsExporter(
+    registry,
+    MultiprocessStore(settings.metrics_multiprocess_dir, registry) if settings.metrics_multiprocess_dir else None,
+    settings.metrics_flush_interval
+)
@@ -0,0 +1,172 @@
+"""
+PyMongo monitoring listeners publishing connection pool and command metrics.
+
+Listeners are invoked synchronously on the threads Motor runs PyMongo on,
+so all state is guarded by a lock and every callback only updates counters.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Sequence
+from pymongo import monitoring
+
+# Upper bounds in seconds, chosen to split sub-millisecond local calls from slow queries
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with count, sum and max."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one observation; callers hold the owning monitor's lock."""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Get a copy of the histogram.
+
+        Returns:
+            Dict[str, object]: Bucket bounds, per-bucket counts, count, sum and max
+        """
+        return {
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+            "count": self.count,
+            "sum": self.total,
+            "max": self.max
+        }
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Tracks pool size, connections in use and checkout wait time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open_connections = 0
+        self.in_use = 0
+        self.waiting = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.pool_clears = 0
+        self.checkout_wait = LatencyHistogram()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections = max(0, self.open_connections - 1)
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self.waiting += 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.waiting = max(0, self.waiting - 1)
+            self.checkout_failures[event.reason] = self.checkout_failures.get(event.reason, 0) + 1
+            if event.duration is not None:
+                self.checkout_wait.observe(event.duration)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.waiting = max(0, self.waiting - 1)
+            self.in_use += 1
+            if event.duration is not None:
+                self.checkout_wait.observe(event.duration)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Get current pool statistics.
+
+        Returns:
+            Dict[str, object]: Connection counts, waiters, failures and checkout wait histogram
+        """
+        with self._lock:
+            return {
+                "open_connections": self.open_connections,
+                "in_use": self.in_use,
+                "waiting": self.waiting,
+                "pool_clears": self.pool_clears,
+                "checkout_failures": dict(self.checkout_failures),
+                "checkout_wait_seconds": self.checkout_wait.snapshot()
+            }
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Records latency histograms per command name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.failures: Dict[str, int] = {}
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._observe(event.command_name, event.duration_micros)
+
+    def failed(self, event):
+        with self._lock:
+            self.failures[event.command_name] = self.failures.get(event.command_name, 0) + 1
+        self._observe(event.command_name, event.duration_micros)
+
+    def _observe(self, command_name: str, duration_micros: int) -> None:
+        with self._lock:
+            histogram = self.latency.get(command_name)
+            if histogram is None:
+                histogram = self.latency[command_name] = LatencyHistogram()
+            histogram.observe(duration_micros / 1_000_000)
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Get command statistics.
+
+        Returns:
+            Dict[str, object]: Latency histogram and failure count per command name
+        """
+        with self._lock:
+            return {
+                name: {
+                    "latency_seconds": histogram.snapshot(),
+                    "failures": self.failures.get(name, 0)
+                }
+                for name, histogram in self.latency.items()
+            }
+
+
+# Global listener instances registered on the Motor client
+pool_monitor = PoolMonitor()
+command_monitor = CommandMonitor()
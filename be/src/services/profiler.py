@@ -0,0 +1,132 @@
+"""
+On-demand sampling profiler and asyncio task dump for a live worker.
+
+The profiler runs in its own thread and periodically reads the current
+frame of every other thread with sys._current_frames(), so the profiled
+code is not instrumented and pays only for the GIL hand-offs of the
+sampler. Stacks are aggregated in the collapsed format understood by
+flamegraph.pl and speedscope: "root;caller;callee count" per line.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+MAX_STACK_DEPTH = 128
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{frame.f_lineno})"
+
+
+def _collapse(frame) -> List[str]:
+    stack = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+class SamplingProfiler:
+    """Samples the stacks of all threads at a fixed interval."""
+
+    def __init__(self, interval: float):
+        """
+        Initialize the profiler.
+
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            if len(names) != threading.active_count():
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = [names.get(thread_id, f"thread-{thread_id}")] + _collapse(frame)
+                self.samples[";".join(stack)] += 1
+            self.sample_count += 1
+            self._stop.wait(max(0.0, self.interval - (time.perf_counter() - started)))
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def collapsed(self) -> str:
+        """
+        Get the aggregated stacks in collapsed format.
+
+        Returns:
+            str: One "frame;frame;frame count" line per distinct stack
+        """
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+async def profile(seconds: float, interval: float) -> SamplingProfiler:
+    """
+    Sample the process for `seconds` while the event loop keeps serving.
+
+    Returns:
+        SamplingProfiler: Stopped profiler holding the samples
+    """
+    profiler = SamplingProfiler(interval)
+    profiler.start()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+    return profiler
+
+
+def _awaiting(coro) -> List[str]:
+    chain = []
+    awaited = getattr(coro, "cr_await", None)
+    while awaited is not None and len(chain) < MAX_STACK_DEPTH:
+        chain.append(getattr(awaited, "__qualname__", type(awaited).__qualname__))
+        awaited = getattr(awaited, "cr_await", None) or getattr(awaited, "gi_yieldfrom", None)
+    return chain
+
+
+def dump_tasks() -> List[Dict[str, object]]:
+    """
+    Describe all tasks of the running event loop.
+
+    Returns:
+        List[Dict[str, object]]: Name, coroutine, state, suspended stack and
+        the chain of awaitables each pending task is waiting on
+    """
+    tasks = []
+    for task in asyncio.all_tasks():
+        coro = task.get_coro()
+        tasks.append({
+            "name": task.get_name(),
+            "coroutine": getattr(coro, "__qualname__", repr(coro)),
+            "state": "done" if task.done() else ("cancelling" if task.cancelling() else "pending"),
+            "stack": [_frame_label(frame) for frame in task.get_stack(limit=MAX_STACK_DEPTH)],
+            "awaiting": _awaiting(coro)
+        })
+    tasks.sort(key=lambda task: task["name"])
+    return tasks
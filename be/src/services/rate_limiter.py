@@ -0,0 +1,320 @@
+"""
+Token bucket rate limiting with pluggable state backends.
+"""
+
+import asyncio
+import logging
+import math
+import re
+import time
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from pymongo import ReturnDocument
+from ..protocols.rate_limit_protocol import RateLimitBackendProtocol, RateLimitResult
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _bucket_state(capacity: int, refill_rate: float, tokens: float, allowed: bool, cost: int) -> RateLimitResult:
+    return RateLimitResult(
+        allowed=allowed,
+        limit=capacity,
+        remaining=max(0, int(tokens)),
+        reset_after=(capacity - tokens) / refill_rate,
+        retry_after=0.0 if allowed else (cost - tokens) / refill_rate
+    )
+
+
+class InMemoryRateLimitBackend:
+    """
+    Per-process token buckets.
+
+    Buckets are spread over a fixed number of shards so the idle-key
+    sweeper only walks one shard per tick, keeping each pause short.
+    """
+
+    def __init__(self, shards: int = 16, sweep_interval: float = 30.0, clock=time.monotonic):
+        """
+        Initialize the backend.
+
+        Args:
+            shards: Number of bucket shards
+            sweep_interval: Seconds between sweeping two consecutive shards
+            clock: Monotonic time source
+        """
+        self.shards: List[Dict[str, List[float]]] = [{} for _ in range(max(1, shards))]
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self._next_shard = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def consume(self, key: str, capacity: int, refill_rate: float, cost: int = 1) -> RateLimitResult:
+        """Take tokens from an in-memory bucket."""
+        now = self.clock()
+        shard = self.shards[hash(key) % len(self.shards)]
+        bucket = shard.get(key)
+        if bucket is None:
+            tokens = float(capacity)
+        else:
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        # Store the time at which the bucket refills completely so the sweeper can drop it
+        shard[key] = [tokens, now, now + (capacity - tokens) / refill_rate]
+        return _bucket_state(capacity, refill_rate, tokens, allowed, cost)
+
+    async def refund(self, key: str, capacity: int, refill_rate: float, cost: int = 1) -> None:
+        """Put tokens back into an in-memory bucket."""
+        now = self.clock()
+        shard = self.shards[hash(key) % len(self.shards)]
+        bucket = shard.get(key)
+        if bucket is None:
+            return
+        tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate + cost)
+        shard[key] = [tokens, now, now + (capacity - tokens) / refill_rate]
+
+    def sweep(self) -> int:
+        """
+        Drop buckets of one shard that have refilled completely.
+
+        A full bucket behaves exactly like a missing one, so this only frees memory.
+
+        Returns:
+            int: Number of removed buckets
+        """
+        shard = self.shards[self._next_shard]
+        self._next_shard = (self._next_shard + 1) % len(self.shards)
+        now = self.clock()
+        idle = [key for key, bucket in shard.items() if bucket[2] <= now]
+        for key in idle:
+            del shard[key]
+        return len(idle)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval / len(self.shards))
+            self.sweep()
+
+    async def start(self) -> None:
+        """Start the idle-key sweeper."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the idle-key sweeper."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self.shards)
+
+
+class MongoRateLimitBackend:
+    """
+    Token buckets shared by all workers, stored in MongoDB.
+
+    Each check is a single atomic findAndModify with an update pipeline.
+    Buckets expire through a TTL index once they would have refilled.
+    If the database is unavailable requests are allowed (fail open).
+    """
+
+    collection_name = "rate_limits"
+
+    def __init__(self, database_getter=None):
+        """
+        Initialize the backend.
+
+        Args:
+            database_getter: Callable returning the Motor database, defaults to the app database
+        """
+        self._database_getter = database_getter or _default_database
+
+    @property
+    def collection(self):
+        return self._database_getter()[self.collection_name]
+
+    async def consume(self, key: str, capacity: int, refill_rate: float, cost: int = 1) -> RateLimitResult:
+        """Take tokens from a shared bucket."""
+        now = time.time()
+        refilled = {"$min": [capacity, {"$add": [
+            {"$ifNull": ["$tokens", capacity]},
+            {"$multiply": [{"$subtract": [now, {"$ifNull": ["$ts", now]}]}, refill_rate]}
+        ]}]}
+        pipeline = [
+            {"$set": {"tokens": refilled, "ts": now}},
+            {"$set": {"allowed": {"$gte": ["$tokens", cost]}}},
+            {"$set": {
+                "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]},
+                "expires_at": {"$add": ["$$NOW", int(capacity / refill_rate * 1000)]}
+            }}
+        ]
+        try:
+            bucket = await self.collection.find_one_and_update(
+                {"_id": key},
+                pipeline,
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except Exception as e:
+            logger.warning("Rate limit backend unavailable, allowing request: %s", e)
+            return RateLimitResult(allowed=True, limit=capacity, remaining=capacity, reset_after=0.0)
+
+        return _bucket_state(capacity, refill_rate, bucket["tokens"], bucket["allowed"], cost)
+
+    async def refund(self, key: str, capacity: int, refill_rate: float, cost: int = 1) -> None:
+        """Put tokens back into a shared bucket."""
+        try:
+            await self.collection.update_one(
+                {"_id": key},
+                [{"$set": {"tokens": {"$min": [capacity, {"$add": ["$tokens", cost]}]}}}]
+            )
+        except Exception as e:
+            logger.warning("Rate limit refund of %s failed: %s", key, e)
+
+    async def start(self) -> None:
+        """Create the TTL index that expires idle buckets."""
+        try:
+            await self.collection.create_index("expires_at", expireAfterSeconds=0)
+        except Exception as e:
+            logger.warning("Failed to create rate limit TTL index: %s", e)
+
+    async def stop(self) -> None:
+        """Nothing to stop; buckets expire in the database."""
+
+
+def _default_database():
+    from .database import db_manager
+    return db_manager.client[settings.database_name]
+
+
+class RateLimitRule:
+    """
+    A token bucket budget applied to matching requests.
+
+    `scope` selects what the bucket is keyed by: "client" buckets are per
+    client address, "document" buckets are per share_id and are shared by
+    every client writing to that document.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests: int,
+        window: float,
+        path_pattern: str,
+        methods: Optional[FrozenSet[str]] = None,
+        scope: str = "client"
+    ):
+        self.name = name
+        self.capacity = requests
+        self.window = window
+        self.refill_rate = requests / window
+        self.path = re.compile(path_pattern)
+        self.methods = methods
+        self.scope = scope
+
+    def key_for(self, method: str, path: str, client: str) -> Optional[str]:
+        """Return the bucket key for a request, or None if the rule does not apply."""
+        if self.methods is not None and method not in self.methods:
+            return None
+        match = self.path.match(path)
+        if not match:
+            return None
+        if self.scope == "document":
+            share_id = match.groupdict().get("share_id")
+            return f"{self.name}:{share_id}" if share_id else None
+        return f"{self.name}:{client}"
+
+
+def default_rules() -> List[RateLimitRule]:
+    """Build the rate limit rules configured in settings."""
+    writes = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+    return [
+        RateLimitRule(
+            "global",
+            settings.rate_limit_requests,
+            settings.rate_limit_window,
+            r"^/api/"
+        ),
+        RateLimitRule(
+            "writes",
+            settings.rate_limit_write_requests,
+            settings.rate_limit_window,
+            r"^/api/v1/documents(/|$)",
+            methods=writes
+        ),
+        RateLimitRule(
+            "document",
+            settings.rate_limit_document_requests,
+            settings.rate_limit_window,
+            r"^/api/v1/documents/(?P<share_id>[^/]+)$",
+            methods=frozenset({"PUT"}),
+            scope="document"
+        ),
+    ]
+
+
+class RateLimiter:
+    """Applies a set of rules against a backend."""
+
+    def __init__(self, backend: RateLimitBackendProtocol, rules: List[RateLimitRule]):
+        self.backend = backend
+        self.rules = rules
+
+    async def check(self, method: str, path: str, client: str) -> Tuple[Optional[RateLimitResult], Optional[RateLimitRule]]:
+        """
+        Consume one token from every matching rule.
+
+        A rejected request keeps none of the tokens it took from earlier rules.
+
+        Returns:
+            Tuple[Optional[RateLimitResult], Optional[RateLimitRule]]: The most
+            restrictive result and its rule, or (None, None) if no rule applies
+        """
+        worst: Optional[RateLimitResult] = None
+        worst_rule: Optional[RateLimitRule] = None
+        debited: List[Tuple[str, RateLimitRule]] = []
+        for rule in self.rules:
+            key = rule.key_for(method, path, client)
+            if key is None:
+                continue
+            result = await self.backend.consume(key, rule.capacity, rule.refill_rate)
+            if not result.allowed:
+                for debited_key, debited_rule in debited:
+                    await self.backend.refund(debited_key, debited_rule.capacity, debited_rule.refill_rate)
+                return result, rule
+            debited.append((key, rule))
+            if worst is None or result.remaining < worst.remaining:
+                worst, worst_rule = result, rule
+        return worst, worst_rule
+
+
+def create_rate_limit_backend() -> RateLimitBackendProtocol:
+    """
+    Create the rate limit backend configured in settings.
+
+    Returns:
+        RateLimitBackendProtocol: "mongodb" for shared buckets, in-memory otherwise
+    """
+    if settings.rate_limit_backend == "mongodb":
+        return MongoRateLimitBackend()
+    return InMemoryRateLimitBackend(
+        shards=settings.rate_limit_shards,
+        sweep_interval=settings.rate_limit_sweep_interval
+    )
+
+
+# Global rate limiter instance
+rate_limiter = RateLimiter(create_rate_limit_backend(), default_rules())
+
+
+def format_reset(seconds: float) -> str:
+    """Format a delay as whole seconds for rate limit headers."""
+    return str(max(0, math.ceil(seconds)))
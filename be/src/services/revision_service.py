@@ -0,0 +1,317 @@
+"""
+Revision service for tracking document history as delta chains.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import List, NamedTuple, Optional
+from datetime import datetime, UTC
+from ..models.revision import RevisionListResponse, RevisionResponse, RevisionSummary
+from ..protocols.revision_protocol import RevisionData, RevisionRepositoryProtocol
+from ..repositories.revision_repository import get_revision_repository
+from ..settings import settings
+from ..utils.delta import apply_delta, compute_delta, delta_size
+from ..utils.lru_cache import LRUCache
+from .executor import PROCESS, executor
+
+logger = logging.getLogger(__name__)
+
+# Serializes revision numbering per document within this worker
+_record_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+class LatestRevision(NamedTuple):
+    """Content of the newest revision of a document, as recorded by this worker."""
+    number: int
+    snapshot_number: int
+    content: str
+
+
+# Latest revisions recorded here, so an autosave does not rebuild its predecessor
+latest_revisions: LRUCache[LatestRevision] = LRUCache(
+    settings.revision_cache_size,
+    max_weight=settings.revision_cache_max_bytes,
+    weigher=lambda latest: len(latest.content)
+)
+
+
+def reconstruct(chain: List[RevisionData]) -> str:
+    """
+    Rebuild the content of the last revision in a chain.
+
+    Args:
+        chain: Revisions starting with a snapshot, in ascending order
+
+    Returns:
+        str: Content of the last revision in the chain
+    """
+    content = chain[0].content or ""
+    for revision in chain[1:]:
+        if revision.is_snapshot:
+            content = revision.content or ""
+        else:
+            content = apply_delta(content, revision.delta or [])
+    return content
+
+
+class RevisionService:
+    """Service for recording and reconstructing document revisions."""
+
+    def __init__(
+        self,
+        revision_repository: RevisionRepositoryProtocol,
+        snapshot_interval: int = settings.revision_snapshot_interval,
+        retention_count: int = settings.revision_retention_count
+    ):
+        """
+        Initialize the revision service with its dependencies.
+
+        Args:
+            revision_repository: Repository for revision persistence
+            snapshot_interval: Maximum chain length before a full snapshot is stored
+            retention_count: Number of most recent revisions kept by compaction
+        """
+        self.revision_repository = revision_repository
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.retention_count = max(1, retention_count)
+
+    async def record(self, share_id: str, content: str, created_at: Optional[datetime] = None) -> Optional[RevisionData]:
+        """
+        Record a new revision of a document.
+
+        Stores a forward delta against the previous revision, or a full
+        snapshot when the current chain reached `snapshot_interval` or the
+        delta would not be smaller than the content itself. The previous
+        content comes from `latest_revisions` while it is still the newest
+        stored revision, and is only rebuilt from its chain otherwise.
+
+        Returns:
+            Optional[RevisionData]: Stored revision, None if content is unchanged
+        """
+        lock = _record_locks.get(share_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            _record_locks[share_id] = lock
+
+        async with lock:
+            try:
+                latest = await self.revision_repository.list_summaries(share_id, 1)
+                created_at = created_at or datetime.now(UTC)
+
+                if not latest:
+                    revision = self._snapshot(share_id, 1, content, created_at)
+                    snapshot_number = 1
+                else:
+                    cached = latest_revisions.get(share_id)
+                    if cached is None or cached.number != latest[0].number:
+                        # Recorded by another worker, or evicted
+                        chain = await self.revision_repository.latest_chain(share_id)
+                        cached = LatestRevision(chain[-1].number, chain[0].number, reconstruct(chain))
+                    previous = cached.content
+                    if previous == content:
+                        return None
+
+                    number = cached.number + 1
+                    snapshot_number = cached.snapshot_number
+                    if number - snapshot_number >= self.snapshot_interval:
+                        revision = self._snapshot(share_id, number, content, created_at)
+                    else:
+                        if len(previous) + len(content) < settings.revision_offload_threshold:
+                            delta = compute_delta(previous, content)
+                        else:
+                            delta = await executor.run(PROCESS, compute_delta, previous, content)
+                        if delta_size(delta) >= len(content):
+                            revision = self._snapshot(share_id, number, content, created_at)
+                        else:
+                            revision = RevisionData(
+                                share_id=share_id,
+                                number=number,
+                                is_snapshot=False,
+                                size=len(content),
+                                created_at=created_at,
+                                delta=delta
+                            )
+
+                try:
+                    await self.revision_repository.add(revision)
+                except Exception:
+                    latest_revisions.pop(share_id)
+                    raise
+
+                if revision.is_snapshot:
+                    snapshot_number = revision.number
+                latest_revisions.set(share_id, LatestRevision(revision.number, snapshot_number, content))
+                return revision
+
+            except Exception as e:
+                logger.error("Error recording revision: %s", e)
+                raise RuntimeError(f"Failed to record revision: {e}")
+
+    async def list_revisions(self, share_id: str, limit: int = 100) -> RevisionListResponse:
+        """List the revisions of a document, newest first."""
+        try:
+            revisions = await self.revision_repository.list_summaries(share_id, limit)
+
+            return RevisionListResponse(
+                share_id=share_id,
+                revisions=[
+                    RevisionSummary(
+                        number=revision.number,
+                        is_snapshot=revision.is_snapshot,
+                        size=revision.size,
+                        created_at=revision.created_at
+                    )
+                    for revision in revisions
+                ]
+            )
+
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Error listing revisions: %s", e)
+            raise RuntimeError(f"Failed to list revisions: {e}")
+
+    async def get_revision(self, share_id: str, number: int) -> Optional[RevisionResponse]:
+        """Reconstruct a single revision of a document."""
+        try:
+            chain = await self.revision_repository.chain_for(share_id, number)
+
+            if not chain:
+                return None
+
+            return RevisionResponse(
+                share_id=share_id,
+                number=number,
+                content=reconstruct(chain),
+                created_at=chain[-1].created_at
+            )
+
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Error retrieving revision: %s", e)
+            raise RuntimeError(f"Failed to retrieve revision: {e}")
+
+    async def compact(self, share_id: str) -> int:
+        """
+        Drop revisions beyond the retention count.
+
+        The oldest retained revision is rewritten as a snapshot before
+        older revisions are deleted, so every retained revision stays
+        reconstructable even if compaction is interrupted.
+
+        Returns:
+            int: Number of deleted revisions
+        """
+        try:
+            chain = await self.revision_repository.latest_chain(share_id)
+            if not chain:
+                return 0
+
+            first_kept = chain[-1].number - self.retention_count + 1
+            if first_kept <= 1 or await self.revision_repository.count(share_id) <= self.retention_count:
+                return 0
+
+            kept_chain = await self.revision_repository.chain_for(share_id, first_kept)
+            if kept_chain and not kept_chain[-1].is_snapshot:
+                await self.revision_repository.replace(
+                    self._snapshot(share_id, first_kept, reconstruct(kept_chain), kept_chain[-1].created_at)
+                )
+
+            deleted = await self.revision_repository.delete_before(share_id, first_kept)
+            logger.debug("Compacted %s revisions of %s", deleted, share_id)
+            return deleted
+
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Error compacting revisions: %s", e)
+            raise RuntimeError(f"Failed to compact revisions: {e}")
+
+    @staticmethod
+    def _snapshot(share_id: str, number: int, content: str, created_at: datetime) -> RevisionData:
+        return RevisionData(
+            share_id=share_id,
+            number=number,
+            is_snapshot=True,
+            size=len(content),
+            created_at=created_at,
+            content=content
+        )
+
+
+class RevisionCompactor:
+    """
+    Background task that applies the revision retention policy.
+
+    Candidates are read from the stored revisions on every run, so documents
+    written before a restart, or by another worker, are compacted as well.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.revision_compaction_interval,
+        batch_size: int = settings.revision_compaction_batch_size
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self, revision_service: Optional[RevisionService] = None) -> int:
+        """
+        Compact documents that store more than the retention count of revisions.
+
+        Returns:
+            int: Total number of deleted revisions
+        """
+        service = revision_service or get_revision_service()
+        candidates = await service.revision_repository.find_compactable(service.retention_count, self.batch_size)
+        deleted = 0
+        for share_id in candidates:
+            try:
+                deleted += await service.compact(share_id)
+            except RuntimeError as e:
+                logger.warning("Revision compaction failed for %s: %s", share_id, e)
+        return deleted
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error("Revision compaction run failed: %s", e)
+
+    def start(self) -> None:
+        """Start the background compaction loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background compaction loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global revision compactor instance
+revision_compactor = RevisionCompactor()
+
+
+def get_revision_service() -> Optional[RevisionService]:
+    """
+    Get a RevisionService instance with injected dependencies.
+
+    Revisions are stored in MongoDB, so they are off with the log backend.
+
+    Returns:
+        Optional[RevisionService]: Configured revision service instance, None with the log backend
+    """
+    if settings.storage_backend != "mongodb":
+        return None
+    return RevisionService(revision_repository=get_revision_repository())
@@ -0,0 +1,183 @@
+"""
+Hash sharding of documents across MongoDB databases.
+
+Shards are configured in `mongodb_shards` as comma-separated entries
+`[name=]target`. A target is either a database name on `mongodb_url` or a
+MongoDB URL with the database in its path. Without a name, the database name
+is used. The name is what documents are hashed against, so it must stay the
+same when a shard's URL changes.
+
+Each document belongs to the shard with the highest rendezvous score for its
+share_id. When a shard is added, it takes over only the documents it now
+scores highest for, about 1/N of each existing shard. The ranking of the
+other shards is unchanged, so the previous owner of a document is the
+next-ranked shard, and reads can fall back to it until the document has been
+moved (see src/tools/rebalance_shards.py).
+"""
+
+import asyncio
+import hashlib
+import logging
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import pymongo
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from pymongo.uri_parser import parse_uri
+from .mongo_monitoring import PoolMonitor, command_monitor
+
+logger = logging.getLogger(__name__)
+
+DOCUMENTS_COLLECTION = "documents"
+
+
+class ShardConfig(NamedTuple):
+    """Name, URL and database of one shard."""
+    name: str
+    url: str
+    database: str
+
+
+def parse_shards(spec: str, default_url: str, default_database: str) -> List[ShardConfig]:
+    """
+    Parse a shard list such as "a=editer_a,b=mongodb://db-b:27017/editer".
+
+    Raises:
+        ValueError: If an entry is empty or names are not unique
+    """
+    shards = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, separator, target = entry.partition("=")
+        if not separator or "://" in name:
+            name, target = "", entry
+        if "://" in target:
+            url = target
+            database = parse_uri(url)["database"] or default_database
+        else:
+            url, database = default_url, target
+        if not database:
+            raise ValueError(f"Invalid shard '{entry}'")
+        shards.append(ShardConfig(name.strip() or database, url, database))
+
+    names = [shard.name for shard in shards]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Shard names must be unique, got {names}; name shards as name=target")
+    return shards
+
+
+def shard_score(name: str, share_id: str) -> int:
+    """Rendezvous score of a shard for a share_id, stable across processes and versions."""
+    digest = hashlib.blake2b(f"{name}\x00{share_id}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def rank_shards(share_id: str, names: Sequence[str]) -> List[str]:
+    """Order shard names from owner to least preferred for a share_id."""
+    return sorted(names, key=lambda name: shard_score(name, share_id), reverse=True)
+
+
+class Shard:
+    """One shard with its own client, connection pool and health state."""
+
+    def __init__(self, config: ShardConfig):
+        self.config = config
+        self.name = config.name
+        self.client: Optional[AsyncIOMotorClient] = None
+        self.collection: Optional[AsyncIOMotorCollection] = None
+        self.pool = PoolMonitor()
+        self.healthy = False
+
+    def stats(self) -> Dict[str, object]:
+        """Get health and pool statistics of the shard."""
+        return {"database": self.config.database, "healthy": self.healthy, "pool": self.pool.stats()}
+
+
+class ShardSet:
+    """Routes documents to shards by share_id."""
+
+    def __init__(self, configs: Sequence[ShardConfig]):
+        """
+        Initialize the shards; clients are created by connect().
+
+        Raises:
+            ValueError: If no shards are configured
+        """
+        if not configs:
+            raise ValueError("At least one shard is required")
+        self.shards: Dict[str, Shard] = {config.name: Shard(config) for config in configs}
+
+    def rank(self, share_id: str) -> List[Shard]:
+        """Get all shards from the owner of share_id to the least preferred."""
+        return [self.shards[name] for name in rank_shards(share_id, list(self.shards))]
+
+    def owner(self, share_id: str) -> Shard:
+        """Get the shard that share_id belongs to."""
+        return max(self.shards.values(), key=lambda shard: shard_score(shard.name, share_id))
+
+    async def connect(self, options: Dict[str, object]) -> None:
+        """
+        Connect every shard and ensure the share_id index of its collection.
+
+        Args:
+            options: Motor client options; the pool listener is replaced per shard
+        """
+        for shard in self.shards.values():
+            listeners = [shard.pool, command_monitor]
+            shard.client = AsyncIOMotorClient(shard.config.url, **{**options, "event_listeners": listeners})
+            shard.collection = shard.client[shard.config.database][DOCUMENTS_COLLECTION]
+
+        async def prepare(shard: Shard) -> None:
+            await shard.client.admin.command("ping")
+            await shard.collection.create_index("share_id", unique=True)
+            shard.healthy = True
+
+        await asyncio.gather(*(prepare(shard) for shard in self.shards.values()))
+        logger.info("Connected %s document shards: %s", len(self.shards), ', '.join(self.shards))
+
+    async def disconnect(self) -> None:
+        """Close the clients of all shards."""
+        for shard in self.shards.values():
+            if shard.client is not None:
+                shard.client.close()
+            shard.healthy = False
+
+    async def health_check(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ping all shards concurrently and record the health of each.
+
+        Returns:
+            bool: True if every shard answered
+        """
+        async def ping(shard: Shard) -> None:
+            try:
+                if timeout is None:
+                    await shard.client.admin.command("ping")
+                else:
+                    with pymongo.timeout(timeout):
+                        await shard.client.admin.command("ping")
+                healthy = True
+            except Exception as e:
+                logger.error("Health check of shard %s failed: %s", shard.name, e)
+                healthy = False
+            if healthy != shard.healthy:
+                logger.warning(
+                    "Shard %s health changed: %s",
+                    shard.name,
+                    "healthy" if healthy else "unhealthy",
+                    extra={"shard": shard.name, "healthy": healthy},
+                )
+            shard.healthy = healthy
+
+        await asyncio.gather(*(ping(shard) for shard in self.shards.values()))
+        return all(shard.healthy for shard in self.shards.values())
+
+    def stats(self) -> Dict[str, Dict[str, object]]:
+        """Get health and pool statistics per shard."""
+        return {name: shard.stats() for name, shard in self.shards.items()}
+
+
+def create_shard_set(spec: str, default_url: str, default_database: str) -> Optional[ShardSet]:
+    """Create the shards of a configured shard list, None if it is empty."""
+    configs = parse_shards(spec, default_url, default_database)
+    return ShardSet(configs) if configs else None
@@ -0,0 +1,100 @@
+"""
+Snapshot service for publishing immutable, content-addressed document copies.
+"""
+
+import logging
+from typing import Optional
+from ..models.snapshot import SnapshotPublishResponse, SnapshotResponse
+from ..protocols.repository_protocol import DocumentRepositoryProtocol
+from ..protocols.snapshot_protocol import SnapshotRepositoryProtocol
+from ..repositories.document_repository import get_document_repository
+from ..repositories.snapshot_repository import get_snapshot_repository
+from ..settings import settings
+from ..utils.hashing import content_hash
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_URL_PREFIX = "/api/v1/snapshots"
+
+
+class SnapshotService:
+    """Service for snapshot operations with dependency injection."""
+
+    def __init__(
+        self,
+        document_repository: DocumentRepositoryProtocol,
+        snapshot_repository: SnapshotRepositoryProtocol
+    ):
+        """
+        Initialize the snapshot service with its dependencies.
+
+        Args:
+            document_repository: Repository for document persistence
+            snapshot_repository: Repository for snapshot persistence
+        """
+        self.document_repository = document_repository
+        self.snapshot_repository = snapshot_repository
+
+    async def publish(self, share_id: str) -> Optional[SnapshotPublishResponse]:
+        """Freeze the current content of a document under its content hash."""
+        try:
+            doc_data = await self.document_repository.find_by_share_id(share_id)
+
+            if not doc_data:
+                return None
+
+            snapshot = await self.snapshot_repository.save(
+                content_hash=content_hash(doc_data.content),
+                share_id=share_id,
+                content=doc_data.content
+            )
+
+            return SnapshotPublishResponse(
+                share_id=share_id,
+                content_hash=snapshot.content_hash,
+                url=f"{SNAPSHOT_URL_PREFIX}/{snapshot.content_hash}",
+                created_at=snapshot.created_at
+            )
+
+        except (TimeoutError, ConnectionError):
+            raise
+        except Exception as e:
+            logger.error("Error publishing snapshot: %s", e)
+            raise RuntimeError(f"Failed to publish snapshot: {e}")
+
+    async def get_snapshot(self, snapshot_hash: str) -> Optional[SnapshotResponse]:
+        """Get a published snapshot by content hash."""
+        try:
+            snapshot = await self.snapshot_repository.find_by_hash(snapshot_hash)
+
+            if not snapshot:
+                return None
+
+            return SnapshotResponse(
+                content_hash=snapshot.content_hash,
+                content=snapshot.content,
+                created_at=snapshot.created_at
+            )
+
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.error("Error retrieving snapshot: %s", e)
+            raise RuntimeError(f"Failed to retrieve snapshot: {e}")
+
+
+def get_snapshot_service() -> Optional[SnapshotService]:
+    """
+    Get a SnapshotService instance with injected dependencies.
+
+    Snapshots are stored in MongoDB, so they are off with the log backend.
+
+    Returns:
+        Optional[SnapshotService]: Configured snapshot service instance, None with the log backend
+    """
+    if settings.storage_backend != "mongodb":
+        return None
+    return SnapshotService(
+        document_repository=get_document_repository(),
+        snapshot_repository=get_snapshot_repository()
+    )
@@ -0,0 +1,135 @@
+"""
+Sync service for rsync-style delta transfer of document content.
+"""
+
+import base64
+import logging
+from typing import Optional
+from ..models.sync import SyncInstruction, SyncRequest, SyncResponse
+from ..protocols.repository_protocol import DocumentRepositoryProtocol
+from ..repositories.document_repository import get_document_repository
+from ..settings import settings
+from ..utils.hashing import content_hash
+from ..utils.lru_cache import LRUCache
+from ..utils.rsync import SignatureIndex, match_blocks
+from .admission_controller import Overloaded
+from .executor import THREAD, executor
+
+logger = logging.getLogger(__name__)
+
+def _index_weight(index: SignatureIndex) -> int:
+    return len(index.data) + index.rolling.itemsize * len(index.rolling)
+
+
+# Rolling signatures keyed by (content hash, block size), shared across requests
+signature_cache: LRUCache[SignatureIndex] = LRUCache(
+    settings.sync_signature_cache_size,
+    max_weight=settings.sync_signature_cache_max_bytes,
+    weigher=_index_weight
+)
+
+
+class SyncService:
+    """Service for computing delta sync instructions."""
+
+    def __init__(
+        self,
+        document_repository: DocumentRepositoryProtocol,
+        cache: LRUCache = signature_cache
+    ):
+        """
+        Initialize the sync service with its dependencies.
+
+        Args:
+            document_repository: Repository for document persistence
+            cache: Cache of signature indexes of current document versions
+        """
+        self.document_repository = document_repository
+        self.cache = cache
+
+    @staticmethod
+    def _validate(request: SyncRequest) -> None:
+        if not settings.sync_min_block_size <= request.block_size <= settings.sync_max_block_size:
+            raise ValueError(
+                f"block_size must be between {settings.sync_min_block_size} "
+                f"and {settings.sync_max_block_size}"
+            )
+        expected_blocks = -(-request.length // request.block_size)
+        if len(request.blocks) != expected_blocks:
+            raise ValueError(f"Expected {expected_blocks} block signatures for length {request.length}")
+
+    @staticmethod
+    def _match(index: Optional[SignatureIndex], data: bytes, request: SyncRequest):
+        if index is None:
+            index = SignatureIndex(data, request.block_size)
+        instructions = match_blocks(
+            index,
+            [(block.weak, block.strong) for block in request.blocks],
+            request.length
+        )
+        return index, instructions
+
+    async def sync(self, share_id: str, request: SyncRequest) -> Optional[SyncResponse]:
+        """
+        Compute the instructions that turn the client's copy into the current content.
+
+        Returns:
+            Optional[SyncResponse]: Sync instructions, None if the document does not exist
+
+        Raises:
+            ValueError: If the block signatures are inconsistent
+        """
+        self._validate(request)
+        try:
+            doc_data = await self.document_repository.find_by_share_id(share_id)
+
+            if not doc_data:
+                return None
+
+            data = doc_data.content.encode("utf-8")
+            digest = content_hash(doc_data.content)
+            key = (digest, request.block_size)
+
+            index = self.cache.get(key)
+            if len(data) < settings.sync_offload_threshold:
+                index, matched = self._match(index, data, request)
+            else:
+                # A thread, not a process: cached indexes are too large to pickle per request
+                index, matched = await executor.run(THREAD, self._match, index, data, request)
+            self.cache.set(key, index)
+
+            instructions = []
+            literal_bytes = 0
+            for op, value, count in matched:
+                if op == "copy":
+                    instructions.append(SyncInstruction(op="copy", start=value, count=count))
+                else:
+                    literal_bytes += len(value)
+                    instructions.append(SyncInstruction(op="literal", data=base64.b64encode(value).decode("ascii")))
+
+            logger.debug("Sync of %s: %s of %s bytes sent as literals", share_id, literal_bytes, len(data))
+            return SyncResponse(
+                share_id=doc_data.share_id,
+                updated_at=doc_data.updated_at,
+                length=len(data),
+                sha256=digest,
+                block_size=request.block_size,
+                literal_bytes=literal_bytes,
+                instructions=instructions
+            )
+
+        except (TimeoutError, ConnectionError, Overloaded):
+            raise
+        except Exception as e:
+            logger.error("Error syncing document: %s", e)
+            raise RuntimeError(f"Failed to sync document: {e}")
+
+
+def get_sync_service() -> SyncService:
+    """
+    Get a SyncService instance with injected dependencies.
+
+    Returns:
+        SyncService: Configured sync service instance
+    """
+    return SyncService(document_repository=get_document_repository())
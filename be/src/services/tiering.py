@@ -0,0 +1,309 @@
+"""
+Hot/cold tiering of idle documents.
+
+A background job moves documents that have not been accessed for
+`tiering_idle_days` from the documents collection (the hot tier) to
+`documents_archive` in the same database (the cold tier). Each archived
+document is stored as one zlib-compressed BSON blob. A document counts as
+accessed at its `last_accessed_at`, or its `updated_at` if it has never been
+tracked.
+
+The job scans documents in _id order, a batch at a time, and paces moves to
+`tiering_rate` per second. After each batch it stores how far it got in
+`tiering_state`, so a restart continues from there. Every worker runs the
+job, so a pass over a collection first takes a lease in `tiering_state`
+that expires after `tiering_lease_seconds`. It is renewed after each batch
+and released at the end; workers without it skip the pass. A document is
+removed from the hot tier only if it is unchanged since it was read, so
+concurrent edits and reads keep it hot.
+
+Repositories look documents up in the hot tier first. On a miss they call
+rehydrate(), which moves the document back and marks it as just accessed.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, List, Optional, Tuple
+import bson
+from bson import Binary
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from ..models.document import Document
+from ..settings import settings
+from .database import db_manager
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_COLLECTION = "documents_archive"
+STATE_COLLECTION = "tiering_state"
+
+tiering_documents_total = registry.counter(
+    "tiering_documents_total", "Documents moved between the hot and cold tier by outcome.", ("outcome",)
+)
+
+
+def pack_document(document: Dict[str, Any], level: int = 6) -> Dict[str, Any]:
+    """Build the archive record of a hot document."""
+    data = zlib.compress(bson.encode(document), level)
+    return {
+        "_id": document["_id"],
+        "share_id": document["share_id"],
+        "data": Binary(data),
+        "archived_at": datetime.now(UTC),
+        "size": len(document.get("content", "")),
+        "compressed_size": len(data)
+    }
+
+
+def unpack_document(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Restore the hot document from its archive record."""
+    return bson.decode(zlib.decompress(record["data"]))
+
+
+def archive_of(collection: AsyncIOMotorCollection) -> AsyncIOMotorCollection:
+    """Get the archive collection next to a documents collection."""
+    return collection.database[ARCHIVE_COLLECTION]
+
+
+async def rehydrate(collection: AsyncIOMotorCollection, share_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Move an archived document back into `collection`.
+
+    Returns:
+        Optional[Dict[str, Any]]: The hot document, None if it is not archived
+    """
+    archive = archive_of(collection)
+    record = await archive.find_one({"share_id": share_id})
+    if record is None:
+        return None
+    document = unpack_document(record)
+    document["last_accessed_at"] = datetime.now(UTC)
+    try:
+        await collection.insert_one(document)
+        tiering_documents_total.inc("rehydrated")
+    except DuplicateKeyError:
+        # Rehydrated concurrently, or an archive copy left by an interrupted move
+        document = await collection.find_one({"share_id": share_id})
+    await archive.delete_one({"_id": record["_id"]})
+    return document
+
+
+def idle_query(cutoff: datetime) -> Dict[str, Any]:
+    """Query for documents last accessed, or else last updated, before `cutoff`."""
+    return {
+        "$or": [
+            {"last_accessed_at": {"$lt": cutoff}},
+            {"last_accessed_at": None, "updated_at": {"$lt": cutoff}}
+        ]
+    }
+
+
+class TieringJob:
+    """Background task that archives idle documents."""
+
+    def __init__(
+        self,
+        idle_seconds: float,
+        interval: float,
+        batch_size: int,
+        rate: float,
+        compression_level: int,
+        lease_seconds: float = 300.0,
+        owner: Optional[str] = None,
+        sleep=asyncio.sleep
+    ):
+        """
+        Initialize the job.
+
+        Args:
+            idle_seconds: Seconds without access after which a document is archived
+            interval: Seconds between runs
+            batch_size: Documents read per query and per checkpoint
+            rate: Maximum documents archived per second, 0 for no limit
+            compression_level: zlib level of archived documents
+            lease_seconds: Time a pass may hold a collection without renewing its lease
+            owner: Lease holder name, unique per job by default
+            sleep: Sleep function, replaceable in tests
+        """
+        self.idle_seconds = idle_seconds
+        self.interval = interval
+        self.batch_size = batch_size
+        self.rate = rate
+        self.compression_level = compression_level
+        self.lease_seconds = lease_seconds
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.sleep = sleep
+        self._prepared: set = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def collections(self) -> List[Tuple[str, AsyncIOMotorCollection]]:
+        """Get the hot collections to tier: one per shard, or the primary one."""
+        if db_manager.shards is not None:
+            return [(shard.name, shard.collection) for shard in db_manager.shards.shards.values()]
+        return [("primary", Document.get_motor_collection())]
+
+    async def _prepare(self, name: str, collection: AsyncIOMotorCollection) -> None:
+        if name not in self._prepared:
+            await archive_of(collection).create_index("share_id", unique=True)
+            self._prepared.add(name)
+
+    async def acquire_lease(self, collection: AsyncIOMotorCollection) -> bool:
+        """
+        Take or renew the lease on tiering a collection.
+
+        Returns:
+            bool: True if this job holds the lease until `lease_seconds` from now
+        """
+        state = collection.database[STATE_COLLECTION]
+        now = datetime.now(UTC)
+        try:
+            await state.find_one_and_update(
+                {"_id": f"lease:{collection.name}", "$or": [{"owner": self.owner}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"owner": self.owner, "expires_at": now + timedelta(seconds=self.lease_seconds)}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            return True
+        except DuplicateKeyError:
+            # The lease exists, held by another job
+            return False
+
+    async def release_lease(self, collection: AsyncIOMotorCollection) -> None:
+        """Give up the lease on a collection, if this job holds it."""
+        state = collection.database[STATE_COLLECTION]
+        try:
+            await state.delete_one({"_id": f"lease:{collection.name}", "owner": self.owner})
+        except Exception as e:
+            logger.warning("Tiering lease of %s not released, it expires instead: %s", collection.name, e)
+
+    async def archive(self, collection: AsyncIOMotorCollection, document: Dict[str, Any]) -> bool:
+        """
+        Move one document to the archive unless it changed since it was read.
+
+        Returns:
+            bool: True if the document was archived
+        """
+        archive = archive_of(collection)
+        await archive.replace_one(
+            {"_id": document["_id"]}, pack_document(document, self.compression_level), upsert=True
+        )
+        result = await collection.delete_one({
+            "_id": document["_id"],
+            "updated_at": document["updated_at"],
+            "last_accessed_at": document.get("last_accessed_at")
+        })
+        if result.deleted_count:
+            return True
+        await archive.delete_one({"_id": document["_id"]})
+        return False
+
+    async def run_collection(self, name: str, collection: AsyncIOMotorCollection) -> Dict[str, int]:
+        """
+        Archive the idle documents of one collection, resuming from its checkpoint.
+
+        Nothing is done while another job holds the collection's lease.
+
+        Returns:
+            Dict[str, int]: Counts of archived and skipped documents
+        """
+        counts = {"archived": 0, "skipped": 0}
+        if not await self.acquire_lease(collection):
+            logger.debug("Tiering of %s skipped, another worker holds the lease", name)
+            return counts
+        try:
+            await self._archive_idle(name, collection, counts)
+        finally:
+            await self.release_lease(collection)
+
+        if counts["archived"] or counts["skipped"]:
+            logger.info("Tiering of %s: %s", name, counts, extra={"collection": name, **counts})
+        return counts
+
+    async def _archive_idle(self, name: str, collection: AsyncIOMotorCollection, counts: Dict[str, int]) -> None:
+        await self._prepare(name, collection)
+        state = collection.database[STATE_COLLECTION]
+        checkpoint = await state.find_one({"_id": collection.name})
+        last_id = checkpoint["last_id"] if checkpoint else None
+        cutoff = datetime.now(UTC) - timedelta(seconds=self.idle_seconds)
+        started = time.monotonic()
+
+        while True:
+            query = idle_query(cutoff)
+            if last_id is not None:
+                query["_id"] = {"$gt": last_id}
+            batch = await collection.find(query, sort=[("_id", 1)], limit=self.batch_size).to_list(None)
+            for document in batch:
+                if self.rate:
+                    delay = started + (counts["archived"] + counts["skipped"]) / self.rate - time.monotonic()
+                    if delay > 0:
+                        await self.sleep(delay)
+                outcome = "archived" if await self.archive(collection, document) else "skipped"
+                counts[outcome] += 1
+                tiering_documents_total.inc(outcome)
+                last_id = document["_id"]
+
+            if len(batch) < self.batch_size:
+                # Pass complete; the next run starts from the beginning
+                await state.delete_one({"_id": collection.name})
+                break
+            if not await self.acquire_lease(collection):
+                # Expired while this pass stalled; the new holder resumes from the last checkpoint
+                logger.warning("Tiering of %s stopped, its lease was taken over", name)
+                break
+            await state.update_one({"_id": collection.name}, {"$set": {"last_id": last_id}}, upsert=True)
+
+    async def run_once(self) -> Dict[str, int]:
+        """
+        Archive idle documents of all hot collections.
+
+        Returns:
+            Dict[str, int]: Counts of archived and skipped documents
+        """
+        totals = {"archived": 0, "skipped": 0}
+        for name, collection in self.collections():
+            counts = await self.run_collection(name, collection)
+            for key, value in counts.items():
+                totals[key] += value
+        return totals
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error("Tiering run failed: %s", e)
+
+    def start(self) -> None:
+        """Start the background tiering loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background tiering loop; an interrupted run resumes from its checkpoint."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global tiering job instance
+tiering_job = TieringJob(
+    idle_seconds=settings.tiering_idle_days * 24 * 60 * 60,
+    interval=settings.tiering_interval,
+    batch_size=settings.tiering_batch_size,
+    rate=settings.tiering_rate,
+    compression_level=settings.tiering_compression_level,
+    lease_seconds=settings.tiering_lease_seconds
+)
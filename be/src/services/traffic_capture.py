@@ -0,0 +1,182 @@
+"""
+Opt-in recording of request traffic for replay in load tests.
+
+A trace is a JSON-lines file, gzip-compressed when its name ends in .gz.
+The first line is a header ({"version", "started_at", "content"}) and every
+further line describes one request with short keys:
+
+    t  start, seconds since capture start   m  method
+    r  route template                       s  share_id, if any
+    q  request body bytes                   p  response body bytes
+    c  status code                          d  duration in milliseconds
+    b  request body text, only with content capture enabled
+
+Records are handed to a writer thread through a bounded queue, so the
+event loop never waits for the file; records that do not fit are dropped
+and counted, and capture stops if the file cannot be written. They are written as requests finish, so
+read_trace puts them back in the order they started. Every process writes
+its own trace, named with its pid (traffic.jsonl.gz becomes
+traffic.<pid>.jsonl.gz), so uvicorn workers never share a file.
+"""
+
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, UTC
+from typing import Dict, Iterator, List, Optional, Tuple
+from ..settings import settings
+from .metrics import registry
+
+logger = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+_STOP = object()
+
+traffic_capture_dropped_total = registry.counter(
+    "traffic_capture_dropped_total", "Request records not captured because the writer fell behind or failed."
+)
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def worker_path(path: str, pid: int) -> str:
+    """Insert the process id before the extensions of a trace path."""
+    directory, name = os.path.split(path)
+    stem, dot, extensions = name.partition(".")
+    return os.path.join(directory, f"{stem}.{pid}{dot}{extensions}")
+
+
+class TrafficRecorder:
+    """Writes request records to a trace file from a background thread."""
+
+    def __init__(self, path: str, include_content: bool = False, max_queued: int = 10000):
+        """
+        Initialize the recorder.
+
+        Args:
+            path: Trace file, appended to; .gz for gzip compression. The
+                pid of the process that starts the recorder is added to the name
+            include_content: Also record request bodies, which contain document content
+            max_queued: Records waiting for the writer beyond which new ones are dropped
+        """
+        self.base_path = path
+        self.path = path
+        self.include_content = include_content
+        self.recorded = 0
+        self.dropped = 0
+        self._started_at = time.perf_counter()
+        self._started_wall = datetime.now(UTC)
+        self._queue: queue.Queue = queue.Queue(max_queued)
+        self._thread: Optional[threading.Thread] = None
+        self._failed = False
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and not self._failed
+
+    def record(self, entry: Dict[str, object], started: float) -> None:
+        """Queue one request record; `started` is the request's time.perf_counter() start."""
+        entry["t"] = round(max(0.0, started - self._started_at), 6)
+        try:
+            if self._failed:
+                raise queue.Full
+            self._queue.put_nowait(entry)
+            self.recorded += 1
+        except queue.Full:
+            self.dropped += 1
+            traffic_capture_dropped_total.inc()
+
+    def _write(self) -> None:
+        try:
+            with _open(self.path, "a") as f:
+                f.write(json.dumps({
+                    "version": TRACE_VERSION,
+                    "started_at": self._started_wall.isoformat(),
+                    "content": self.include_content
+                }) + "\n")
+                while True:
+                    entry = self._queue.get()
+                    if entry is _STOP:
+                        break
+                    f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        except OSError as e:
+            self._failed = True
+            logger.error("Traffic capture to %s failed, capture stopped: %s", self.path, e)
+
+    def start(self) -> None:
+        """Open the trace and start the writer thread."""
+        if self._thread is not None:
+            return
+        # Resolved here rather than at import, as workers may be forked after the import
+        self.path = worker_path(self.base_path, os.getpid())
+        self._started_at = time.perf_counter()
+        self._started_wall = datetime.now(UTC)
+        self._queue = queue.Queue(self._queue.maxsize)
+        self._failed = False
+        self._thread = threading.Thread(target=self._write, name="traffic-capture", daemon=True)
+        self._thread.start()
+        logger.warning(
+            "Capturing traffic to %s%s", self.path, " including document content" if self.include_content else ""
+        )
+
+    def stop(self) -> None:
+        """Write the remaining records and close the trace."""
+        if self._thread is None:
+            return
+        while self._thread.is_alive():
+            # A writer that failed no longer drains the queue
+            try:
+                self._queue.put(_STOP, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self._thread.join()
+        self._thread = None
+
+
+def read_trace(path: str) -> Tuple[Dict[str, object], Iterator[Dict[str, object]]]:
+    """
+    Read a trace file.
+
+    Returns:
+        Tuple[Dict[str, object], Iterator[Dict[str, object]]]: Header of the
+        first capture in the file and all request records by start time
+    """
+    with _open(path, "r") as f:
+        header = json.loads(f.readline())
+
+    def records() -> Iterator[Dict[str, object]]:
+        # Records of one capture are held in memory to sort them by start time
+        capture: List[Dict[str, object]] = []
+        offset = 0.0
+        with _open(path, "r") as f:
+            for line in f:
+                entry = json.loads(line)
+                if "version" in entry:
+                    # Later captures appended to the same file continue after the previous one
+                    if capture:
+                        capture.sort(key=lambda record: record["t"])
+                        offset = capture[-1]["t"]
+                        yield from capture
+                        capture = []
+                    continue
+                entry["t"] += offset
+                capture.append(entry)
+        capture.sort(key=lambda record: record["t"])
+        yield from capture
+
+    return header, records()
+
+
+# Global recorder, started in the lifespan when capture is enabled
+traffic_recorder = TrafficRecorder(
+    settings.traffic_capture_path, settings.traffic_capture_content, settings.traffic_capture_max_queued
+)
@@ -19,6 +19,36 @@ class Settings(BaseSettings):
     # Database Configuration
     mongodb_url: str = "mongodb://localhost:27017"
     database_name: str = "editer"
+    mongodb_max_pool_size: int = 100
+    mongodb_min_pool_size: int = 0
+    mongodb_max_idle_time_ms: Optional[int] = None  # close idle pooled connections after this
+    mongodb_wait_queue_timeout_ms: Optional[int] = None  # max wait for a free connection
+    mongodb_server_selection_timeout_ms: int = 5000
+    mongodb_connect_timeout_ms: int = 5000
+    mongodb_socket_timeout_ms: int = 5000
+    mongodb_compressors: str = ""  # e.g. "zstd,snappy,zlib"; zstd/snappy need extra packages
+    mongodb_write_concern: str = "1"  # w value: a node count or "majority"
+    mongodb_journal: Optional[bool] = None
+    mongodb_prewarm_connections: int = 0  # connections opened at startup
+    
+    # Document Sharding (revisions, snapshots and rate limits stay on mongodb_url)
+    mongodb_shards: str = ""  # comma-separated [name=]database or [name=]mongodb://host/database
+    mongodb_shard_fallback_reads: int = 0  # next-ranked shards also searched while rebalancing
+    
+    # Storage Backend
+    storage_backend: str = "mongodb"  # "mongodb" or "log" (embedded, single node)
+    log_store_path: str = "data"  # directory of the log files
+    log_store_sync_interval_ms: float = 2.0  # group commit window
+    log_store_compaction_interval: float = 60.0  # seconds between compaction checks
+    log_store_compaction_garbage_ratio: float = 0.5  # superseded share of the log that triggers compaction
+    log_store_compaction_min_bytes: int = 64 * 1024 * 1024
+    
+    # Write Durability
+    write_concern_create: str = "majority"
+    write_journal_create: bool = True
+    write_concern_update: str = "1"  # intermediate autosaves
+    write_journal_update: bool = False
+    write_checkpoint_interval: float = 30.0  # max seconds between durable writes per document, 0 = always
     
     # CORS Configuration
     allowed_origins: str = "http://localhost:3000,http://localhost:5173,http://127.0.0.1:3000,http://127.0.0.1:5173"
@@ -32,13 +62,135 @@ class Settings(BaseSettings):
     max_title_length: int = 200
     max_content_length: int = 10 * 1024 * 1024  # 10MB
     
+    # Revision History
+    revisions_enabled: bool = True
+    revision_snapshot_interval: int = 20  # revisions per delta chain
+    revision_retention_count: int = 200
+    revision_compaction_interval: int = 300  # seconds
+    revision_offload_threshold: int = 64 * 1024  # combined characters before deltas run in a process
+    revision_compaction_batch_size: int = 100  # documents compacted per run
+    revision_cache_size: int = 1024  # latest revision content kept per worker
+    revision_cache_max_bytes: int = 64 * 1024 * 1024
+    
+    # Diff Configuration
+    diff_timeout_seconds: float = 2.0
+    diff_max_input_size: int = 2 * 1024 * 1024  # combined characters
+    diff_max_edit_distance: int = 20000  # lines
+    diff_max_output_lines: int = 20000
+    diff_offload_threshold: int = 64 * 1024  # characters; larger inputs always run in a process
+    diff_inline_budget_seconds: float = 0.01  # time a smaller diff may take on the event loop
+    diff_cache_size: int = 256
+    diff_cache_max_bytes: int = 32 * 1024 * 1024  # characters of cached diff output
+    
+    # Delta Sync Configuration
+    sync_min_block_size: int = 64
+    sync_max_block_size: int = 64 * 1024
+    sync_signature_cache_size: int = 32
+    sync_signature_cache_max_bytes: int = 64 * 1024 * 1024  # content plus rolling checksums
+    sync_offload_threshold: int = 64 * 1024  # bytes
+    
+    # Executors for CPU-heavy work
+    executor_thread_workers: int = 4
+    executor_process_workers: int = 2  # 0 runs pure-Python work on the thread pool instead
+    executor_max_queue: int = 64  # waiting calls per pool
+    executor_max_wait_ms: int = 2000
+    executor_start_method: str = "spawn"  # "spawn", "forkserver" or "fork"
+    
+    # Hot/Cold Tiering (MongoDB backend)
+    tiering_enabled: bool = False
+    tiering_idle_days: float = 90.0  # archive documents not accessed for this long
+    tiering_interval: float = 3600.0  # seconds between runs
+    tiering_batch_size: int = 100  # documents per query and checkpoint
+    tiering_rate: float = 50.0  # max documents archived per second, 0 = unlimited
+    tiering_compression_level: int = 6  # zlib level
+    tiering_lease_seconds: float = 300.0  # a worker's hold on a collection's pass, renewed per batch
+    
+    # Access Tracking (MongoDB backend)
+    access_tracking_enabled: bool = True
+    access_tracking_flush_interval: float = 10.0  # seconds between bulk writes
+    access_tracking_max_pending: int = 100000  # documents with unflushed accesses
+    access_tracking_batch_size: int = 1000  # documents per bulk write
+    
+    # Snapshot Configuration
+    snapshot_max_age: int = 365 * 24 * 60 * 60  # seconds
+    
     # Rate Limiting
+    rate_limit_enabled: bool = True
     rate_limit_requests: int = 100
     rate_limit_window: int = 60  # seconds
+    rate_limit_write_requests: int = 60  # per client per window
+    rate_limit_document_requests: int = 60  # per document per window
+    rate_limit_backend: str = "memory"  # "memory" or "mongodb"
+    rate_limit_shards: int = 16
+    rate_limit_sweep_interval: float = 30.0  # seconds per full sweep
+    rate_limit_trust_forwarded: bool = False
+    
+    # Request Deadlines
+    request_timeout_read_ms: int = 3000
+    request_timeout_write_ms: int = 10000
+    request_timeout_max_ms: int = 30000
+    
+    # Admission Control
+    admission_enabled: bool = True
+    admission_read_limit: int = 64  # initial concurrent reads
+    admission_write_limit: int = 32  # initial concurrent writes
+    admission_min_limit: int = 4
+    admission_max_limit: int = 256
+    admission_max_queue: int = 128
+    admission_max_wait_ms: int = 1000
+    admission_read_target_latency_ms: int = 100
+    admission_write_target_latency_ms: int = 250
+    admission_retry_after: int = 1  # seconds
+    
+    # Circuit Breaker
+    circuit_breaker_enabled: bool = True
+    circuit_breaker_failure_rate: float = 0.5  # failed share of calls that opens the circuit
+    circuit_breaker_min_calls: int = 20  # calls in the window before it may open
+    circuit_breaker_window_seconds: float = 10.0
+    circuit_breaker_open_seconds: float = 5.0  # fail fast this long before probing
+    circuit_breaker_half_open_calls: int = 3  # successful probes needed to close
+    circuit_breaker_cache_size: int = 1000  # last-known-good documents
+    circuit_breaker_cache_max_bytes: int = 64 * 1024 * 1024
+    
+    # Health Probing
+    health_probe_interval: float = 5.0  # seconds between database pings
+    health_probe_timeout_ms: int = 1000
+    health_max_staleness: float = 15.0  # not ready without a successful probe this recent
+    
+    # Metrics
+    metrics_enabled: bool = True
+    metrics_multiprocess_dir: Optional[str] = None  # shared directory when running several workers
+    metrics_flush_interval: float = 5.0  # seconds between per-worker snapshot writes
+    repository_instrumentation_enabled: bool = True
+    repository_slow_threshold_ms: int = 200  # log repository calls slower than this
+    server_timing_enabled: bool = False  # Server-Timing header; exposes internals, enable for development only
+    
+    # Event Loop Monitoring
+    loop_monitor_enabled: bool = True
+    loop_monitor_interval_ms: int = 100  # heartbeat interval
+    loop_stall_threshold_ms: int = 250  # log the loop thread stack when blocked this long
+    
+    # Fault Injection (debug mode only)
+    fault_injection_enabled: bool = False
+    fault_injection_profile: str = ""  # JSON, e.g. {"find": {"latency": "lognormal:0.02:0.5", "error_rate": 0.01}}
+    fault_injection_seed: Optional[int] = None
+    
+    # Traffic Capture (for replay in load tests)
+    traffic_capture_enabled: bool = False
+    traffic_capture_path: str = "traffic.jsonl.gz"  # the pid of each worker is added to the name
+    traffic_capture_content: bool = False  # also record request bodies, i.e. document content
+    traffic_capture_max_queued: int = 10000  # records waiting for the writer before new ones are dropped
+    
+    # Admin Endpoints (enabled in debug mode or when admin_token is set)
+    admin_token: Optional[str] = None
+    profiler_max_seconds: float = 60.0
+    profiler_interval_ms: float = 10.0
     
     # Logging Configuration
     log_level: str = "INFO"
     log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    log_json: bool = True  # JSON lines with request fields instead of log_format
+    log_sample_rate: float = 0.01  # share of high-volume success logs kept
     
     model_config = {
         "env_file": ".env",
@@ -0,0 +1,11 @@
+"""
+Embedded storage engines.
+"""
+
+from .log_store import DuplicateKeyError, LogRecord, LogStore
+
+__all__ = [
+    "DuplicateKeyError",
+    "LogRecord",
+    "LogStore"
+]
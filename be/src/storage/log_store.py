@@ -0,0 +1,484 @@
+"""
+Append-only, checksummed document log on local disk.
+
+Every write appends one record holding the whole document:
+
+    crc32 (u32) | payload length (u32) | payload
+    payload = type (u8) | key length (u16) | ObjectId (12 bytes) |
+              created_at (f64) | updated_at (f64) | key | content (utf-8)
+
+An in-memory index maps each key to the offset and length of its latest
+record, and reads copy records out of a memory map of the log.
+
+Writes are group committed: a write is appended immediately, but it is
+acknowledged and becomes visible only after an fsync. A committer task waits
+`sync_interval` to collect concurrent writes, then issues one fsync for all of
+them.
+
+Superseded records are garbage. Once garbage exceeds a share of the log,
+compaction copies the live records to the next generation of the log in a
+thread. It then pauses writes briefly to copy records written in the meantime
+and switches over. On startup the log is scanned to rebuild the index, and a
+torn record at its end (from a crash mid-write) is truncated.
+
+A failed fsync leaves it unknown which appended bytes reached the disk, so
+it fails every unacknowledged write, truncates the log back to the first of
+them and closes the store; it has to be reopened.
+"""
+
+import asyncio
+import fcntl
+import logging
+import mmap
+import os
+import re
+import struct
+import time
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+RECORD_HEADER = struct.Struct("<II")
+PAYLOAD_HEADER = struct.Struct("<BH12sdd")
+PUT = 1
+MAX_PAYLOAD_SIZE = 256 * 1024 * 1024
+LOG_FILE_PATTERN = re.compile(r"^documents-(\d{8})\.log$")
+
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+class LogRecord(NamedTuple):
+    """Document as stored in the log; timestamps are unix seconds."""
+    key: str
+    id: bytes
+    created_at: float
+    updated_at: float
+    content: str
+
+
+class DuplicateKeyError(Exception):
+    """Raised when creating a key that already exists."""
+
+
+def encode_record(record: LogRecord) -> bytes:
+    """Encode a record with its checksum header."""
+    key = record.key.encode("utf-8")
+    payload = (
+        PAYLOAD_HEADER.pack(PUT, len(key), record.id, record.created_at, record.updated_at)
+        + key
+        + record.content.encode("utf-8")
+    )
+    return RECORD_HEADER.pack(zlib.crc32(payload), len(payload)) + payload
+
+
+def decode_payload(payload: bytes) -> LogRecord:
+    """Decode a payload whose checksum has been verified."""
+    _, key_length, doc_id, created_at, updated_at = PAYLOAD_HEADER.unpack_from(payload)
+    key_end = PAYLOAD_HEADER.size + key_length
+    return LogRecord(
+        key=payload[PAYLOAD_HEADER.size:key_end].decode("utf-8"),
+        id=doc_id,
+        created_at=created_at,
+        updated_at=updated_at,
+        content=payload[key_end:].decode("utf-8")
+    )
+
+
+def scan(data, start: int = 0):
+    """
+    Yield (offset, length, record) for each valid record from `start`.
+
+    Stops at the end of the data or at the first truncated or corrupt record.
+    """
+    offset = start
+    end = len(data)
+    while offset + RECORD_HEADER.size <= end:
+        crc, length = RECORD_HEADER.unpack_from(data, offset)
+        payload_start = offset + RECORD_HEADER.size
+        if length < PAYLOAD_HEADER.size or length > MAX_PAYLOAD_SIZE or payload_start + length > end:
+            return
+        payload = data[payload_start:payload_start + length]
+        if zlib.crc32(payload) != crc:
+            return
+        yield offset, RECORD_HEADER.size + length, decode_payload(payload)
+        offset = payload_start + length
+
+
+class LogStore:
+    """Embedded key-document store on an append-only log."""
+
+    def __init__(
+        self,
+        directory: str,
+        sync_interval: float,
+        compaction_interval: float,
+        garbage_ratio: float,
+        compaction_min_bytes: int
+    ):
+        """
+        Initialize the store; the log is opened by connect().
+
+        Args:
+            directory: Directory holding the log files
+            sync_interval: Seconds a group commit waits to collect more writes
+            compaction_interval: Seconds between checks whether to compact
+            garbage_ratio: Share of superseded bytes that triggers compaction
+            compaction_min_bytes: Logs smaller than this are never compacted
+        """
+        self.directory = directory
+        self.sync_interval = sync_interval
+        self.compaction_interval = compaction_interval
+        self.garbage_ratio = garbage_ratio
+        self.compaction_min_bytes = compaction_min_bytes
+
+        self.index: Dict[str, Tuple[int, int]] = {}
+        self.generation = 0
+        self.size = 0
+        self.garbage_bytes = 0
+        self.syncs = 0
+        self.synced_writes = 0
+        self.compactions = 0
+        self.truncated_bytes = 0
+
+        self._fd: Optional[int] = None
+        self._lock_fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        # Appended but not yet synced writes: (future, key, offset, length)
+        self._pending: List[Tuple[asyncio.Future, str, int, int]] = []
+        self._pending_keys: Dict[str, int] = {}
+        self._committer: Optional[asyncio.Task] = None
+        self._writes_open: Optional[asyncio.Event] = None
+        self._compacting = False
+        self._compactor: Optional[asyncio.Task] = None
+        self._failure: Optional[Exception] = None
+
+    # Files
+
+    def _path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"documents-{generation:08d}.log")
+
+    def _open(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock_fd = os.open(os.path.join(self.directory, "LOCK"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+            raise RuntimeError(f"Log store {self.directory} is open in another process")
+        generations = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".log.tmp"):
+                # Compaction that did not finish; the previous generation is intact
+                os.remove(os.path.join(self.directory, name))
+                continue
+            match = LOG_FILE_PATTERN.match(name)
+            if match:
+                generations.append(int(match.group(1)))
+        generations.sort()
+        self.generation = generations[-1] if generations else 1
+        for stale in generations[:-1]:
+            # A compaction finished but crashed before deleting its input
+            os.remove(self._path(stale))
+
+        self._fd = os.open(self._path(self.generation), os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        file_size = os.fstat(self._fd).st_size
+        self._recover(file_size)
+
+    def _recover(self, file_size: int) -> None:
+        self.index = {}
+        self.garbage_bytes = 0
+        valid_end = 0
+        if file_size:
+            with mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ) as data:
+                for offset, length, record in scan(data):
+                    previous = self.index.get(record.key)
+                    if previous is not None:
+                        self.garbage_bytes += previous[1]
+                    self.index[record.key] = (offset, length)
+                    valid_end = offset + length
+        if valid_end < file_size:
+            self.truncated_bytes = file_size - valid_end
+            logger.warning(
+                "Truncating %s bytes of incomplete or corrupt records at the end of %s",
+                self.truncated_bytes,
+                self._path(self.generation),
+            )
+            os.ftruncate(self._fd, valid_end)
+            os.fsync(self._fd)
+        self.size = valid_end
+        self._map = None
+        logger.info("Log store opened with %s documents, %s bytes", len(self.index), self.size)
+
+    def _read(self, offset: int, length: int) -> bytes:
+        end = offset + length
+        if self._map is None or len(self._map) < end:
+            if self._map is not None:
+                self._map.close()
+            self._map = mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ)
+        return self._map[offset:end]
+
+    def _close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    # Lifecycle, mirroring DatabaseManager
+
+    async def connect(self) -> None:
+        """Open the log, recovering the index, and start background compaction."""
+        await asyncio.get_running_loop().run_in_executor(None, self._open)
+        self._failure = None
+        self._writes_open = asyncio.Event()
+        self._writes_open.set()
+        self._compactor = asyncio.create_task(self._compact_periodically())
+
+    async def disconnect(self) -> None:
+        """Stop compaction, sync pending writes and close the log."""
+        if self._compactor is not None:
+            self._compactor.cancel()
+            try:
+                await self._compactor
+            except asyncio.CancelledError:
+                pass
+            self._compactor = None
+        if self._committer is not None:
+            await self._committer
+        self._close()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def health_check(self, timeout: Optional[float] = None) -> bool:
+        """Check that the log is open."""
+        return self._fd is not None
+
+    def pool_stats(self) -> Dict[str, object]:
+        """Get store statistics, reported where MongoDB reports its pool."""
+        return self.stats()
+
+    def stats(self) -> Dict[str, object]:
+        """Get size, garbage, group commit and compaction statistics."""
+        return {
+            "backend": "log",
+            "documents": len(self.index),
+            "generation": self.generation,
+            "log_bytes": self.size,
+            "garbage_bytes": self.garbage_bytes,
+            "syncs": self.syncs,
+            "writes_per_sync": round(self.synced_writes / self.syncs, 2) if self.syncs else 0.0,
+            "compactions": self.compactions,
+            "truncated_bytes": self.truncated_bytes
+        }
+
+    # Reads and writes
+
+    def _check_open(self) -> None:
+        if self._failure is not None:
+            raise RuntimeError(f"Log store is closed after a failed sync: {self._failure}")
+        if self._fd is None:
+            raise RuntimeError("Log store is not open")
+
+    def get(self, key: str) -> Optional[LogRecord]:
+        """Get the latest acknowledged record of `key`."""
+        self._check_open()
+        location = self.index.get(key)
+        if location is None:
+            return None
+        data = self._read(*location)
+        crc, length = RECORD_HEADER.unpack_from(data)
+        payload = data[RECORD_HEADER.size:]
+        if zlib.crc32(payload) != crc:
+            raise RuntimeError(f"Checksum mismatch in log record of '{key}'")
+        return decode_payload(payload)
+
+    async def put(self, record: LogRecord, create: bool = False) -> LogRecord:
+        """
+        Append a record and wait until it is durable.
+
+        Args:
+            record: Document to store under record.key
+            create: Fail if the key already exists
+
+        Raises:
+            DuplicateKeyError: If `create` is set and the key exists
+            RuntimeError: If the log is closed or syncing fails
+        """
+        while not self._writes_open.is_set():
+            # Compaction may close the gate again before a woken writer runs
+            await self._writes_open.wait()
+        self._check_open()
+        if create and (record.key in self.index or record.key in self._pending_keys):
+            raise DuplicateKeyError(record.key)
+
+        data = encode_record(record)
+        offset = self.size
+        written = 0
+        while written < len(data):
+            written += os.write(self._fd, data[written:])
+        self.size += len(data)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((future, record.key, offset, len(data)))
+        self._pending_keys[record.key] = self._pending_keys.get(record.key, 0) + 1
+        if self._committer is None or self._committer.done():
+            self._committer = asyncio.create_task(self._commit())
+        await future
+        return record
+
+    async def _commit(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            # Let concurrent writers join this sync
+            await asyncio.sleep(self.sync_interval)
+            batch, self._pending = self._pending, []
+            try:
+                await loop.run_in_executor(None, _fdatasync, self._fd)
+                error = None
+            except OSError as e:
+                logger.error("Log store sync failed: %s", e)
+                error = RuntimeError(f"Log store sync failed: {e}")
+                # Writes appended after the batch cannot be made durable either
+                batch += self._pending
+                self._pending = []
+                self._fail(batch[0][2], e)
+            self.syncs += 1
+            self.synced_writes += len(batch)
+            for future, key, offset, length in batch:
+                remaining = self._pending_keys[key] - 1
+                if remaining:
+                    self._pending_keys[key] = remaining
+                else:
+                    del self._pending_keys[key]
+                if error is None:
+                    previous = self.index.get(key)
+                    if previous is not None:
+                        self.garbage_bytes += previous[1]
+                    self.index[key] = (offset, length)
+                else:
+                    self.garbage_bytes += length
+                if not future.done():
+                    if error is None:
+                        future.set_result(None)
+                    else:
+                        future.set_exception(error)
+
+    def _fail(self, offset: int, error: Exception) -> None:
+        """Drop the unacknowledged writes from `offset` on and close the store."""
+        self._failure = error
+        try:
+            os.ftruncate(self._fd, offset)
+            os.fsync(self._fd)
+            self.size = offset
+        except OSError as e:
+            logger.critical(
+                "Log store could not truncate unacknowledged writes at offset %d of %s, "
+                "they may reappear on restart: %s",
+                offset, self._path(self.generation), e
+            )
+        self._close()
+
+    # Compaction
+
+    def _copy_live(self, snapshot: Dict[str, Tuple[int, int]], path: str) -> Dict[str, Tuple[int, int]]:
+        copied = {}
+        with open(self._path(self.generation), "rb") as source, open(path, "wb") as target:
+            with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                offset = 0
+                for key, (start, length) in sorted(snapshot.items(), key=lambda item: item[1][0]):
+                    target.write(data[start:start + length])
+                    copied[key] = (offset, length)
+                    offset += length
+            target.flush()
+            os.fsync(target.fileno())
+        return copied
+
+    async def compact(self) -> None:
+        """Rewrite the log with only the latest record of each key."""
+        if self._compacting or self._fd is None:
+            return
+        self._compacting = True
+        loop = asyncio.get_running_loop()
+        generation = self.generation + 1
+        temporary = self._path(generation) + ".tmp"
+        started = time.perf_counter()
+        try:
+            snapshot = dict(self.index)
+            index = await loop.run_in_executor(None, self._copy_live, snapshot, temporary)
+
+            self._writes_open.clear()
+            try:
+                if self._committer is not None:
+                    await self._committer
+                self._check_open()
+                # Copy what was written while the live records were being copied
+                changed = [(key, location) for key, location in self.index.items() if snapshot.get(key) != location]
+                with open(temporary, "ab") as target:
+                    offset = target.tell()
+                    for key, (start, length) in changed:
+                        target.write(self._read(start, length))
+                        index[key] = (offset, length)
+                        offset += length
+                    target.flush()
+                    await loop.run_in_executor(None, os.fsync, target.fileno())
+                os.replace(temporary, self._path(generation))
+                directory = os.open(self.directory, os.O_RDONLY)
+                try:
+                    os.fsync(directory)
+                finally:
+                    os.close(directory)
+
+                previous = self._path(self.generation)
+                before = self.size
+                self._close()
+                self._fd = os.open(self._path(generation), os.O_RDWR | os.O_APPEND)
+                self.generation = generation
+                self.index = index
+                self.size = offset
+                self.garbage_bytes = 0
+                os.remove(previous)
+            finally:
+                self._writes_open.set()
+
+            self.compactions += 1
+            logger.info(
+                "Compacted log store from %s to %s bytes in %.0f ms",
+                before,
+                self.size,
+                (time.perf_counter() - started) * 1000,
+                extra={"bytes_before": before, "bytes_after": self.size},
+            )
+        except Exception:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        finally:
+            self._compacting = False
+
+    def needs_compaction(self) -> bool:
+        """Check whether garbage exceeds the configured share of a large enough log."""
+        return self.size >= self.compaction_min_bytes and self.garbage_bytes >= self.size * self.garbage_ratio
+
+    async def _compact_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.compaction_interval)
+            if self.needs_compaction():
+                try:
+                    await self.compact()
+                except Exception as e:
+                    logger.error("Log store compaction failed: %s", e)
+
+
+# Global log store, used when storage_backend is "log"
+log_store = LogStore(
+    directory=settings.log_store_path,
+    sync_interval=settings.log_store_sync_interval_ms / 1000,
+    compaction_interval=settings.log_store_compaction_interval,
+    garbage_ratio=settings.log_store_compaction_garbage_ratio,
+    compaction_min_bytes=settings.log_store_compaction_min_bytes
+)
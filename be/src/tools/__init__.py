@@ -0,0 +1,3 @@
+"""
+Operational command-line tools, run with `python -m src.tools.<name>`.
+"""
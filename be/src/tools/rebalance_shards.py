@@ -0,0 +1,162 @@
+"""
+Move documents to the shard that owns them, e.g. after adding shards.
+
+Usage (from the backend directory):
+    python -m src.tools.rebalance_shards [--dry-run] [--batch-size 500] [--rate 200]
+
+Reads the shards from MONGODB_SHARDS. To add shards without downtime:
+
+1. Append the new shards to MONGODB_SHARDS and set
+   MONGODB_SHARD_FALLBACK_READS to the number of shards added. The app then
+   looks up documents on the shards that owned them before, if they are not
+   yet on their new owner.
+2. Restart the app, then run this tool until it reports no moves.
+3. Set MONGODB_SHARD_FALLBACK_READS back to 0 and restart the app.
+
+Each document is copied to its owner, then deleted from its old shard, but
+only if it was not updated since it was copied. If it was updated, the copy
+is repeated. The copy never overwrites a newer version on the owner. An
+interrupted run leaves at most duplicate copies, which the next run cleans
+up, so the tool can be stopped and rerun at any time.
+
+Documents archived by tiering are moved to the owner's documents_archive
+the same way, guarded by their `archived_at` instead of `updated_at`.
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Dict, Optional
+from pymongo.errors import DuplicateKeyError
+from ..services.database import client_options
+from ..services.sharding import Shard, ShardSet, create_shard_set
+from ..services.tiering import archive_of
+from ..settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+async def move_document(source: Shard, target: Shard, document: Dict[str, object]) -> bool:
+    """
+    Move one document from `source` to `target`.
+
+    Returns:
+        bool: True if the document was moved by this call
+    """
+    while True:
+        try:
+            # Matches nothing if the owner already has this or a newer version; the upsert then conflicts
+            await target.collection.replace_one(
+                {"share_id": document["share_id"], "updated_at": {"$lt": document["updated_at"]}},
+                document,
+                upsert=True
+            )
+        except DuplicateKeyError:
+            pass
+        result = await source.collection.delete_one({"_id": document["_id"], "updated_at": document["updated_at"]})
+        if result.deleted_count:
+            return True
+        # Updated on the old shard since it was read; copy the new version
+        document = await source.collection.find_one({"_id": document["_id"]})
+        if document is None:
+            return False
+
+
+async def move_archived(source: Shard, target: Shard, record: Dict[str, object]) -> bool:
+    """
+    Move one archive record from the archive of `source` to that of `target`.
+
+    Returns:
+        bool: True if the record was moved by this call
+    """
+    source_archive, target_archive = archive_of(source.collection), archive_of(target.collection)
+    while True:
+        # A hot copy on the owner is at least as new as any archived one
+        if await target.collection.find_one({"share_id": record["share_id"]}, {"_id": 1}) is None:
+            try:
+                await target_archive.replace_one({"_id": record["_id"]}, record, upsert=True)
+            except DuplicateKeyError:
+                pass
+        result = await source_archive.delete_one({"_id": record["_id"], "archived_at": record["archived_at"]})
+        if result.deleted_count:
+            return True
+        # Rehydrated or archived again since it was read; drop the copy of the old record
+        await target_archive.delete_one({"_id": record["_id"], "archived_at": record["archived_at"]})
+        record = await source_archive.find_one({"_id": record["_id"]})
+        if record is None:
+            # Back in the hot tier, which the next run moves
+            return False
+
+
+async def rebalance(
+    shards: ShardSet,
+    batch_size: int = 500,
+    rate: Optional[float] = None,
+    dry_run: bool = False,
+    sleep=asyncio.sleep
+) -> Counter:
+    """
+    Move every document that is not on its owning shard.
+
+    Args:
+        shards: Connected shards
+        batch_size: Documents fetched per cursor batch
+        rate: Maximum documents moved per second, None for no limit
+        dry_run: Only count the documents that would move
+        sleep: Sleep function, replaceable in tests
+
+    Returns:
+        Counter: Scanned and moved documents, the same prefixed with
+        "archived_" for archive records, and moves per source and target shard
+    """
+    counts: Counter = Counter()
+    started = time.monotonic()
+
+    async def scan(source: Shard, collection, move: Callable[..., Awaitable[bool]], prefix: str) -> None:
+        async for document in collection.find({}, batch_size=batch_size):
+            counts[prefix + "scanned"] += 1
+            target = shards.owner(document["share_id"])
+            if target is source:
+                continue
+            if dry_run:
+                counts[prefix + "to_move"] += 1
+                counts[f"{source.name}->{target.name}"] += 1
+                continue
+            if rate:
+                # Pace moves evenly instead of in bursts
+                delay = started + (counts["moved"] + counts["archived_moved"]) / rate - time.monotonic()
+                if delay > 0:
+                    await sleep(delay)
+            if await move(source, target, document):
+                counts[prefix + "moved"] += 1
+                counts[f"{source.name}->{target.name}"] += 1
+
+    for source in shards.shards.values():
+        await scan(source, source.collection, move_document, "")
+        await scan(source, archive_of(source.collection), move_archived, "archived_")
+        logger.info("Rebalanced shard %s: %s", source.name, dict(counts))
+    return counts
+
+
+async def main(batch_size: int, rate: Optional[float], dry_run: bool) -> None:
+    shards = create_shard_set(settings.mongodb_shards, settings.mongodb_url, settings.database_name)
+    if shards is None:
+        raise SystemExit("MONGODB_SHARDS is not set")
+    await shards.connect(client_options())
+    try:
+        counts = await rebalance(shards, batch_size, rate, dry_run)
+    finally:
+        await shards.disconnect()
+    print(", ".join(f"{key}: {value}" for key, value in counts.items()) or "no documents")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format=settings.log_format)
+    parser = argparse.ArgumentParser(prog="python -m src.tools.rebalance_shards")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--rate", type=float, help="maximum documents moved per second")
+    parser.add_argument("--dry-run", action="store_true", help="only count the documents that would move")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.rate, args.dry_run))
@@ -0,0 +1,84 @@
+"""
+Line-based delta encoding used for compact document revisions.
+
+A delta is a JSON-serializable list of operations that rebuilds a target
+text from a base text:
+
+    ["c", start, end]  copy base lines [start, end)
+    ["i", text]        insert literal text
+"""
+
+from difflib import SequenceMatcher
+from typing import List, Union
+
+DeltaOp = List[Union[str, int]]
+Delta = List[DeltaOp]
+
+
+def compute_delta(base: str, target: str) -> Delta:
+    """
+    Compute a forward delta that turns `base` into `target`.
+
+    Args:
+        base: Original text
+        target: New text
+
+    Returns:
+        Delta: List of copy/insert operations
+    """
+    base_lines = base.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    matcher = SequenceMatcher(None, base_lines, target_lines)
+
+    delta: Delta = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append(["c", i1, i2])
+        elif tag in ("replace", "insert"):
+            delta.append(["i", "".join(target_lines[j1:j2])])
+    return delta
+
+
+def apply_delta(base: str, delta: Delta) -> str:
+    """
+    Rebuild a text by applying a delta to its base.
+
+    Args:
+        base: Text the delta was computed against
+        delta: Operations produced by compute_delta
+
+    Returns:
+        str: Reconstructed text
+
+    Raises:
+        ValueError: If the delta contains an unknown operation
+    """
+    base_lines = base.splitlines(keepends=True)
+    parts: List[str] = []
+    for op in delta:
+        if op[0] == "c":
+            parts.extend(base_lines[op[1]:op[2]])
+        elif op[0] == "i":
+            parts.append(op[1])
+        else:
+            raise ValueError(f"Unknown delta operation: {op[0]}")
+    return "".join(parts)
+
+
+def delta_size(delta: Delta) -> int:
+    """
+    Approximate the stored size of a delta in characters.
+
+    Args:
+        delta: Delta operations
+
+    Returns:
+        int: Approximate encoded size
+    """
+    size = 0
+    for op in delta:
+        if op[0] == "i":
+            size += len(op[1]) + 8
+        else:
+            size += 16
+    return size
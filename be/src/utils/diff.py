@@ -0,0 +1,257 @@
+"""
+Line-hash based diff between two texts.
+
+Lines are interned to integer ids so comparisons are integer equality, the
+common prefix and suffix are trimmed, and the remainder is diffed with
+Myers' O(ND) algorithm. The algorithm checks a deadline while it runs so
+CPU time stays bounded even for inputs that differ everywhere.
+"""
+
+import time
+from array import array
+from typing import List, Optional, Tuple
+
+Opcode = Tuple[str, int, int, int, int]
+
+
+class DiffTooLarge(Exception):
+    """Raised when inputs exceed the configured size or edit distance."""
+
+
+class DiffTimeout(Exception):
+    """Raised when computing the diff exceeds its deadline."""
+
+
+class DiffHunkData:
+    """Data class for a unified diff hunk."""
+
+    def __init__(self, a_start: int, a_count: int, b_start: int, b_count: int, lines: List[str]):
+        self.a_start = a_start
+        self.a_count = a_count
+        self.b_start = b_start
+        self.b_count = b_count
+        self.lines = lines
+
+
+class DiffResult:
+    """Data class for a computed diff."""
+
+    def __init__(self, hunks: List[DiffHunkData], added: int, removed: int, truncated: bool):
+        self.hunks = hunks
+        self.added = added
+        self.removed = removed
+        self.truncated = truncated
+
+
+def _intern(a_lines: List[str], b_lines: List[str]) -> Tuple[List[int], List[int]]:
+    ids: dict = {}
+    a_ids = [ids.setdefault(line, len(ids)) for line in a_lines]
+    b_ids = [ids.setdefault(line, len(ids)) for line in b_lines]
+    return a_ids, b_ids
+
+
+def _myers(a: List[int], b: List[int], deadline: float, max_edits: int) -> List[Opcode]:
+    """Compute opcodes for two id sequences with Myers' algorithm."""
+    n, m = len(a), len(b)
+    if n == 0 and m == 0:
+        return []
+    if n == 0:
+        return [("insert", 0, 0, 0, m)]
+    if m == 0:
+        return [("delete", 0, n, 0, 0)]
+
+    limit = min(n + m, max_edits)
+    offset = limit + 1
+    v = array("l", [0]) * (2 * limit + 3)
+    trace: List[array] = []
+
+    for d in range(limit + 1):
+        # Every round costs O(d), so checking each one keeps short budgets accurate
+        if time.monotonic() > deadline:
+            raise DiffTimeout()
+        trace.append(v[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(trace, n, m)
+    raise DiffTooLarge()
+
+
+def _backtrack(trace: List[array], n: int, m: int) -> List[Opcode]:
+    steps: List[Opcode] = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        lo = -d - 1
+        k = x - y
+        if k == -d or (k != d and v[k - 1 - lo] < v[k + 1 - lo]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k - lo] if d > 0 else 0
+        prev_y = prev_x - prev_k if d > 0 else 0
+
+        if x > prev_x and y > prev_y:
+            snake = min(x - prev_x, y - prev_y)
+            steps.append(("equal", x - snake, x, y - snake, y))
+            x -= snake
+            y -= snake
+        if d > 0:
+            if x == prev_x:
+                steps.append(("insert", x, x, prev_y, y))
+            else:
+                steps.append(("delete", prev_x, x, y, y))
+        x, y = prev_x, prev_y
+
+    opcodes: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in reversed(steps):
+        if opcodes:
+            last = opcodes[-1]
+            if last[0] == tag or (last[0] != "equal" and tag != "equal"):
+                merged_tag = tag if last[0] == tag else "replace"
+                opcodes[-1] = (merged_tag, last[1], i2, last[3], j2)
+                continue
+        opcodes.append((tag, i1, i2, j1, j2))
+    return opcodes
+
+
+def _group(opcodes: List[Opcode], context: int) -> List[List[Opcode]]:
+    """Group opcodes into hunks with `context` lines of surrounding context."""
+    if not opcodes:
+        return []
+    codes = list(opcodes)
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)
+
+    groups: List[List[Opcode]] = []
+    group: List[Opcode] = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > context * 2:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+    return groups
+
+
+def diff_texts(
+    a: str,
+    b: str,
+    context: int = 3,
+    timeout: float = 2.0,
+    max_edits: int = 20000,
+    max_output_lines: Optional[int] = None
+) -> DiffResult:
+    """
+    Compute a line diff of two texts.
+
+    Args:
+        a: Original text
+        b: New text
+        context: Number of unchanged lines around each change
+        timeout: CPU time budget in seconds
+        max_edits: Maximum edit distance before giving up
+        max_output_lines: Maximum number of hunk lines returned
+
+    Returns:
+        DiffResult: Hunks and change statistics
+
+    Raises:
+        DiffTooLarge: If the edit distance exceeds `max_edits`
+        DiffTimeout: If the diff cannot be computed within `timeout`
+    """
+    deadline = time.monotonic() + timeout
+    a_lines = a.splitlines()
+    b_lines = b.splitlines()
+    a_ids, b_ids = _intern(a_lines, b_lines)
+
+    prefix = 0
+    limit = min(len(a_ids), len(b_ids))
+    while prefix < limit and a_ids[prefix] == b_ids[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a_ids[-1 - suffix] == b_ids[-1 - suffix]:
+        suffix += 1
+
+    middle = _myers(
+        a_ids[prefix:len(a_ids) - suffix],
+        b_ids[prefix:len(b_ids) - suffix],
+        deadline,
+        max_edits
+    )
+
+    opcodes: List[Opcode] = []
+    if prefix:
+        opcodes.append(("equal", 0, prefix, 0, prefix))
+    opcodes.extend((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix) for tag, i1, i2, j1, j2 in middle)
+    if suffix:
+        opcodes.append(("equal", len(a_ids) - suffix, len(a_ids), len(b_ids) - suffix, len(b_ids)))
+
+    hunks: List[DiffHunkData] = []
+    added = removed = emitted = 0
+    truncated = False
+    for group in _group(opcodes, context):
+        lines: List[str] = []
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                lines.extend(" " + line for line in a_lines[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                lines.extend("-" + line for line in a_lines[i1:i2])
+                removed += i2 - i1
+            if tag in ("replace", "insert"):
+                lines.extend("+" + line for line in b_lines[j1:j2])
+                added += j2 - j1
+
+        if max_output_lines is not None and emitted + len(lines) > max_output_lines:
+            truncated = True
+            continue
+        emitted += len(lines)
+        first, last = group[0], group[-1]
+        hunks.append(DiffHunkData(
+            a_start=first[1] + 1,
+            a_count=last[2] - first[1],
+            b_start=first[3] + 1,
+            b_count=last[4] - first[3],
+            lines=lines
+        ))
+
+    return DiffResult(hunks=hunks, added=added, removed=removed, truncated=truncated)
+
+
+def render_unified(result: DiffResult, a_label: str, b_label: str) -> str:
+    """
+    Render a diff result in unified diff format.
+
+    Args:
+        result: Computed diff
+        a_label: Label for the original text
+        b_label: Label for the new text
+
+    Returns:
+        str: Unified diff text, empty if the texts are identical
+    """
+    if not result.hunks:
+        return ""
+    out = [f"--- {a_label}", f"+++ {b_label}"]
+    for hunk in result.hunks:
+        a_start = hunk.a_start if hunk.a_count else hunk.a_start - 1
+        b_start = hunk.b_start if hunk.b_count else hunk.b_start - 1
+        out.append(f"@@ -{a_start},{hunk.a_count} +{b_start},{hunk.b_count} @@")
+        out.extend(hunk.lines)
+    return "\n".join(out) + "\n"
@@ -0,0 +1,18 @@
+"""
+Content hashing helpers.
+"""
+
+import hashlib
+
+
+def content_hash(content: str) -> str:
+    """
+    Compute a stable hash of document content.
+
+    Args:
+        content: Document content
+
+    Returns:
+        str: Hex-encoded SHA-256 digest of the UTF-8 encoded content
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
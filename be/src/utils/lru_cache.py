@@ -0,0 +1,83 @@
+"""
+Small in-process LRU cache used for memoizing derived document data.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """Bounded mapping that evicts the least recently used entry."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_weight: Optional[int] = None,
+        weigher: Optional[Callable[[V], int]] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept, 0 disables caching
+            max_weight: Optional bound on the total weight of all entries
+            weigher: Function returning the weight of a value, required with max_weight
+        """
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self.weight = 0
+        self._data: "OrderedDict[Hashable, V]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _weigh(self, value: V) -> int:
+        return self.weigher(value) if self.weigher else 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value for `key`, or None if absent."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Store a value, evicting the oldest entry when full."""
+        if self.max_entries <= 0:
+            return
+        weight = self._weigh(value)
+        if self.max_weight is not None and weight > self.max_weight:
+            self.pop(key)
+            return
+        self.pop(key)
+        self._data[key] = value
+        self.weight += weight
+        while len(self._data) > self.max_entries or (
+            self.max_weight is not None and self.weight > self.max_weight
+        ):
+            _, evicted = self._data.popitem(last=False)
+            self.weight -= self._weigh(evicted)
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """Remove and return the value for `key`, or None if absent."""
+        value = self._data.pop(key, None)
+        if value is not None:
+            self.weight -= self._weigh(value)
+        return value
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+        self.weight = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
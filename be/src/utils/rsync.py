@@ -0,0 +1,203 @@
+"""
+rsync-style block matching between a client's copy and the current content.
+
+The client splits its copy into fixed-size blocks (the last block may be
+shorter) and sends a weak and a strong checksum per block:
+
+    a = sum(block) mod 2**16
+    b = sum((len(block) - j) * block[j]) mod 2**16
+    weak = a + (b << 16)
+    strong = first 32 hex characters of SHA-256(block)
+
+The server slides a rolling window over its current content and answers
+with copy instructions referencing client blocks plus literal bytes for
+everything that did not match.
+"""
+
+import hashlib
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+Instruction = Tuple[str, Union[int, bytes], int]
+
+# Strong checksums memoized per index before the memo is reset
+STRONG_MEMO_SIZE = 4096
+
+
+def weak_checksum(block: bytes) -> int:
+    """Compute the rsync weak checksum of a block."""
+    a = b = 0
+    length = len(block)
+    for j, byte in enumerate(block):
+        a += byte
+        b += (length - j) * byte
+    return (a & 0xFFFF) | ((b & 0xFFFF) << 16)
+
+
+def strong_checksum(block: bytes) -> str:
+    """Compute the strong checksum of a block."""
+    return hashlib.sha256(block).hexdigest()[:32]
+
+
+def block_signatures(data: bytes, block_size: int) -> List[Tuple[int, str]]:
+    """
+    Compute the (weak, strong) signatures of consecutive blocks.
+
+    Args:
+        data: Content to sign
+        block_size: Block size in bytes
+
+    Returns:
+        List[Tuple[int, str]]: Signature per block
+    """
+    return [
+        (weak_checksum(data[i:i + block_size]), strong_checksum(data[i:i + block_size]))
+        for i in range(0, len(data), block_size)
+    ]
+
+
+class SignatureIndex:
+    """
+    Rolling checksums of one content version for one block size.
+
+    Computed once per (content, block size) and reused by every sync
+    against that version; strong checksums are filled in lazily and at
+    most `memo_size` are kept.
+    """
+
+    def __init__(self, data: bytes, block_size: int, memo_size: int = STRONG_MEMO_SIZE):
+        self.data = data
+        self.block_size = block_size
+        self.rolling = self._rolling(data, block_size)
+        self.memo_size = memo_size
+        self._strong: Dict[Tuple[int, int], str] = {}
+
+    @staticmethod
+    def _rolling(data: bytes, block_size: int) -> array:
+        out = array("I")
+        if len(data) < block_size:
+            return out
+        a = b = 0
+        for j in range(block_size):
+            a += data[j]
+            b += (block_size - j) * data[j]
+        a &= 0xFFFF
+        b &= 0xFFFF
+        out.append(a | (b << 16))
+        for i in range(len(data) - block_size):
+            removed = data[i]
+            a = (a - removed + data[i + block_size]) & 0xFFFF
+            b = (b - block_size * removed + a) & 0xFFFF
+            out.append(a | (b << 16))
+        return out
+
+    def strong_at(self, offset: int, length: int) -> str:
+        """Strong checksum of data[offset:offset + length], memoized."""
+        key = (offset, length)
+        value = self._strong.get(key)
+        if value is None:
+            value = strong_checksum(self.data[offset:offset + length])
+            if len(self._strong) >= self.memo_size:
+                self._strong.clear()
+            self._strong[key] = value
+        return value
+
+
+def match_blocks(
+    index: SignatureIndex,
+    blocks: Sequence[Tuple[int, str]],
+    client_length: int
+) -> List[Instruction]:
+    """
+    Build instructions that rebuild the indexed content from a client copy.
+
+    Args:
+        index: Rolling checksums of the current content
+        blocks: Client block signatures in order
+        client_length: Byte length of the client copy
+
+    Returns:
+        List[Instruction]: ("copy", first_block, block_count) and
+        ("literal", data, 0) instructions in order
+    """
+    data = index.data
+    block_size = index.block_size
+    full_blocks = client_length // block_size
+    tail_length = client_length - full_blocks * block_size
+
+    table: Dict[int, List[Tuple[str, int]]] = {}
+    for number, (weak, strong) in enumerate(blocks[:full_blocks]):
+        table.setdefault(weak, []).append((strong, number))
+
+    # A short final client block can only match at the end of the content
+    scan_end = len(data)
+    tail_match: Optional[int] = None
+    if tail_length and len(blocks) > full_blocks and len(data) >= tail_length:
+        tail_start = len(data) - tail_length
+        weak, strong = blocks[full_blocks]
+        if weak_checksum(data[tail_start:]) == weak and index.strong_at(tail_start, tail_length) == strong:
+            tail_match = full_blocks
+            scan_end = tail_start
+
+    instructions: List[Instruction] = []
+
+    def copy(number: int) -> None:
+        if instructions and instructions[-1][0] == "copy":
+            _, first, count = instructions[-1]
+            if first + count == number:
+                instructions[-1] = ("copy", first, count + 1)
+                return
+        instructions.append(("copy", number, 1))
+
+    rolling = index.rolling
+    literal_start = 0
+    i = 0
+    last_offset = scan_end - block_size
+    while i <= last_offset:
+        candidates = table.get(rolling[i])
+        if candidates:
+            strong = index.strong_at(i, block_size)
+            matches = [n for s, n in candidates if s == strong]
+            number = None
+            if matches:
+                # Prefer the block continuing the previous copy so runs coalesce
+                number = matches[0]
+                if instructions and instructions[-1][0] == "copy":
+                    expected = instructions[-1][1] + instructions[-1][2]
+                    if expected in matches:
+                        number = expected
+            if number is not None:
+                if literal_start < i:
+                    instructions.append(("literal", data[literal_start:i], 0))
+                copy(number)
+                i += block_size
+                literal_start = i
+                continue
+        i += 1
+
+    if literal_start < scan_end:
+        instructions.append(("literal", data[literal_start:scan_end], 0))
+    if tail_match is not None:
+        copy(tail_match)
+    return instructions
+
+
+def apply_instructions(client_copy: bytes, block_size: int, instructions: Sequence[Instruction]) -> bytes:
+    """
+    Rebuild content from a client copy and sync instructions.
+
+    Args:
+        client_copy: Bytes of the client's copy
+        block_size: Block size used for the signatures
+        instructions: Instructions produced by match_blocks
+
+    Returns:
+        bytes: Rebuilt content
+    """
+    parts: List[bytes] = []
+    for op, value, count in instructions:
+        if op == "copy":
+            parts.append(client_copy[value * block_size:(value + count) * block_size])
+        else:
+            parts.append(value)
+    return b"".join(parts)
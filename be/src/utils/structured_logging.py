@@ -0,0 +1,150 @@
+"""
+Queue-based, structured logging.
+
+Loggers only enqueue records: `ContextQueueHandler` runs on the calling
+thread (usually the event loop), merges the message and captures the
+fields of the current request, and a `QueueListener` thread formats the
+records and writes them to stderr. Slow terminals, pipes or log shippers
+therefore never block request handling.
+
+High-volume success messages opt into sampling with
+`extra={"sample": True}`. `SamplingFilter` keeps the first occurrence of
+each message template and then one in every N, and adds `sample_rate` so
+log-based counts can be scaled back up. Sampling is keyed by the template,
+so sampled calls must use lazy %-style arguments rather than f-strings.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import sys
+import time
+import uuid
+from datetime import datetime, UTC
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from ..context.request_context import get_request_context
+
+# Attributes every LogRecord has; anything else was passed via `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+MAX_REQUEST_ID_LENGTH = 128
+
+
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """
+    Get the id of a request: the caller's X-Request-ID if usable, else a new one.
+
+    Args:
+        incoming: Value of the X-Request-ID header, if any
+    """
+    if incoming and len(incoming) <= MAX_REQUEST_ID_LENGTH and incoming.isprintable():
+        return incoming
+    return uuid.uuid4().hex
+
+
+class ContextQueueHandler(QueueHandler):
+    """Queue handler that attaches request context fields before enqueueing."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the message and capture request fields on the emitting thread."""
+        context = get_request_context()
+        if context is not None:
+            if context.request_id:
+                record.request_id = context.request_id
+            if context.method:
+                record.method = context.method
+                record.route = context.route or context.path
+                record.latency_ms = round((time.monotonic() - context.started_at) * 1000, 3)
+
+        record.message = record.getMessage()
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        # Arguments and tracebacks may hold objects that are mutated or freed later
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps one in every N records of each message template that opted into sampling."""
+
+    def __init__(self, rate: float):
+        """
+        Initialize the filter.
+
+        Args:
+            rate: Share of sampled records to keep, 0 drops them all and 1 keeps them all
+        """
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self.counts: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sample", False):
+            return True
+        if self.every == 0:
+            return False
+        template = str(record.msg)
+        count = self.counts.get(template, 0)
+        self.counts[template] = count + 1
+        if count % self.every:
+            return False
+        record.sample_rate = 1 / self.every
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats records as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and key != "sample":
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: str, json_format: bool, text_format: str, sample_rate: float) -> None:
+    """
+    Route all logging through a queue and a background writer thread.
+
+    Args:
+        level: Root logger level name, e.g. "INFO"
+        json_format: Write JSON lines instead of `text_format`
+        text_format: logging.Formatter format used when `json_format` is false
+        sample_rate: Share of sampled success records to keep
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    writer = logging.StreamHandler(sys.stderr)
+    writer.setFormatter(JSONFormatter() if json_format else logging.Formatter(text_format))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = ContextQueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(sample_rate))
+
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level))
+    root.addHandler(handler)
+
+    _listener = QueueListener(log_queue, writer, respect_handler_level=True)
+    _listener.start()
+    # Flush records still queued when the process exits
+    atexit.register(_listener.stop)
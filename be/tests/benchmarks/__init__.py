@@ -0,0 +1,8 @@
+"""
+Benchmarks of the document hot paths.
+
+Not collected by pytest; run from the backend directory with
+    python -m tests.benchmarks run --output results.json
+and compare two runs with
+    python -m tests.benchmarks compare baseline.json results.json
+"""
@@ -0,0 +1,134 @@
+"""
+Run the benchmarks or compare two result files.
+
+Usage (from the backend directory):
+    python -m tests.benchmarks run [--output results.json] [--ops 200] [--concurrency 8]
+                                   [--targets service api] [--sizes 1KB 1MB] [--mixes read_90]
+                                   [--baseline baseline.json] [--tolerance 0.1]
+                                   [--faults '{"*": {"latency": "lognormal:0.005:0.5"}}']
+    python -m tests.benchmarks compare baseline.json results.json [--tolerance 0.1]
+
+Store the output of a run on a quiet machine as the baseline and compare
+later runs from the same machine against it; numbers from different
+machines are not comparable. Both commands exit with status 1 when a
+scenario regressed beyond the tolerance. --faults wraps the mock
+repository with FaultInjectingRepository, seeded with --seed; failed
+operations are counted in "errors" instead of stopping the run.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+from datetime import datetime, UTC
+
+# Benchmarks drive the app without a database or rate limits
+os.environ.setdefault("RATE_LIMIT_ENABLED", "False")
+os.environ.setdefault("LOOP_MONITOR_ENABLED", "False")
+
+from src.repositories.fault_injection_repository import FaultInjector, parse_profiles  # noqa: E402
+from .compare import compare  # noqa: E402
+from .harness import measure  # noqa: E402
+from .scenarios import MIXES, SIZES, TARGETS, operation_plan, scenario_names  # noqa: E402
+
+
+async def run_scenario(target_name: str, size: str, mix: str, ops: int, concurrency: int, seed: int, faults) -> dict:
+    injector = FaultInjector(parse_profiles(json.loads(faults)), seed) if faults else None
+    target = TARGETS[target_name](injector)
+    await target.setup(SIZES[size])
+    plan = operation_plan(MIXES[mix], seed)
+    errors = 0
+
+    async def operation(index: int) -> None:
+        nonlocal errors
+        try:
+            if plan[index % len(plan)]:
+                await target.read(index)
+            else:
+                await target.write(index)
+        except Exception:
+            errors += 1
+
+    try:
+        result = await measure(operation, ops, concurrency)
+        result["errors"] = errors
+        return result
+    finally:
+        await target.teardown()
+
+
+async def run(args) -> dict:
+    results = {}
+    for name, (target, size, mix) in scenario_names(args.targets, args.sizes, args.mixes).items():
+        results[name] = await run_scenario(target, size, mix, args.ops, args.concurrency, args.seed, args.faults)
+        result = results[name]
+        print(
+            f"{name:28} {result['throughput']:>10.1f} ops/s  p50 {result['p50_ms']:>9.3f} ms  "
+            f"p99 {result['p99_ms']:>9.3f} ms  peak {result['peak_memory_bytes'] / 1024:>9.0f} KiB",
+            flush=True
+        )
+    return {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "ops": args.ops,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "faults": args.faults
+        },
+        "results": results
+    }
+
+
+def report(regressions) -> int:
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    print(f"{len(regressions)} regression(s)")
+    return 1 if regressions else 0
+
+
+def load_results(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", help="write results as JSON to this file")
+    run_parser.add_argument("--ops", type=int, default=200, help="operations per scenario")
+    run_parser.add_argument("--concurrency", type=int, default=8)
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    run_parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    run_parser.add_argument("--mixes", nargs="+", choices=list(MIXES), default=list(MIXES))
+    run_parser.add_argument("--baseline", help="compare against this result file after running")
+    run_parser.add_argument("--tolerance", type=float, default=0.1)
+    run_parser.add_argument("--faults", help="JSON fault profiles per repository operation")
+
+    compare_parser = commands.add_parser("compare", help="compare a result file against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--tolerance", type=float, default=0.1)
+
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        return report(compare(load_results(args.baseline), load_results(args.current), args.tolerance))
+
+    output = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+    if args.baseline:
+        return report(compare(load_results(args.baseline), output["results"], args.tolerance))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
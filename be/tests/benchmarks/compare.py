@@ -0,0 +1,47 @@
+"""
+Comparison of benchmark results against a stored baseline.
+"""
+
+from typing import Dict, List
+
+# Latency changes smaller than this are timer noise, whatever the ratio
+MIN_LATENCY_DELTA_MS = 0.05
+
+
+def compare(
+    baseline: Dict[str, Dict[str, float]],
+    current: Dict[str, Dict[str, float]],
+    tolerance: float
+) -> List[str]:
+    """
+    Find scenarios that got worse than the baseline by more than `tolerance`.
+
+    Args:
+        baseline: Results of the reference run keyed by scenario name
+        current: Results of the new run keyed by scenario name
+        tolerance: Allowed relative change, e.g. 0.1 for 10%
+
+    Returns:
+        List[str]: One description per regression, empty if there is none
+    """
+    regressions = []
+    for name, before in sorted(baseline.items()):
+        after = current.get(name)
+        if after is None:
+            continue
+
+        if after["throughput"] < before["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {before['throughput']} -> {after['throughput']} ops/s"
+            )
+        for key in ("p50_ms", "p99_ms"):
+            if (
+                after[key] > before[key] * (1 + tolerance)
+                and after[key] - before[key] >= MIN_LATENCY_DELTA_MS
+            ):
+                regressions.append(f"{name}: {key} {before[key]} -> {after[key]}")
+        if after["peak_memory_bytes"] > before["peak_memory_bytes"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: peak memory {before['peak_memory_bytes']} -> {after['peak_memory_bytes']} bytes"
+            )
+    return regressions
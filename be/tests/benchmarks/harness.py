@@ -0,0 +1,69 @@
+"""
+Measurement loop shared by all benchmark scenarios.
+"""
+
+import asyncio
+import gc
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, List
+
+Operation = Callable[[int], Awaitable[object]]
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Get the value below which `fraction` of the samples fall."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _drive(operation: Operation, count: int, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < count:
+            index = next_index
+            next_index += 1
+            started = time.perf_counter()
+            await operation(index)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def measure(operation: Operation, count: int, concurrency: int, warmup: int = 10) -> Dict[str, float]:
+    """
+    Run `operation(i)` `count` times on `concurrency` workers.
+
+    Throughput and latency come from an untraced run; peak memory from a
+    second, shorter run under tracemalloc, which would otherwise distort
+    the timings.
+
+    Returns:
+        Dict[str, float]: ops, throughput (ops/s), p50_ms, p99_ms and peak_memory_bytes
+    """
+    await _drive(operation, warmup, 1)
+    gc.collect()
+
+    started = time.perf_counter()
+    latencies = await _drive(operation, count, concurrency)
+    elapsed = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        await _drive(operation, max(1, count // 10), concurrency)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ops": count,
+        "throughput": round(count / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+        "peak_memory_bytes": peak
+    }
@@ -0,0 +1,210 @@
+"""
+Replay a captured traffic trace against a running app.
+
+Usage (from the backend directory):
+    python -m tests.benchmarks.replay traffic.*.jsonl.gz --base-url http://localhost:8000
+                                      [--speed 1] [--concurrency 64] [--limit 10000]
+
+The traces of several workers are merged into one schedule, aligned on
+the wall-clock start of each capture.
+
+Requests are sent at their captured offsets divided by --speed; --speed 0
+sends them as fast as --concurrency allows. Captured share_ids are mapped
+to documents of the target app: creates are replayed and their new ids
+substituted, and documents first seen in a read or update are created
+beforehand with the captured size. Without captured content, bodies are
+synthetic text of the captured size. Routes with path parameters other
+than {share_id} cannot be rebuilt and are skipped.
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import re
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+import httpx
+from src.services.traffic_capture import read_trace
+from .harness import percentile
+
+CREATE_ROUTE = "/api/v1/documents"
+FILLER = "lorem ipsum dolor sit amet\n"
+PATH_PARAM = re.compile(r"\{(\w+)\}")
+
+
+def synthetic_body(size: int) -> bytes:
+    """Build a JSON document body of about `size` bytes."""
+    content_size = max(1, size - len('{"content": ""}'))
+    return json.dumps({"content": (FILLER * (content_size // len(FILLER) + 1))[:content_size]}).encode()
+
+
+def read_traces(paths: List[str]) -> Tuple[Dict[str, object], Iterator[Dict[str, object]]]:
+    """
+    Merge the traces of several workers by start time.
+
+    Returns:
+        Tuple[Dict[str, object], Iterator[Dict[str, object]]]: Header of the
+        earliest capture and the records of all traces, offsets relative to it
+    """
+    traces = [read_trace(path) for path in paths]
+    header = min((header for header, _ in traces), key=lambda header: header["started_at"])
+    first = datetime.fromisoformat(header["started_at"])
+
+    def shifted(trace_header: Dict[str, object], records: Iterator[Dict[str, object]]):
+        offset = (datetime.fromisoformat(trace_header["started_at"]) - first).total_seconds()
+        for entry in records:
+            entry["t"] += offset
+            yield entry
+
+    return header, heapq.merge(*(shifted(*trace) for trace in traces), key=lambda entry: entry["t"])
+
+
+class Replayer:
+    """Sends captured requests to a target app and collects latencies."""
+
+    def __init__(self, client: httpx.AsyncClient, concurrency: int):
+        self.client = client
+        self.slots = asyncio.Semaphore(concurrency)
+        self.documents: Dict[str, asyncio.Future] = {}
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.skipped: Counter = Counter()
+        self.max_lag = 0.0
+
+    def body(self, entry: Dict[str, object]) -> bytes:
+        if "b" in entry:
+            return entry["b"].encode("utf-8")
+        return synthetic_body(entry["q"]) if entry["q"] else b""
+
+    async def _create(self, body: bytes) -> Optional[str]:
+        response = await self.client.post(CREATE_ROUTE, content=body, headers={"content-type": "application/json"})
+        return response.json().get("share_id") if response.status_code == 201 else None
+
+    async def _seed(self, future: asyncio.Future, size: int) -> None:
+        try:
+            future.set_result(await self._create(synthetic_body(size)))
+        except Exception:
+            future.set_result(None)
+
+    def resolve(self, captured_id: str, size: int) -> asyncio.Future:
+        """Get the future target id of a captured share_id, creating the document if unseen."""
+        future = self.documents.get(captured_id)
+        if future is None:
+            future = self.documents[captured_id] = asyncio.get_running_loop().create_future()
+            asyncio.create_task(self._seed(future, size))
+        return future
+
+    async def send(self, entry: Dict[str, object], path_id: Optional[asyncio.Future], created: Optional[asyncio.Future]):
+        route = entry["r"]
+        try:
+            path = route
+            if path_id is not None:
+                share_id = await path_id
+                if share_id is None:
+                    self.skipped["document not seeded"] += 1
+                    return
+                path = route.replace("{share_id}", share_id)
+
+            body = self.body(entry)
+            headers = {"content-type": "application/json"} if body else {}
+            started = time.perf_counter()
+            try:
+                response = await self.client.request(entry["m"], path, content=body, headers=headers)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                response = None
+                status = type(e).__name__
+            self.latencies[route].append(time.perf_counter() - started)
+            self.statuses[route][status] += 1
+
+            if created is not None:
+                share_id = response.json().get("share_id") if response is not None and response.status_code == 201 else None
+                created.set_result(share_id)
+        finally:
+            if created is not None and not created.done():
+                created.set_result(None)
+            self.slots.release()
+
+    async def replay(self, records, speed: float, limit: Optional[int]) -> float:
+        """Send the records at their captured pace; returns the elapsed seconds."""
+        tasks = set()
+        started = time.perf_counter()
+        for count, entry in enumerate(records):
+            if limit is not None and count >= limit:
+                break
+            route = entry["r"]
+            params = set(PATH_PARAM.findall(route))
+            if route == "unmatched" or params - {"share_id"}:
+                self.skipped[route] += 1
+                continue
+
+            if speed > 0:
+                due = started + entry["t"] / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await self.slots.acquire()
+            if speed > 0:
+                self.max_lag = max(self.max_lag, time.perf_counter() - due)
+
+            path_id = self.resolve(entry["s"], entry["p"]) if params and "s" in entry else None
+            if params and path_id is None:
+                self.skipped["no share_id"] += 1
+                self.slots.release()
+                continue
+            created = None
+            if entry["m"] == "POST" and route == CREATE_ROUTE and "s" in entry:
+                created = self.documents.setdefault(entry["s"], asyncio.get_running_loop().create_future())
+                if created.done():
+                    created = None
+
+            task = asyncio.create_task(self.send(entry, path_id, created))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        return time.perf_counter() - started
+
+    def report(self, elapsed: float) -> str:
+        """Format latency distributions and status counts per route."""
+        lines = [f"{'route':44} {'count':>7} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9}  statuses"]
+        total = 0
+        for route in sorted(self.latencies):
+            samples = self.latencies[route]
+            total += len(samples)
+            statuses = " ".join(f"{status}:{count}" for status, count in sorted(self.statuses[route].items()))
+            lines.append(
+                f"{route:44} {len(samples):>7} {percentile(samples, 0.5) * 1000:>9.2f} "
+                f"{percentile(samples, 0.9) * 1000:>9.2f} {percentile(samples, 0.99) * 1000:>9.2f} "
+                f"{max(samples) * 1000:>9.2f}  {statuses}"
+            )
+        lines.append(f"{total} requests in {elapsed:.1f} s ({total / elapsed if elapsed else 0:.1f}/s), "
+                     f"max schedule lag {self.max_lag * 1000:.1f} ms")
+        if self.skipped:
+            lines.append("skipped: " + ", ".join(f"{reason} ({count})" for reason, count in self.skipped.items()))
+        return "\n".join(lines)
+
+
+async def main(paths: List[str], base_url: str, speed: float, concurrency: int, limit: Optional[int]) -> None:
+    header, records = read_traces(paths)
+    print(f"Replaying capture from {header['started_at']} at {speed or 'max'}x speed, concurrency {concurrency}")
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        replayer = Replayer(client, concurrency)
+        elapsed = await replayer.replay(records, speed, limit)
+    print(replayer.report(elapsed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks.replay")
+    parser.add_argument("trace", nargs="+", help="trace files written by traffic capture, one per worker")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--speed", type=float, default=1.0, help="time compression factor, 0 for no pacing")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--limit", type=int, help="replay at most this many requests")
+    args = parser.parse_args()
+    asyncio.run(main(args.trace, args.base_url, args.speed, args.concurrency, args.limit))
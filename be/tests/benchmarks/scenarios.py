@@ -0,0 +1,151 @@
+"""
+Benchmark targets and the scenario matrix: target x content size x read/write mix.
+
+The service target calls DocumentService directly; the API target sends
+requests through the full ASGI app, middleware included, with in-process
+httpx. The service_revisions target adds what the default configuration
+does on every request: recording revisions, in MockRevisionRepository, and
+tracking accesses. All store documents in MockDocumentRepository, so
+results measure this code and not the database.
+"""
+
+import json
+import logging
+import random
+from typing import Dict, List, Optional
+import httpx
+from src.main import app
+from src.repositories.fault_injection_repository import FaultInjectingRepository, FaultInjector
+from src.models.request_response import DocumentUpdate
+from src.repositories.access_stats_repository import AccessStatsRepository
+from src.services.access_tracker import AccessTracker
+from src.services.document_service import DocumentService, get_document_service
+from src.services.revision_service import RevisionService, latest_revisions
+from src.settings import settings
+from tests.fixtures import MockDocumentRepository, MockHRIDGenerator, MockRevisionRepository
+
+SIZES = {"1KB": 1024, "16KB": 16 * 1024, "256KB": 256 * 1024, "1MB": 1024 * 1024}
+# Share of reads per mix; writes are updates of existing documents, like autosaves
+MIXES = {"read_100": 1.0, "read_90": 0.9, "read_50": 0.5}
+DOCUMENTS = 16
+
+# Client-side request logs are not part of the measured server work
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+async def make_service(size: int, faults: Optional[FaultInjector], revisions: bool = False):
+    """
+    Build the DocumentService of a scenario with DOCUMENTS documents of `size`.
+
+    Documents are stored below the fault layer, so setup never fails. With
+    `revisions`, the service records revisions and tracks accesses like the
+    default configuration; the access tracker is never flushed.
+    """
+    repository = MockDocumentRepository()
+    share_ids = [f"bench-{i}" for i in range(DOCUMENTS)]
+    for share_id in share_ids:
+        await repository.create(share_id, make_content(size, 0))
+    if faults is not None:
+        repository = FaultInjectingRepository(repository, faults)
+    if not revisions:
+        return DocumentService(MockHRIDGenerator(), repository), share_ids
+
+    revision_service = RevisionService(MockRevisionRepository())
+    latest_revisions.clear()
+    for share_id in share_ids:
+        await revision_service.record(share_id, make_content(size, 0))
+    access_tracker = AccessTracker(
+        AccessStatsRepository(),
+        flush_interval=settings.access_tracking_flush_interval,
+        max_pending=settings.access_tracking_max_pending,
+        batch_size=settings.access_tracking_batch_size
+    )
+    return DocumentService(MockHRIDGenerator(), repository, revision_service, access_tracker), share_ids
+
+
+def make_content(size: int, variant: int) -> str:
+    """Build `size` characters of line-oriented text that differs per variant."""
+    line = f"line of document text, revision {variant}\n"
+    return (line * (size // len(line) + 1))[:size]
+
+
+class ServiceTarget:
+    """Calls DocumentService with a mock repository."""
+
+    name = "service"
+    revisions = False
+
+    def __init__(self, faults: Optional[FaultInjector] = None):
+        self.faults = faults
+
+    async def setup(self, size: int) -> None:
+        self.service, self.share_ids = await make_service(size, self.faults, self.revisions)
+        self.updates = [DocumentUpdate(content=make_content(size, variant)) for variant in (1, 2)]
+
+    async def read(self, index: int) -> None:
+        await self.service.get_document(self.share_ids[index % DOCUMENTS])
+
+    async def write(self, index: int) -> None:
+        await self.service.update_document(self.share_ids[index % DOCUMENTS], self.updates[index % 2])
+
+    async def teardown(self) -> None:
+        pass
+
+
+class RevisionsServiceTarget(ServiceTarget):
+    """Calls DocumentService with revision recording and access tracking."""
+
+    name = "service_revisions"
+    revisions = True
+
+
+class APITarget:
+    """Sends HTTP requests through the ASGI app with in-process httpx."""
+
+    name = "api"
+    headers = {"content-type": "application/json"}
+
+    def __init__(self, faults: Optional[FaultInjector] = None):
+        self.faults = faults
+
+    async def setup(self, size: int) -> None:
+        service, self.share_ids = await make_service(size, self.faults)
+        app.dependency_overrides[get_document_service] = lambda: service
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+        # Pre-encoded bodies keep client-side serialization out of the measurement
+        self.updates = [json.dumps({"content": make_content(size, variant)}).encode() for variant in (1, 2)]
+
+    async def read(self, index: int) -> None:
+        response = await self.client.get(f"/api/v1/documents/{self.share_ids[index % DOCUMENTS]}")
+        response.raise_for_status()
+
+    async def write(self, index: int) -> None:
+        response = await self.client.put(
+            f"/api/v1/documents/{self.share_ids[index % DOCUMENTS]}",
+            content=self.updates[index % 2],
+            headers=self.headers
+        )
+        response.raise_for_status()
+
+    async def teardown(self) -> None:
+        await self.client.aclose()
+        app.dependency_overrides.clear()
+
+
+TARGETS = {"service": ServiceTarget, "service_revisions": RevisionsServiceTarget, "api": APITarget}
+
+
+def operation_plan(read_ratio: float, seed: int, length: int = 1000) -> List[bool]:
+    """Get a repeatable sequence of read (True) and write (False) choices."""
+    rng = random.Random(seed)
+    return [rng.random() < read_ratio for _ in range(length)]
+
+
+def scenario_names(targets: List[str], sizes: List[str], mixes: List[str]) -> Dict[str, tuple]:
+    """Map "target/size/mix" names to their (target, size, mix) parameters."""
+    return {
+        f"{target}/{size}/{mix}": (target, size, mix)
+        for target in targets
+        for size in sizes
+        for mix in mixes
+    }
@@ -8,6 +8,7 @@ os.environ["DEBUG"] = "False"
 os.environ["MONGODB_URL"] = "mongodb://localhost:27017"
 os.environ["DATABASE_NAME"] = "test_editer"
 os.environ["HRID_SEED"] = "test-seed-for-testing-123"
+os.environ["RATE_LIMIT_ENABLED"] = "False"
 
 from tests.fixtures import MockHRIDGenerator, MockDocumentRepository
 from src.services.document_service import DocumentService
@@ -4,6 +4,14 @@ Test fixtures and mock implementations for dependency injection.
 
 from .mock_hrid_generator import MockHRIDGenerator
 from .mock_document_repository import MockDocumentRepository
+from .mock_revision_repository import MockRevisionRepository
+from .mock_snapshot_repository import MockSnapshotRepository
+from .mock_collection import MockCollection
 
-__all__ = ["MockHRIDGenerator", "MockDocumentRepository"]
-
+__all__ = [
+    "MockHRIDGenerator",
+    "MockDocumentRepository",
+    "MockRevisionRepository",
+    "MockSnapshotRepository",
+    "MockCollection",
+]
@@ -0,0 +1,151 @@
+"""
+In-memory stand-in for the Motor collection operations used by repositories and jobs.
+"""
+
+import copy
+from types import SimpleNamespace
+from pymongo.errors import DuplicateKeyError
+
+
+def matches(document, query):
+    """Check a document against equality, $lt, $gt and $or conditions; None matches a missing field."""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(document, branch) for branch in condition):
+                return False
+            continue
+        value = document.get(key)
+        if isinstance(condition, dict):
+            if value is None:
+                return False
+            if "$lt" in condition and not value < condition["$lt"]:
+                return False
+            if "$gt" in condition and not value > condition["$gt"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+def apply_update(document, update):
+    """Apply $set, $inc and $max operators to a document in place."""
+    document.update(update.get("$set", {}))
+    for key, amount in update.get("$inc", {}).items():
+        document[key] = document.get(key, 0) + amount
+    for key, value in update.get("$max", {}).items():
+        if document.get(key) is None or value > document[key]:
+            document[key] = value
+
+
+class MockCursor:
+    """Async iterator over a snapshot of documents."""
+
+    def __init__(self, documents):
+        self.documents = iter(documents)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.documents)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length=None):
+        return list(self.documents)
+
+
+class MockDatabase:
+    """Creates collections on first access, like a Motor database."""
+
+    def __init__(self):
+        self.collections = {}
+
+    def __getitem__(self, name):
+        if name not in self.collections:
+            self.collections[name] = MockCollection(self, name)
+        return self.collections[name]
+
+
+class MockCollection:
+    """In-memory collection with unique _id and share_id."""
+
+    def __init__(self, database=None, name="documents"):
+        self.database = database or MockDatabase()
+        self.name = name
+        self.documents = {}
+
+    def with_options(self, **options):
+        return self
+
+    async def create_index(self, keys, **options):
+        return keys
+
+    def find(self, query, batch_size=None, sort=None, limit=0):
+        documents = [copy.deepcopy(d) for d in self.documents.values() if matches(d, query)]
+        for key, direction in reversed(sort or []):
+            documents.sort(key=lambda d: d[key], reverse=direction < 0)
+        return MockCursor(documents[:limit] if limit else documents)
+
+    async def find_one(self, query, projection=None):
+        for document in self.documents.values():
+            if matches(document, query):
+                if projection:
+                    return {k: copy.deepcopy(v) for k, v in document.items() if k == "_id" or k in projection}
+                return copy.deepcopy(document)
+        return None
+
+    async def insert_one(self, document):
+        share_id = document.get("share_id")
+        if document["_id"] in self.documents or (
+            share_id is not None and any(d.get("share_id") == share_id for d in self.documents.values())
+        ):
+            raise DuplicateKeyError("duplicate key")
+        self.documents[document["_id"]] = copy.deepcopy(document)
+        return SimpleNamespace(inserted_id=document["_id"])
+
+    async def replace_one(self, query, document, upsert=False):
+        for key, current in self.documents.items():
+            if matches(current, query):
+                self.documents[key] = copy.deepcopy(document)
+                return SimpleNamespace(matched_count=1)
+        if upsert:
+            await self.insert_one(document)
+        return SimpleNamespace(matched_count=0)
+
+    async def update_one(self, query, update, upsert=False):
+        for current in self.documents.values():
+            if matches(current, query):
+                apply_update(current, update)
+                return SimpleNamespace(matched_count=1)
+        if upsert:
+            await self.insert_one({**query, **update.get("$set", {})})
+        return SimpleNamespace(matched_count=0)
+
+    async def bulk_write(self, requests, ordered=True):
+        matched = 0
+        for request in requests:
+            result = await self.update_one(request._filter, request._doc)
+            matched += result.matched_count
+        return SimpleNamespace(matched_count=matched)
+
+    async def delete_one(self, query):
+        for key, current in self.documents.items():
+            if matches(current, query):
+                del self.documents[key]
+                return SimpleNamespace(deleted_count=1)
+        return SimpleNamespace(deleted_count=0)
+
+    async def find_one_and_update(self, query, update, upsert=False, return_document=None):
+        for current in self.documents.values():
+            if matches(current, query):
+                apply_update(current, update)
+                return copy.deepcopy(current)
+        if upsert:
+            # Like MongoDB, the new document takes the equality fields of the query
+            document = {k: v for k, v in query.items() if not k.startswith("$") and not isinstance(v, dict)}
+            apply_update(document, update)
+            await self.insert_one(document)
+            return copy.deepcopy(document)
+        return None
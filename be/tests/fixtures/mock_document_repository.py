@@ -37,7 +37,7 @@ class MockDocumentRepository:
         self.create_called = True
         
         if self.should_raise_on_create:
-            raise RuntimeError("Mock database error on create")
+            raise RuntimeError("Mock database error on create") from ConnectionError("connection lost")
         
         doc_data = DocumentData(
             id=f"mock-id-{len(self.documents)}",
@@ -66,7 +66,7 @@ class MockDocumentRepository:
         self.find_called = True
         
         if self.should_raise_on_find:
-            raise RuntimeError("Mock database error on find")
+            raise RuntimeError("Mock database error on find") from ConnectionError("connection lost")
         
         return self.documents.get(share_id)
     
@@ -88,7 +88,7 @@ class MockDocumentRepository:
         self.update_called = True
         
         if self.should_raise_on_update:
-            raise RuntimeError("Mock database error on update")
+            raise RuntimeError("Mock database error on update") from ConnectionError("connection lost")
         
         doc_data = self.documents.get(share_id)
         if not doc_data:
@@ -0,0 +1,73 @@
+"""
+Mock revision repository for testing.
+"""
+
+from typing import Dict, List
+from src.protocols.revision_protocol import RevisionData
+
+
+class MockRevisionRepository:
+    """Mock implementation of RevisionRepositoryProtocol for testing."""
+    
+    def __init__(self):
+        """Initialize mock repository with in-memory storage."""
+        self.revisions: Dict[str, Dict[int, RevisionData]] = {}
+        self.should_raise_on_add = False
+    
+    async def add(self, revision: RevisionData) -> None:
+        """Mock revision insert."""
+        if self.should_raise_on_add:
+            raise RuntimeError("Mock database error on revision add")
+        
+        revisions = self.revisions.setdefault(revision.share_id, {})
+        if revision.number in revisions:
+            raise RuntimeError("Mock duplicate revision number")
+        revisions[revision.number] = revision
+    
+    async def replace(self, revision: RevisionData) -> None:
+        """Mock revision overwrite."""
+        self.revisions.setdefault(revision.share_id, {})[revision.number] = revision
+    
+    async def latest_chain(self, share_id: str) -> List[RevisionData]:
+        """Mock lookup of the chain ending at the latest revision."""
+        revisions = self.revisions.get(share_id)
+        if not revisions:
+            return []
+        return await self.chain_for(share_id, max(revisions))
+    
+    async def chain_for(self, share_id: str, number: int) -> List[RevisionData]:
+        """Mock lookup of the chain ending at a given revision."""
+        revisions = self.revisions.get(share_id, {})
+        if number not in revisions:
+            return []
+        
+        chain = []
+        for current in sorted((n for n in revisions if n <= number), reverse=True):
+            chain.append(revisions[current])
+            if revisions[current].is_snapshot:
+                return list(reversed(chain))
+        return []
+    
+    async def list_summaries(self, share_id: str, limit: int) -> List[RevisionData]:
+        """Mock revision listing, newest first."""
+        revisions = self.revisions.get(share_id, {})
+        return [revisions[n] for n in sorted(revisions, reverse=True)[:limit]]
+    
+    async def count(self, share_id: str) -> int:
+        """Mock revision count."""
+        return len(self.revisions.get(share_id, {}))
+    
+    async def delete_before(self, share_id: str, number: int) -> int:
+        """Mock deletion of older revisions."""
+        revisions = self.revisions.get(share_id, {})
+        stale = [n for n in revisions if n < number]
+        for n in stale:
+            del revisions[n]
+        return len(stale)
+    
+    async def find_compactable(self, retention_count: int, limit: int) -> List[str]:
+        """Mock lookup of documents beyond the retention count."""
+        return [
+            share_id for share_id, revisions in self.revisions.items()
+            if revisions and max(revisions) - min(revisions) >= retention_count
+        ][:limit]
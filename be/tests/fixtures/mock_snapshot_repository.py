@@ -0,0 +1,32 @@
+"""
+Mock snapshot repository for testing.
+"""
+
+from typing import Dict, Optional
+from datetime import datetime, UTC
+from src.protocols.snapshot_protocol import SnapshotData
+
+
+class MockSnapshotRepository:
+    """Mock implementation of SnapshotRepositoryProtocol for testing."""
+    
+    def __init__(self):
+        """Initialize mock repository with in-memory storage."""
+        self.snapshots: Dict[str, SnapshotData] = {}
+        self.save_count = 0
+    
+    async def save(self, content_hash: str, share_id: str, content: str) -> SnapshotData:
+        """Mock idempotent snapshot insert."""
+        self.save_count += 1
+        if content_hash not in self.snapshots:
+            self.snapshots[content_hash] = SnapshotData(
+                content_hash=content_hash,
+                share_id=share_id,
+                content=content,
+                created_at=datetime.now(UTC)
+            )
+        return self.snapshots[content_hash]
+    
+    async def find_by_hash(self, content_hash: str) -> Optional[SnapshotData]:
+        """Mock snapshot lookup."""
+        return self.snapshots.get(content_hash)
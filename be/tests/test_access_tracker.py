@@ -0,0 +1,224 @@
+"""
+Unit tests for batched document access tracking.
+"""
+from datetime import datetime, timedelta, UTC
+import pytest
+from bson import ObjectId
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.models.document import DocumentUpdate
+from src.protocols.access_stats_protocol import AccessStatsData
+from src.repositories.access_stats_repository import AccessStatsRepository
+from src.services.access_tracker import AccessTracker, get_access_tracker
+from src.services.database import db_manager
+from src.services.document_service import DocumentService
+from src.services.sharding import ShardConfig, ShardSet
+from src.services.tiering import ARCHIVE_COLLECTION, pack_document
+from src.settings import settings
+from tests.fixtures import MockCollection, MockDocumentRepository, MockHRIDGenerator
+
+
+class MockAccessStatsRepository:
+    """In-memory access stats repository recording each increment call."""
+
+    def __init__(self, share_ids=()):
+        self.stats = {share_id: AccessStatsData(share_id, 0, None) for share_id in share_ids}
+        self.calls = []
+        self.fail = False
+
+    async def increment(self, updates):
+        if self.fail:
+            raise RuntimeError("Database access stats operation failed: unavailable")
+        self.calls.append(dict(updates))
+        for share_id, (views, accessed_at) in updates.items():
+            if share_id in self.stats:
+                current = self.stats[share_id]
+                self.stats[share_id] = AccessStatsData(
+                    share_id, current.view_count + views, max(filter(None, (current.last_accessed_at, accessed_at)))
+                )
+
+    async def find(self, share_id):
+        return self.stats.get(share_id)
+
+
+def make_tracker(repository, max_pending=100, batch_size=100):
+    """Build a tracker that is flushed explicitly by the tests."""
+    return AccessTracker(repository, flush_interval=3600, max_pending=max_pending, batch_size=batch_size)
+
+
+@pytest.mark.asyncio
+class TestAccessTracker:
+    """Test counting accesses in memory and flushing them in bulk."""
+
+    async def test_accesses_are_combined_per_flush(self):
+        """Test that repeated reads of a document become one increment."""
+        repository = MockAccessStatsRepository(["a", "b"])
+        tracker = make_tracker(repository)
+        for _ in range(5):
+            tracker.record("a")
+        tracker.record("b")
+        tracker.record("b", view=False)
+
+        assert await tracker.flush() == 2
+
+        assert len(repository.calls) == 1
+        assert repository.calls[0]["a"][0] == 5
+        assert repository.calls[0]["b"][0] == 1
+        assert repository.stats["b"].last_accessed_at is not None
+        assert tracker.pending == {}
+        assert await tracker.flush() == 0
+        assert len(repository.calls) == 1
+
+    async def test_flush_is_split_into_batches(self):
+        """Test that each repository call holds at most batch_size documents."""
+        repository = MockAccessStatsRepository()
+        tracker = make_tracker(repository, batch_size=2)
+        for i in range(5):
+            tracker.record(f"doc-{i}")
+
+        assert await tracker.flush() == 5
+
+        assert [len(call) for call in repository.calls] == [2, 2, 1]
+
+    async def test_failed_flush_is_retried(self):
+        """Test that accesses of a failed flush are kept and merged with new ones."""
+        repository = MockAccessStatsRepository(["doc"])
+        tracker = make_tracker(repository)
+        tracker.record("doc")
+        tracker.record("doc")
+        repository.fail = True
+
+        assert await tracker.flush() == 0
+        tracker.record("doc")
+        repository.fail = False
+        await tracker.flush()
+
+        assert repository.stats["doc"].view_count == 3
+
+    async def test_pending_documents_are_bounded(self):
+        """Test that accesses to new documents are dropped once max_pending is reached."""
+        tracker = make_tracker(MockAccessStatsRepository(), max_pending=2)
+        tracker.record("a")
+        tracker.record("b")
+        tracker.record("c")
+        tracker.record("a")
+
+        assert sorted(tracker.pending) == ["a", "b"]
+        assert tracker.pending["a"].views == 2
+        assert tracker.stats() == {"pending": 2, "dropped": 1}
+
+    async def test_stop_flushes_pending_accesses(self):
+        """Test that stopping the tracker writes what has not been flushed yet."""
+        repository = MockAccessStatsRepository(["doc"])
+        tracker = make_tracker(repository)
+        tracker.start()
+        tracker.record("doc")
+
+        await tracker.stop()
+
+        assert repository.stats["doc"].view_count == 1
+        assert tracker.pending == {}
+
+    async def test_stats_include_pending_views(self):
+        """Test that statistics add unflushed views to the stored ones."""
+        repository = MockAccessStatsRepository(["doc"])
+        tracker = make_tracker(repository)
+        tracker.record("doc")
+        await tracker.flush()
+        tracker.record("doc")
+
+        stats = await tracker.get_stats("doc")
+
+        assert stats.view_count == 2
+        assert stats.pending_views == 1
+        assert stats.last_accessed_at > datetime.now(UTC) - timedelta(minutes=1)
+        assert await tracker.get_stats("missing") is None
+
+    async def test_document_service_records_accesses(self):
+        """Test that reads count as views and updates only as accesses."""
+        tracker = make_tracker(MockAccessStatsRepository())
+        repository = MockDocumentRepository()
+        service = DocumentService(MockHRIDGenerator(), repository, access_tracker=tracker)
+        await repository.create("doc", "content")
+
+        await service.get_document("doc")
+        await service.update_document("doc", DocumentUpdate(content="edited"))
+        await service.get_document("missing")
+
+        assert list(tracker.pending) == ["doc"]
+        assert tracker.pending["doc"].views == 1
+
+
+@pytest.mark.asyncio
+class TestAccessStatsRepository:
+    """Test bulk writes of access statistics."""
+
+    @pytest.fixture
+    def collection(self, monkeypatch):
+        """Route the repository to one in-memory shard."""
+        shards = ShardSet([ShardConfig("a", "mongodb://localhost:27017", "editer")])
+        shard = shards.shards["a"]
+        shard.collection = MockCollection()
+        monkeypatch.setattr(db_manager, "shards", shards)
+        return shard.collection
+
+    async def test_increment_and_find(self, collection):
+        """Test that increments add views, keep the latest access and skip missing documents."""
+        now = datetime.now(UTC)
+        await collection.insert_one({"_id": ObjectId(), "share_id": "doc", "content": "x"})
+        repository = AccessStatsRepository()
+
+        await repository.increment({"doc": (3, now), "missing": (1, now)})
+        await repository.increment({"doc": (2, now - timedelta(hours=1))})
+
+        stats = await repository.find("doc")
+        assert stats.view_count == 5
+        assert stats.last_accessed_at == now
+        assert len(collection.documents) == 1
+        assert await repository.find("missing") is None
+
+    async def test_find_archived_document(self, collection, monkeypatch):
+        """Test that statistics of an archived document are read without rehydrating it."""
+        monkeypatch.setattr(settings, "tiering_enabled", True)
+        document = {"_id": ObjectId(), "share_id": "doc", "content": "x", "view_count": 7}
+        await collection.database[ARCHIVE_COLLECTION].insert_one(pack_document(document))
+
+        stats = await AccessStatsRepository().find("doc")
+
+        assert stats.view_count == 7
+        assert collection.documents == {}
+
+
+class TestStatsEndpoint:
+    """Test the document statistics endpoint."""
+
+    def test_get_stats(self):
+        """Test statistics of a tracked and a missing document."""
+        tracker = make_tracker(MockAccessStatsRepository(["doc"]))
+        tracker.record("doc")
+        app.dependency_overrides[get_access_tracker] = lambda: tracker
+
+        try:
+            with TestClient(app) as client:
+                response = client.get("/api/v1/documents/doc/stats")
+                assert response.status_code == status.HTTP_200_OK
+                assert response.json()["view_count"] == 1
+                assert response.json()["pending_views"] == 1
+
+                response = client.get("/api/v1/documents/missing/stats")
+                assert response.status_code == status.HTTP_404_NOT_FOUND
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_tracking_disabled(self):
+        """Test that statistics are not found when tracking is disabled."""
+        app.dependency_overrides[get_access_tracker] = lambda: None
+
+        try:
+            with TestClient(app) as client:
+                response = client.get("/api/v1/documents/doc/stats")
+                assert response.status_code == status.HTTP_404_NOT_FOUND
+        finally:
+            app.dependency_overrides.clear()
@@ -0,0 +1,177 @@
+"""
+Unit tests for adaptive concurrency limiting and load shedding.
+"""
+import asyncio
+import pytest
+from fastapi import FastAPI, HTTPException, status
+from fastapi.testclient import TestClient
+
+from src.context.request_context import get_request_context
+from src.middleware.admission import AdmissionMiddleware
+from src.middleware.request_context import RequestContextMiddleware
+from src.services import admission_controller as admission_module
+from src.services.admission_controller import AdaptiveLimiter, AdmissionController, Overloaded, admission_metrics
+
+
+def make_limiter(**overrides) -> AdaptiveLimiter:
+    """Build a small limiter for tests."""
+    options = dict(
+        name="test",
+        initial_limit=2,
+        min_limit=1,
+        max_limit=10,
+        max_queue=1,
+        max_wait=0.05,
+        target_latency=0.1
+    )
+    options.update(overrides)
+    return AdaptiveLimiter(**options)
+
+
+@pytest.mark.asyncio
+class TestAdaptiveLimiter:
+    """Test AdaptiveLimiter admission and adaptation."""
+    
+    async def test_admits_up_to_limit(self):
+        """Test that requests within the limit are admitted immediately."""
+        limiter = make_limiter()
+        
+        await limiter.acquire()
+        await limiter.acquire()
+        
+        assert limiter.in_flight == 2
+    
+    async def test_queued_request_gets_released_slot(self):
+        """Test that a waiting request is admitted when a slot frees up."""
+        limiter = make_limiter(max_wait=1.0)
+        await limiter.acquire()
+        await limiter.acquire()
+        
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+        
+        limiter.release(0.01)
+        await waiter
+        
+        assert limiter.in_flight == 2
+        assert limiter.queue_depth == 0
+    
+    async def test_sheds_when_queue_is_full(self):
+        """Test that requests beyond the queue bound are shed immediately."""
+        limiter = make_limiter(max_wait=1.0)
+        await limiter.acquire()
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        
+        with pytest.raises(Overloaded, match="queue_full"):
+            await limiter.acquire()
+        
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.stats()["shed"]["queue_full"] == 1
+        assert limiter.queue_depth == 0
+    
+    async def test_sheds_after_bounded_wait(self):
+        """Test that queued requests are shed after max_wait."""
+        limiter = make_limiter()
+        await limiter.acquire()
+        await limiter.acquire()
+        
+        with pytest.raises(Overloaded, match="timeout"):
+            await limiter.acquire()
+        
+        assert limiter.queue_depth == 0
+        assert limiter.stats()["shed"]["timeout"] == 1
+    
+    async def test_slow_requests_decrease_limit(self):
+        """Test multiplicative decrease on slow completions."""
+        limiter = make_limiter(initial_limit=10, backoff=0.5)
+        await limiter.acquire()
+        
+        limiter.release(1.0)
+        
+        assert limiter.limit == 5
+    
+    async def test_fast_saturated_requests_increase_limit(self):
+        """Test additive increase while saturated."""
+        limiter = make_limiter(initial_limit=2)
+        await limiter.acquire()
+        await limiter.acquire()
+        
+        limiter.release(0.01)
+        
+        assert limiter.limit == pytest.approx(2.5)
+
+
+class TestAdmissionMiddleware:
+    """Test the admission middleware."""
+    
+    def test_shed_requests_get_503(self):
+        """Test that shed requests get 503 with Retry-After."""
+        limiter = make_limiter(initial_limit=1, max_limit=1, max_queue=0)
+        controller = AdmissionController({"reads": limiter, "writes": limiter}, retry_after=3)
+        app = FastAPI()
+        
+        @app.get("/api/v1/items")
+        async def items():
+            return {"ok": True}
+        
+        app.add_middleware(AdmissionMiddleware, controller=controller)
+        
+        with TestClient(app) as client:
+            admitted = client.get("/api/v1/items")
+            limiter.in_flight = 1  # occupy the only slot
+            shed = client.get("/api/v1/items")
+        
+        assert admitted.status_code == status.HTTP_200_OK
+        assert shed.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert shed.headers["retry-after"] == "3"
+    
+    def test_only_overload_shrinks_limit(self):
+        """Test that database and deadline errors keep the limit while rejected work shrinks it."""
+        limiter = make_limiter(initial_limit=4, target_latency=10.0)
+        controller = AdmissionController({"reads": limiter, "writes": limiter})
+        app = FastAPI()
+        
+        @app.get("/api/v1/unavailable")
+        async def unavailable():
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        @app.get("/api/v1/timeout")
+        async def timeout():
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT)
+        
+        @app.get("/api/v1/overloaded")
+        async def overloaded():
+            get_request_context().overloaded = True
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        app.add_middleware(AdmissionMiddleware, controller=controller)
+        app.add_middleware(RequestContextMiddleware)
+        
+        with TestClient(app) as client:
+            client.get("/api/v1/unavailable")
+            client.get("/api/v1/timeout")
+            assert limiter.limit == 4
+            
+            client.get("/api/v1/overloaded")
+            assert limiter.limit < 4
+
+
+class TestAdmissionMetrics:
+    """Test the exported limiter metrics."""
+    
+    def test_metrics_include_queue_depth_and_shed_counts(self, monkeypatch):
+        """Test that each limiter reports its gauges and shed counts by reason."""
+        limiter = make_limiter(name="reads")
+        limiter.shed["queue_full"] = 3
+        monkeypatch.setattr(admission_module, "admission_controller", AdmissionController({"reads": limiter}))
+        
+        metrics = admission_metrics()
+        
+        assert metrics["admission_limit"]["samples"] == [[["reads"], 2]]
+        assert metrics["admission_queue_depth"]["samples"] == [[["reads"], 0]]
+        assert [["reads", "queue_full"], 3] in metrics["admission_shed_total"]["samples"]
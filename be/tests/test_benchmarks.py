@@ -0,0 +1,73 @@
+"""
+Unit tests for the benchmark harness and baseline comparison.
+"""
+import pytest
+
+from tests.benchmarks.compare import compare
+from tests.benchmarks.harness import measure, percentile
+
+
+def result(throughput=1000.0, p50_ms=1.0, p99_ms=5.0, peak_memory_bytes=1000):
+    """Build one scenario result."""
+    return {
+        "ops": 100,
+        "throughput": throughput,
+        "p50_ms": p50_ms,
+        "p99_ms": p99_ms,
+        "peak_memory_bytes": peak_memory_bytes
+    }
+
+
+class TestCompare:
+    """Test regression detection against a baseline."""
+
+    def test_changes_within_tolerance_pass(self):
+        """Test that small changes and improvements are not regressions."""
+        baseline = {"api/1KB/read_90": result()}
+        current = {"api/1KB/read_90": result(throughput=950.0, p50_ms=0.5, p99_ms=5.4, peak_memory_bytes=1050)}
+
+        assert compare(baseline, current, tolerance=0.1) == []
+
+    def test_regressions_are_reported(self):
+        """Test that each metric worse than the tolerance is reported."""
+        baseline = {"api/1KB/read_90": result()}
+        current = {"api/1KB/read_90": result(throughput=800.0, p99_ms=7.0, peak_memory_bytes=2000)}
+
+        regressions = compare(baseline, current, tolerance=0.1)
+
+        assert len(regressions) == 3
+        assert regressions[0].startswith("api/1KB/read_90: throughput")
+
+    def test_tiny_latency_changes_are_noise(self):
+        """Test that sub-threshold latency changes are ignored however large the ratio."""
+        baseline = {"service/1KB/read_100": result(p50_ms=0.005, p99_ms=0.01)}
+        current = {"service/1KB/read_100": result(p50_ms=0.01, p99_ms=0.02)}
+
+        assert compare(baseline, current, tolerance=0.1) == []
+
+
+class TestPercentile:
+    """Test latency percentiles."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        assert percentile(list(range(100)), 0.5) == 50
+        assert percentile(list(range(100)), 0.99) == 99
+
+
+@pytest.mark.asyncio
+class TestHarness:
+    """Test the measurement loop."""
+
+    async def test_measure_runs_every_operation(self):
+        """Test that every index is run once and results are reported."""
+        seen = []
+
+        async def operation(index):
+            seen.append(index)
+
+        stats = await measure(operation, count=50, concurrency=4, warmup=0)
+
+        assert sorted(seen[:50]) == list(range(50))
+        assert stats["ops"] == 50
+        assert stats["p99_ms"] >= stats["p50_ms"]
@@ -0,0 +1,336 @@
+"""
+Unit tests for the database circuit breaker and serve-stale fallback.
+"""
+import pytest
+from datetime import datetime, UTC
+from fastapi import status
+from fastapi.testclient import TestClient
+from pymongo.errors import DuplicateKeyError, ServerSelectionTimeoutError
+
+from src.context.deadline import DeadlineExceeded
+from src.context.request_context import RequestContext, reset_request_context, set_request_context
+from src.main import app
+from src.repositories.circuit_breaker_repository import CircuitBreakerRepository
+from src.services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    is_infrastructure_error,
+)
+from src.services.document_service import DocumentService, get_document_service
+from src.utils.lru_cache import LRUCache
+from tests.fixtures import MockHRIDGenerator, MockDocumentRepository
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_breaker(clock=None, **overrides) -> CircuitBreaker:
+    """Build a small breaker for tests."""
+    options = dict(
+        name="test",
+        failure_rate=0.5,
+        min_calls=4,
+        window_seconds=10.0,
+        open_seconds=5.0,
+        half_open_calls=2,
+        clock=clock or FakeClock()
+    )
+    options.update(overrides)
+    return CircuitBreaker(**options)
+
+
+def trip(breaker: CircuitBreaker) -> None:
+    """Record enough failures to open the breaker."""
+    while breaker.state != OPEN:
+        assert breaker.allow()
+        breaker.record_failure()
+
+
+class TestCircuitBreaker:
+    """Test CircuitBreaker state transitions."""
+
+    def test_opens_at_failure_rate(self):
+        """Test that the breaker opens once the failure rate is reached."""
+        breaker = make_breaker()
+
+        for ok in (True, True, False):
+            breaker.allow()
+            breaker.record_success() if ok else breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert breaker.times_opened == 1
+
+    def test_needs_min_calls(self):
+        """Test that a few failures on low traffic do not open the breaker."""
+        breaker = make_breaker()
+
+        for _ in range(breaker.min_calls - 1):
+            breaker.allow()
+            breaker.record_failure()
+
+        assert breaker.state == CLOSED
+
+    def test_old_outcomes_leave_the_window(self):
+        """Test that failures outside the rolling window are forgotten."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        for _ in range(3):
+            breaker.allow()
+            breaker.record_failure()
+
+        clock.now = 11.0
+        breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == CLOSED
+        assert breaker.stats()["calls"] == 1
+
+    def test_rejects_while_open(self):
+        """Test that calls fail fast while the breaker is open."""
+        breaker = make_breaker()
+        trip(breaker)
+
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.check()
+
+        assert exc_info.value.retry_after == 5.0
+        assert breaker.rejected == 1
+
+    def test_half_open_probes_close_the_breaker(self):
+        """Test that enough successful probes restore normal operation."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        trip(breaker)
+        clock.now = 5.0
+
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record_success()
+        breaker.record_success()
+
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+    def test_failed_probe_reopens(self):
+        """Test that a failing probe opens the breaker again."""
+        clock = FakeClock()
+        breaker = make_breaker(clock)
+        trip(breaker)
+        clock.now = 5.0
+
+        breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+    def test_released_probe_frees_its_slot(self):
+        """Test that probes ending without an outcome do not block probing."""
+        clock = FakeClock()
+        breaker = make_breaker(clock, half_open_calls=1)
+        trip(breaker)
+        clock.now = 5.0
+
+        assert breaker.allow()
+        breaker.release()
+
+        assert breaker.allow()
+
+
+class TestLastKnownGoodCache:
+    """Test the weight bound used for the last-known-good cache."""
+
+    def test_evicts_by_weight(self):
+        """Test that the oldest entries are evicted once the weight bound is hit."""
+        cache = LRUCache(10, max_weight=10, weigher=len)
+        cache.set("a", "aaaa")
+        cache.set("b", "bbbb")
+        cache.set("c", "cccc")
+
+        assert "a" not in cache
+        assert cache.weight == 8
+
+    def test_skips_values_heavier_than_bound(self):
+        """Test that a single oversized value is not cached."""
+        cache = LRUCache(10, max_weight=3, weigher=len)
+        cache.set("a", "aa")
+        cache.set("a", "aaaa")
+
+        assert "a" not in cache
+        assert cache.weight == 0
+
+
+@pytest.mark.asyncio
+class TestCircuitBreakerRepository:
+    """Test the repository wrapper."""
+
+    @pytest.fixture
+    def repository(self):
+        """Wrapper around a mock repository with its own breaker and cache."""
+        return CircuitBreakerRepository(MockDocumentRepository(), make_breaker(), LRUCache(10))
+
+    async def test_serves_stale_read_when_open(self, repository):
+        """Test that reads fall back to the last-known-good copy while open."""
+        await repository.create("cached-doc", "hello")
+        trip(repository.breaker)
+        context = RequestContext("GET", "/")
+        token = set_request_context(context)
+
+        try:
+            result = await repository.find_by_share_id("cached-doc")
+        finally:
+            reset_request_context(token)
+
+        assert result.content == "hello"
+        assert context.stale_age is not None
+        assert not repository.repository.find_called
+
+    async def test_serves_stale_read_on_failure(self, repository):
+        """Test that a failed read is answered from cache and counted."""
+        await repository.find_by_share_id("missing")
+        await repository.create("cached-doc", "hello")
+        repository.repository.should_raise_on_find = True
+
+        result = await repository.find_by_share_id("cached-doc")
+
+        assert result.content == "hello"
+        assert repository.breaker.stats()["failures"] == 1
+
+    async def test_uncached_read_fails_fast_when_open(self, repository):
+        """Test that reads without a cached copy fail fast while open."""
+        trip(repository.breaker)
+
+        with pytest.raises(CircuitOpenError):
+            await repository.find_by_share_id("unknown")
+
+    async def test_writes_fail_fast_when_open(self, repository):
+        """Test that writes are rejected without touching the database."""
+        trip(repository.breaker)
+
+        with pytest.raises(CircuitOpenError):
+            await repository.update("doc", "content", datetime.now(UTC))
+
+        assert not repository.repository.update_called
+
+    async def test_write_failure_is_counted(self, repository):
+        """Test that failed writes count towards opening the breaker."""
+        repository.repository.should_raise_on_create = True
+
+        for _ in range(repository.breaker.min_calls):
+            with pytest.raises(RuntimeError):
+                await repository.create("doc", "content")
+
+        assert repository.breaker.state == OPEN
+
+
+    async def test_client_errors_are_not_counted(self, repository):
+        """Test that short client deadlines and duplicate keys do not open the breaker."""
+        async def fail(share_id, content):
+            raise error
+
+        repository.repository.create = fail
+        context = RequestContext("PUT", "/")
+        context.client_deadline = True
+        token = set_request_context(context)
+        try:
+            for error in (DeadlineExceeded("deadline"), RuntimeError("duplicate")):
+                error.__context__ = DuplicateKeyError("duplicate key")
+                for _ in range(repository.breaker.min_calls):
+                    with pytest.raises((RuntimeError, TimeoutError)):
+                        await repository.create("doc", "content")
+        finally:
+            reset_request_context(token)
+
+        assert repository.breaker.state == CLOSED
+        assert repository.breaker.stats()["failures"] == 0
+
+
+class TestInfrastructureErrors:
+    """Test which errors count as database failures."""
+
+    def test_classification(self):
+        """Test that connection errors and server timeouts count, caller errors do not."""
+        def wrapped(cause):
+            try:
+                raise cause
+            except Exception:
+                try:
+                    raise RuntimeError("Database operation failed")
+                except RuntimeError as e:
+                    return e
+
+        assert is_infrastructure_error(wrapped(ServerSelectionTimeoutError("no servers")))
+        assert is_infrastructure_error(wrapped(ConnectionError("reset")))
+        assert is_infrastructure_error(DeadlineExceeded("route default ran out"))
+        assert not is_infrastructure_error(wrapped(DuplicateKeyError("duplicate key")))
+        assert not is_infrastructure_error(RuntimeError("unrelated"))
+
+        context = RequestContext("GET", "/")
+        context.client_deadline = True
+        token = set_request_context(context)
+        try:
+            assert not is_infrastructure_error(DeadlineExceeded("client deadline"))
+        finally:
+            reset_request_context(token)
+
+
+class TestCircuitBreakerEndpoints:
+    """Test breaker behavior through the API."""
+
+    def test_open_circuit_returns_503(self):
+        """Test that writes are rejected with 503 and Retry-After."""
+        repository = CircuitBreakerRepository(MockDocumentRepository(), make_breaker(), LRUCache(10))
+        trip(repository.breaker)
+        app.dependency_overrides[get_document_service] = lambda: DocumentService(MockHRIDGenerator(), repository)
+
+        try:
+            with TestClient(app) as client:
+                response = client.put("/api/v1/documents/doc", json={"content": "new"})
+
+                assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+                assert response.headers["retry-after"] == "5"
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_stale_read_has_staleness_headers(self):
+        """Test that stale responses carry Warning and Age headers."""
+        repository = CircuitBreakerRepository(MockDocumentRepository(), make_breaker(), LRUCache(10))
+        app.dependency_overrides[get_document_service] = lambda: DocumentService(MockHRIDGenerator(), repository)
+
+        try:
+            with TestClient(app) as client:
+                client.portal.call(repository.create, "stale-doc", "hello")
+                trip(repository.breaker)
+
+                response = client.get("/api/v1/documents/stale-doc")
+
+                assert response.status_code == status.HTTP_200_OK
+                assert response.json()["content"] == "hello"
+                assert "Stale" in response.headers["warning"]
+                assert response.headers["age"] == "0"
+        finally:
+            app.dependency_overrides.clear()
+
+    def test_health_reports_breaker_state(self):
+        """Test that /health includes the breaker state."""
+        with TestClient(app) as client:
+            response = client.get("/health")
+
+        assert response.json()["circuit_breaker"]["state"] in (CLOSED, OPEN, HALF_OPEN)
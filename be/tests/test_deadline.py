@@ -0,0 +1,117 @@
+"""
+Unit tests for per-request deadline propagation.
+"""
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from src.context.deadline import DeadlineExceeded, check_deadline, deadline_scope, remaining_time
+from src.main import app
+from src.middleware.request_context import RequestContextMiddleware, request_timeout_ms
+from src.models.request_response import DocumentCreate
+from src.services.database import mongo_deadline
+from src.services.document_service import DocumentService, get_document_service
+from src.settings import settings
+from tests.fixtures import MockHRIDGenerator, MockDocumentRepository
+
+
+class TestRequestTimeout:
+    """Test deadline resolution from headers and route defaults."""
+    
+    def test_route_defaults(self):
+        """Test that reads and writes get their own default budgets."""
+        assert request_timeout_ms("GET", []) == settings.request_timeout_read_ms
+        assert request_timeout_ms("PUT", []) == settings.request_timeout_write_ms
+    
+    def test_header_overrides_default(self):
+        """Test that clients can set their own budget."""
+        assert request_timeout_ms("GET", [(b"x-request-timeout-ms", b"250")]) == 250
+    
+    def test_header_is_capped(self):
+        """Test that client budgets are capped."""
+        headers = [(b"x-request-timeout-ms", b"99999999")]
+        
+        assert request_timeout_ms("GET", headers) == settings.request_timeout_max_ms
+    
+    def test_invalid_header_falls_back(self):
+        """Test that malformed headers are ignored."""
+        headers = [(b"x-request-timeout-ms", b"soon")]
+        
+        assert request_timeout_ms("GET", headers) == settings.request_timeout_read_ms
+
+
+class TestDeadlineScope:
+    """Test deadline helpers."""
+    
+    def test_no_deadline_outside_requests(self):
+        """Test that there is no deadline by default."""
+        assert remaining_time() is None
+        check_deadline()
+    
+    def test_expired_deadline_raises(self):
+        """Test that an expired deadline fails fast."""
+        with deadline_scope(0):
+            with pytest.raises(DeadlineExceeded):
+                check_deadline()
+    
+    def test_nested_scope_cannot_extend_parent(self):
+        """Test that nested scopes keep the tighter deadline."""
+        with deadline_scope(1):
+            with deadline_scope(100):
+                assert remaining_time() <= 1
+    
+    def test_mongo_deadline_fails_fast_when_expired(self):
+        """Test that no database call is attempted after the deadline."""
+        with deadline_scope(0):
+            with pytest.raises(DeadlineExceeded):
+                with mongo_deadline("find"):
+                    pass
+
+
+@pytest.mark.asyncio
+class TestDocumentServiceDeadline:
+    """Test deadline handling in DocumentService."""
+    
+    async def test_expired_deadline_is_not_wrapped(self, document_service, mock_document_repository):
+        """Test that deadline errors surface as TimeoutError, not RuntimeError."""
+        with deadline_scope(0):
+            with pytest.raises(DeadlineExceeded):
+                await document_service.create_document(DocumentCreate(content="late"))
+        
+        assert not mock_document_repository.create_called
+
+
+class TestDeadlineMiddleware:
+    """Test deadline propagation through HTTP requests."""
+    
+    def test_deadline_is_visible_to_handlers(self):
+        """Test that handlers see the deadline set from the header."""
+        mini_app = FastAPI()
+        
+        @mini_app.get("/remaining")
+        async def remaining():
+            return {"remaining": remaining_time()}
+        
+        mini_app.add_middleware(RequestContextMiddleware)
+        
+        with TestClient(mini_app) as client:
+            response = client.get("/remaining", headers={"X-Request-Timeout-Ms": "500"})
+        
+        assert 0 < response.json()["remaining"] <= 0.5
+    
+    def test_deadline_exceeded_returns_504(self):
+        """Test that deadline errors map to 504."""
+        class ExpiredRepository(MockDocumentRepository):
+            async def find_by_share_id(self, share_id):
+                raise DeadlineExceeded("Deadline exceeded during find")
+        
+        mock_service = DocumentService(MockHRIDGenerator(), ExpiredRepository())
+        app.dependency_overrides[get_document_service] = lambda: mock_service
+        
+        try:
+            with TestClient(app) as client:
+                response = client.get("/api/v1/documents/slow")
+                
+                assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+        finally:
+            app.dependency_overrides.clear()
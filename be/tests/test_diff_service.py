@@ -0,0 +1,200 @@
+"""
+Unit tests for the line-hash diff and the diff endpoint.
+"""
+import difflib
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services import diff_service as diff_service_module
+from src.services.diff_service import DiffService, _cached_weight, get_diff_service
+from src.settings import settings
+from src.utils.diff import DiffTimeout, DiffTooLarge, diff_texts, render_unified
+from src.utils.lru_cache import LRUCache
+from tests.fixtures import MockDocumentRepository
+
+
+@pytest.fixture
+def diff_service(mock_document_repository):
+    """Fixture providing a DiffService with a private cache."""
+    return DiffService(mock_document_repository, cache=LRUCache(16))
+
+
+class TestDiffTexts:
+    """Test the diff algorithm."""
+    
+    def test_unified_output_matches_difflib(self):
+        """Test that unified output matches difflib for a simple edit."""
+        a = "".join(f"line {i}\n" for i in range(20))
+        b = a.replace("line 5\n", "line five\n") + "line 20\n"
+        
+        expected = "".join(difflib.unified_diff(
+            a.splitlines(keepends=True), b.splitlines(keepends=True), "a", "b"
+        ))
+        
+        assert render_unified(diff_texts(a, b), "a", "b") == expected
+    
+    def test_counts_added_and_removed_lines(self):
+        """Test change statistics."""
+        result = diff_texts("a\nb\nc", "a\nc\nd\ne")
+        
+        assert result.removed == 1
+        assert result.added == 2
+    
+    def test_identical_texts_have_no_hunks(self):
+        """Test that identical inputs produce an empty diff."""
+        assert diff_texts("same\ntext", "same\ntext").hunks == []
+    
+    def test_edit_distance_cap(self):
+        """Test that completely different inputs respect max_edits."""
+        a = "\n".join(f"a{i}" for i in range(500))
+        b = "\n".join(f"b{i}" for i in range(500))
+        
+        with pytest.raises(DiffTooLarge):
+            diff_texts(a, b, max_edits=100)
+    
+    def test_timeout(self):
+        """Test that the deadline is enforced."""
+        a = "\n".join(f"a{i}" for i in range(3000))
+        b = "\n".join(f"b{i}" for i in range(3000))
+        
+        with pytest.raises(DiffTimeout):
+            diff_texts(a, b, timeout=0)
+    
+    def test_output_truncation(self):
+        """Test that hunks beyond max_output_lines are dropped."""
+        a = "".join(f"line {i}\n" for i in range(100))
+        b = a.replace("line 10\n", "x\n").replace("line 90\n", "y\n")
+        
+        result = diff_texts(a, b, context=0, max_output_lines=2)
+        
+        assert len(result.hunks) == 1
+        assert result.truncated
+
+
+@pytest.mark.asyncio
+class TestDiffService:
+    """Test DiffService diff_documents method."""
+    
+    async def test_diff_documents(self, diff_service, mock_document_repository):
+        """Test diffing two stored documents."""
+        await mock_document_repository.create("a", "one\ntwo\n")
+        await mock_document_repository.create("b", "one\nthree\n")
+        
+        result = await diff_service.diff_documents("a", "b", format="structured")
+        
+        assert result.status == "ok"
+        assert result.hunks[0].lines == [" one", "-two", "+three"]
+        assert result.unified is None
+    
+    async def test_identical_documents(self, diff_service, mock_document_repository):
+        """Test that identical content short-circuits."""
+        await mock_document_repository.create("a", "same")
+        await mock_document_repository.create("b", "same")
+        
+        result = await diff_service.diff_documents("a", "b")
+        
+        assert result.identical
+    
+    async def test_missing_document_returns_none(self, diff_service, mock_document_repository):
+        """Test that a missing document returns None."""
+        await mock_document_repository.create("a", "text")
+        
+        assert await diff_service.diff_documents("a", "missing") is None
+    
+    async def test_results_are_cached_by_content(self, diff_service, mock_document_repository):
+        """Test that diffs are cached by content hash pair."""
+        await mock_document_repository.create("a", "one\n")
+        await mock_document_repository.create("b", "two\n")
+        await mock_document_repository.create("c", "one\n")
+        
+        await diff_service.diff_documents("a", "b")
+        await diff_service.diff_documents("c", "b")
+        
+        assert diff_service.cache.hits == 1
+    
+    async def test_cache_is_bounded_by_output_size(self, mock_document_repository):
+        """Test that a diff larger than the cache byte bound is not kept."""
+        diff_service = DiffService(mock_document_repository, cache=LRUCache(16, max_weight=100, weigher=_cached_weight))
+        await mock_document_repository.create("a", "".join(f"line {i}\n" for i in range(50)))
+        await mock_document_repository.create("b", "".join(f"changed {i}\n" for i in range(50)))
+        await mock_document_repository.create("c", "one\n")
+        await mock_document_repository.create("d", "two\n")
+        
+        await diff_service.diff_documents("a", "b")
+        await diff_service.diff_documents("c", "d")
+        
+        assert len(diff_service.cache) == 1
+        assert 0 < diff_service.cache.weight <= 100
+    
+    async def test_too_large_input(self, diff_service, mock_document_repository, monkeypatch):
+        """Test graceful degradation for oversized inputs."""
+        monkeypatch.setattr(settings, "diff_max_input_size", 10)
+        await mock_document_repository.create("a", "x" * 20)
+        await mock_document_repository.create("b", "y" * 20)
+        
+        result = await diff_service.diff_documents("a", "b")
+        
+        assert result.status == "too_large"
+        assert result.unified is None
+    
+    async def test_large_input_runs_off_loop(self, diff_service, mock_document_repository, monkeypatch):
+        """Test that inputs above the offload threshold are still diffed."""
+        monkeypatch.setattr(settings, "diff_offload_threshold", 0)
+        await mock_document_repository.create("a", "one\n")
+        await mock_document_repository.create("b", "two\n")
+        
+        result = await diff_service.diff_documents("a", "b")
+        
+        assert result.status == "ok"
+        assert "-one" in result.unified
+
+    async def test_slow_small_diff_moves_off_loop(self, diff_service, mock_document_repository, monkeypatch):
+        """Test that a small diff exceeding the inline budget is finished by the executor, and a quick one is not."""
+        offloaded = []
+
+        async def run(kind, fn, *args, **kwargs):
+            offloaded.append(kwargs["timeout"])
+            return fn(*args, **kwargs)
+
+        monkeypatch.setattr(diff_service_module.executor, "run", run)
+        await mock_document_repository.create("a", "".join(f"a {i}\n" for i in range(300)))
+        await mock_document_repository.create("b", "".join(f"b {i}\n" for i in range(300)))
+        await mock_document_repository.create("c", "one\n")
+        await mock_document_repository.create("d", "two\n")
+
+        assert (await diff_service.diff_documents("c", "d")).status == "ok"
+        assert offloaded == []
+
+        monkeypatch.setattr(settings, "diff_inline_budget_seconds", 0.0)
+        result = await diff_service.diff_documents("a", "b")
+
+        assert result.status == "ok"
+        assert result.removed == 300
+        assert offloaded == [settings.diff_timeout_seconds]
+
+
+class TestDiffEndpoint:
+    """Test the diff endpoint."""
+    
+    def test_diff_endpoint(self):
+        """Test diffing two documents over HTTP."""
+        mock_repo = MockDocumentRepository()
+        diff_service = DiffService(mock_repo, cache=LRUCache(16))
+        app.dependency_overrides[get_diff_service] = lambda: diff_service
+        
+        try:
+            with TestClient(app) as client:
+                client.portal.call(mock_repo.create, "a", "one\ntwo\n")
+                client.portal.call(mock_repo.create, "b", "one\n2\n")
+                
+                response = client.get("/api/v1/diff", params={"a": "a", "b": "b"})
+                assert response.status_code == status.HTTP_200_OK
+                assert response.json()["unified"].startswith("--- a\n+++ b\n")
+                assert "hunks" not in response.json()
+                
+                response = client.get("/api/v1/diff", params={"a": "a", "b": "missing"})
+                assert response.status_code == status.HTTP_404_NOT_FOUND
+        finally:
+            app.dependency_overrides.clear()
@@ -0,0 +1,91 @@
+"""
+Unit tests for per-operation write concerns.
+"""
+from pymongo.write_concern import WriteConcern
+
+from src.repositories.document_repository import DurabilityPolicy, create_durability_policy
+from src.services.database import write_concern
+from src.settings import settings
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_policy(clock: FakeClock, interval: float = 30.0) -> DurabilityPolicy:
+    """Build a policy with distinguishable concerns."""
+    return DurabilityPolicy(
+        durable=WriteConcern(w="majority", j=True),
+        fast=WriteConcern(w=1, j=False),
+        checkpoint_interval=interval,
+        clock=clock
+    )
+
+
+class TestWriteConcern:
+    """Test write concern parsing from settings values."""
+    
+    def test_numeric_and_tagged_values(self):
+        """Test that node counts become integers and tags stay strings."""
+        assert write_concern("1", False).document == {"w": 1, "j": False}
+        assert write_concern("majority", True).document == {"w": "majority", "j": True}
+    
+    def test_policy_from_settings(self):
+        """Test that the default policy uses the configured concerns."""
+        policy = create_durability_policy()
+        
+        assert policy.durable.document["w"] == settings.write_concern_create
+        assert policy.checkpoint_interval == settings.write_checkpoint_interval
+
+
+class TestDurabilityPolicy:
+    """Test choosing write concerns per operation."""
+    
+    def test_create_is_durable(self):
+        """Test that creates always use the durable concern."""
+        policy = make_policy(FakeClock())
+        
+        assert policy.for_create() is policy.durable
+    
+    def test_autosaves_are_fast_between_checkpoints(self):
+        """Test that updates after a durable write use the fast concern."""
+        clock = FakeClock()
+        policy = make_policy(clock)
+        policy.written("doc", policy.for_create())
+        
+        clock.now = 10.0
+        
+        assert policy.for_update("doc") is policy.fast
+    
+    def test_checkpoint_after_interval(self):
+        """Test that a durable write is forced once the interval has passed."""
+        clock = FakeClock()
+        policy = make_policy(clock)
+        policy.written("doc", policy.for_create())
+        
+        clock.now = 30.0
+        concern = policy.for_update("doc")
+        assert concern is policy.durable
+        
+        policy.written("doc", concern)
+        clock.now = 31.0
+        assert policy.for_update("doc") is policy.fast
+    
+    def test_unknown_document_gets_durable_write(self):
+        """Test that documents without a known durable write get one first."""
+        policy = make_policy(FakeClock())
+        
+        assert policy.for_update("doc") is policy.durable
+    
+    def test_zero_interval_is_always_durable(self):
+        """Test that a zero interval makes every update durable."""
+        policy = make_policy(FakeClock(), interval=0)
+        policy.written("doc", policy.durable)
+        
+        assert policy.for_update("doc") is policy.durable
@@ -0,0 +1,128 @@
+"""
+Unit tests for the bounded thread and process executors.
+"""
+import asyncio
+import os
+import threading
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services import diff_service as diff_service_module
+from src.services.admission_controller import Overloaded
+from src.services.diff_service import DiffService, get_diff_service
+from src.services.executor import PROCESS, THREAD, OffloadExecutor
+from src.services.revision_service import RevisionService
+from src.settings import settings
+from src.utils.delta import apply_delta
+from src.utils.lru_cache import LRUCache
+from tests.fixtures import MockDocumentRepository, MockRevisionRepository
+
+
+@pytest.mark.asyncio
+class TestOffloadExecutor:
+    """Test running calls on the pools."""
+
+    async def test_process_pool_runs_in_another_process(self):
+        """Test that process work runs outside this process."""
+        executor = OffloadExecutor(thread_workers=1, process_workers=1, max_queue=4, max_wait=1.0)
+        try:
+            assert await executor.run(PROCESS, os.getpid) != os.getpid()
+            assert await executor.run(THREAD, os.getpid) == os.getpid()
+        finally:
+            await executor.stop()
+
+    async def test_process_work_falls_back_to_threads(self):
+        """Test that process work runs on threads when the process pool is disabled."""
+        executor = OffloadExecutor(thread_workers=1, process_workers=0, max_queue=4, max_wait=1.0)
+        try:
+            assert await executor.run(PROCESS, threading.get_ident) != threading.get_ident()
+            assert "process" not in executor.stats()
+        finally:
+            await executor.stop()
+
+    async def test_full_queue_is_rejected(self):
+        """Test that calls beyond the workers and the queue are rejected."""
+        executor = OffloadExecutor(thread_workers=1, process_workers=0, max_queue=1, max_wait=5.0)
+        release = threading.Event()
+        try:
+            running = asyncio.create_task(executor.run(THREAD, release.wait))
+            await asyncio.sleep(0.01)
+            queued = asyncio.create_task(executor.run(THREAD, release.wait))
+            await asyncio.sleep(0.01)
+
+            with pytest.raises(Overloaded):
+                await executor.run(THREAD, release.wait)
+            assert executor.stats()["thread"]["queue_depth"] == 1
+
+            release.set()
+            assert await running is True
+            assert await queued is True
+        finally:
+            release.set()
+            await executor.stop()
+
+    async def test_slot_is_held_until_the_call_ends(self):
+        """Test that a caller giving up does not free the slot of a still running call."""
+        executor = OffloadExecutor(thread_workers=1, process_workers=0, max_queue=0, max_wait=0.0)
+        release = threading.Event()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(executor.run(THREAD, release.wait), timeout=0.01)
+
+            with pytest.raises(Overloaded):
+                await executor.run(THREAD, release.wait)
+
+            release.set()
+            await asyncio.sleep(0.05)
+            assert executor.stats()["thread"]["in_flight"] == 0
+        finally:
+            release.set()
+            await executor.stop()
+
+
+@pytest.mark.asyncio
+class TestRevisionOffload:
+    """Test offloading revision deltas of large documents."""
+
+    async def test_large_delta_is_offloaded(self, monkeypatch):
+        """Test that deltas above the threshold are computed off the loop and still apply."""
+        monkeypatch.setattr(settings, "revision_offload_threshold", 0)
+        service = RevisionService(MockRevisionRepository())
+        base = "".join(f"line {i}\n" for i in range(200))
+        target = base.replace("line 100\n", "line one hundred\n")
+
+        await service.record("doc", base)
+        revision = await service.record("doc", target)
+
+        assert not revision.is_snapshot
+        assert apply_delta(base, revision.delta) == target
+
+
+class TestOverloadedEndpoint:
+    """Test responses when an executor sheds work."""
+
+    def test_diff_returns_503(self, monkeypatch):
+        """Test that a rejected diff returns 503 with Retry-After."""
+        class SaturatedExecutor:
+            async def run(self, kind, fn, *args, **kwargs):
+                raise Overloaded("queue_full")
+
+        monkeypatch.setattr(settings, "diff_offload_threshold", 0)
+        monkeypatch.setattr(diff_service_module, "executor", SaturatedExecutor())
+        mock_repo = MockDocumentRepository()
+        app.dependency_overrides[get_diff_service] = lambda: DiffService(mock_repo, cache=LRUCache(16))
+
+        try:
+            with TestClient(app) as client:
+                client.portal.call(mock_repo.create, "a", "one\n")
+                client.portal.call(mock_repo.create, "b", "two\n")
+
+                response = client.get("/api/v1/diff", params={"a": "a", "b": "b"})
+
+                assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+                assert response.headers["retry-after"] == str(settings.admission_retry_after)
+                assert "executors" in client.get("/health").json()
+        finally:
+            app.dependency_overrides.clear()
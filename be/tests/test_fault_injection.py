@@ -0,0 +1,141 @@
+"""
+Unit tests for the fault-injecting document repository.
+"""
+import random
+from datetime import datetime, UTC
+import pytest
+
+from src.context.deadline import DeadlineExceeded, deadline_scope
+from src.models.request_response import DocumentCreate
+from src.repositories.fault_injection_repository import (
+    FaultInjectingRepository,
+    FaultInjector,
+    FaultProfile,
+    parse_latency,
+    parse_profiles
+)
+from src.services.document_service import DocumentService
+from tests.fixtures import MockHRIDGenerator, MockDocumentRepository
+
+
+class FakeSleep:
+    """Records requested sleeps instead of waiting."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, seconds):
+        self.calls.append(seconds)
+
+
+def make_repository(profiles, seed=7):
+    """Build a fault-injecting mock repository with a fake sleep."""
+    sleep = FakeSleep()
+    injector = FaultInjector(parse_profiles(profiles), seed=seed, sleep=sleep)
+    return FaultInjectingRepository(MockDocumentRepository(), injector), sleep
+
+
+async def outcomes(repository, calls=50):
+    """Run finds and return the outcome of each."""
+    results = []
+    for _ in range(calls):
+        try:
+            await repository.find_by_share_id("doc")
+            results.append("ok")
+        except RuntimeError:
+            results.append("error")
+    return results
+
+
+class TestProfiles:
+    """Test parsing fault profiles."""
+
+    def test_latency_distributions(self):
+        """Test that each latency distribution parses and stays in range."""
+        rng = random.Random(1)
+
+        assert parse_latency("fixed:0.25")(rng) == 0.25
+        assert 0.01 <= parse_latency("uniform:0.01:0.02")(rng) <= 0.02
+        assert parse_latency("exponential:0.01")(rng) >= 0
+        assert parse_latency("lognormal:0.02:0.5")(rng) > 0
+        assert parse_latency(None)(rng) == 0.0
+
+    @pytest.mark.parametrize("spec", ["fixed", "uniform:1", "gamma:1:2", "fixed:x"])
+    def test_invalid_latency(self, spec):
+        """Test that malformed distributions are rejected."""
+        with pytest.raises(ValueError):
+            parse_latency(spec)
+
+    def test_unknown_profile_key(self):
+        """Test that unknown profile keys are rejected."""
+        with pytest.raises(ValueError):
+            FaultProfile.from_dict({"errors": 0.5})
+
+
+@pytest.mark.asyncio
+class TestFaultInjection:
+    """Test injected faults."""
+
+    async def test_same_seed_same_faults(self):
+        """Test that a seed reproduces the same sequence of faults."""
+        first, _ = make_repository({"find": {"error_rate": 0.3}})
+        second, _ = make_repository({"find": {"error_rate": 0.3}})
+
+        runs = [await outcomes(first), await outcomes(second)]
+
+        assert runs[0] == runs[1]
+        assert 0 < runs[0].count("error") < 50
+
+    async def test_operations_draw_independently(self):
+        """Test that interleaved calls of other operations do not shift the faults of one."""
+        alone, _ = make_repository({"*": {"error_rate": 0.3}})
+        interleaved, _ = make_repository({"*": {"error_rate": 0.3}})
+
+        expected = await outcomes(alone, 20)
+        actual = []
+        for _ in range(20):
+            try:
+                await interleaved.create("other", "text")
+            except RuntimeError:
+                pass
+            actual += await outcomes(interleaved, 1)
+
+        assert actual == expected
+
+    async def test_latency_is_added(self):
+        """Test that latency from the distribution is slept before each call."""
+        repository, sleep = make_repository({"find": {"latency": "fixed:0.05"}})
+
+        await outcomes(repository, 3)
+
+        assert sleep.calls == [0.05, 0.05, 0.05]
+
+    async def test_timeout_hangs_until_deadline(self):
+        """Test that an injected timeout waits at most until the deadline."""
+        repository, sleep = make_repository({"find": {"timeout_rate": 1.0, "timeout_seconds": 30}})
+
+        with deadline_scope(0.5):
+            with pytest.raises(DeadlineExceeded):
+                await repository.find_by_share_id("doc")
+
+        assert sleep.calls[0] <= 0.5
+        assert repository.injector.injected[("find", "timeout")] == 1
+
+    async def test_stalled_write_is_applied(self):
+        """Test that a stalled update is applied even though it times out."""
+        repository, _ = make_repository({"update": {"stall_rate": 1.0, "stall_seconds": 10}})
+        await repository.repository.create("doc", "old")
+
+        with deadline_scope(1.0):
+            with pytest.raises(DeadlineExceeded):
+                await repository.update("doc", "new", datetime.now(UTC))
+
+        assert repository.repository.documents["doc"].content == "new"
+
+    async def test_service_surfaces_injected_errors(self):
+        """Test that injected errors reach callers like database errors."""
+        repository, _ = make_repository({"create": {"error_rate": 1.0}})
+        service = DocumentService(MockHRIDGenerator(), repository)
+
+        with pytest.raises(RuntimeError, match="injected fault"):
+            await service.create_document(DocumentCreate(content="text"))
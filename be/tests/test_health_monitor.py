@@ -0,0 +1,121 @@
+"""
+Unit tests for background health probing and the health endpoints.
+"""
+import asyncio
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.health_monitor import HealthMonitor, health_monitor
+
+
+class FakeDatabase:
+    """Database manager stand-in with a scripted health check."""
+
+    def __init__(self, healthy: bool = True, delay: float = 0.0):
+        self.healthy = healthy
+        self.delay = delay
+        self.pings = 0
+
+    async def health_check(self, timeout=None) -> bool:
+        self.pings += 1
+        await asyncio.sleep(self.delay)
+        return self.healthy
+
+    def pool_stats(self):
+        return {"max_pool_size": 10}
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+class TestHealthMonitor:
+    """Test HealthMonitor probing and cached state."""
+
+    async def test_probe_records_result(self):
+        """Test that a probe caches health and latency."""
+        monitor = HealthMonitor(FakeDatabase(), interval=1.0, timeout=0.5, max_staleness=3.0)
+
+        assert await monitor.probe()
+
+        status_data = monitor.status()
+        assert status_data["ready"]
+        assert status_data["database"] == "healthy"
+        assert status_data["last_probe_latency_ms"] is not None
+        assert status_data["pool"] == {"max_pool_size": 10}
+
+    async def test_failed_probe_is_not_ready(self):
+        """Test that an unhealthy database makes the service not ready."""
+        monitor = HealthMonitor(FakeDatabase(healthy=False), interval=1.0, timeout=0.5, max_staleness=3.0)
+
+        assert not await monitor.probe()
+
+        assert not monitor.ready
+        assert monitor.consecutive_failures == 1
+
+    async def test_slow_probe_times_out(self):
+        """Test that a hanging ping counts as a failure."""
+        monitor = HealthMonitor(FakeDatabase(delay=1.0), interval=1.0, timeout=0.01, max_staleness=3.0)
+
+        assert not await monitor.probe()
+
+    async def test_stale_probe_is_not_ready(self):
+        """Test that readiness expires when probes stop succeeding."""
+        clock = FakeClock()
+        monitor = HealthMonitor(FakeDatabase(), interval=1.0, timeout=0.5, max_staleness=3.0, clock=clock)
+        await monitor.probe()
+
+        clock.now = 4.0
+
+        assert not monitor.ready
+
+    async def test_background_loop_probes(self):
+        """Test that the monitor keeps probing after start."""
+        database = FakeDatabase()
+        monitor = HealthMonitor(database, interval=0.01, timeout=0.5, max_staleness=3.0)
+
+        await monitor.start()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+        assert database.pings > 1
+
+
+class TestHealthEndpoints:
+    """Test the liveness and readiness endpoints."""
+
+    def test_liveness(self):
+        """Test that liveness does not depend on the database."""
+        with TestClient(app) as client:
+            response = client.get("/health/live")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "alive"
+
+    def test_readiness(self):
+        """Test that readiness reflects the cached probe."""
+        with TestClient(app) as client:
+            response = client.get("/health/ready")
+            assert response.status_code == status.HTTP_200_OK
+
+            health_monitor.database_healthy = False
+            response = client.get("/health/ready")
+            assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    def test_health_reports_probe(self):
+        """Test that /health includes probe latency and a single loop lag figure."""
+        with TestClient(app) as client:
+            data = client.get("/health").json()
+
+        assert "last_probe_latency_ms" in data["probe"]
+        assert "event_loop_lag_ms" not in data["probe"]
+        assert "lag_ms" in data["event_loop"]
@@ -0,0 +1,66 @@
+"""
+Unit tests for the instrumented repository wrapper.
+"""
+import logging
+import pytest
+from datetime import datetime, UTC
+
+from src.repositories.instrumented_repository import InstrumentedDocumentRepository
+from src.services.metrics import repository_document_size_bytes, repository_operation_duration_seconds
+from tests.fixtures import MockDocumentRepository
+
+
+def histogram_count(histogram, *labels) -> int:
+    """Number of observations recorded for `labels`."""
+    entry = histogram.values.get(labels)
+    return sum(entry[:-1]) if entry else 0
+
+
+@pytest.mark.asyncio
+class TestInstrumentedDocumentRepository:
+    """Test timing, size recording and the slow-operation log."""
+    
+    async def test_delegates_and_records(self):
+        """Test that calls pass through and are recorded."""
+        repository = InstrumentedDocumentRepository(MockDocumentRepository(), slow_threshold=10.0)
+        before = histogram_count(repository_operation_duration_seconds, "create", "ok")
+        
+        created = await repository.create("doc", "hello")
+        found = await repository.find_by_share_id("doc")
+        
+        assert found.content == created.content == "hello"
+        assert histogram_count(repository_operation_duration_seconds, "create", "ok") == before + 1
+        assert repository_document_size_bytes.values[("find",)][-1] >= 5
+    
+    async def test_records_errors(self):
+        """Test that failures are recorded with their outcome and re-raised."""
+        mock_repository = MockDocumentRepository()
+        mock_repository.should_raise_on_update = True
+        repository = InstrumentedDocumentRepository(mock_repository, slow_threshold=10.0)
+        before = histogram_count(repository_operation_duration_seconds, "update", "error")
+        
+        with pytest.raises(RuntimeError):
+            await repository.update("doc", "content", datetime.now(UTC))
+        
+        assert histogram_count(repository_operation_duration_seconds, "update", "error") == before + 1
+    
+    async def test_logs_slow_operations(self, caplog):
+        """Test that operations above the threshold emit a structured log record."""
+        repository = InstrumentedDocumentRepository(MockDocumentRepository(), slow_threshold=0.0)
+        
+        with caplog.at_level(logging.WARNING, logger="src.repositories.instrumented_repository"):
+            await repository.create("slow-doc", "hello")
+        
+        record = next(r for r in caplog.records if r.message.startswith("Slow repository operation"))
+        assert record.slow_operation["operation"] == "create"
+        assert record.slow_operation["share_id"] == "slow-doc"
+        assert record.slow_operation["size"] == 5
+    
+    async def test_fast_operations_are_not_logged(self, caplog):
+        """Test that operations below the threshold are not logged."""
+        repository = InstrumentedDocumentRepository(MockDocumentRepository(), slow_threshold=10.0)
+        
+        with caplog.at_level(logging.WARNING, logger="src.repositories.instrumented_repository"):
+            await repository.create("doc", "hello")
+        
+        assert not caplog.records
@@ -0,0 +1,273 @@
+"""
+Unit tests for the embedded log store and its document repository.
+"""
+import asyncio
+import os
+from datetime import datetime, UTC
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.repositories.log_repository import LogDocumentRepository
+from src.settings import settings
+from src.storage.log_store import LogRecord, LogStore, encode_record, log_store
+
+
+def make_store(path, **options):
+    """Build a store in a test directory with compaction effectively off."""
+    defaults = {
+        "sync_interval": 0.0,
+        "compaction_interval": 3600.0,
+        "garbage_ratio": 0.5,
+        "compaction_min_bytes": 0
+    }
+    defaults.update(options)
+    return LogStore(str(path), **defaults)
+
+
+def record(key, content, id=b"\x01" * 12):
+    """Build a record with fixed timestamps."""
+    return LogRecord(key=key, id=id, created_at=1.0, updated_at=2.0, content=content)
+
+
+@pytest.mark.asyncio
+class TestLogStore:
+    """Test writes, recovery and compaction of the log store."""
+
+    async def test_round_trip_and_reopen(self, tmp_path):
+        """Test that the latest record of each key survives a restart."""
+        store = make_store(tmp_path)
+        await store.connect()
+        await store.put(record("a", "one"))
+        await store.put(record("b", "ünïcode"))
+        await store.put(record("a", "two"))
+        assert store.get("a").content == "two"
+        await store.disconnect()
+
+        reopened = make_store(tmp_path)
+        await reopened.connect()
+        try:
+            assert reopened.get("a").content == "two"
+            assert reopened.get("b").content == "ünïcode"
+            assert reopened.get("missing") is None
+            assert reopened.garbage_bytes == len(encode_record(record("a", "one")))
+        finally:
+            await reopened.disconnect()
+
+    async def test_recovery_truncates_torn_record(self, tmp_path):
+        """Test that a partially written record at the end is discarded on startup."""
+        store = make_store(tmp_path)
+        await store.connect()
+        await store.put(record("a", "kept"))
+        path = store._path(store.generation)
+        await store.disconnect()
+        with open(path, "ab") as f:
+            f.write(encode_record(record("b", "torn"))[:-3])
+
+        reopened = make_store(tmp_path)
+        await reopened.connect()
+        try:
+            assert reopened.get("a").content == "kept"
+            assert reopened.get("b") is None
+            assert reopened.truncated_bytes > 0
+            await reopened.put(record("c", "after"))
+            assert reopened.get("c").content == "after"
+        finally:
+            await reopened.disconnect()
+
+    async def test_recovery_stops_at_corrupt_record(self, tmp_path):
+        """Test that a record failing its checksum and everything after it are discarded."""
+        store = make_store(tmp_path)
+        await store.connect()
+        await store.put(record("a", "good"))
+        await store.put(record("b", "flipped"))
+        path = store._path(store.generation)
+        await store.disconnect()
+        with open(path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"X")
+
+        reopened = make_store(tmp_path)
+        await reopened.connect()
+        try:
+            assert reopened.get("a").content == "good"
+            assert reopened.get("b") is None
+        finally:
+            await reopened.disconnect()
+
+    async def test_group_commit_batches_syncs(self, tmp_path):
+        """Test that concurrent writes share fsyncs and are visible only once durable."""
+        store = make_store(tmp_path, sync_interval=0.01)
+        await store.connect()
+        try:
+            writes = [asyncio.create_task(store.put(record(f"k{i}", "x"))) for i in range(20)]
+            await asyncio.sleep(0)
+            assert store.get("k0") is None
+
+            await asyncio.gather(*writes)
+
+            assert store.get("k19").content == "x"
+            assert store.syncs < 20
+            assert store.synced_writes == 20
+        finally:
+            await store.disconnect()
+
+    async def test_failed_sync_closes_store(self, tmp_path, monkeypatch):
+        """Test that a write whose sync failed is not recovered and later writes are refused."""
+        store = make_store(tmp_path)
+        await store.connect()
+        await store.put(record("a", "kept"))
+
+        def fail(fd):
+            raise OSError("disk gone")
+
+        monkeypatch.setattr("src.storage.log_store._fdatasync", fail)
+        with pytest.raises(RuntimeError, match="sync failed"):
+            await store.put(record("b", "lost"))
+        monkeypatch.undo()
+        with pytest.raises(RuntimeError, match="closed after a failed sync"):
+            await store.put(record("c", "refused"))
+        assert not await store.health_check()
+        await store.disconnect()
+
+        reopened = make_store(tmp_path)
+        await reopened.connect()
+        try:
+            assert reopened.get("a").content == "kept"
+            assert reopened.get("b") is None
+            assert reopened.truncated_bytes == 0
+        finally:
+            await reopened.disconnect()
+
+    async def test_duplicate_create_rejected(self, tmp_path):
+        """Test that create fails for a key being written or already stored."""
+        store = make_store(tmp_path, sync_interval=0.01)
+        await store.connect()
+        repository = LogDocumentRepository(store)
+        try:
+            results = await asyncio.gather(
+                repository.create("doc", "first"),
+                repository.create("doc", "second"),
+                return_exceptions=True
+            )
+            assert sum(isinstance(result, RuntimeError) for result in results) == 1
+            with pytest.raises(RuntimeError, match="duplicate"):
+                await repository.create("doc", "third")
+        finally:
+            await store.disconnect()
+
+    async def test_compaction_keeps_live_records(self, tmp_path):
+        """Test that compaction drops superseded records, including writes made during it."""
+        store = make_store(tmp_path)
+        await store.connect()
+        try:
+            for version in range(10):
+                await store.put(record("a", f"v{version}"))
+            await store.put(record("b", "only"))
+            assert store.needs_compaction()
+            old_path = store._path(store.generation)
+
+            compaction = asyncio.create_task(store.compact())
+            write = asyncio.create_task(store.put(record("c", "during")))
+            await asyncio.gather(compaction, write)
+
+            assert store.generation == 2
+            assert not os.path.exists(old_path)
+            assert store.garbage_bytes == 0
+            assert store.get("a").content == "v9"
+            assert store.get("c").content == "during"
+        finally:
+            await store.disconnect()
+
+        reopened = make_store(tmp_path)
+        await reopened.connect()
+        try:
+            assert {key: reopened.get(key).content for key in "abc"} == {"a": "v9", "b": "only", "c": "during"}
+            assert reopened.size == sum(length for _, length in reopened.index.values())
+        finally:
+            await reopened.disconnect()
+
+    async def test_interrupted_compaction_is_discarded(self, tmp_path):
+        """Test that a leftover compaction file does not replace the log."""
+        store = make_store(tmp_path)
+        await store.connect()
+        await store.put(record("a", "kept"))
+        await store.disconnect()
+        with open(store._path(2) + ".tmp", "wb") as f:
+            f.write(b"partial")
+
+        reopened = make_store(tmp_path)
+        await reopened.connect()
+        try:
+            assert reopened.generation == 1
+            assert reopened.get("a").content == "kept"
+            assert sorted(os.listdir(tmp_path)) == ["LOCK", os.path.basename(reopened._path(1))]
+        finally:
+            await reopened.disconnect()
+
+    async def test_second_process_locked_out(self, tmp_path):
+        """Test that a log directory cannot be opened twice."""
+        store = make_store(tmp_path)
+        await store.connect()
+        try:
+            with pytest.raises(RuntimeError, match="another process"):
+                await make_store(tmp_path).connect()
+        finally:
+            await store.disconnect()
+
+
+@pytest.mark.asyncio
+class TestLogDocumentRepository:
+    """Test the document repository on the log store."""
+
+    async def test_create_find_update(self, tmp_path):
+        """Test the repository protocol on the log store."""
+        store = make_store(tmp_path)
+        await store.connect()
+        repository = LogDocumentRepository(store)
+        try:
+            created = await repository.create("doc", "hello")
+            updated_at = datetime.now(UTC)
+            updated = await repository.update("doc", "world", updated_at)
+            found = await repository.find_by_share_id("doc")
+
+            assert len(created.id) == 24
+            assert found.id == created.id
+            assert found.content == "world"
+            assert found.created_at == created.created_at
+            assert abs((updated.updated_at - updated_at).total_seconds()) < 0.001
+            assert await repository.update("missing", "x", updated_at) is None
+            assert await repository.find_by_share_id("missing") is None
+        finally:
+            await store.disconnect()
+
+
+class TestLogBackendApp:
+    """Test the app running on the log backend."""
+
+    def test_documents_without_revisions_or_snapshots(self, tmp_path, monkeypatch):
+        """Test that documents work and MongoDB-only features are reported as unavailable."""
+        monkeypatch.setattr(settings, "storage_backend", "log")
+        monkeypatch.setattr(settings, "revisions_enabled", True)
+        monkeypatch.setattr(log_store, "directory", str(tmp_path))
+
+        with TestClient(app) as client:
+            response = client.post("/api/v1/documents", json={"content": "hello"})
+            assert response.status_code == status.HTTP_201_CREATED
+            share_id = response.json()["share_id"]
+
+            response = client.put(f"/api/v1/documents/{share_id}", json={"content": "world"})
+            assert response.status_code == status.HTTP_200_OK
+            response = client.get(f"/api/v1/documents/{share_id}")
+            assert response.json()["content"] == "world"
+
+            for method, path in [
+                ("GET", f"/api/v1/documents/{share_id}/revisions"),
+                ("GET", f"/api/v1/documents/{share_id}/revisions/1"),
+                ("POST", f"/api/v1/documents/{share_id}/snapshots"),
+                ("GET", "/api/v1/snapshots/" + "0" * 64),
+                ("GET", f"/api/v1/documents/{share_id}/stats")
+            ]:
+                response = client.request(method, path)
+                assert response.status_code == status.HTTP_404_NOT_FOUND, path
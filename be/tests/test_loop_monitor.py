@@ -0,0 +1,60 @@
+"""
+Unit tests for event-loop lag monitoring and blocking-call detection.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.services.loop_monitor import LoopMonitor
+
+
+@pytest.mark.asyncio
+class TestLoopMonitor:
+    """Test lag measurement."""
+    
+    async def test_measures_lag(self):
+        """Test that a blocked loop shows up as heartbeat lag."""
+        monitor = LoopMonitor(interval=0.01, stall_threshold=10.0)
+        monitor.start()
+        
+        await asyncio.sleep(0.02)
+        time.sleep(0.05)
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+        
+        assert monitor.max_lag >= 0.03
+        assert monitor.stats()["stalls"] == 0
+
+
+class TestBlockingCallDetection:
+    """Test detection of a handler that blocks the event loop."""
+    
+    def test_blocking_handler_is_reported(self, caplog):
+        """Test that the stack of a blocking handler is logged once per stall."""
+        monitor = LoopMonitor(interval=0.01, stall_threshold=0.05)
+        
+        @asynccontextmanager
+        async def lifespan(app):
+            monitor.start()
+            yield
+            await monitor.stop()
+        
+        mini_app = FastAPI(lifespan=lifespan)
+        
+        @mini_app.get("/blocking")
+        async def blocking_handler():
+            time.sleep(0.3)  # synchronous call on the event loop
+            return {"ok": True}
+        
+        with caplog.at_level(logging.WARNING, logger="src.services.loop_monitor"):
+            with TestClient(mini_app) as client:
+                client.get("/blocking")
+        
+        stall_logs = [r for r in caplog.records if r.message.startswith("Event loop blocked")]
+        assert monitor.stalls == 1
+        assert len(stall_logs) == 1
+        assert "blocking_handler" in stall_logs[0].message
@@ -0,0 +1,114 @@
+"""
+Unit tests for metrics recording and Prometheus exposition.
+"""
+import os
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.document_service import DocumentService, get_document_service
+from src.services.metrics import (
+    MetricsExporter,
+    MetricsRegistry,
+    MultiprocessStore,
+    merge_snapshots,
+    render
+)
+from tests.fixtures import MockHRIDGenerator, MockDocumentRepository
+
+
+class TestExposition:
+    """Test rendering of metric families."""
+
+    def test_histogram_is_cumulative(self):
+        """Test that histogram buckets are rendered cumulatively with sum and count."""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, "/a")
+        histogram.observe(0.5, "/a")
+        histogram.observe(5.0, "/a")
+
+        text = render(registry.collect())
+
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{route="/a",le="1"} 2' in text
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+        assert 'latency_seconds_count{route="/a"} 3' in text
+        assert 'latency_seconds_sum{route="/a"} 5.55' in text
+
+    def test_labels_are_escaped(self):
+        """Test that label values are escaped."""
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests.", ("path",)).inc('a"b')
+
+        assert 'requests_total{path="a\\"b"} 1' in render(registry.collect())
+
+    def test_duplicate_names_are_rejected(self):
+        """Test that a metric name can only be registered once."""
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests.")
+
+        with pytest.raises(ValueError):
+            registry.counter("requests_total", "Requests.")
+
+
+class TestMultiprocess:
+    """Test merging snapshots of several workers."""
+
+    def make_snapshot(self, requests: int, in_flight: int):
+        """Build a worker snapshot with one counter and one gauge."""
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests.").inc(amount=requests)
+        registry.gauge("in_flight", "In flight.").set(in_flight)
+        return registry.collect()
+
+    def test_counters_sum_and_dead_gauges_drop(self):
+        """Test that counters of all workers are summed and gauges only from live ones."""
+        merged = merge_snapshots([
+            (self.make_snapshot(3, 1), True),
+            (self.make_snapshot(4, 2), True),
+            (self.make_snapshot(5, 7), False)
+        ])
+
+        assert merged["requests_total"]["samples"] == [[[], 12]]
+        assert merged["in_flight"]["samples"] == [[[], 3]]
+
+    def test_store_round_trip(self, tmp_path):
+        """Test that worker snapshots are shared through the directory."""
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests.").inc(amount=2)
+        exporter = MetricsExporter(registry, MultiprocessStore(str(tmp_path), registry), interval=1.0)
+        (tmp_path / "999999999.json").write_text(
+            '{"requests_total": {"type": "counter", "help": "Requests.", "labelnames": [], "samples": [[[], 5]]}}'
+        )
+
+        text = exporter.render()
+
+        assert "requests_total 7" in text
+        assert os.path.exists(tmp_path / f"{os.getpid()}.json")
+
+
+class TestMetricsEndpoint:
+    """Test request metrics through the API."""
+
+    def test_requests_are_recorded_by_route_template(self):
+        """Test that /metrics reports latency by route template and status."""
+        mock_service = DocumentService(MockHRIDGenerator(), MockDocumentRepository())
+        app.dependency_overrides[get_document_service] = lambda: mock_service
+
+        try:
+            with TestClient(app) as client:
+                client.get("/api/v1/documents/does-not-exist")
+                response = client.get("/metrics")
+
+                assert response.status_code == status.HTTP_200_OK
+                assert response.headers["content-type"].startswith("text/plain")
+                assert (
+                    'http_requests_total{method="GET",route="/api/v1/documents/{share_id}",status="404"}'
+                    in response.text
+                )
+                assert "http_request_duration_seconds_bucket" in response.text
+                assert "process_resident_memory_bytes" in response.text
+        finally:
+            app.dependency_overrides.clear()
@@ -0,0 +1,104 @@
+"""
+Unit tests for MongoDB pool and command monitoring.
+"""
+from types import SimpleNamespace
+from pymongo.monitoring import (
+    ConnectionCheckedInEvent,
+    ConnectionCheckedOutEvent,
+    ConnectionCheckOutFailedEvent,
+    ConnectionCheckOutStartedEvent,
+    ConnectionCreatedEvent
+)
+
+from src.services.database import client_options
+from src.services.mongo_monitoring import CommandMonitor, LatencyHistogram, PoolMonitor
+from src.settings import settings
+
+ADDRESS = ("localhost", 27017)
+
+
+class TestLatencyHistogram:
+    """Test LatencyHistogram bucketing."""
+    
+    def test_observations_land_in_buckets(self):
+        """Test that observations are counted in the first bucket that bounds them."""
+        histogram = LatencyHistogram(buckets=(0.01, 0.1))
+        
+        histogram.observe(0.005)
+        histogram.observe(0.1)
+        histogram.observe(3.0)
+        
+        assert histogram.counts == [1, 1, 1]
+        assert histogram.count == 3
+        assert histogram.max == 3.0
+
+
+class TestPoolMonitor:
+    """Test PoolMonitor counters."""
+    
+    def test_tracks_checkouts(self):
+        """Test that in-use connections and checkout waits are tracked."""
+        monitor = PoolMonitor()
+        
+        monitor.connection_created(ConnectionCreatedEvent(ADDRESS, 1))
+        monitor.connection_check_out_started(ConnectionCheckOutStartedEvent(ADDRESS))
+        assert monitor.stats()["waiting"] == 1
+        
+        monitor.connection_checked_out(ConnectionCheckedOutEvent(ADDRESS, 1, 0.02))
+        stats = monitor.stats()
+        assert stats["open_connections"] == 1
+        assert stats["in_use"] == 1
+        assert stats["waiting"] == 0
+        assert stats["checkout_wait_seconds"]["count"] == 1
+        
+        monitor.connection_checked_in(ConnectionCheckedInEvent(ADDRESS, 1))
+        assert monitor.stats()["in_use"] == 0
+    
+    def test_counts_checkout_failures(self):
+        """Test that failed checkouts are counted by reason."""
+        monitor = PoolMonitor()
+        
+        monitor.connection_check_out_started(ConnectionCheckOutStartedEvent(ADDRESS))
+        monitor.connection_check_out_failed(ConnectionCheckOutFailedEvent(ADDRESS, "timeout", 1.0))
+        
+        assert monitor.stats()["checkout_failures"] == {"timeout": 1}
+
+
+class TestCommandMonitor:
+    """Test CommandMonitor latency recording."""
+    
+    def test_records_latency_per_command(self):
+        """Test that latencies and failures are grouped by command name."""
+        monitor = CommandMonitor()
+        
+        monitor.succeeded(SimpleNamespace(command_name="find", duration_micros=1500))
+        monitor.failed(SimpleNamespace(command_name="find", duration_micros=500))
+        monitor.succeeded(SimpleNamespace(command_name="insert", duration_micros=800))
+        
+        stats = monitor.stats()
+        assert stats["find"]["latency_seconds"]["count"] == 2
+        assert stats["find"]["failures"] == 1
+        assert stats["insert"]["latency_seconds"]["sum"] == 0.0008
+
+
+class TestClientOptions:
+    """Test Motor client options built from settings."""
+    
+    def test_pool_settings_and_listeners(self, monkeypatch):
+        """Test that pool, write concern and compression settings are passed through."""
+        monkeypatch.setattr(settings, "mongodb_max_pool_size", 20)
+        monkeypatch.setattr(settings, "mongodb_wait_queue_timeout_ms", 250)
+        monkeypatch.setattr(settings, "mongodb_write_concern", "majority")
+        monkeypatch.setattr(settings, "mongodb_compressors", "zlib")
+        
+        options = client_options()
+        
+        assert options["maxPoolSize"] == 20
+        assert options["waitQueueTimeoutMS"] == 250
+        assert options["w"] == "majority"
+        assert options["compressors"] == "zlib"
+        assert len(options["event_listeners"]) == 2
+    
+    def test_numeric_write_concern(self):
+        """Test that numeric write concerns are passed as integers."""
+        assert client_options()["w"] == int(settings.mongodb_write_concern)
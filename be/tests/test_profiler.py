@@ -0,0 +1,117 @@
+"""
+Unit tests for the sampling profiler and admin endpoints.
+"""
+import asyncio
+import threading
+import time
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.profiler import SamplingProfiler, dump_tasks
+from src.settings import settings
+
+
+def busy_loop(stop: threading.Event) -> None:
+    """Burn CPU until stopped."""
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestSamplingProfiler:
+    """Test stack sampling."""
+    
+    def test_samples_busy_thread(self):
+        """Test that a busy function shows up in collapsed stacks."""
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_loop, args=(stop,), name="busy-worker")
+        worker.start()
+        profiler = SamplingProfiler(interval=0.001)
+        
+        profiler.start()
+        time.sleep(0.05)
+        profiler.stop()
+        stop.set()
+        worker.join()
+        
+        collapsed = profiler.collapsed()
+        assert profiler.sample_count > 0
+        assert any(
+            line.startswith("busy-worker;") and "busy_loop" in line
+            for line in collapsed.splitlines()
+        )
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed.splitlines())
+
+
+@pytest.mark.asyncio
+class TestTaskDump:
+    """Test the asyncio task dump."""
+    
+    async def test_pending_task_is_listed(self):
+        """Test that pending tasks are listed with what they wait on."""
+        async def waiting_job():
+            await asyncio.sleep(10)
+        
+        task = asyncio.create_task(waiting_job(), name="waiting-job")
+        await asyncio.sleep(0)
+        
+        try:
+            entry = next(t for t in dump_tasks() if t["name"] == "waiting-job")
+            assert entry["state"] == "pending"
+            assert "waiting_job" in entry["coroutine"]
+            assert entry["awaiting"][0] == "sleep"
+        finally:
+            task.cancel()
+
+
+class TestAdminEndpoints:
+    """Test access control of the admin endpoints."""
+    
+    def test_disabled_without_debug_or_token(self, monkeypatch):
+        """Test that admin endpoints are hidden by default."""
+        monkeypatch.setattr(settings, "debug", False)
+        monkeypatch.setattr(settings, "admin_token", None)
+        
+        with TestClient(app) as client:
+            response = client.get("/admin/tasks")
+        
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    
+    def test_token_is_required(self, monkeypatch):
+        """Test that a configured token must be presented."""
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        
+        with TestClient(app) as client:
+            assert client.get("/admin/tasks").status_code == status.HTTP_403_FORBIDDEN
+            response = client.get("/admin/tasks", headers={"X-Admin-Token": "secret"})
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["tasks"]
+    
+    def test_profile_returns_collapsed_stacks(self, monkeypatch):
+        """Test that profiling returns flamegraph input."""
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        
+        with TestClient(app) as client:
+            response = client.get(
+                "/admin/profile",
+                params={"seconds": 0.05, "interval_ms": 1, "format": "collapsed"},
+                headers={"X-Admin-Token": "secret"}
+            )
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.text.strip()
+    
+    def test_profile_duration_is_capped(self, monkeypatch):
+        """Test that overly long profiles are rejected."""
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        
+        with TestClient(app) as client:
+            response = client.get(
+                "/admin/profile",
+                params={"seconds": settings.profiler_max_seconds + 1},
+                headers={"X-Admin-Token": "secret"}
+            )
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,171 @@
+"""
+Unit tests for token bucket rate limiting.
+"""
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from src.middleware.rate_limit import RateLimitMiddleware
+from src.services.rate_limiter import InMemoryRateLimitBackend, RateLimiter, RateLimitRule
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """Fixture providing a fake clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def backend(clock):
+    """Fixture providing an in-memory backend driven by the fake clock."""
+    return InMemoryRateLimitBackend(shards=4, clock=clock)
+
+
+def make_app(limiter: RateLimiter) -> FastAPI:
+    """Build a minimal app protected by the rate limit middleware."""
+    app = FastAPI()
+    
+    @app.get("/api/v1/documents/{share_id}")
+    async def read(share_id: str):
+        return {"share_id": share_id}
+    
+    @app.put("/api/v1/documents/{share_id}")
+    async def write(share_id: str):
+        return {"share_id": share_id}
+    
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+    
+    app.add_middleware(RateLimitMiddleware, limiter=limiter, trust_forwarded=True)
+    return app
+
+
+@pytest.mark.asyncio
+class TestInMemoryBackend:
+    """Test the in-memory token bucket."""
+    
+    async def test_allows_up_to_capacity(self, backend):
+        """Test that a full bucket allows `capacity` requests."""
+        results = [await backend.consume("k", capacity=3, refill_rate=1.0) for _ in range(4)]
+        
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results[:3]] == [2, 1, 0]
+    
+    async def test_refills_over_time(self, backend, clock):
+        """Test that tokens are refilled at the configured rate."""
+        for _ in range(3):
+            await backend.consume("k", capacity=3, refill_rate=1.0)
+        denied = await backend.consume("k", capacity=3, refill_rate=1.0)
+        
+        clock.now += 1.0
+        allowed = await backend.consume("k", capacity=3, refill_rate=1.0)
+        
+        assert denied.retry_after == pytest.approx(1.0)
+        assert allowed.allowed
+    
+    async def test_sweeper_drops_refilled_buckets(self, backend, clock):
+        """Test that idle buckets are removed shard by shard."""
+        for i in range(20):
+            await backend.consume(f"k{i}", capacity=2, refill_rate=1.0)
+        
+        clock.now += 1.0
+        for _ in backend.shards:
+            backend.sweep()
+        
+        assert len(backend) == 0
+    
+    async def test_sweeper_keeps_active_buckets(self, backend):
+        """Test that buckets that are still refilling are kept."""
+        await backend.consume("k", capacity=2, refill_rate=1.0)
+        
+        for _ in backend.shards:
+            backend.sweep()
+        
+        assert len(backend) == 1
+
+
+class TestRateLimitRule:
+    """Test rule matching."""
+    
+    def test_client_scoped_key(self):
+        """Test that client rules key by client address."""
+        rule = RateLimitRule("global", 10, 60, r"^/api/")
+        
+        assert rule.key_for("GET", "/api/v1/documents/x", "1.2.3.4") == "global:1.2.3.4"
+        assert rule.key_for("GET", "/health", "1.2.3.4") is None
+    
+    def test_document_scoped_key(self):
+        """Test that document rules key by share_id and filter methods."""
+        rule = RateLimitRule(
+            "document", 10, 60, r"^/api/v1/documents/(?P<share_id>[^/]+)$",
+            methods=frozenset({"PUT"}), scope="document"
+        )
+        
+        assert rule.key_for("PUT", "/api/v1/documents/abc", "1.2.3.4") == "document:abc"
+        assert rule.key_for("GET", "/api/v1/documents/abc", "1.2.3.4") is None
+
+
+class TestRateLimitMiddleware:
+    """Test the rate limit middleware."""
+    
+    def test_headers_and_rejection(self, backend):
+        """Test rate limit headers and 429 responses."""
+        limiter = RateLimiter(backend, [RateLimitRule("global", 2, 60, r"^/api/")])
+        
+        with TestClient(make_app(limiter)) as client:
+            first = client.get("/api/v1/documents/a")
+            client.get("/api/v1/documents/a")
+            rejected = client.get("/api/v1/documents/a")
+            unlimited = client.get("/health")
+        
+        assert first.status_code == status.HTTP_200_OK
+        assert first.headers["ratelimit-limit"] == "2"
+        assert first.headers["ratelimit-remaining"] == "1"
+        assert first.headers["ratelimit-policy"] == "2;w=60"
+        assert rejected.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(rejected.headers["retry-after"]) > 0
+        assert "ratelimit-limit" not in unlimited.headers
+    
+    def test_document_budget_is_shared_across_clients(self, backend):
+        """Test that per-document budgets apply to all clients together."""
+        limiter = RateLimiter(backend, [RateLimitRule(
+            "document", 2, 60, r"^/api/v1/documents/(?P<share_id>[^/]+)$",
+            methods=frozenset({"PUT"}), scope="document"
+        )])
+        
+        with TestClient(make_app(limiter)) as client:
+            codes = [
+                client.put("/api/v1/documents/a", headers={"X-Forwarded-For": f"10.0.0.{i}"}).status_code
+                for i in range(3)
+            ]
+            other = client.put("/api/v1/documents/b")
+        
+        assert codes == [200, 200, 429]
+        assert other.status_code == status.HTTP_200_OK
+
+    def test_rejected_request_keeps_no_tokens(self, backend):
+        """Test that a request rejected by a later rule gets its earlier tokens back."""
+        limiter = RateLimiter(backend, [
+            RateLimitRule("global", 3, 60, r"^/api/"),
+            RateLimitRule(
+                "document", 1, 60, r"^/api/v1/documents/(?P<share_id>[^/]+)$",
+                methods=frozenset({"PUT"}), scope="document"
+            )
+        ])
+
+        with TestClient(make_app(limiter)) as client:
+            codes = [client.put("/api/v1/documents/a").status_code for _ in range(3)]
+            codes += [client.get("/api/v1/documents/a").status_code for _ in range(3)]
+
+        assert codes == [200, 429, 429, 200, 200, 429]
@@ -0,0 +1,227 @@
+"""
+Unit tests for revision tracking with delta chains and snapshots.
+"""
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.models.request_response import DocumentCreate, DocumentUpdate
+from src.services.document_service import DocumentService
+from src.services.revision_service import RevisionService, RevisionCompactor, get_revision_service, latest_revisions
+from src.utils.delta import apply_delta, compute_delta
+from tests.fixtures import MockHRIDGenerator, MockDocumentRepository, MockRevisionRepository
+
+
+@pytest.fixture
+def mock_revision_repository():
+    """Fixture providing a mock revision repository and an empty latest revision cache."""
+    latest_revisions.clear()
+    return MockRevisionRepository()
+
+
+@pytest.fixture
+def revision_service(mock_revision_repository):
+    """Fixture providing a RevisionService with short chains and retention."""
+    return RevisionService(mock_revision_repository, snapshot_interval=3, retention_count=5)
+
+
+class TestDelta:
+    """Test line-based delta encoding."""
+    
+    def test_delta_roundtrip(self):
+        """Test that applying a delta rebuilds the target."""
+        base = "line one\nline two\nline three\n"
+        target = "line one\nline 2\nline three\nline four"
+        
+        assert apply_delta(base, compute_delta(base, target)) == target
+    
+    def test_delta_copies_unchanged_lines(self):
+        """Test that unchanged lines are encoded as copies."""
+        base = "".join(f"line {i}\n" for i in range(100))
+        target = base + "appended\n"
+        
+        delta = compute_delta(base, target)
+        
+        assert delta == [["c", 0, 100], ["i", "appended\n"]]
+    
+    def test_apply_delta_rejects_unknown_operation(self):
+        """Test that malformed deltas raise ValueError."""
+        with pytest.raises(ValueError):
+            apply_delta("text", [["x", 0]])
+
+
+@pytest.mark.asyncio
+class TestRevisionServiceRecord:
+    """Test RevisionService record method."""
+    
+    async def test_first_revision_is_snapshot(self, revision_service):
+        """Test that the first revision stores full content."""
+        revision = await revision_service.record("doc", "hello")
+        
+        assert revision.number == 1
+        assert revision.is_snapshot
+        assert revision.content == "hello"
+    
+    async def test_following_revisions_are_deltas(self, revision_service):
+        """Test that subsequent revisions store deltas."""
+        base = "".join(f"line {i}\n" for i in range(50))
+        await revision_service.record("doc", base)
+        
+        revision = await revision_service.record("doc", base + "more\n")
+        
+        assert revision.number == 2
+        assert not revision.is_snapshot
+        assert revision.content is None
+    
+    async def test_snapshot_every_interval(self, revision_service):
+        """Test that chains are bounded by the snapshot interval."""
+        base = "".join(f"line {i}\n" for i in range(50))
+        revisions = [await revision_service.record("doc", base + f"edit {i}\n") for i in range(7)]
+        
+        assert [r.is_snapshot for r in revisions] == [True, False, False, True, False, False, True]
+    
+    async def test_unchanged_content_is_skipped(self, revision_service):
+        """Test that saving identical content does not add a revision."""
+        await revision_service.record("doc", "same")
+        
+        assert await revision_service.record("doc", "same") is None
+    
+    async def test_previous_content_is_cached(self, revision_service, mock_revision_repository):
+        """Test that consecutive autosaves do not rebuild the previous revision."""
+        await revision_service.record("doc", "one\n")
+        calls = []
+        latest_chain = mock_revision_repository.latest_chain
+        
+        async def counting_latest_chain(share_id):
+            calls.append(share_id)
+            return await latest_chain(share_id)
+        
+        mock_revision_repository.latest_chain = counting_latest_chain
+        await revision_service.record("doc", "one\ntwo\n")
+        await revision_service.record("doc", "one\ntwo\nthree\n")
+        
+        assert calls == []
+        revision = await revision_service.get_revision("doc", 3)
+        assert revision.content == "one\ntwo\nthree\n"
+    
+    async def test_revision_recorded_elsewhere_is_rebuilt(self, revision_service, mock_revision_repository):
+        """Test that a stale cache entry is ignored when another worker added a revision."""
+        other_worker = RevisionService(mock_revision_repository, snapshot_interval=3, retention_count=5)
+        await revision_service.record("doc", "one\n")
+        await other_worker.record("doc", "one\ntwo\n")
+        latest_revisions.set("doc", latest_revisions.get("doc")._replace(number=1, content="one\n"))
+        
+        await revision_service.record("doc", "one\ntwo\nthree\n")
+        
+        revision = await revision_service.get_revision("doc", 3)
+        assert revision.content == "one\ntwo\nthree\n"
+    
+    async def test_get_revision_reconstructs_content(self, revision_service):
+        """Test that every revision can be reconstructed."""
+        base = "".join(f"line {i}\n" for i in range(50))
+        contents = [base + f"edit {i}\n" * i for i in range(8)]
+        for content in contents:
+            await revision_service.record("doc", content)
+        
+        for number, content in enumerate(contents, start=1):
+            revision = await revision_service.get_revision("doc", number)
+            assert revision.content == content
+    
+    async def test_get_missing_revision_returns_none(self, revision_service):
+        """Test that unknown revisions return None."""
+        await revision_service.record("doc", "hello")
+        
+        assert await revision_service.get_revision("doc", 42) is None
+    
+    async def test_list_revisions_newest_first(self, revision_service):
+        """Test revision listing order."""
+        for i in range(3):
+            await revision_service.record("doc", f"content {i}")
+        
+        result = await revision_service.list_revisions("doc")
+        
+        assert [r.number for r in result.revisions] == [3, 2, 1]
+
+
+@pytest.mark.asyncio
+class TestRevisionCompaction:
+    """Test the revision retention policy."""
+    
+    async def test_compact_keeps_retention_count(self, revision_service, mock_revision_repository):
+        """Test that compaction keeps only the newest revisions."""
+        base = "".join(f"line {i}\n" for i in range(50))
+        contents = [base + f"edit {i}\n" for i in range(12)]
+        for content in contents:
+            await revision_service.record("doc", content)
+        
+        deleted = await revision_service.compact("doc")
+        
+        assert deleted == 7
+        assert await mock_revision_repository.count("doc") == 5
+        for number in range(8, 13):
+            revision = await revision_service.get_revision("doc", number)
+            assert revision.content == contents[number - 1]
+    
+    async def test_compactor_finds_documents_beyond_retention(self, revision_service, mock_revision_repository):
+        """Test that the background compactor compacts documents found in storage."""
+        compactor = RevisionCompactor(interval=60)
+        for i in range(8):
+            await revision_service.record("doc", f"content {i}")
+        for i in range(3):
+            await revision_service.record("short", f"content {i}")
+        
+        await compactor.run_once(revision_service)
+        
+        assert await mock_revision_repository.count("doc") == 5
+        assert await mock_revision_repository.count("short") == 3
+        assert await mock_revision_repository.find_compactable(5, 10) == []
+
+
+@pytest.mark.asyncio
+class TestDocumentServiceRevisions:
+    """Test revision recording through DocumentService."""
+    
+    async def test_create_and_update_record_revisions(self, revision_service, mock_revision_repository):
+        """Test that writes record revisions."""
+        service = DocumentService(MockHRIDGenerator(), MockDocumentRepository(), revision_service)
+        
+        created = await service.create_document(DocumentCreate(content="first"))
+        await service.update_document(created.share_id, DocumentUpdate(content="second"))
+        
+        assert await mock_revision_repository.count(created.share_id) == 2
+    
+    async def test_revision_failure_does_not_fail_update(self, revision_service, mock_revision_repository):
+        """Test that revision errors do not fail the document write."""
+        service = DocumentService(MockHRIDGenerator(), MockDocumentRepository(), revision_service)
+        mock_revision_repository.should_raise_on_add = True
+        
+        created = await service.create_document(DocumentCreate(content="first"))
+        
+        assert created.content == "first"
+
+
+class TestRevisionEndpoints:
+    """Test revision endpoints."""
+    
+    def test_list_and_get_revision(self, revision_service):
+        """Test listing and fetching revisions over HTTP."""
+        app.dependency_overrides[get_revision_service] = lambda: revision_service
+        
+        try:
+            with TestClient(app) as client:
+                client.portal.call(revision_service.record, "doc", "first")
+                client.portal.call(revision_service.record, "doc", "second")
+                
+                response = client.get("/api/v1/documents/doc/revisions")
+                assert response.status_code == status.HTTP_200_OK
+                assert [r["number"] for r in response.json()["revisions"]] == [2, 1]
+                
+                response = client.get("/api/v1/documents/doc/revisions/1")
+                assert response.status_code == status.HTTP_200_OK
+                assert response.json()["content"] == "first"
+                
+                response = client.get("/api/v1/documents/doc/revisions/9")
+                assert response.status_code == status.HTTP_404_NOT_FOUND
+        finally:
+            app.dependency_overrides.clear()
@@ -0,0 +1,87 @@
+"""
+Unit tests for the Server-Timing breakdown.
+"""
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.context.request_context import RequestContext, reset_request_context, set_request_context
+from src.context.timing import add_timing, server_timing_header, timed
+from src.main import app
+from src.services.document_service import DocumentService, get_document_service
+from src.settings import settings
+from tests.fixtures import MockHRIDGenerator, MockDocumentRepository
+
+
+def phases(header: str):
+    """Names of the phases in a Server-Timing header."""
+    return [entry.split(";")[0].strip() for entry in header.split(",")]
+
+
+class TestTimingHelpers:
+    """Test collection of phase timings."""
+    
+    def test_timings_accumulate_per_phase(self):
+        """Test that repeated phases are summed."""
+        context = RequestContext("GET", "/")
+        token = set_request_context(context)
+        try:
+            add_timing("db", 0.001)
+            add_timing("db", 0.002)
+            with timed("convert"):
+                pass
+        finally:
+            reset_request_context(token)
+        
+        assert abs(context.timings["db"] - 0.003) < 1e-9
+        assert "convert" in context.timings
+    
+    def test_timings_outside_requests_are_ignored(self):
+        """Test that recording without a request context is a no-op."""
+        add_timing("db", 0.001)
+    
+    def test_header_format(self):
+        """Test that the header lists phases with durations in milliseconds."""
+        context = RequestContext("GET", "/")
+        context.timings["repo"] = 0.0025
+        context.handler_finished_at = context.started_at + 0.004
+        
+        header = server_timing_header(context, now=context.started_at + 0.005)
+        
+        assert 'repo;dur=2.50;desc="Repository calls"' in header
+        assert "serialize;dur=1.00" in header
+        assert "total;dur=5.00" in header
+
+
+class TestServerTimingHeader:
+    """Test the Server-Timing header on document routes."""
+    
+    def test_document_routes_report_phases(self, monkeypatch):
+        """Test that creating a document reports every phase."""
+        monkeypatch.setattr(settings, "server_timing_enabled", True)
+        mock_service = DocumentService(MockHRIDGenerator(), MockDocumentRepository())
+        app.dependency_overrides[get_document_service] = lambda: mock_service
+        
+        try:
+            with TestClient(app) as client:
+                response = client.post("/api/v1/documents", json={"content": "hello"})
+                
+                assert response.status_code == status.HTTP_201_CREATED
+                names = phases(response.headers["server-timing"])
+                for phase in ("parse", "hrid", "repo", "convert", "serialize", "total"):
+                    assert phase in names
+        finally:
+            app.dependency_overrides.clear()
+    
+    def test_header_is_off_by_default(self):
+        """Test that the header is omitted unless enabled."""
+        assert settings.server_timing_enabled is False
+        mock_service = DocumentService(MockHRIDGenerator(), MockDocumentRepository())
+        app.dependency_overrides[get_document_service] = lambda: mock_service
+        
+        try:
+            with TestClient(app) as client:
+                response = client.post("/api/v1/documents", json={"content": "hello"})
+                
+                assert "server-timing" not in response.headers
+        finally:
+            app.dependency_overrides.clear()
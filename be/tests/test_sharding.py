@@ -0,0 +1,226 @@
+"""
+Unit tests for document sharding and shard rebalancing.
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+import pytest
+from bson import ObjectId
+
+from src.repositories.document_repository import DocumentRepository
+from src.services.database import db_manager
+from src.services.sharding import ShardConfig, ShardSet, parse_shards, rank_shards
+from src.settings import settings
+from src.services.tiering import ARCHIVE_COLLECTION, pack_document
+from src.tools.rebalance_shards import move_archived, move_document, rebalance
+from tests.fixtures import MockCollection
+
+
+def make_shards(*names):
+    """Build shards with in-memory collections."""
+    shards = ShardSet([ShardConfig(name, "mongodb://localhost:27017", f"editer_{name}") for name in names])
+    for shard in shards.shards.values():
+        shard.collection = MockCollection()
+    return shards
+
+
+def make_document(share_id, content="text", updated_at=None):
+    """Build a stored document."""
+    updated_at = updated_at or datetime(2024, 1, 1)
+    return {"_id": ObjectId(), "share_id": share_id, "content": content,
+            "created_at": datetime(2024, 1, 1), "updated_at": updated_at}
+
+
+class TestRouting:
+    """Test shard configuration and rendezvous routing."""
+
+    def test_parse_shards(self):
+        """Test database names, URLs and explicit names."""
+        shards = parse_shards(
+            "editer_a, b=mongodb://db-b:27017/editer, mongodb://db-c:27017/other",
+            "mongodb://localhost:27017",
+            "editer"
+        )
+
+        assert shards == [
+            ShardConfig("editer_a", "mongodb://localhost:27017", "editer_a"),
+            ShardConfig("b", "mongodb://db-b:27017/editer", "editer"),
+            ShardConfig("other", "mongodb://db-c:27017/other", "other")
+        ]
+        assert parse_shards("", "mongodb://localhost:27017", "editer") == []
+
+    def test_duplicate_names_rejected(self):
+        """Test that shards on the same database name must be named."""
+        with pytest.raises(ValueError, match="unique"):
+            parse_shards("mongodb://a/editer,mongodb://b/editer", "mongodb://localhost", "editer")
+
+    def test_routing_is_stable_and_balanced(self):
+        """Test that routing depends only on names and spreads documents evenly."""
+        ids = [f"doc-{i}" for i in range(4000)]
+        owners = Counter(rank_shards(share_id, ["a", "b", "c", "d"])[0] for share_id in ids)
+
+        assert [rank_shards(share_id, ["d", "c", "b", "a"])[0] for share_id in ids[:50]] == \
+            [rank_shards(share_id, ["a", "b", "c", "d"])[0] for share_id in ids[:50]]
+        assert all(800 < count < 1200 for count in owners.values())
+
+    def test_adding_a_shard_moves_only_to_it(self):
+        """Test that a new shard takes about 1/N of documents and the rest stay."""
+        ids = [f"doc-{i}" for i in range(4000)]
+        before = {share_id: rank_shards(share_id, ["a", "b", "c"]) for share_id in ids}
+        after = {share_id: rank_shards(share_id, ["a", "b", "c", "d"]) for share_id in ids}
+
+        moved = [share_id for share_id in ids if after[share_id][0] != before[share_id][0]]
+
+        assert all(after[share_id][0] == "d" for share_id in moved)
+        assert all(after[share_id][1] == before[share_id][0] for share_id in moved)
+        assert 800 < len(moved) < 1200
+
+
+@pytest.mark.asyncio
+class TestShardedRepository:
+    """Test repository lookups across shards."""
+
+    async def test_reads_fall_back_to_previous_owner(self, monkeypatch):
+        """Test that a document not yet moved is found and updated on its previous shard."""
+        shards = make_shards("a", "b")
+        share_id = "doc-1"
+        owner, previous = shards.rank(share_id)
+        await previous.collection.insert_one(make_document(share_id, "old"))
+        monkeypatch.setattr(db_manager, "shards", shards)
+        repository = DocumentRepository()
+
+        monkeypatch.setattr(settings, "mongodb_shard_fallback_reads", 0)
+        assert await repository.find_by_share_id(share_id) is None
+
+        monkeypatch.setattr(settings, "mongodb_shard_fallback_reads", 1)
+        updated = await repository.update(share_id, "new", datetime(2024, 2, 1))
+        found = await repository.find_by_share_id(share_id)
+
+        assert updated.content == "new"
+        assert found.content == "new"
+        assert owner.collection.documents == {}
+
+    async def test_create_checks_previous_owner(self, monkeypatch):
+        """Test that a share_id still held by a previous owner is not created again on its new shard."""
+        shards = make_shards("a", "b")
+        share_id = "doc-1"
+        owner, previous = shards.rank(share_id)
+        await previous.collection.insert_one(make_document(share_id, "old"))
+        monkeypatch.setattr(db_manager, "shards", shards)
+        monkeypatch.setattr(settings, "mongodb_shard_fallback_reads", 1)
+        repository = DocumentRepository()
+
+        with pytest.raises(RuntimeError, match=f"exists in documents of shard {previous.name}"):
+            await repository.create(share_id, "new")
+
+        assert owner.collection.documents == {}
+        assert (await repository.find_by_share_id(share_id)).content == "old"
+
+
+@pytest.mark.asyncio
+class TestRebalance:
+    """Test moving documents to their owning shards."""
+
+    async def test_rebalance_after_adding_shard(self):
+        """Test that every document ends up on its owner and a rerun moves nothing."""
+        old = make_shards("a", "b")
+        documents = [make_document(f"doc-{i}") for i in range(200)]
+        for document in documents:
+            await old.owner(document["share_id"]).collection.insert_one(document)
+
+        shards = make_shards("a", "b", "c")
+        for name in ("a", "b"):
+            shards.shards[name].collection = old.shards[name].collection
+
+        dry = await rebalance(shards, dry_run=True)
+        counts = await rebalance(shards)
+        again = await rebalance(shards)
+
+        assert counts["moved"] == dry["to_move"] > 0
+        assert again["moved"] == 0
+        assert dry["scanned"] == 200
+        for document in documents:
+            owner = shards.owner(document["share_id"])
+            assert await owner.collection.find_one({"share_id": document["share_id"]}) is not None
+        assert sum(len(shard.collection.documents) for shard in shards.shards.values()) == 200
+
+    async def test_move_keeps_concurrent_update(self):
+        """Test that an update on the old shard after reading is copied, not lost."""
+        shards = make_shards("a", "b")
+        source, target = shards.shards["a"], shards.shards["b"]
+        read = make_document("doc", "v1")
+        await source.collection.insert_one(read)
+        source.collection.documents[read["_id"]].update(content="v2", updated_at=read["updated_at"] + timedelta(1))
+
+        assert await move_document(source, target, read)
+
+        assert (await target.collection.find_one({"share_id": "doc"}))["content"] == "v2"
+        assert source.collection.documents == {}
+
+    async def test_move_never_overwrites_newer_copy(self):
+        """Test that a stale version does not replace a newer one on the owner."""
+        shards = make_shards("a", "b")
+        source, target = shards.shards["a"], shards.shards["b"]
+        stale = make_document("doc", "stale")
+        newer = dict(stale, content="newer", updated_at=stale["updated_at"] + timedelta(1))
+        await source.collection.insert_one(stale)
+        await target.collection.insert_one(newer)
+
+        assert await move_document(source, target, stale)
+
+        assert (await target.collection.find_one({"share_id": "doc"}))["content"] == "newer"
+        assert source.collection.documents == {}
+
+    async def test_rebalance_moves_archived_documents(self, monkeypatch):
+        """Test that archived documents move to their owner's archive and stay readable."""
+        old = make_shards("a", "b")
+        documents = [make_document(f"doc-{i}") for i in range(50)]
+        for document in documents:
+            await old.owner(document["share_id"]).collection.database[ARCHIVE_COLLECTION].insert_one(
+                pack_document(document)
+            )
+        shards = make_shards("a", "b", "c")
+        for name in ("a", "b"):
+            shards.shards[name].collection = old.shards[name].collection
+
+        dry = await rebalance(shards, dry_run=True)
+        counts = await rebalance(shards)
+
+        assert dry["archived_scanned"] == 50
+        assert counts["archived_moved"] == dry["archived_to_move"] > 0
+        assert counts["moved"] == 0
+        archived = sum(len(shard.collection.database[ARCHIVE_COLLECTION].documents) for shard in shards.shards.values())
+        assert archived == 50
+
+        monkeypatch.setattr(db_manager, "shards", shards)
+        monkeypatch.setattr(settings, "mongodb_shard_fallback_reads", 0)
+        monkeypatch.setattr(settings, "tiering_enabled", True)
+        for document in documents:
+            found = await DocumentRepository().find_by_share_id(document["share_id"])
+            assert found.content == document["content"]
+
+    async def test_archived_move_skips_rehydrated_record(self):
+        """Test that a record rehydrated after it was read is not left on the owner's archive."""
+        shards = make_shards("a", "b")
+        source, target = shards.shards["a"], shards.shards["b"]
+        record = pack_document(make_document("doc"))
+        await source.collection.database[ARCHIVE_COLLECTION].insert_one(record)
+        source.collection.database[ARCHIVE_COLLECTION].documents.clear()
+
+        assert not await move_archived(source, target, record)
+
+        assert target.collection.database[ARCHIVE_COLLECTION].documents == {}
+
+    async def test_rate_limits_moves(self):
+        """Test that moves are paced by the configured rate."""
+        shards = make_shards("a", "b")
+        for i in range(20):
+            await shards.shards["a"].collection.insert_one(make_document(f"doc-{i}"))
+        delays = []
+
+        async def sleep(seconds):
+            delays.append(seconds)
+
+        counts = await rebalance(shards, rate=1.0, sleep=sleep)
+
+        assert counts["moved"] > 1
+        assert len(delays) >= counts["moved"] - 1
@@ -0,0 +1,102 @@
+"""
+Unit tests for immutable content-addressed snapshots.
+"""
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.services.snapshot_service import SnapshotService, get_snapshot_service
+from src.utils.hashing import content_hash
+from tests.fixtures import MockDocumentRepository, MockSnapshotRepository
+
+
+@pytest.fixture
+def mock_snapshot_repository():
+    """Fixture providing a mock snapshot repository."""
+    return MockSnapshotRepository()
+
+
+@pytest.fixture
+def snapshot_service(mock_document_repository, mock_snapshot_repository):
+    """Fixture providing a SnapshotService with injected mocks."""
+    return SnapshotService(mock_document_repository, mock_snapshot_repository)
+
+
+@pytest.mark.asyncio
+class TestSnapshotService:
+    """Test SnapshotService methods."""
+    
+    async def test_publish_freezes_current_content(self, snapshot_service, mock_document_repository):
+        """Test that publishing addresses the content by hash."""
+        await mock_document_repository.create("doc", "frozen")
+        
+        result = await snapshot_service.publish("doc")
+        
+        assert result.content_hash == content_hash("frozen")
+        assert result.url == f"/api/v1/snapshots/{content_hash('frozen')}"
+    
+    async def test_snapshot_survives_document_edits(self, snapshot_service, mock_document_repository):
+        """Test that later edits do not change a published snapshot."""
+        await mock_document_repository.create("doc", "frozen")
+        published = await snapshot_service.publish("doc")
+        await mock_document_repository.update("doc", "edited", published.created_at)
+        
+        snapshot = await snapshot_service.get_snapshot(published.content_hash)
+        
+        assert snapshot.content == "frozen"
+    
+    async def test_identical_content_is_deduplicated(self, snapshot_service, mock_document_repository, mock_snapshot_repository):
+        """Test that identical content maps to one snapshot."""
+        await mock_document_repository.create("a", "same")
+        await mock_document_repository.create("b", "same")
+        
+        first = await snapshot_service.publish("a")
+        second = await snapshot_service.publish("b")
+        
+        assert first.content_hash == second.content_hash
+        assert len(mock_snapshot_repository.snapshots) == 1
+    
+    async def test_publish_missing_document_returns_none(self, snapshot_service):
+        """Test publishing a missing document."""
+        assert await snapshot_service.publish("missing") is None
+
+
+class TestSnapshotEndpoints:
+    """Test snapshot endpoints."""
+    
+    def test_publish_and_fetch_with_cache_headers(self):
+        """Test immutable caching headers and conditional requests."""
+        mock_repo = MockDocumentRepository()
+        snapshot_service = SnapshotService(mock_repo, MockSnapshotRepository())
+        app.dependency_overrides[get_snapshot_service] = lambda: snapshot_service
+        
+        try:
+            with TestClient(app) as client:
+                client.portal.call(mock_repo.create, "doc", "frozen")
+                
+                response = client.post("/api/v1/documents/doc/snapshots")
+                assert response.status_code == status.HTTP_201_CREATED
+                url = response.json()["url"]
+                
+                response = client.get(url)
+                assert response.status_code == status.HTTP_200_OK
+                assert response.json()["content"] == "frozen"
+                assert "immutable" in response.headers["cache-control"]
+                etag = response.headers["etag"]
+                
+                response = client.get(url, headers={"If-None-Match": etag})
+                assert response.status_code == status.HTTP_304_NOT_MODIFIED
+                
+                response = client.get(url, headers={"If-None-Match": f'"other", W/{etag}'})
+                assert response.status_code == status.HTTP_304_NOT_MODIFIED
+                
+                missing = "/api/v1/snapshots/" + "0" * 64
+                for header in ("*", f'"{"0" * 64}"'):
+                    response = client.get(missing, headers={"If-None-Match": header})
+                    assert response.status_code == status.HTTP_404_NOT_FOUND
+                
+                response = client.get("/api/v1/snapshots/not-a-hash")
+                assert response.status_code == status.HTTP_404_NOT_FOUND
+        finally:
+            app.dependency_overrides.clear()
@@ -0,0 +1,112 @@
+"""
+Unit tests for queue-based structured logging and log sampling.
+"""
+import json
+import logging
+import queue
+import sys
+from fastapi.testclient import TestClient
+
+from src.context.request_context import RequestContext, reset_request_context, set_request_context
+from src.main import app
+from src.utils.structured_logging import ContextQueueHandler, JSONFormatter, SamplingFilter
+
+
+def make_record(msg: str, *args, **extra) -> logging.LogRecord:
+    """Build an INFO record like logger.info(msg, *args, extra=extra) would."""
+    record = logging.LogRecord("src.api.documents", logging.INFO, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestContextQueueHandler:
+    """Test enqueueing records with request fields."""
+
+    def test_request_fields_are_captured(self):
+        """Test that records carry the fields of the current request."""
+        log_queue = queue.SimpleQueue()
+        handler = ContextQueueHandler(log_queue)
+        context = RequestContext(method="GET", path="/api/v1/documents/abc", request_id="req-1")
+        context.route = "/api/v1/documents/{share_id}"
+
+        token = set_request_context(context)
+        try:
+            handler.handle(make_record("Document retrieved: %s", "abc", share_id="abc"))
+        finally:
+            reset_request_context(token)
+
+        entry = json.loads(JSONFormatter().format(log_queue.get_nowait()))
+        assert entry["message"] == "Document retrieved: abc"
+        assert entry["request_id"] == "req-1"
+        assert entry["route"] == "/api/v1/documents/{share_id}"
+        assert entry["share_id"] == "abc"
+        assert entry["latency_ms"] >= 0
+
+    def test_exceptions_are_formatted_before_enqueueing(self):
+        """Test that tracebacks survive the queue as text."""
+        log_queue = queue.SimpleQueue()
+        handler = ContextQueueHandler(log_queue)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord("test", logging.ERROR, __file__, 1, "failed", (), sys.exc_info())
+        handler.handle(record)
+
+        entry = json.loads(JSONFormatter().format(log_queue.get_nowait()))
+        assert "ValueError: boom" in entry["exception"]
+
+
+class TestSamplingFilter:
+    """Test per-message sampling."""
+
+    def test_keeps_one_in_n_per_template(self):
+        """Test that each template keeps its first record and then one in every N."""
+        sampler = SamplingFilter(rate=0.25)
+
+        kept = [sampler.filter(make_record("Document retrieved: %s", i, sample=True)) for i in range(8)]
+        other = sampler.filter(make_record("Document updated: %s", 1, sample=True))
+
+        assert kept == [True, False, False, False, True, False, False, False]
+        assert other is True
+
+    def test_unsampled_records_pass(self):
+        """Test that records without the sample flag are never dropped."""
+        sampler = SamplingFilter(rate=0)
+
+        assert sampler.filter(make_record("Service error: %s", "x"))
+        assert not sampler.filter(make_record("Document retrieved: %s", "x", sample=True))
+
+
+class TestRequestId:
+    """Test request id propagation over HTTP."""
+
+    def test_request_id_is_echoed_or_generated(self):
+        """Test that a client request id is echoed and a missing one generated."""
+        with TestClient(app) as client:
+            response = client.get("/health/live", headers={"X-Request-ID": "client-id"})
+            assert response.headers["x-request-id"] == "client-id"
+
+            response = client.get("/health/live")
+            assert len(response.headers["x-request-id"]) == 32
+
+    def test_route_template_includes_prefix(self):
+        """Test that handlers of included routers see their full route template."""
+        seen = []
+        original = ContextQueueHandler.prepare
+
+        def prepare(handler, record):
+            record = original(handler, record)
+            seen.append(getattr(record, "route", None))
+            return record
+
+        logger = logging.getLogger()
+        handler = next(h for h in logger.handlers if isinstance(h, ContextQueueHandler))
+        handler.prepare = prepare.__get__(handler)
+        try:
+            with TestClient(app) as client:
+                client.get("/api/v1/documents/missing")
+        finally:
+            del handler.prepare
+
+        assert "/api/v1/documents/{share_id}" in seen
+        assert "/documents/{share_id}" not in seen
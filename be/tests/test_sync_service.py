@@ -0,0 +1,158 @@
+"""
+Unit tests for rsync-style delta sync.
+"""
+import base64
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.models.sync import BlockSignature, SyncRequest
+from src.services.sync_service import SyncService, _index_weight, get_sync_service
+from src.utils.lru_cache import LRUCache
+from src.utils.rsync import (
+    SignatureIndex,
+    apply_instructions,
+    block_signatures,
+    match_blocks,
+    weak_checksum,
+)
+from tests.fixtures import MockDocumentRepository
+
+
+def make_request(copy: bytes, block_size: int = 64) -> SyncRequest:
+    """Build a sync request the way a client would."""
+    return SyncRequest(
+        block_size=block_size,
+        length=len(copy),
+        blocks=[BlockSignature(weak=w, strong=s) for w, s in block_signatures(copy, block_size)]
+    )
+
+
+def rebuild(copy: bytes, block_size: int, instructions) -> bytes:
+    """Apply response instructions to a client copy."""
+    parts = []
+    for instruction in instructions:
+        if instruction.op == "copy":
+            parts.append(copy[instruction.start * block_size:(instruction.start + instruction.count) * block_size])
+        else:
+            parts.append(base64.b64decode(instruction.data))
+    return b"".join(parts)
+
+
+@pytest.fixture
+def sync_service(mock_document_repository):
+    """Fixture providing a SyncService with a private cache."""
+    return SyncService(mock_document_repository, cache=LRUCache(4))
+
+
+class TestBlockMatching:
+    """Test the rolling checksum block matcher."""
+    
+    def test_rolling_checksums_match_direct_computation(self):
+        """Test that rolled checksums equal per-window checksums."""
+        data = bytes(range(256)) * 4
+        index = SignatureIndex(data, 16)
+        
+        assert all(index.rolling[i] == weak_checksum(data[i:i + 16]) for i in range(len(data) - 15))
+    
+    def test_unchanged_copy_is_all_copies(self):
+        """Test that an identical copy needs no literals."""
+        data = b"0123456789" * 100
+        
+        instructions = match_blocks(SignatureIndex(data, 64), block_signatures(data, 64), len(data))
+        
+        assert instructions == [("copy", 0, 16)]
+    
+    def test_insertion_sends_only_new_bytes(self):
+        """Test that an insertion is sent as a single literal."""
+        old = bytes(range(256)) * 8
+        new = old[:500] + b"inserted" + old[500:]
+        
+        instructions = match_blocks(SignatureIndex(new, 64), block_signatures(old, 64), len(old))
+        literals = [value for op, value, _ in instructions if op == "literal"]
+        
+        assert apply_instructions(old, 64, instructions) == new
+        assert sum(len(value) for value in literals) <= 64 + len(b"inserted")
+
+    
+    def test_strong_checksum_memo_is_bounded(self):
+        """Test that memoized strong checksums stay within the memo size."""
+        old = bytes(range(256)) * 8
+        index = SignatureIndex(old, 64, memo_size=4)
+        
+        instructions = match_blocks(index, block_signatures(old, 64), len(old))
+        
+        assert instructions == [("copy", 0, 32)]
+        assert 0 < len(index._strong) <= 4
+
+
+@pytest.mark.asyncio
+class TestSyncService:
+    """Test SyncService sync method."""
+    
+    async def test_sync_rebuilds_current_content(self, sync_service, mock_document_repository):
+        """Test that instructions rebuild the current content from an old copy."""
+        old = "".join(f"line {i}\n" for i in range(200))
+        new = old.replace("line 50\n", "line fifty 🌍\n")
+        await mock_document_repository.create("doc", new)
+        
+        result = await sync_service.sync("doc", make_request(old.encode()))
+        
+        assert rebuild(old.encode(), 64, result.instructions).decode() == new
+        assert result.literal_bytes < 200
+    
+    async def test_signature_index_is_cached(self, sync_service, mock_document_repository):
+        """Test that repeated syncs reuse the signature index."""
+        await mock_document_repository.create("doc", "x" * 1000)
+        
+        await sync_service.sync("doc", make_request(b"x" * 900))
+        await sync_service.sync("doc", make_request(b"x" * 800))
+        
+        assert sync_service.cache.hits == 1
+    
+    async def test_signature_cache_is_bounded_by_bytes(self, mock_document_repository):
+        """Test that cached signature indexes are weighed by content and checksum bytes."""
+        service = SyncService(mock_document_repository, cache=LRUCache(16, max_weight=12000, weigher=_index_weight))
+        for name in ("a", "b", "c"):
+            await mock_document_repository.create(name, name * 1000)
+            await service.sync(name, make_request(b"x" * 100))
+
+        # About 1000 content bytes and 4 bytes per rolling checksum each
+        assert len(service.cache) == 2
+        assert service.cache.weight <= 12000
+
+    async def test_missing_document_returns_none(self, sync_service):
+        """Test syncing a missing document."""
+        assert await sync_service.sync("missing", make_request(b"")) is None
+    
+    async def test_inconsistent_block_count_raises(self, sync_service):
+        """Test that block count must match the declared length."""
+        request = make_request(b"x" * 200)
+        request.length = 1000
+        
+        with pytest.raises(ValueError):
+            await sync_service.sync("doc", request)
+
+
+class TestSyncEndpoint:
+    """Test the sync endpoint."""
+    
+    def test_sync_endpoint(self):
+        """Test syncing over HTTP."""
+        mock_repo = MockDocumentRepository()
+        sync_service = SyncService(mock_repo, cache=LRUCache(4))
+        app.dependency_overrides[get_sync_service] = lambda: sync_service
+        
+        try:
+            with TestClient(app) as client:
+                client.portal.call(mock_repo.create, "doc", "a" * 300)
+                
+                response = client.post("/api/v1/documents/doc/sync", json=make_request(b"a" * 256).model_dump())
+                assert response.status_code == status.HTTP_200_OK
+                assert response.json()["length"] == 300
+                
+                response = client.post("/api/v1/documents/doc/sync", json={"block_size": 1, "length": 0, "blocks": []})
+                assert response.status_code == status.HTTP_400_BAD_REQUEST
+        finally:
+            app.dependency_overrides.clear()
@@ -0,0 +1,199 @@
+"""
+Unit tests for hot/cold tiering of idle documents.
+"""
+import asyncio
+from datetime import datetime, timedelta, UTC
+import pytest
+from bson import ObjectId
+
+from src.repositories.document_repository import DocumentRepository
+from src.services.database import db_manager
+from src.services.sharding import ShardConfig, ShardSet
+from src.services.tiering import ARCHIVE_COLLECTION, STATE_COLLECTION, TieringJob, pack_document, unpack_document
+from src.settings import settings
+from tests.fixtures import MockCollection
+
+NOW = datetime.now(UTC)
+
+
+def make_document(share_id, idle_days, tracked=True):
+    """Build a document last accessed, or last updated if untracked, `idle_days` ago."""
+    seen = NOW - timedelta(days=idle_days)
+    document = {"_id": ObjectId(), "share_id": share_id, "content": "lorem ipsum " * 100,
+                "created_at": seen, "updated_at": seen}
+    if tracked:
+        document["last_accessed_at"] = seen
+    return document
+
+
+def make_job(**options):
+    """Build a job archiving documents idle for 30 days, without pacing."""
+    defaults = {"idle_seconds": 30 * 86400, "interval": 3600, "batch_size": 2, "rate": 0, "compression_level": 6}
+    defaults.update(options)
+    return TieringJob(**defaults)
+
+
+async def seed(collection, *documents):
+    """Insert documents into a collection."""
+    for document in documents:
+        await collection.insert_one(document)
+
+
+@pytest.mark.asyncio
+class TestTieringJob:
+    """Test archiving idle documents."""
+
+    async def test_archive_record_round_trip(self):
+        """Test that an archived document restores unchanged and compressed."""
+        document = make_document("doc", 0)
+
+        record = pack_document(document)
+        restored = unpack_document(record)
+
+        assert restored["_id"] == document["_id"]
+        assert restored["content"] == document["content"]
+        assert record["compressed_size"] < record["size"]
+
+    async def test_archives_only_idle_documents(self):
+        """Test that idle documents move to the archive, using updated_at when never accessed."""
+        collection = MockCollection()
+        await seed(
+            collection,
+            make_document("idle", 40),
+            make_document("untracked", 40, tracked=False),
+            make_document("recent", 5),
+            make_document("recently-read", 40)
+        )
+        collection.documents[next(
+            key for key, d in collection.documents.items() if d["share_id"] == "recently-read"
+        )]["last_accessed_at"] = NOW
+
+        counts = await make_job().run_collection("primary", collection)
+
+        assert counts == {"archived": 2, "skipped": 0}
+        assert sorted(d["share_id"] for d in collection.documents.values()) == ["recent", "recently-read"]
+        archive = collection.database[ARCHIVE_COLLECTION]
+        assert sorted(d["share_id"] for d in archive.documents.values()) == ["idle", "untracked"]
+        assert collection.database[STATE_COLLECTION].documents == {}
+
+    async def test_changed_document_stays_hot(self):
+        """Test that a document accessed after it was read is not archived."""
+        collection = MockCollection()
+        document = make_document("doc", 40)
+        await seed(collection, document)
+        collection.documents[document["_id"]]["last_accessed_at"] = NOW
+
+        assert not await make_job().archive(collection, document)
+
+        assert document["_id"] in collection.documents
+        assert collection.database[ARCHIVE_COLLECTION].documents == {}
+
+    async def test_interrupted_run_resumes_from_checkpoint(self):
+        """Test that a run stopped mid-way continues after the last finished batch."""
+        collection = MockCollection()
+        await seed(collection, *(make_document(f"doc-{i}", 40) for i in range(5)))
+        calls = []
+
+        async def sleep(seconds):
+            calls.append(seconds)
+            if len(calls) == 3:
+                raise RuntimeError("stopped")
+
+        with pytest.raises(RuntimeError):
+            # Paced at one per second, so the third sleep comes before the fourth document
+            await make_job(rate=1.0, sleep=sleep).run_collection("primary", collection)
+        checkpoint = await collection.database[STATE_COLLECTION].find_one({"_id": "documents"})
+        assert checkpoint is not None
+
+        counts = await make_job().run_collection("primary", collection)
+
+        assert collection.documents == {}
+        assert len(collection.database[ARCHIVE_COLLECTION].documents) == 5
+        assert counts == {"archived": 2, "skipped": 0}
+        assert collection.database[STATE_COLLECTION].documents == {}
+
+    async def test_concurrent_jobs_take_turns(self):
+        """Test that only the job holding a collection's lease archives it."""
+        collection = MockCollection()
+        await seed(collection, *(make_document(f"doc-{i}", 40) for i in range(5)))
+
+        async def sleep(seconds):
+            await asyncio.sleep(0)
+
+        first, second = make_job(rate=1.0, sleep=sleep), make_job(rate=1.0, sleep=sleep)
+        counts = await asyncio.gather(
+            first.run_collection("primary", collection), second.run_collection("primary", collection)
+        )
+
+        assert counts == [{"archived": 5, "skipped": 0}, {"archived": 0, "skipped": 0}]
+        assert len(collection.database[ARCHIVE_COLLECTION].documents) == 5
+        assert collection.database[STATE_COLLECTION].documents == {}
+
+    async def test_expired_lease_is_taken_over(self):
+        """Test that a lease left by a stopped worker blocks others only until it expires."""
+        collection = MockCollection()
+        stopped, job = make_job(), make_job()
+
+        assert await stopped.acquire_lease(collection)
+        assert not await job.acquire_lease(collection)
+        lease = collection.database[STATE_COLLECTION].documents["lease:documents"]
+        lease["expires_at"] = NOW - timedelta(seconds=1)
+
+        assert await job.acquire_lease(collection)
+        assert lease["owner"] == job.owner
+        await stopped.release_lease(collection)
+        assert "lease:documents" in collection.database[STATE_COLLECTION].documents
+
+
+@pytest.mark.asyncio
+class TestRehydration:
+    """Test transparent reads and writes of archived documents."""
+
+    @pytest.fixture
+    def collection(self, monkeypatch):
+        """Route the repository to one in-memory shard with tiering enabled."""
+        shards = ShardSet([ShardConfig("a", "mongodb://localhost:27017", "editer")])
+        shard = shards.shards["a"]
+        shard.collection = MockCollection()
+        monkeypatch.setattr(db_manager, "shards", shards)
+        monkeypatch.setattr(settings, "tiering_enabled", True)
+        return shard.collection
+
+    async def test_find_rehydrates(self, collection):
+        """Test that finding an archived document moves it back to the hot tier."""
+        document = make_document("doc", 40)
+        await seed(collection, document)
+        await make_job().run_collection("a", collection)
+
+        found = await DocumentRepository().find_by_share_id("doc")
+
+        assert found.content == document["content"]
+        assert found.id == str(document["_id"])
+        hot = await collection.find_one({"share_id": "doc"})
+        assert hot["last_accessed_at"] > NOW - timedelta(minutes=1)
+        assert collection.database[ARCHIVE_COLLECTION].documents == {}
+
+    async def test_update_rehydrates(self, collection):
+        """Test that updating an archived document rehydrates and updates it."""
+        await seed(collection, make_document("doc", 40))
+        await make_job().run_collection("a", collection)
+
+        updated = await DocumentRepository().update("doc", "new", datetime.now(UTC))
+
+        assert updated.content == "new"
+        assert (await collection.find_one({"share_id": "doc"}))["content"] == "new"
+
+    async def test_create_checks_archive(self, collection):
+        """Test that a share_id of an archived document is not created again in the hot tier."""
+        await seed(collection, make_document("doc", 40))
+        await make_job().run_collection("a", collection)
+
+        with pytest.raises(RuntimeError, match=f"exists in {ARCHIVE_COLLECTION}"):
+            await DocumentRepository().create("doc", "new")
+
+        assert collection.documents == {}
+        assert len(collection.database[ARCHIVE_COLLECTION].documents) == 1
+
+    async def test_missing_document(self, collection):
+        """Test that a document in neither tier is not found."""
+        assert await DocumentRepository().find_by_share_id("missing") is None
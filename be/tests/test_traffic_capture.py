@@ -0,0 +1,167 @@
+"""
+Unit tests for traffic capture and replay.
+"""
+import json
+import os
+import time
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.middleware.traffic_capture import TrafficCaptureMiddleware
+from src.services.document_service import DocumentService, get_document_service
+from src.services.traffic_capture import TrafficRecorder, read_trace, worker_path
+from tests.benchmarks.replay import Replayer, read_traces
+from tests.fixtures import MockHRIDGenerator, MockDocumentRepository
+
+
+def make_app(recorder: TrafficRecorder) -> FastAPI:
+    """Build a small app behind the capture middleware."""
+    mini_app = FastAPI()
+
+    @mini_app.post("/api/v1/documents", status_code=201)
+    async def create(body: dict):
+        return {"id": "1", "share_id": "new-doc", "content": body["content"]}
+
+    @mini_app.get("/api/v1/documents/{share_id}")
+    async def read(share_id: str):
+        return {"id": "1", "share_id": share_id, "content": "text"}
+
+    mini_app.add_middleware(TrafficCaptureMiddleware, recorder=recorder)
+    return mini_app
+
+
+class TestCapture:
+    """Test recording requests to a trace."""
+
+    def test_records_metadata_without_content(self, tmp_path):
+        """Test that routes, share_ids, sizes and timing are recorded but content is not."""
+        recorder = TrafficRecorder(str(tmp_path / "trace.jsonl.gz"))
+        recorder.start()
+        body = json.dumps({"content": "secret text"})
+        with TestClient(make_app(recorder)) as client:
+            client.post("/api/v1/documents", content=body, headers={"content-type": "application/json"})
+            client.get("/api/v1/documents/abc")
+        recorder.stop()
+
+        header, records = read_trace(recorder.path)
+        created, read = list(records)
+
+        assert header["content"] is False
+        assert created["r"] == "/api/v1/documents" and created["s"] == "new-doc" and created["c"] == 201
+        assert created["q"] == len(body)
+        assert "b" not in created
+        assert read["r"] == "/api/v1/documents/{share_id}" and read["s"] == "abc"
+        assert read["p"] > 0 and read["d"] >= 0 and read["t"] >= created["t"]
+        assert "secret" not in open(recorder.path, "rb").read().decode("latin-1")
+
+    def test_records_beyond_queue_are_dropped(self, tmp_path):
+        """Test that records the writer has not taken yet are bounded."""
+        recorder = TrafficRecorder(str(tmp_path / "trace.jsonl"), max_queued=2)
+        for _ in range(3):
+            recorder.record({"m": "GET", "r": "/"}, time.perf_counter())
+
+        assert recorder.recorded == 2
+        assert recorder.dropped == 1
+
+    def test_writer_failure_stops_capture(self, tmp_path):
+        """Test that records are dropped instead of queued once the trace cannot be written."""
+        recorder = TrafficRecorder(str(tmp_path / "missing" / "trace.jsonl"))
+        recorder.start()
+        recorder._thread.join(timeout=5)
+
+        assert not recorder.running
+        recorder.record({"m": "GET", "r": "/"}, time.perf_counter())
+        assert recorder.dropped == 1
+        recorder.stop()
+
+    def test_one_trace_per_process(self, tmp_path):
+        """Test that the pid is added to the trace name when the recorder starts."""
+        recorder = TrafficRecorder(str(tmp_path / "trace.jsonl.gz"))
+        recorder.start()
+        recorder.stop()
+
+        assert recorder.path == str(tmp_path / f"trace.{os.getpid()}.jsonl.gz")
+        assert os.path.exists(recorder.path)
+        assert worker_path("traffic.jsonl", 7) == "traffic.7.jsonl"
+
+    def test_records_are_read_by_start_time(self, tmp_path):
+        """Test that a slow request finishing after a fast one is stamped and read at its start."""
+        recorder = TrafficRecorder(str(tmp_path / "trace.jsonl"))
+        recorder.start()
+        slow_started = time.perf_counter()
+        fast_started = slow_started + 0.5
+        recorder.record({"m": "GET", "r": "/fast"}, fast_started)
+        recorder.record({"m": "GET", "r": "/slow"}, slow_started)
+        recorder.stop()
+
+        _, records = read_trace(recorder.path)
+        slow, fast = list(records)
+
+        assert slow["r"] == "/slow" and fast["r"] == "/fast"
+        assert fast["t"] - slow["t"] == pytest.approx(0.5)
+
+    def test_content_only_when_enabled(self, tmp_path):
+        """Test that request bodies are recorded with content capture enabled."""
+        recorder = TrafficRecorder(str(tmp_path / "trace.jsonl"), include_content=True)
+        recorder.start()
+        with TestClient(make_app(recorder)) as client:
+            client.post("/api/v1/documents", json={"content": "kept"})
+        recorder.stop()
+
+        _, records = read_trace(recorder.path)
+        assert json.loads(next(records)["b"]) == {"content": "kept"}
+
+
+@pytest.mark.asyncio
+class TestReplay:
+    """Test replaying a trace against the app."""
+
+    async def test_replay_maps_share_ids(self):
+        """Test that created and unseen documents are mapped to target documents."""
+        service = DocumentService(MockHRIDGenerator(), MockDocumentRepository())
+        app.dependency_overrides[get_document_service] = lambda: service
+        records = [
+            {"t": 0.0, "m": "POST", "r": "/api/v1/documents", "s": "captured-a", "q": 100, "p": 150, "c": 201},
+            {"t": 0.0, "m": "GET", "r": "/api/v1/documents/{share_id}", "s": "captured-a", "q": 0, "p": 150, "c": 200},
+            {"t": 0.0, "m": "PUT", "r": "/api/v1/documents/{share_id}", "s": "captured-b", "q": 80, "p": 120, "c": 200},
+            {"t": 0.0, "m": "GET", "r": "/api/v1/snapshots/{snapshot_id}", "q": 0, "p": 10, "c": 200}
+        ]
+
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://replay") as client:
+                replayer = Replayer(client, concurrency=4)
+                await replayer.replay(records, speed=0, limit=None)
+        finally:
+            app.dependency_overrides.clear()
+
+        assert replayer.statuses["/api/v1/documents"] == {"201": 1}
+        assert replayer.statuses["/api/v1/documents/{share_id}"] == {"200": 2}
+        assert replayer.skipped["/api/v1/snapshots/{snapshot_id}"] == 1
+        assert len(service.document_repository.documents) == 2
+        assert "requests in" in replayer.report(1.0)
+
+
+class TestMergeTraces:
+    """Test merging the traces of several workers."""
+
+    def test_merged_on_capture_start(self, tmp_path):
+        """Test that records of traces started at different times are interleaved by start time."""
+        paths = []
+        for name, started_at, offsets in [
+            ("a", "2026-01-01T00:00:00+00:00", [0.0, 2.0]),
+            ("b", "2026-01-01T00:00:01+00:00", [0.5]),
+        ]:
+            path = tmp_path / f"{name}.jsonl"
+            lines = [{"version": 1, "started_at": started_at, "content": False}]
+            lines += [{"t": offset, "m": "GET", "r": f"/{name}"} for offset in offsets]
+            path.write_text("".join(json.dumps(line) + "\n" for line in lines))
+            paths.append(str(path))
+
+        header, records = read_traces(paths)
+
+        assert header["started_at"] == "2026-01-01T00:00:00+00:00"
+        assert [(entry["r"], entry["t"]) for entry in records] == [("/a", 0.0), ("/b", 1.5), ("/a", 2.0)]